@@ -0,0 +1,215 @@
+"""
+Answer key service - Compiled, cached answer keys for quiz scoring.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+from django.core.cache import cache
+from django.db.models import F
+
+from .models import Question, Quiz
+
+
+def normalize_gap_answer(value: Any) -> str:
+    """Normalize a fill-in-the-blank answer for comparison."""
+    return str(value).lower().strip()
+
+
+@dataclass(frozen=True)
+class CompiledQuestion:
+    """
+    Scoring data for one question, resolved from its options, matching
+    pairs, gap answers and answer_data so checking an answer needs no queries.
+    """
+    id: int
+    question_type: str
+    points: int
+    # matching: ((left_text, right_text), ...)
+    matching_pairs: Tuple[Tuple[str, str], ...] = ()
+    # fill_blank: ((gap_index, normalized accepted answers), ...)
+    gaps: Tuple[Tuple[str, FrozenSet[str]], ...] = ()
+    # mcq_multi: option positions that must be selected
+    correct_positions: FrozenSet[int] = frozenset()
+    # mcq: True when QuestionOption rows exist; correct_position is None if none is marked correct
+    has_options: bool = False
+    correct_position: Optional[int] = None
+    # ordering / true_false / legacy mcq: value compared directly with the answer
+    correct_value: Any = None
+    manual_grading: bool = True
+    keywords: Tuple[str, ...] = ()
+
+    @classmethod
+    def compile(cls, question: Question) -> 'CompiledQuestion':
+        """
+        Compile a question. Uses prefetched options, matching_pairs and
+        gap_answers when available.
+        """
+        data = question.answer_data or {}
+        qtype = question.question_type
+        kwargs: Dict[str, Any] = {}
+
+        if qtype == 'matching':
+            kwargs['matching_pairs'] = tuple(
+                (pair.left_text, pair.right_text) for pair in question.matching_pairs.all()
+            )
+        elif qtype == 'fill_blank':
+            kwargs['gaps'] = tuple(
+                (str(gap.gap_index), frozenset(normalize_gap_answer(a) for a in gap.accepted_answers))
+                for gap in question.gap_answers.all()
+            )
+        elif qtype == 'ordering':
+            kwargs['correct_value'] = data.get('correct_order', [])
+        elif qtype in ('mcq', 'mcq_multi'):
+            options = list(question.options.all())
+            correct = [opt.position for opt in options if opt.is_correct]
+            kwargs['has_options'] = bool(options)
+            if qtype == 'mcq_multi':
+                kwargs['correct_positions'] = frozenset(
+                    correct if options else data.get('correct_indices', [])
+                )
+            elif options:
+                kwargs['correct_position'] = correct[0] if len(correct) == 1 else None
+            else:
+                kwargs['correct_value'] = data.get('correct')
+        elif qtype == 'true_false':
+            kwargs['correct_value'] = data.get('correct')
+        elif qtype == 'short_answer':
+            kwargs['manual_grading'] = data.get('manual_grading', True)
+            kwargs['keywords'] = tuple(kw.lower() for kw in data.get('keywords', []))
+
+        return cls(id=question.id, question_type=qtype, points=question.points, **kwargs)
+
+    def check(self, student_answer) -> Tuple[Optional[bool], Optional[int]]:
+        """
+        Check a student answer.
+        Returns (is_correct, points_earned); (None, None) when manual grading is needed.
+        """
+        if self.question_type == 'matching':
+            # student_answer: {"LeftText": "RightText", ...}
+            if not self.matching_pairs:
+                return False, 0
+            correct_count = sum(
+                1 for left, right in self.matching_pairs if student_answer.get(left) == right
+            )
+            return self._partial(correct_count, len(self.matching_pairs))
+
+        elif self.question_type == 'fill_blank':
+            # student_answer: {"0": "answer1", "1": "answer2"}
+            if not self.gaps:
+                return False, 0
+            correct_count = sum(
+                1 for gap_index, accepted in self.gaps
+                if normalize_gap_answer(student_answer.get(gap_index, '')) in accepted
+            )
+            return self._partial(correct_count, len(self.gaps))
+
+        elif self.question_type == 'mcq_multi':
+            # student_answer: [0, 2] (list of selected option positions)
+            submitted = set(student_answer) if isinstance(student_answer, list) else set()
+            return self._all_or_nothing(submitted == self.correct_positions)
+
+        elif self.question_type == 'mcq':
+            if self.has_options:
+                try:
+                    is_correct = (
+                        self.correct_position is not None
+                        and int(student_answer) == self.correct_position
+                    )
+                except (ValueError, TypeError):
+                    is_correct = False
+            else:
+                is_correct = (student_answer == self.correct_value)
+            return self._all_or_nothing(is_correct)
+
+        elif self.question_type in ('ordering', 'true_false'):
+            return self._all_or_nothing(student_answer == self.correct_value)
+
+        elif self.question_type == 'short_answer':
+            if self.manual_grading:
+                return None, None  # Needs manual grading
+            answer_lower = str(student_answer).lower()
+            return self._all_or_nothing(any(kw in answer_lower for kw in self.keywords))
+
+        return False, 0
+
+    def _all_or_nothing(self, is_correct: bool) -> Tuple[bool, int]:
+        return is_correct, self.points if is_correct else 0
+
+    def _partial(self, correct_count: int, total: int) -> Tuple[bool, int]:
+        is_completely_correct = (correct_count == total)
+        points_earned = self.points if is_completely_correct else int(self.points * correct_count / total)
+        return is_completely_correct, points_earned
+
+
+@dataclass(frozen=True)
+class AnswerKey:
+    """Compiled answer key of one quiz revision, questions in position order."""
+    quiz_id: int
+    revision: int
+    pass_threshold: int
+    questions: Tuple[CompiledQuestion, ...] = ()
+    index: Dict[int, CompiledQuestion] = field(default_factory=dict)
+
+    @classmethod
+    def compile(cls, quiz: Quiz, revision: int) -> 'AnswerKey':
+        """Compile every question of a quiz with its options, pairs and gaps prefetched."""
+        questions = tuple(
+            CompiledQuestion.compile(q)
+            for q in quiz.questions.prefetch_related('options', 'matching_pairs', 'gap_answers')
+        )
+        return cls(
+            quiz_id=quiz.id,
+            revision=revision,
+            pass_threshold=quiz.pass_threshold,
+            questions=questions,
+            index={q.id: q for q in questions},
+        )
+
+    def get(self, question_id: int) -> Optional[CompiledQuestion]:
+        return self.index.get(question_id)
+
+    @property
+    def total_points(self) -> int:
+        return sum(q.points for q in self.questions)
+
+
+class AnswerKeyService:
+    """
+    Serves compiled answer keys from Django's cache framework.
+    Keys are stored under the quiz's answer_key_revision, which is advanced
+    in the database whenever the quiz, a question, or a question's options,
+    pairs or gaps change. The bump is part of the editing transaction, so
+    every process sees it exactly when the edit commits.
+    """
+
+    CACHE_TIMEOUT = 60 * 60 * 24
+    KEY = 'answer_key:{quiz_id}:{revision}'
+
+    @classmethod
+    def get_key(cls, quiz_id: int) -> AnswerKey:
+        """
+        Get the compiled answer key for a quiz, compiling it on a cache miss.
+
+        Args:
+            quiz_id: The quiz to get the answer key for
+
+        Returns:
+            The AnswerKey for the quiz's current revision
+        """
+        revision = cls.get_revision(quiz_id)
+        cache_key = cls.KEY.format(quiz_id=quiz_id, revision=revision)
+        answer_key = cache.get(cache_key)
+        if answer_key is None:
+            answer_key = AnswerKey.compile(Quiz.objects.get(pk=quiz_id), revision)
+            cache.set(cache_key, answer_key, cls.CACHE_TIMEOUT)
+        return answer_key
+
+    @classmethod
+    def get_revision(cls, quiz_id: int) -> int:
+        """Read the quiz's current answer key revision from the database."""
+        return Quiz.objects.filter(pk=quiz_id).values_list('answer_key_revision', flat=True).get()
+
+    @classmethod
+    def invalidate(cls, quiz_id: int) -> None:
+        """Advance the revision so the next read after commit recompiles the key."""
+        Quiz.objects.filter(pk=quiz_id).update(answer_key_revision=F('answer_key_revision') + 1)
@@ -5,3 +5,7 @@ class AssessmentsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.assessments"
     verbose_name = "Assessments"
+
+    def ready(self):
+        """Import signals when app is ready."""
+        import apps.assessments.signals  # noqa: F401
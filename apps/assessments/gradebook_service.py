@@ -0,0 +1,218 @@
+"""
+Gradebook aggregation service - Builds program gradebooks with grouped queries.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from django.db.models import Case, Count, IntegerField, Max, When
+
+from apps.progression.models import Enrollment
+from .models import Assignment, AssignmentSubmission, Quiz, QuizAttempt
+
+
+@dataclass
+class QuizCell:
+    """Aggregated attempts of one student on one quiz."""
+    best_score: Optional[float] = None
+    attempt_count: int = 0
+    passed: Optional[bool] = None
+
+
+@dataclass
+class AssignmentCell:
+    """One student's submission state for one assignment."""
+    score: Optional[float] = None  # Final score after late penalty
+    raw_score: Optional[float] = None
+    status: str = 'not_submitted'
+    is_late: bool = False
+    dimension_scores: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class GradebookMatrix:
+    """
+    Students × items gradebook for a program.
+    Row i of every matrix belongs to enrollments[i]; columns follow
+    quizzes and assignments respectively.
+    """
+    enrollments: List[Enrollment]
+    quizzes: List[Quiz]
+    assignments: List[Assignment]
+    quiz_cells: List[List[QuizCell]] = field(default_factory=list)
+    assignment_cells: List[List[AssignmentCell]] = field(default_factory=list)
+    overall: List[Optional[float]] = field(default_factory=list)
+
+    def rows(self) -> Iterator[Tuple[Enrollment, List[QuizCell], List[AssignmentCell], Optional[float]]]:
+        """Iterate (enrollment, quiz row, assignment row, overall) tuples."""
+        return zip(self.enrollments, self.quiz_cells, self.assignment_cells, self.overall)
+
+
+class GradebookService:
+    """
+    Computes best quiz scores, attempt counts, assignment final scores and the
+    weighted overall for a set of enrollments in a constant number of queries.
+    """
+
+    DEFAULT_QUIZ_WEIGHT = 30
+
+    def __init__(self, program, grading_config: Optional[Dict[str, Any]] = None):
+        self.program = program
+        if grading_config is None:
+            grading_config = program.blueprint.grading_logic if program.blueprint else {}
+        self.grading_config = grading_config or {}
+        self._quizzes = None
+        self._assignments = None
+
+    @property
+    def quizzes(self) -> List[Quiz]:
+        """Published quizzes of the program (gradebook columns)."""
+        if self._quizzes is None:
+            self._quizzes = list(
+                Quiz.objects.filter(node__program=self.program, is_published=True).order_by(
+                    'created_at'
+                )
+            )
+        return self._quizzes
+
+    @property
+    def assignments(self) -> List[Assignment]:
+        """Published assignments of the program (gradebook columns)."""
+        if self._assignments is None:
+            self._assignments = list(
+                Assignment.objects.filter(program=self.program, is_published=True)
+                .select_related('rubric')
+                .order_by('created_at')
+            )
+        return self._assignments
+
+    def build(self, enrollments: Optional[List[Enrollment]] = None) -> GradebookMatrix:
+        """
+        Build the gradebook matrix.
+
+        Args:
+            enrollments: Rows to compute; defaults to every enrollment of the program
+
+        Returns:
+            GradebookMatrix with quiz, assignment and overall scores
+        """
+        if enrollments is None:
+            enrollments = list(
+                Enrollment.objects.filter(program=self.program)
+                .select_related('user')
+                .order_by('user__last_name', 'user__first_name')
+            )
+        matrix = GradebookMatrix(
+            enrollments=list(enrollments),
+            quizzes=self.quizzes,
+            assignments=self.assignments,
+        )
+        enrollment_ids = [e.id for e in matrix.enrollments]
+
+        matrix.quiz_cells = self._build_quiz_cells(enrollment_ids)
+        matrix.assignment_cells = self._build_assignment_cells(enrollment_ids)
+        matrix.overall = [
+            self.weighted_overall(quiz_row, assignment_row)
+            for quiz_row, assignment_row in zip(matrix.quiz_cells, matrix.assignment_cells)
+        ]
+        return matrix
+
+    def iter_chunks(self, chunk_size: int = 500) -> Iterator[GradebookMatrix]:
+        """
+        Build the gradebook in enrollment chunks so memory stays flat.
+        Enrollments are walked with keyset pagination on id.
+
+        Args:
+            chunk_size: Number of enrollments per chunk
+
+        Yields:
+            GradebookMatrix for each chunk of enrollments
+        """
+        last_id = 0
+        while True:
+            chunk = list(
+                Enrollment.objects.filter(program=self.program, id__gt=last_id)
+                .select_related('user')
+                .order_by('id')[:chunk_size]
+            )
+            if not chunk:
+                return
+            yield self.build(chunk)
+            last_id = chunk[-1].id
+
+    def _build_quiz_cells(self, enrollment_ids: List[int]) -> List[List[QuizCell]]:
+        """Aggregate attempts per (enrollment, quiz) in one grouped query."""
+        row_index = {enrollment_id: i for i, enrollment_id in enumerate(enrollment_ids)}
+        col_index = {quiz.id: j for j, quiz in enumerate(self.quizzes)}
+        cells = [[QuizCell() for _ in self.quizzes] for _ in enrollment_ids]
+        if not enrollment_ids or not self.quizzes:
+            return cells
+
+        aggregates = (
+            QuizAttempt.objects.filter(enrollment_id__in=enrollment_ids, quiz_id__in=col_index)
+            .values('enrollment_id', 'quiz_id')
+            .annotate(
+                attempt_count=Count('id'),
+                best_score=Max('score'),
+                # 1 if any attempt passed, 0 if any failed, NULL if all await grading
+                passed_flag=Max(Case(
+                    When(passed=True, then=1),
+                    When(passed=False, then=0),
+                    output_field=IntegerField(),
+                )),
+            )
+        )
+        for row in aggregates:
+            cell = cells[row_index[row['enrollment_id']]][col_index[row['quiz_id']]]
+            cell.attempt_count = row['attempt_count']
+            cell.best_score = float(row['best_score']) if row['best_score'] else None
+            cell.passed = None if row['passed_flag'] is None else bool(row['passed_flag'])
+        return cells
+
+    def _build_assignment_cells(self, enrollment_ids: List[int]) -> List[List[AssignmentCell]]:
+        """Load submissions for all rows in one query and apply late penalties."""
+        row_index = {enrollment_id: i for i, enrollment_id in enumerate(enrollment_ids)}
+        assignments_by_id = {a.id: a for a in self.assignments}
+        col_index = {a.id: j for j, a in enumerate(self.assignments)}
+        cells = [[AssignmentCell() for _ in self.assignments] for _ in enrollment_ids]
+        if not enrollment_ids or not self.assignments:
+            return cells
+
+        submissions = AssignmentSubmission.objects.filter(
+            enrollment_id__in=enrollment_ids, assignment_id__in=col_index
+        ).only('id', 'enrollment_id', 'assignment_id', 'score', 'is_late', 'status', 'dimension_scores')
+        for sub in submissions:
+            # Reuse the already-loaded assignment instead of a per-row lookup
+            sub.assignment = assignments_by_id[sub.assignment_id]
+            cell = cells[row_index[sub.enrollment_id]][col_index[sub.assignment_id]]
+            cell.score = sub.get_final_score() if sub.score else None
+            cell.raw_score = float(sub.score) if sub.score is not None else None
+            cell.status = sub.status
+            cell.is_late = sub.is_late
+            cell.dimension_scores = sub.dimension_scores
+        return cells
+
+    def weighted_overall(
+        self,
+        quiz_row: List[QuizCell],
+        assignment_row: List[AssignmentCell]
+    ) -> Optional[float]:
+        """
+        Weighted overall percentage for one row.
+        Quizzes share quiz_weight equally; each assignment carries its own weight.
+        """
+        total_weight = 0
+        weighted_score = 0.0
+
+        if quiz_row:
+            quiz_weight = self.grading_config.get('quiz_weight', self.DEFAULT_QUIZ_WEIGHT)
+            quiz_sum = sum(cell.best_score or 0 for cell in quiz_row)
+            weighted_score += (quiz_sum / len(quiz_row)) * (quiz_weight / 100)
+            total_weight += quiz_weight
+
+        for assignment, cell in zip(self.assignments, assignment_row):
+            if cell.score is not None:
+                weighted_score += cell.score * (assignment.weight / 100)
+            total_weight += assignment.weight
+
+        overall = (weighted_score / total_weight * 100) if total_weight > 0 else None
+        return round(overall, 1) if overall else None
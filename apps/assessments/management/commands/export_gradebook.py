@@ -0,0 +1,64 @@
+"""
+Django management command for exporting a program gradebook.
+
+Usage:
+    python manage.py export_gradebook --program-id=1 > gradebook.csv
+    python manage.py export_gradebook --program-id=1 --output=gradebook.csv
+    python manage.py export_gradebook --program-id=1 --format=xlsx --output=gradebook.xlsx
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.assessments.gradebook_export import GradebookExporter
+from apps.core.models import Program
+
+
+class Command(BaseCommand):
+    help = 'Export a program gradebook as CSV or XLSX, streaming enrollments in chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--program-id',
+            type=int,
+            required=True,
+            help='Program to export',
+        )
+        parser.add_argument(
+            '--format',
+            choices=GradebookExporter.FORMATS,
+            default='csv',
+            help='Output format (default: csv)',
+        )
+        parser.add_argument(
+            '--output',
+            help='File to write; CSV goes to stdout when omitted',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=GradebookExporter.DEFAULT_CHUNK_SIZE,
+            help='Enrollments loaded per chunk',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            program = Program.objects.select_related('blueprint').get(pk=options['program_id'])
+        except Program.DoesNotExist:
+            raise CommandError(f"Program with ID {options['program_id']} does not exist")
+        
+        exporter = GradebookExporter(program, chunk_size=options['chunk_size'])
+        output = options['output']
+        
+        if options['format'] == 'xlsx':
+            if not output:
+                raise CommandError('--output is required for XLSX exports')
+            exporter.write_xlsx(output)
+        elif output:
+            with open(output, 'w', newline='', encoding='utf-8') as f:
+                for line in exporter.iter_csv():
+                    f.write(line)
+        else:
+            for line in exporter.iter_csv():
+                self.stdout.write(line, ending='')
+        
+        if output:
+            self.stdout.write(self.style.SUCCESS(f'Gradebook for {program.name} written to {output}'))
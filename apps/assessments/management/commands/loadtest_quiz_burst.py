@@ -0,0 +1,140 @@
+"""
+Django management command load-testing quiz start/submit under an exam burst.
+
+Creates a synthetic published quiz and enrolled students, then drives
+student_quiz_start and student_quiz_submit through the full request stack
+from a thread pool and reports latency percentiles per phase. The synthetic
+data is committed (worker threads use their own connections) and deleted
+afterwards.
+
+Run it once per database stand-in to compare them:
+    DB_ENGINE=sqlite3 python manage.py loadtest_quiz_burst
+    DB_ENGINE=mysql python manage.py loadtest_quiz_burst --students=500 --concurrency=500
+
+Usage:
+    python manage.py loadtest_quiz_burst
+    python manage.py loadtest_quiz_burst --students=200 --questions=40 --concurrency=100
+"""
+import json
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+
+from apps.assessments.models import Question, QuestionOption, Quiz
+from apps.core.models import Program, User
+from apps.curriculum.models import CurriculumNode
+from apps.progression.models import Enrollment
+
+
+class Command(BaseCommand):
+    help = 'Load-test concurrent quiz start/submit and report p50/p95/p99 latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=500)
+        parser.add_argument('--concurrency', type=int, default=500, help='Worker threads')
+        parser.add_argument('--questions', type=int, default=20)
+
+    def handle(self, *args, **options):
+        tag = uuid.uuid4().hex[:8]
+        program, quiz, users = self._create_fixture(tag, options['students'], options['questions'])
+        try:
+            self.stdout.write(
+                f'Database: {connection.vendor}; {len(users)} students, '
+                f'{options["questions"]} questions, {options["concurrency"]} workers'
+            )
+            host = settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else 'localhost'
+            clients = [self._client(user, host) for user in users]
+
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+                started = list(pool.map(lambda c: self._start(c, quiz.id), clients))
+                self._report('start', started)
+                submitted = list(pool.map(
+                    lambda args: self._submit(args[0], quiz.id, args[1]),
+                    zip(clients, [payload for _, _, payload in started]),
+                ))
+                self._report('submit', submitted)
+        finally:
+            program.delete()
+            User.objects.filter(username__startswith=f'burst-{tag}-').delete()
+
+    def _create_fixture(self, tag, students, questions):
+        program = Program.objects.create(name=f'Burst Load Test {tag}', code=f'BURST-{tag}')
+        node = CurriculumNode.objects.create(
+            program=program, node_type='lesson', title='Exam', is_published=True
+        )
+        quiz = Quiz.objects.create(
+            node=node, title='Burst Exam', is_published=True, shuffle_options=True
+        )
+        created = Question.objects.bulk_create([
+            Question(quiz=quiz, question_type='mcq', text=f'Question {i}', position=i, answer_data={})
+            for i in range(questions)
+        ])
+        QuestionOption.objects.bulk_create([
+            QuestionOption(question=q, text=f'Option {pos}', is_correct=(pos == 0), position=pos)
+            for q in created
+            for pos in range(4)
+        ])
+        users = User.objects.bulk_create([
+            User(username=f'burst-{tag}-{i}', email=f'burst-{tag}-{i}@example.com')
+            for i in range(students)
+        ])
+        Enrollment.objects.bulk_create([
+            Enrollment(user=user, program=program, status='active') for user in users
+        ])
+        return program, quiz, users
+
+    def _client(self, user, host):
+        client = Client(HTTP_HOST=host)
+        client.force_login(user)
+        return client
+
+    def _start(self, client, quiz_id):
+        """Returns (latency seconds, ok, answers to submit)."""
+        began = time.perf_counter()
+        try:
+            response = client.get(f'/student/quiz/{quiz_id}/', HTTP_X_INERTIA='true')
+            elapsed = time.perf_counter() - began
+            ok = response.status_code == 200
+            answers = {}
+            if ok:
+                for q in json.loads(response.content)['props']['questions']:
+                    answers[str(q['id'])] = q['options'].index('Option 0')
+            return elapsed, ok, answers
+        except Exception:
+            return time.perf_counter() - began, False, {}
+        finally:
+            connection.close()
+
+    def _submit(self, client, quiz_id, answers):
+        began = time.perf_counter()
+        try:
+            response = client.post(
+                f'/student/quiz/{quiz_id}/submit/',
+                data=json.dumps({'answers': answers}),
+                content_type='application/json',
+            )
+            return time.perf_counter() - began, response.status_code < 400, None
+        except Exception:
+            return time.perf_counter() - began, False, None
+        finally:
+            connection.close()
+
+    def _report(self, phase, results):
+        latencies = sorted(elapsed * 1000 for elapsed, _, _ in results)
+        errors = sum(1 for _, ok, _ in results if not ok)
+        if len(latencies) > 1:
+            centiles = statistics.quantiles(latencies, n=100)
+            p50, p95, p99 = centiles[49], centiles[94], centiles[98]
+        else:
+            p50 = p95 = p99 = latencies[0] if latencies else 0.0
+        self.stdout.write(
+            f'  {phase:<7} n={len(results):<5} errors={errors:<4} '
+            f'p50={p50:8.1f} ms  p95={p95:8.1f} ms  p99={p99:8.1f} ms  '
+            f'max={(latencies[-1] if latencies else 0):8.1f} ms'
+        )
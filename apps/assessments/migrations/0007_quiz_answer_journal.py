@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 15:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0006_rename_assessments_rubrics_scope_owner_idx_assessments_scope_79e54f_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizAnswerJournal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('question_id', models.PositiveIntegerField()),
+                ('answer', models.JSONField(null=True)),
+                ('sequence', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('attempt', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='journal_entries', to='assessments.quizattempt')),
+            ],
+            options={
+                'db_table': 'quiz_answer_journal',
+                'indexes': [models.Index(fields=['attempt', 'sequence'], name='quiz_answer_attempt_53fd4f_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0007_quiz_answer_journal'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='answer_key_revision',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
@@ -3,7 +3,7 @@ Assessment models - Grading strategies and results.
 """
 from django.db import models
 from typing import Optional
-from apps.core.models import TimeStampedModel
+from apps.core.models import DatabaseRevisionMixin, TimeStampedModel
 
 
 class AssessmentResult(TimeStampedModel):
@@ -119,7 +119,7 @@ class Rubric(TimeStampedModel):
         return total
 
 
-class Quiz(TimeStampedModel):
+class Quiz(DatabaseRevisionMixin, TimeStampedModel):
     """
     Quiz attached to a lesson/session node.
     Each lesson can have one or more quizzes for knowledge checks.
@@ -142,6 +142,12 @@ class Quiz(TimeStampedModel):
     shuffle_options = models.BooleanField(default=False)
     is_published = models.BooleanField(default=False)
 
+    # Advanced in the database whenever the quiz, a question or its answer
+    # data changes (AnswerKeyService.invalidate); cached answer keys and
+    # payloads are stored under it
+    answer_key_revision = models.PositiveIntegerField(default=1, editable=False)
+    revision_field = 'answer_key_revision'
+
     class Meta:
         db_table = 'quizzes'
         indexes = [
@@ -199,99 +205,18 @@ class Question(TimeStampedModel):
         Check if student answer is correct.
         Returns (is_correct, points_earned).
         
-        Refactored to support new question types.
+        Scores against the quiz's compiled answer key, so no per-question
+        queries are made once the key is cached.
         """
-        # 1. Matching Questions
-        if self.question_type == 'matching':
-            # student_answer: {"LeftText": "RightText", ...}
-            pairs = list(self.matching_pairs.all())
-            if not pairs:
-                return False, 0
-            
-            correct_count = 0
-            for pair in pairs:
-                # Key is now left_text as sent by frontend
-                submitted = student_answer.get(pair.left_text)
-                if submitted == pair.right_text:
-                    correct_count += 1
-            
-            is_completely_correct = (correct_count == len(pairs))
-            points_earned = self.points if is_completely_correct else int(self.points * correct_count / len(pairs))
-            return is_completely_correct, points_earned
-
-        # 2. Fill in the Blank
-        elif self.question_type == 'fill_blank':
-            # student_answer: {"0": "answer1", "1": "answer2"}
-            gaps = list(self.gap_answers.all())
-            if not gaps:
-                return False, 0
-                
-            correct_count = 0
-            for gap in gaps:
-                submitted = str(student_answer.get(str(gap.gap_index), '')).lower().strip()
-                accepted = [a.lower().strip() for a in gap.accepted_answers]
-                if submitted in accepted:
-                    correct_count += 1
-            
-            is_completely_correct = (correct_count == len(gaps))
-            points_earned = self.points if is_completely_correct else int(self.points * correct_count / len(gaps))
-            return is_completely_correct, points_earned
-
-        # 3. Ordering / Sequence
-        elif self.question_type == 'ordering':
-            # student_answer: [2, 0, 1, 3] (indices in correct order)
-            correct_order = self.answer_data.get('correct_order', [])
-            is_correct = (student_answer == correct_order)
-            return is_correct, self.points if is_correct else 0
-
-        # 4. Multi-Select MCQ
-        elif self.question_type == 'mcq_multi':
-            # student_answer: [0, 2] (list of selected option positions)
-            # Use QuestionOption model if available, fallback to answer_data for legacy/migration
-            if self.options.exists():
-                correct_positions = set(
-                    opt.position for opt in self.options.filter(is_correct=True)
-                )
-            else:
-                # Fallback to answer_data
-                correct_positions = set(self.answer_data.get('correct_indices', []))
-                
-            submitted_set = set(student_answer) if isinstance(student_answer, list) else set()
-            is_correct = (submitted_set == correct_positions)
-            return is_correct, self.points if is_correct else 0
-
-        # 5. Standard MCQ
-        elif self.question_type == 'mcq':
-            if self.options.exists():
-                # select related is_correct option
-                try:
-                    correct_option = self.options.get(is_correct=True)
-                    # Assuming student answer sends position index
-                    is_correct = (int(student_answer) == correct_option.position)
-                except (self.options.model.DoesNotExist, ValueError, TypeError):
-                    is_correct = False
-            else:
-                # Fallback
-                correct_idx = self.answer_data.get('correct')
-                is_correct = (student_answer == correct_idx)
-            return is_correct, self.points if is_correct else 0
-        
-        # 6. True/False
-        elif self.question_type == 'true_false':
-            correct_val = self.answer_data.get('correct')
-            is_correct = (student_answer == correct_val)
-            return is_correct, self.points if is_correct else 0
+        from .answer_key_service import AnswerKeyService, CompiledQuestion
         
-        # 7. Short Answer
-        elif self.question_type == 'short_answer':
-            if self.answer_data.get('manual_grading', True):
-                return None, None  # Needs manual grading
-            keywords = self.answer_data.get('keywords', [])
-            answer_lower = str(student_answer).lower()
-            is_correct = any(kw.lower() in answer_lower for kw in keywords)
-            return is_correct, self.points if is_correct else 0
-        
-        return False, 0
+        compiled = None
+        if self.pk and self.quiz_id:
+            compiled = AnswerKeyService.get_key(self.quiz_id).get(self.pk)
+        if compiled is None:
+            # Unsaved question or one added since the key was compiled
+            compiled = CompiledQuestion.compile(self)
+        return compiled.check(student_answer)
 
 
 class QuizAttempt(models.Model):
@@ -335,27 +260,52 @@ class QuizAttempt(models.Model):
         Grade the quiz attempt.
         Returns (points_earned, points_possible, percentage, passed).
         """
+        from .answer_key_service import AnswerKeyService
+        
+        answer_key = AnswerKeyService.get_key(self.quiz_id)
         points_earned = 0
         points_possible = 0
         needs_manual = False
         
-        for question in self.quiz.questions.all():
+        for question in answer_key.questions:
             points_possible += question.points
             answer = self.answers.get(str(question.id))
             
             if answer is not None:
-                is_correct, pts = question.check_answer(answer)
+                is_correct, pts = question.check(answer)
                 if is_correct is None:
                     needs_manual = True
                 elif is_correct:
                     points_earned += pts
         
         percentage = (points_earned / points_possible * 100) if points_possible > 0 else 0
-        passed = percentage >= self.quiz.pass_threshold if not needs_manual else None
+        passed = percentage >= answer_key.pass_threshold if not needs_manual else None
         
         return points_earned, points_possible, round(percentage, 2), passed
 
 
+class QuizAnswerJournal(models.Model):
+    """
+    Append-only autosave entry for one question of an in-progress attempt.
+    Replaying entries in sequence order gives the latest answers; the
+    journal is coalesced into QuizAttempt.answers on submit.
+    """
+    attempt = models.ForeignKey(QuizAttempt, on_delete=models.CASCADE, related_name='journal_entries')
+    question_id = models.PositiveIntegerField()
+    answer = models.JSONField(null=True)
+    sequence = models.PositiveIntegerField(default=0)  # Client checkpoint counter
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'quiz_answer_journal'
+        indexes = [
+            models.Index(fields=['attempt', 'sequence']),
+        ]
+
+    def __str__(self):
+        return f"Journal #{self.sequence} for Q{self.question_id} on attempt {self.attempt_id}"
+
+
 class Assignment(TimeStampedModel):
     """
     Major graded assignment within a program.
@@ -0,0 +1,271 @@
+"""
+Quiz attempt service - Cached student question payloads and race-safe attempts.
+"""
+import random
+from typing import Any, Dict, List, Optional
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .answer_key_service import AnswerKeyService
+from .models import Question, Quiz, QuizAnswerJournal, QuizAttempt
+
+
+class QuizPayloadService:
+    """
+    Serves the student-facing question payload of a quiz from the cache.
+    The payload is stored under the quiz's answer_key_revision, the same
+    database revision as the answer key, so any edit that invalidates the
+    key also invalidates the payload in every process. Shuffling is applied
+    per attempt from a deterministic seed, so a resumed attempt sees the
+    same order and submitted option indices can be mapped back.
+    """
+
+    CACHE_TIMEOUT = 60 * 60 * 24
+    KEY = 'quiz_payload:{quiz_id}:{revision}'
+
+    @classmethod
+    def get_payload(cls, quiz_id: int, revision: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the unshuffled question payload (no answers) for a quiz.
+
+        Args:
+            quiz_id: The quiz to serialize
+            revision: The quiz's answer_key_revision if the caller just
+                loaded the row; read from the database otherwise
+
+        Returns:
+            List of question dicts in position order
+        """
+        if revision is None:
+            revision = AnswerKeyService.get_revision(quiz_id)
+        key = cls.KEY.format(quiz_id=quiz_id, revision=revision)
+        payload = cache.get(key)
+        if payload is None:
+            payload = cls._serialize(quiz_id)
+            cache.set(key, payload, cls.CACHE_TIMEOUT)
+        return payload
+
+    @classmethod
+    def _serialize(cls, quiz_id: int) -> List[Dict[str, Any]]:
+        questions = Question.objects.filter(quiz_id=quiz_id).prefetch_related(
+            'options', 'matching_pairs'
+        )
+        payload = []
+        for q in questions:
+            q_data = {
+                'id': q.id,
+                'type': q.question_type,
+                'text': q.text,
+                'points': q.points,
+            }
+            if q.question_type in ('mcq', 'mcq_multi'):
+                q_data['options'] = [
+                    o.text for o in sorted(q.options.all(), key=lambda o: o.position)
+                ]
+            elif q.question_type == 'matching':
+                q_data['pairs'] = [
+                    {'left_text': p.left_text, 'right_text': p.right_text}
+                    for p in q.matching_pairs.all()
+                ]
+            elif q.question_type == 'ordering':
+                q_data['items'] = list((q.answer_data or {}).get('correct_order', []))
+            payload.append(q_data)
+        return payload
+
+    @staticmethod
+    def shuffle_seed(attempt: QuizAttempt) -> str:
+        """Deterministic shuffle seed of an attempt."""
+        return f'{attempt.quiz_id}:{attempt.pk}'
+
+    @classmethod
+    def permutation(cls, attempt: QuizAttempt, question_id: int, size: int) -> List[int]:
+        """Display order of a question's options or items for this attempt."""
+        order = list(range(size))
+        random.Random(f'{cls.shuffle_seed(attempt)}:{question_id}').shuffle(order)
+        return order
+
+    @classmethod
+    def for_attempt(cls, quiz: Quiz, attempt: QuizAttempt) -> List[Dict[str, Any]]:
+        """
+        Question payload as the student sees it in this attempt.
+        Options are shuffled when the quiz enables it; ordering items always are.
+        """
+        questions = []
+        for q in cls.get_payload(quiz.id, quiz.answer_key_revision):
+            q_data = dict(q)
+            if 'options' in q and quiz.shuffle_options:
+                order = cls.permutation(attempt, q['id'], len(q['options']))
+                q_data['options'] = [q['options'][i] for i in order]
+            elif 'items' in q:
+                order = cls.permutation(attempt, q['id'], len(q['items']))
+                q_data['items'] = [q['items'][i] for i in order]
+            questions.append(q_data)
+        return questions
+
+    @classmethod
+    def unshuffle_answers(
+        cls,
+        quiz: Quiz,
+        attempt: QuizAttempt,
+        answers: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Map option indices the student saw back to option positions.
+
+        Args:
+            quiz: The quiz being submitted
+            attempt: The attempt whose seed shuffled the options
+            answers: Submitted answers keyed by question id
+
+        Returns:
+            Answers in the form the answer key scores against
+        """
+        if not quiz.shuffle_options:
+            return answers
+
+        remapped = dict(answers)
+        for q in cls.get_payload(quiz.id, quiz.answer_key_revision):
+            key = str(q['id'])
+            if 'options' not in q or key not in answers:
+                continue
+            order = cls.permutation(attempt, q['id'], len(q['options']))
+            remapped[key] = _remap(answers[key], order)
+        return remapped
+
+
+def _remap(answer: Any, order: List[int]) -> Any:
+    """Translate a display index (or list of them) through a permutation."""
+    if isinstance(answer, list):
+        return [_remap(item, order) for item in answer]
+    try:
+        return order[int(answer)]
+    except (ValueError, TypeError, IndexError):
+        return answer
+
+
+class QuizAttemptService:
+    """
+    Attempt lifecycle that stays correct when many students start and submit
+    at once. Attempt numbers are claimed through the unique
+    (enrollment, quiz, attempt_number) constraint instead of count-then-create,
+    and submission is a conditional UPDATE so a double submit is a no-op.
+    Autosaves append QuizAnswerJournal rows and never touch quiz_attempts.
+    """
+
+    MAX_CREATE_RETRIES = 3
+
+    def start(self, enrollment, quiz: Quiz) -> Optional[QuizAttempt]:
+        """
+        Resume the in-progress attempt or start the next one.
+
+        Args:
+            enrollment: Student's enrollment
+            quiz: Quiz being started
+
+        Returns:
+            The attempt, or None if all attempts are used
+        """
+        attempts = QuizAttempt.objects.filter(enrollment=enrollment, quiz=quiz)
+        for _ in range(self.MAX_CREATE_RETRIES):
+            in_progress = attempts.filter(submitted_at__isnull=True).order_by('attempt_number').first()
+            if in_progress:
+                return in_progress
+
+            last_number = attempts.aggregate(last=Max('attempt_number'))['last'] or 0
+            if last_number >= quiz.max_attempts:
+                return None
+            try:
+                with transaction.atomic():
+                    return QuizAttempt.objects.create(
+                        enrollment=enrollment,
+                        quiz=quiz,
+                        attempt_number=last_number + 1,
+                        started_at=timezone.now(),
+                    )
+            except IntegrityError:
+                # A concurrent request claimed this number; resume its attempt
+                continue
+        return attempts.filter(submitted_at__isnull=True).first()
+
+    def autosave(
+        self,
+        attempt: QuizAttempt,
+        answers: Dict[str, Any],
+        sequence: int = 0
+    ) -> int:
+        """
+        Append changed answers to the attempt's journal in one INSERT.
+
+        Args:
+            attempt: In-progress attempt
+            answers: Changed answers keyed by question id
+            sequence: Client checkpoint counter; later checkpoints win on replay
+
+        Returns:
+            Number of journal entries written
+        """
+        question_ids = {q['id'] for q in QuizPayloadService.get_payload(attempt.quiz_id)}
+        entries = []
+        for key, answer in answers.items():
+            try:
+                question_id = int(key)
+            except (ValueError, TypeError):
+                continue
+            if question_id in question_ids:
+                entries.append(QuizAnswerJournal(
+                    attempt=attempt, question_id=question_id, answer=answer, sequence=sequence,
+                ))
+        QuizAnswerJournal.objects.bulk_create(entries)
+        return len(entries)
+
+    def journal_answers(self, attempt: QuizAttempt) -> Dict[str, Any]:
+        """
+        Rebuild an attempt's answers from its stored answers plus the journal.
+        The latest checkpoint for each question wins.
+        """
+        answers = dict(attempt.answers or {})
+        entries = QuizAnswerJournal.objects.filter(attempt=attempt).order_by('sequence', 'id')
+        for question_id, answer in entries.values_list('question_id', 'answer'):
+            answers[str(question_id)] = answer
+        return answers
+
+    def last_sequence(self, attempt: QuizAttempt) -> int:
+        """Highest checkpoint counter in the journal, so resumed clients continue after it."""
+        last = QuizAnswerJournal.objects.filter(attempt=attempt).aggregate(last=Max('sequence'))['last']
+        return last or 0
+
+    def submit(self, attempt: QuizAttempt, answers: Dict[str, Any]) -> bool:
+        """
+        Score an attempt and close it.
+
+        Args:
+            attempt: In-progress attempt
+            answers: Answers keyed by question id, in option-position form
+
+        Returns:
+            False if the attempt had already been submitted
+        """
+        attempt.answers = answers
+        attempt.submitted_at = timezone.now()
+        points_earned, points_possible, percentage, passed = attempt.calculate_score()
+        attempt.points_earned = points_earned
+        attempt.points_possible = points_possible
+        attempt.score = percentage
+        attempt.passed = passed
+
+        with transaction.atomic():
+            updated = QuizAttempt.objects.filter(pk=attempt.pk, submitted_at__isnull=True).update(
+                answers=attempt.answers,
+                submitted_at=attempt.submitted_at,
+                points_earned=points_earned,
+                points_possible=points_possible,
+                score=percentage,
+                passed=passed,
+            )
+            if updated:
+                # The journal is now coalesced into attempt.answers
+                QuizAnswerJournal.objects.filter(attempt=attempt).delete()
+        return updated == 1
@@ -0,0 +1,34 @@
+"""
+Assessment signals - Compiled answer key invalidation.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .answer_key_service import AnswerKeyService
+from .models import Question, QuestionGapAnswer, QuestionMatchingPair, QuestionOption, Quiz
+
+
+@receiver(post_save, sender=Quiz)
+def on_quiz_saved(sender, instance, **kwargs):
+    """Pass threshold lives in the key, so quiz edits invalidate it too."""
+    AnswerKeyService.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def on_question_changed(sender, instance, **kwargs):
+    """Invalidate the quiz's answer key when a question changes."""
+    AnswerKeyService.invalidate(instance.quiz_id)
+
+
+@receiver(post_save, sender=QuestionOption)
+@receiver(post_delete, sender=QuestionOption)
+@receiver(post_save, sender=QuestionMatchingPair)
+@receiver(post_delete, sender=QuestionMatchingPair)
+@receiver(post_save, sender=QuestionGapAnswer)
+@receiver(post_delete, sender=QuestionGapAnswer)
+def on_answer_data_changed(sender, instance, **kwargs):
+    """Invalidate the answer key when options, pairs or gap answers change."""
+    quiz_id = Question.objects.filter(pk=instance.question_id).values_list('quiz_id', flat=True).first()
+    if quiz_id is not None:
+        AnswerKeyService.invalidate(quiz_id)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import CertificateTemplate, Certificate, VerificationLog
+from .models import CertificateTemplate, Certificate, CertificateRenderJob, VerificationLog
 
 
 @admin.register(CertificateTemplate)
@@ -33,3 +33,11 @@ class VerificationLogAdmin(admin.ModelAdmin):
     search_fields = ["serial_number_queried", "ip_address"]
     ordering = ["-verified_at"]
     date_hierarchy = "verified_at"
+
+
+@admin.register(CertificateRenderJob)
+class CertificateRenderJobAdmin(admin.ModelAdmin):
+    list_display = ["enrollment", "status", "attempts", "certificate", "created_at"]
+    list_filter = ["status"]
+    ordering = ["-created_at"]
+    raw_id_fields = ["enrollment", "certificate"]
@@ -0,0 +1,119 @@
+"""
+Django management command benchmarking certificate verification throughput.
+
+Creates synthetic certificates and verifies a stream of serials (mostly
+valid, some unknown) two ways, reporting verifications per second:
+
+    legacy   one query and one VerificationLog insert per lookup
+    cached   VerificationService.verify - cached certificate details, a
+             revocation read by primary key and spooled, bulk-inserted
+             log rows
+
+All synthetic rows are rolled back afterwards. Log rows are spooled to a
+temporary directory, so the spool of the running site is left alone.
+
+Usage:
+    python manage.py benchmark_certificate_verification
+    python manage.py benchmark_certificate_verification --certificates=500 --lookups=20000
+"""
+import random
+import tempfile
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from apps.certifications.models import Certificate, CertificateTemplate, VerificationLog
+from apps.certifications.services import VerificationLogSpool, VerificationService
+from apps.core.models import Program, User
+from apps.progression.models import Enrollment
+
+
+class Command(BaseCommand):
+    help = 'Compare per-lookup and cached certificate verification throughput'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--certificates', type=int, default=200)
+        parser.add_argument('--lookups', type=int, default=5000)
+        parser.add_argument('--unknown-ratio', type=float, default=0.1, help='Share of lookups for unknown serials')
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as spool_dir, override_settings(VERIFICATION_LOG_SPOOL_DIR=spool_dir):
+            VerificationLogSpool.reset()
+            self._benchmark(options)
+
+    def _benchmark(self, options):
+        with transaction.atomic():
+            serials = self._create_fixture(options['certificates'])
+            lookups = [
+                f'BENCH-{uuid.uuid4().hex[:6].upper()}' if random.random() < options['unknown_ratio']
+                else random.choice(serials)
+                for _ in range(options['lookups'])
+            ]
+
+            legacy = self._run('legacy', self._legacy_verify, lookups)
+            VerificationService.invalidate(*lookups)
+            cached = self._run('cached', self._cached_verify, lookups)
+
+            self.stdout.write(self.style.SUCCESS(f'Speed-up: {cached / legacy:.1f}x'))
+            VerificationService.invalidate(*lookups)
+            transaction.set_rollback(True)
+
+    def _create_fixture(self, count):
+        tag = uuid.uuid4().hex[:8]
+        template = CertificateTemplate.objects.create(
+            name=f'Benchmark {tag}',
+            template_html='{{student_name}} {{program_title}} {{completion_date}} {{serial_number}}',
+        )
+        program = Program.objects.create(name=f'Verification Benchmark {tag}', code=f'VB-{tag}')
+        user = User.objects.create(username=f'verify-bench-{tag}', email=f'verify-bench-{tag}@example.com')
+        enrollment = Enrollment.objects.create(user=user, program=program)
+        today = timezone.now().date()
+        certificates = Certificate.objects.bulk_create([
+            Certificate(
+                enrollment=enrollment,
+                template=template,
+                serial_number=f'VB{tag[:3].upper()}-{today.year}-{i:06d}',
+                student_name=f'Student {i}',
+                program_title=program.name,
+                completion_date=today,
+                issue_date=today,
+                pdf_path=f'certificates/bench-{i}.pdf',
+            )
+            for i in range(count)
+        ])
+        return [c.serial_number for c in certificates]
+
+    def _run(self, label, verify, lookups):
+        began = time.perf_counter()
+        for serial in lookups:
+            verify(serial)
+        VerificationLogSpool.flush()
+        elapsed = time.perf_counter() - began
+        rate = len(lookups) / elapsed
+        self.stdout.write(f'{label:<7} {len(lookups)} lookups in {elapsed:.2f} s: {rate:,.0f} verifications/s')
+        return rate
+
+    def _legacy_verify(self, serial):
+        certificate = (
+            Certificate.objects.filter(serial_number=serial)
+            .select_related('template', 'enrollment').first()
+        )
+        if certificate is None:
+            result = 'not_found'
+        else:
+            result = 'revoked' if certificate.is_revoked else 'valid'
+        VerificationLog.objects.create(
+            certificate=certificate,
+            serial_number_queried=serial,
+            ip_address='203.0.113.7',
+            user_agent='benchmark',
+            result=result,
+            verified_at=timezone.now(),
+        )
+
+    def _cached_verify(self, serial):
+        VerificationService().verify(serial, ip_address='203.0.113.7', user_agent='benchmark')
@@ -0,0 +1,22 @@
+"""
+Django management command importing spooled verification log rows.
+
+Web processes bulk insert their own spooled rows once enough have
+accumulated, after VERIFICATION_LOG_FLUSH_SECONDS or when they exit. This
+command imports what crashed processes and failed imports left in the
+spool, so no row waits for the next verification to be written.
+
+Usage:
+    python manage.py flush_verification_logs
+"""
+from django.core.management.base import BaseCommand
+
+from apps.certifications.services import VerificationLogSpool
+
+
+class Command(BaseCommand):
+    help = 'Import verification log rows left in the spool directory'
+
+    def handle(self, *args, **options):
+        written = VerificationLogSpool.flush()
+        self.stdout.write(self.style.SUCCESS(f'Imported {written} verification log rows'))
@@ -0,0 +1,63 @@
+"""
+Django management command running the certificate render worker.
+
+Claims queued CertificateRenderJob rows in batches and renders them in this
+process, reusing compiled templates and the font configuration across the
+batch. Run several workers to render in parallel; jobs left running by a
+crashed worker are reclaimed once their heartbeat goes stale.
+
+Usage:
+    python manage.py render_certificates
+    python manage.py render_certificates --once
+    python manage.py render_certificates --batch-size=200 --poll-interval=2
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.certifications.services import CertificateRenderQueue
+
+
+class Command(BaseCommand):
+    help = 'Render queued certificates in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=CertificateRenderQueue.BATCH_SIZE,
+            help='Jobs claimed and rendered per batch',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit when the queue is empty instead of polling',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=5.0,
+            help='Seconds to wait between queue polls',
+        )
+
+    def handle(self, *args, **options):
+        queue = CertificateRenderQueue()
+        while True:
+            jobs = queue.claim_batch(options['batch_size'])
+            if not jobs:
+                if options['once']:
+                    return
+                time.sleep(options['poll_interval'])
+                continue
+
+            began = time.perf_counter()
+            queue.process_batch(jobs)
+            elapsed = time.perf_counter() - began
+
+            completed = sum(1 for job in jobs if job.status == 'completed')
+            self.stdout.write(self.style.SUCCESS(
+                f'Rendered {completed}/{len(jobs)} certificates in {elapsed:.2f} s'
+            ))
+            for job in jobs:
+                if job.status != 'completed':
+                    self.stderr.write(f'Job {job.id} ({job.status}): {job.error}')
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certifications', '0003_certificate_updated_at_verificationlog_updated_at'),
+        ('progression', '0007_enrollment_progress_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CertificateRenderJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('certificate', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='render_jobs', to='certifications.certificate')),
+                ('enrollment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='certificate_render_job', to='progression.enrollment')),
+            ],
+            options={
+                'db_table': 'certificate_render_jobs',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'heartbeat_at'], name='cert_job_status_hb_idx')],
+            },
+        ),
+    ]
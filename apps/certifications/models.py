@@ -5,7 +5,7 @@ Requirements: 1.1, 1.2, 1.3, 1.4, 2.4, 3.2, 4.4, 5.1, 5.2, 5.3, 6.1, 6.2, 6.3
 from django.db import models
 from django.core.signing import TimestampSigner
 from django.urls import reverse
-from apps.core.models import TimeStampedModel
+from apps.core.models import QueuedJob, TimeStampedModel
 
 
 class CertificateTemplate(TimeStampedModel):
@@ -144,3 +144,33 @@ class VerificationLog(TimeStampedModel):
 
     def __str__(self):
         return f"{self.serial_number_queried} - {self.result} at {self.verified_at}"
+
+
+class CertificateRenderJob(QueuedJob):
+    """
+    Queued certificate render for a completed enrollment.
+    Written by the enrollment post_save signal instead of rendering inline;
+    the render_certificates worker claims jobs in batches.
+    """
+    enrollment = models.OneToOneField(
+        'progression.Enrollment',
+        on_delete=models.CASCADE,
+        related_name='certificate_render_job'
+    )
+    certificate = models.ForeignKey(
+        'Certificate',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='render_jobs'
+    )
+
+    class Meta:
+        db_table = 'certificate_render_jobs'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'heartbeat_at'], name='cert_job_status_hb_idx'),
+        ]
+
+    def __str__(self):
+        return f"Certificate render for enrollment {self.enrollment_id} ({self.status})"
@@ -2,18 +2,38 @@
 Certification services - Template generation, serial numbers, verification.
 Requirements: 1.2, 1.3, 1.4, 2.1, 2.2, 2.3, 2.4, 3.1, 3.2, 3.3, 4.1, 4.2, 4.3, 4.4, 5.1, 5.2, 5.3, 6.1, 6.2, 6.3
 """
+import atexit
+import hashlib
+import json
+import multiprocessing
 import os
 import random
+import re
+import socket
 import string
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Optional
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Callable, List, Optional, Tuple
 
+import django
 from django.conf import settings
+from django.core.cache import cache
 from django.core.signing import TimestampSigner, BadSignature, SignatureExpired
+from django.db import connections, transaction
 from django.utils import timezone
 
-from .models import Certificate, CertificateTemplate, VerificationLog
+from apps.core.services.job_queue import JobQueue
+from apps.progression.models import Enrollment
+
+from .models import Certificate, CertificateRenderJob, CertificateTemplate, VerificationLog
+
+PLACEHOLDER_RE = re.compile(r'\{\{(\w+)\}\}')
+STYLE_RE = re.compile(r'<style[^>]*>(.*?)</style>', re.DOTALL | re.IGNORECASE)
 
 
 class TemplateValidationError(Exception):
@@ -23,6 +43,35 @@ class TemplateValidationError(Exception):
         self.missing_placeholders = missing_placeholders or []
 
 
+@dataclass
+class CompiledTemplate:
+    """
+    A certificate template parsed once per template version.
+    segments alternates literal HTML (even indices) and placeholder names
+    (odd indices); the template's <style> blocks are kept apart as css so
+    WeasyPrint parses them once rather than for every certificate.
+    """
+    segments: List[str]
+    css: str
+    _stylesheets: Optional[list] = field(default=None, repr=False)
+
+    def fill(self, data: dict) -> str:
+        """HTML with placeholders replaced; unknown placeholders are left as is."""
+        parts = list(self.segments)
+        for i in range(1, len(parts), 2):
+            key = parts[i]
+            parts[i] = str(data[key]) if key in data else f"{{{{{key}}}}}"
+        return ''.join(parts)
+
+    def stylesheets(self, font_config) -> list:
+        """Parsed WeasyPrint stylesheets, built on first use."""
+        if self._stylesheets is None:
+            from weasyprint import CSS
+
+            self._stylesheets = [CSS(string=self.css, font_config=font_config)] if self.css.strip() else []
+        return self._stylesheets
+
+
 class TemplateGenerator:
     """
     Service for managing certificate templates and generating PDFs.
@@ -34,6 +83,11 @@ class TemplateGenerator:
         '{{completion_date}}',
         '{{serial_number}}'
     ]
+    COMPILED_CACHE_SIZE = 64
+
+    # Shared by every generator in the process, keyed by template version
+    _compiled: 'OrderedDict[tuple, CompiledTemplate]' = OrderedDict()
+    _font_config = None
 
     def validate_template(self, template_html: str) -> dict:
         """
@@ -70,6 +124,36 @@ class TemplateGenerator:
             raise TemplateValidationError("No default template configured")
         return default
 
+    def compile(self, template: CertificateTemplate) -> CompiledTemplate:
+        """
+        Parse a template, or return the cached parse of this version.
+        A version is the template's id, last update and HTML, so an edited
+        template is recompiled on its next use.
+        """
+        html = template.template_html
+        key = (template.pk, template.updated_at, hash(html))
+        compiled = self._compiled.get(key)
+        if compiled is not None:
+            self._compiled.move_to_end(key)
+            return compiled
+
+        css = '\n'.join(STYLE_RE.findall(html))
+        compiled = CompiledTemplate(segments=PLACEHOLDER_RE.split(STYLE_RE.sub('', html)), css=css)
+        if template.pk is not None:
+            self._compiled[key] = compiled
+            while len(self._compiled) > self.COMPILED_CACHE_SIZE:
+                self._compiled.popitem(last=False)
+        return compiled
+
+    @classmethod
+    def font_config(cls):
+        """One WeasyPrint font configuration per process, reused by every render."""
+        if cls._font_config is None:
+            from weasyprint.text.fonts import FontConfiguration
+
+            cls._font_config = FontConfiguration()
+        return cls._font_config
+
     def generate(self, template: CertificateTemplate, data: dict) -> str:
         """
         Generate a PDF certificate from template and data.
@@ -85,10 +169,8 @@ class TemplateGenerator:
         from weasyprint import HTML
         
         # Replace placeholders with actual values
-        html_content = template.template_html
-        for key, value in data.items():
-            placeholder = f"{{{{{key}}}}}"
-            html_content = html_content.replace(placeholder, str(value))
+        compiled = self.compile(template)
+        html_content = compiled.fill(data)
         
         # Ensure certificates directory exists
         cert_dir = os.path.join(settings.MEDIA_ROOT, 'certificates')
@@ -99,10 +181,24 @@ class TemplateGenerator:
         pdf_path = os.path.join('certificates', pdf_filename)
         full_path = os.path.join(settings.MEDIA_ROOT, pdf_path)
         
-        HTML(string=html_content).write_pdf(full_path)
+        font_config = self.font_config()
+        HTML(string=html_content).write_pdf(
+            full_path,
+            stylesheets=compiled.stylesheets(font_config),
+            font_config=font_config,
+        )
         
         return pdf_path
 
+    @staticmethod
+    def discard(pdf_paths: List[str]) -> None:
+        """Delete generated PDFs that no certificate was written for."""
+        for pdf_path in pdf_paths:
+            try:
+                os.remove(os.path.join(settings.MEDIA_ROOT, pdf_path))
+            except FileNotFoundError:
+                pass
+
 
 class SerialNumberGenerator:
     """
@@ -110,6 +206,8 @@ class SerialNumberGenerator:
     Requirements: 3.1, 3.2, 3.3
     """
     DEFAULT_PREFIX = 'LMS'
+    # Serials checked per query by generate_batch
+    LOOKUP_CHUNK = 500
 
     def generate(self, prefix: str = None) -> str:
         """
@@ -136,6 +234,42 @@ class SerialNumberGenerator:
         
         return serial
 
+    def generate_batch(self, count: int, prefix: str = None) -> List[str]:
+        """
+        Allocate count distinct, unused serial numbers.
+        Candidates are checked against existing certificates a chunk at a
+        time instead of one round-trip per serial; only collisions are redrawn.
+        
+        Args:
+            count: Number of serials needed
+            prefix: Institution prefix (default: LMS)
+            
+        Returns:
+            List of unique serial number strings
+        """
+        prefix = prefix or self.DEFAULT_PREFIX
+        year = datetime.now().year
+        alphabet = string.ascii_uppercase + string.digits
+        
+        serials = {}
+        while len(serials) < count:
+            candidates = [
+                serial for serial in dict.fromkeys(
+                    f"{prefix}-{year}-{''.join(random.choices(alphabet, k=6))}"
+                    for _ in range(count - len(serials))
+                )
+                if serial not in serials
+            ]
+            taken = set()
+            for start in range(0, len(candidates), self.LOOKUP_CHUNK):
+                taken.update(
+                    Certificate.objects.filter(
+                        serial_number__in=candidates[start:start + self.LOOKUP_CHUNK]
+                    ).values_list('serial_number', flat=True)
+                )
+            serials.update(dict.fromkeys(c for c in candidates if c not in taken))
+        return list(serials)
+
     def is_unique(self, serial_number: str) -> bool:
         """
         Check if a serial number is unique.
@@ -177,12 +311,207 @@ class VerificationResult:
     message: str = ''
 
 
+class VerificationLogSpool:
+    """
+    Durable batching of verification log rows.
+
+    Each process appends rows as JSON lines to its own segment file in
+    VERIFICATION_LOG_SPOOL_DIR. Every row is written to the file as the
+    attempt happens, so rows survive the process crashing or being
+    recycled. A segment is sealed and imported with one bulk_create once it
+    holds VERIFICATION_LOG_BUFFER_SIZE rows, its first row is
+    VERIFICATION_LOG_FLUSH_SECONDS old, or the process exits. Segments left
+    behind by processes that died on this host are imported by the next
+    flush, e.g. the flush_verification_logs command.
+    """
+
+    OPEN = '.open'
+    READY = '.ready'
+    IMPORTING = '.importing'
+
+    _fd: Optional[int] = None
+    _path: Optional[str] = None
+    _pid: Optional[int] = None
+    _rows = 0
+    _opened_at = 0.0
+    _lock = threading.Lock()
+
+    @classmethod
+    def add(cls, entry: VerificationLog) -> None:
+        """Append a log row to this process's segment, importing it if full or stale."""
+        line = json.dumps({
+            'certificate_id': entry.certificate_id,
+            'serial_number_queried': entry.serial_number_queried,
+            'ip_address': entry.ip_address,
+            'user_agent': entry.user_agent,
+            'result': entry.result,
+            'verified_at': entry.verified_at.isoformat(),
+        }) + '\n'
+        with cls._lock:
+            if cls._fd is None or cls._pid != os.getpid():
+                # First row, or a forked child that must not write to its parent's segment
+                cls._open()
+            os.write(cls._fd, line.encode('utf-8'))
+            cls._rows += 1
+            due = (
+                cls._rows >= settings.VERIFICATION_LOG_BUFFER_SIZE
+                or time.monotonic() - cls._opened_at >= settings.VERIFICATION_LOG_FLUSH_SECONDS
+            )
+            if due:
+                cls._seal()
+        if due:
+            cls.flush()
+
+    @classmethod
+    def flush(cls) -> int:
+        """
+        Seal this process's segment and import every sealed segment,
+        including those of dead processes on this host.
+
+        Returns:
+            Number of rows written
+        """
+        with cls._lock:
+            if cls._fd is not None and cls._pid == os.getpid():
+                cls._seal()
+        directory = cls.directory()
+        if not os.path.isdir(directory):
+            return 0
+        cls._recover(directory)
+        written = 0
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(cls.READY):
+                written += cls._import(os.path.join(directory, name))
+        return written
+
+    @classmethod
+    def directory(cls) -> str:
+        return str(settings.VERIFICATION_LOG_SPOOL_DIR)
+
+    @classmethod
+    def reset(cls) -> None:
+        """Forget this process's segment without importing it."""
+        with cls._lock:
+            if cls._fd is not None and cls._pid == os.getpid():
+                os.close(cls._fd)
+            cls._fd, cls._path, cls._pid, cls._rows = None, None, None, 0
+
+    @classmethod
+    def _open(cls) -> None:
+        # <id>-<pid>-<host><state>: the owner is known from the name alone
+        name = f'{uuid.uuid4().hex}-{os.getpid()}-{socket.gethostname()}{cls.OPEN}'
+        os.makedirs(cls.directory(), exist_ok=True)
+        cls._path = os.path.join(cls.directory(), name)
+        cls._fd = os.open(cls._path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+        cls._pid = os.getpid()
+        cls._rows = 0
+        cls._opened_at = time.monotonic()
+
+    @classmethod
+    def _seal(cls) -> None:
+        os.close(cls._fd)
+        os.rename(cls._path, os.path.splitext(cls._path)[0] + cls.READY)
+        cls._fd, cls._path, cls._pid, cls._rows = None, None, None, 0
+
+    @classmethod
+    def _recover(cls, directory: str) -> None:
+        """Seal segments that processes which died on this host were writing or importing."""
+        host = socket.gethostname()
+        for name in os.listdir(directory):
+            stem, state = os.path.splitext(name)
+            if state not in (cls.OPEN, cls.IMPORTING):
+                continue
+            _, pid, owner_host = stem.split('-', 2)
+            if owner_host == host and not _process_alive(int(pid)):
+                _rename(os.path.join(directory, name), os.path.join(directory, stem + cls.READY))
+
+    @classmethod
+    def _import(cls, path: str) -> int:
+        """Claim a sealed segment, bulk insert its rows and delete it."""
+        segment_id = os.path.basename(path).split('-', 1)[0]
+        claimed = os.path.join(
+            os.path.dirname(path), f'{segment_id}-{os.getpid()}-{socket.gethostname()}{cls.IMPORTING}'
+        )
+        if not _rename(path, claimed):
+            # Another process claimed it first
+            return 0
+        try:
+            entries = []
+            with open(claimed, encoding='utf-8') as segment:
+                for line in segment:
+                    try:
+                        row = json.loads(line)
+                    except ValueError:
+                        # A row cut short by a crash mid-write
+                        continue
+                    row['verified_at'] = datetime.fromisoformat(row['verified_at'])
+                    entries.append(VerificationLog(**row))
+            # Certificates deleted while their rows sat in the spool
+            referenced = {e.certificate_id for e in entries if e.certificate_id}
+            existing = set(Certificate.objects.filter(pk__in=referenced).values_list('pk', flat=True))
+            for entry in entries:
+                if entry.certificate_id not in existing:
+                    entry.certificate_id = None
+            with transaction.atomic():
+                VerificationLog.objects.bulk_create(entries, batch_size=500)
+        except Exception:
+            # Leave the segment for the next flush
+            _rename(claimed, path)
+            raise
+        os.remove(claimed)
+        return len(entries)
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _rename(source: str, target: str) -> bool:
+    try:
+        os.rename(source, target)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _flush_verification_logs():
+    try:
+        VerificationLogSpool.flush()
+    except Exception:
+        # Rows stay in the spool for the next flush
+        pass
+
+
+atexit.register(_flush_verification_logs)
+
+
 class VerificationService:
     """
     Service for verifying certificate authenticity.
+    A certificate's issued details never change, so they are served
+    read-through from the cache, keyed by serial. Revocation is read from
+    the database on every lookup, so a revoked certificate is reported as
+    revoked by every process at once. Attempts are logged through
+    VerificationLogSpool.
     Requirements: 4.1, 4.2, 4.3, 4.4
     """
 
+    CACHE_TIMEOUT = 60 * 60
+    # Unknown serials are cached briefly so a scraper cannot hammer the table
+    NOT_FOUND_TIMEOUT = 60
+    KEY = 'cert_verify:{digest}'
+    SNAPSHOT_FIELDS = [
+        'id', 'enrollment_id', 'template_id', 'serial_number', 'student_name', 'program_title',
+        'completion_date', 'issue_date', 'pdf_path',
+    ]
+    REVOCATION_FIELDS = ['is_revoked', 'revoked_at', 'revocation_reason']
+
     def verify(self, serial_number: str, ip_address: str = None, user_agent: str = None) -> VerificationResult:
         """
         Verify a certificate by its serial number.
@@ -191,10 +520,17 @@ class VerificationService:
         Returns:
             VerificationResult with status and certificate details
         """
-        try:
-            certificate = Certificate.objects.select_related('template', 'enrollment').get(
-                serial_number=serial_number
+        snapshot = self.lookup(serial_number)
+        if snapshot is None:
+            certificate = None
+            result = VerificationResult(
+                status='not_found',
+                message='Certificate not found'
             )
+        else:
+            certificate = Certificate(**snapshot)
+            # Built from the cache, not loaded: mark it as a persisted row
+            certificate._state.adding = False
             if certificate.is_revoked:
                 result = VerificationResult(
                     status='revoked',
@@ -207,18 +543,59 @@ class VerificationService:
                     certificate=certificate,
                     message='Certificate is valid'
                 )
-        except Certificate.DoesNotExist:
-            result = VerificationResult(
-                status='not_found',
-                message='Certificate not found'
-            )
-            certificate = None
         
         # Log the verification attempt
         self.log_attempt(certificate, serial_number, result.status, ip_address, user_agent)
         
         return result
 
+    @classmethod
+    def lookup(cls, serial_number: str) -> Optional[dict]:
+        """
+        Certificate fields for a serial, or None if no such certificate.
+        The issued details are read through the cache; the revocation fields
+        always come from the database, by primary key once cached.
+        """
+        key = cls.cache_key(serial_number)
+        cached = cache.get(key)
+        if cached is None:
+            row = (
+                Certificate.objects.filter(serial_number=serial_number)
+                .values(*cls.SNAPSHOT_FIELDS, *cls.REVOCATION_FIELDS).first()
+            )
+            snapshot = None
+            if row is not None:
+                snapshot = {name: row[name] for name in cls.SNAPSHOT_FIELDS}
+            cache.set(
+                key,
+                {'certificate': snapshot},
+                cls.CACHE_TIMEOUT if snapshot is not None else cls.NOT_FOUND_TIMEOUT
+            )
+            return row
+        
+        snapshot = cached.get('certificate')
+        if snapshot is None:
+            return None
+        revocation = (
+            Certificate.objects.filter(pk=snapshot['id'])
+            .values(*cls.REVOCATION_FIELDS).first()
+        )
+        if revocation is None:
+            # Deleted in a process whose invalidation has not reached this cache
+            cls.invalidate(serial_number)
+            return None
+        return {**snapshot, **revocation}
+
+    @classmethod
+    def invalidate(cls, *serial_numbers: str) -> None:
+        """Drop cached lookups so the next verification reads the database."""
+        cache.delete_many([cls.cache_key(serial) for serial in serial_numbers])
+
+    @classmethod
+    def cache_key(cls, serial_number: str) -> str:
+        # Serials come from user input; hash them into a backend-safe key
+        return cls.KEY.format(digest=hashlib.md5(serial_number.encode('utf-8')).hexdigest())
+
     def log_attempt(
         self,
         certificate: Optional[Certificate],
@@ -228,17 +605,19 @@ class VerificationService:
         user_agent: str = None
     ) -> VerificationLog:
         """
-        Log a verification attempt.
+        Log a verification attempt. The row is spooled, not saved here.
         Requirements: 4.4
         """
-        return VerificationLog.objects.create(
-            certificate=certificate,
+        entry = VerificationLog(
+            certificate_id=certificate.pk if certificate else None,
             serial_number_queried=serial_number,
             ip_address=ip_address,
             user_agent=user_agent,
             result=result,
             verified_at=timezone.now()
         )
+        VerificationLogSpool.add(entry)
+        return entry
 
 
 class CertificationEngine:
@@ -257,30 +636,21 @@ class CertificationEngine:
         self.serial_generator = serial_generator or SerialNumberGenerator()
         self.verification_service = verification_service or VerificationService()
 
-    def generate_certificate(self, enrollment) -> Certificate:
+    def generate_certificate(self, enrollment, template: CertificateTemplate = None) -> Certificate:
         """
         Generate a certificate for a completed enrollment.
         Requirements: 2.1, 2.3, 2.4
         
         Args:
             enrollment: The completed enrollment
+            template: Template to use (default: resolved for the enrollment)
             
         Returns:
             The created Certificate instance
         """
-        template = self.template_generator.get_template_for_enrollment(enrollment)
+        template = template or self.template_generator.get_template_for_enrollment(enrollment)
         serial = self.serial_generator.generate()
-        
-        completion_date = timezone.now().date()
-        if enrollment.completed_at:
-            completion_date = enrollment.completed_at.date()
-        
-        data = {
-            'student_name': enrollment.user.get_full_name() or enrollment.user.email,
-            'program_title': enrollment.program.name,
-            'completion_date': completion_date.strftime('%B %d, %Y'),
-            'serial_number': serial,
-        }
+        data, completion_date = self.certificate_data(enrollment, serial)
         
         pdf_path = self.template_generator.generate(template, data)
         
@@ -295,6 +665,25 @@ class CertificationEngine:
             pdf_path=pdf_path,
         )
 
+    def certificate_data(self, enrollment, serial: str) -> Tuple[dict, date]:
+        """
+        Placeholder values for an enrollment's certificate.
+        
+        Returns:
+            (placeholder data, completion date)
+        """
+        completion_date = timezone.now().date()
+        if enrollment.completed_at:
+            completion_date = enrollment.completed_at.date()
+        
+        data = {
+            'student_name': enrollment.user.get_full_name() or enrollment.user.email,
+            'program_title': enrollment.program.name,
+            'completion_date': completion_date.strftime('%B %d, %Y'),
+            'serial_number': serial,
+        }
+        return data, completion_date
+
     def on_program_completed(self, enrollment) -> Optional[Certificate]:
         """
         Handler for program completion events.
@@ -359,3 +748,278 @@ class CertificationEngine:
             return Certificate.objects.get(id=int(cert_id))
         except (BadSignature, SignatureExpired, Certificate.DoesNotExist, ValueError):
             return None
+
+
+class CertificateRenderQueue(JobQueue):
+    """
+    Durable queue of certificate renders, backed by CertificateRenderJob rows.
+    Completing an enrollment only records a job; the render_certificates
+    worker claims jobs in batches and renders them with one engine, so the
+    compiled templates and font configuration are shared across the batch.
+    """
+
+    model = CertificateRenderJob
+    BATCH_SIZE = 50
+    CLAIM_RELATED = ('enrollment__user', 'enrollment__program__blueprint')
+
+    def __init__(self, engine: CertificationEngine = None):
+        self.engine = engine or CertificationEngine()
+        self._templates = {}
+        self._issued = {}
+
+    def enqueue(self, enrollment) -> Optional[CertificateRenderJob]:
+        """
+        Queue a render for a completed enrollment, at most once per enrollment.
+
+        Returns:
+            The job, or None if the enrollment already has a certificate
+        """
+        job = CertificateRenderJob.objects.filter(enrollment=enrollment).first()
+        if job is not None:
+            return job
+        if Certificate.objects.filter(enrollment=enrollment).exists():
+            return None
+        job, _ = CertificateRenderJob.objects.get_or_create(enrollment=enrollment)
+        return job
+
+    def process_batch(self, jobs: List[CertificateRenderJob]) -> List[CertificateRenderJob]:
+        """
+        Render a batch of claimed jobs. Templates are resolved once per
+        blueprint, and each certificate is committed together with its job.
+        """
+        self._templates = {}
+        # Certificates issued since the job was queued, e.g. by a bulk issue
+        self._issued = dict(
+            Certificate.objects.filter(enrollment_id__in=[job.enrollment_id for job in jobs])
+            .values_list('enrollment_id', 'id')
+        )
+        return super().process_batch(jobs)
+
+    def run(self, job: CertificateRenderJob) -> None:
+        enrollment = job.enrollment
+        blueprint = enrollment.program.blueprint
+        if enrollment.pk in self._issued:
+            self._complete(job, certificate_id=self._issued[enrollment.pk])
+        elif blueprint and blueprint.certificate_enabled:
+            if blueprint.pk not in self._templates:
+                self._templates[blueprint.pk] = self.engine.template_generator.get_template_for_enrollment(
+                    enrollment
+                )
+            with transaction.atomic():
+                certificate_id = lock_enrollment_certificates([enrollment.pk]).get(enrollment.pk)
+                if certificate_id is None:
+                    certificate_id = self.engine.generate_certificate(
+                        enrollment, template=self._templates[blueprint.pk]
+                    ).pk
+                self._complete(job, certificate_id=certificate_id)
+        else:
+            self._complete(job, certificate_id=None)
+
+
+@dataclass
+class BulkIssueReport:
+    """Outcome and timings of a bulk certificate issue."""
+    requested: int = 0
+    issued: int = 0
+    skipped: int = 0
+    failed: int = 0
+    errors: List[str] = field(default_factory=list)
+    serial_seconds: float = 0.0
+    render_seconds: float = 0.0
+    write_seconds: float = 0.0
+    total_seconds: float = 0.0
+
+    @property
+    def per_second(self) -> float:
+        return self.issued / self.total_seconds if self.total_seconds else 0.0
+
+
+def lock_enrollment_certificates(enrollment_ids: List[int]) -> dict:
+    """
+    Lock enrollment rows until the current transaction ends and return the
+    certificate id of each enrollment that already has one. The render
+    worker and BulkCertificateIssuer both take this lock before writing a
+    certificate, so the two never certify the same enrollment twice.
+    """
+    list(
+        Enrollment.objects.select_for_update().filter(pk__in=enrollment_ids)
+        .order_by('pk').values_list('pk', flat=True)
+    )
+    return dict(
+        Certificate.objects.filter(enrollment_id__in=enrollment_ids).values_list('enrollment_id', 'id')
+    )
+
+
+def render_certificate_chunk(template_id: int, rows: List[dict]) -> List[Tuple[str, Optional[str], str]]:
+    """
+    Render one chunk of certificates that share a template; the entry point
+    for worker processes. The template is loaded and compiled once per chunk.
+
+    Args:
+        template_id: CertificateTemplate primary key
+        rows: Placeholder data, one dict per certificate
+
+    Returns:
+        (serial_number, pdf_path or None, error) per row
+    """
+    try:
+        template = CertificateTemplate.objects.get(pk=template_id)
+    except Exception as e:
+        return chunk_failed(rows, e)
+    generator = TemplateGenerator()
+    results = []
+    for data in rows:
+        try:
+            results.append((data['serial_number'], generator.generate(template, data), ''))
+        except Exception as e:
+            results.append((data['serial_number'], None, str(e)))
+    return results
+
+
+def chunk_failed(rows: List[dict], error: Exception) -> List[Tuple[str, Optional[str], str]]:
+    """Results recording every row of a chunk as failed."""
+    return [(data['serial_number'], None, str(error)) for data in rows]
+
+
+class BulkCertificateIssuer:
+    """
+    Issues certificates for a whole cohort at once.
+    Serials are allocated in one batch, PDFs are rendered in chunks across a
+    process pool, and Certificate rows are written with bulk_create.
+    """
+
+    # Certificates per pool task: large enough to amortise the template load
+    RENDER_CHUNK = 25
+    CREATE_BATCH = 500
+
+    def __init__(self, engine: CertificationEngine = None, workers: int = None):
+        self.engine = engine or CertificationEngine()
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+
+    def issue(self, enrollments, progress: Callable[[int, int], None] = None) -> BulkIssueReport:
+        """
+        Issue certificates to every eligible enrollment in a queryset.
+        Enrollments that are not completed, already hold a certificate or
+        whose blueprint has certificates disabled are skipped.
+
+        Args:
+            enrollments: Enrollment queryset, e.g. a program's cohort
+            progress: Optional callback(rendered, total) after each chunk
+
+        Returns:
+            BulkIssueReport with counts and per-phase timings
+        """
+        began = time.perf_counter()
+        report = BulkIssueReport(requested=enrollments.count())
+        eligible = list(
+            enrollments.filter(
+                status='completed',
+                program__blueprint__certificate_enabled=True,
+                certificates__isnull=True,
+            ).select_related('user', 'program__blueprint')
+        )
+        report.skipped = report.requested - len(eligible)
+        if not eligible:
+            report.total_seconds = time.perf_counter() - began
+            return report
+
+        phase = time.perf_counter()
+        serials = self.engine.serial_generator.generate_batch(len(eligible))
+        report.serial_seconds = time.perf_counter() - phase
+
+        templates = {}
+        pending = {}
+        chunks = {}
+        for enrollment, serial in zip(eligible, serials):
+            blueprint_id = enrollment.program.blueprint_id
+            if blueprint_id not in templates:
+                templates[blueprint_id] = self.engine.template_generator.get_template_for_enrollment(enrollment)
+            template = templates[blueprint_id]
+            data, completion_date = self.engine.certificate_data(enrollment, serial)
+            pending[serial] = (enrollment, template, data, completion_date)
+            chunks.setdefault(template.pk, []).append(data)
+
+        tasks = [
+            (template_id, rows[start:start + self.RENDER_CHUNK])
+            for template_id, rows in chunks.items()
+            for start in range(0, len(rows), self.RENDER_CHUNK)
+        ]
+        phase = time.perf_counter()
+        rendered = self._render(tasks, len(pending), progress)
+        report.render_seconds = time.perf_counter() - phase
+
+        phase = time.perf_counter()
+        issue_date = timezone.now().date()
+        certificates = []
+        for serial, pdf_path, error in rendered:
+            if pdf_path is None:
+                report.failed += 1
+                report.errors.append(f"{serial}: {error}")
+                continue
+            enrollment, template, data, completion_date = pending[serial]
+            certificates.append(Certificate(
+                enrollment=enrollment,
+                template=template,
+                serial_number=serial,
+                student_name=data['student_name'],
+                program_title=data['program_title'],
+                completion_date=completion_date,
+                issue_date=issue_date,
+                pdf_path=pdf_path,
+            ))
+        dropped = []
+        try:
+            with transaction.atomic():
+                # A render worker may have certified some of these since they were selected
+                certified = lock_enrollment_certificates([c.enrollment_id for c in certificates])
+                if certified:
+                    dropped = [c.pdf_path for c in certificates if c.enrollment_id in certified]
+                    certificates = [c for c in certificates if c.enrollment_id not in certified]
+                    report.skipped += len(certified)
+                Certificate.objects.bulk_create(certificates, batch_size=self.CREATE_BATCH)
+                # bulk_create sends no signals; drop any cached 'not found' for these serials
+                serials = [c.serial_number for c in certificates]
+                transaction.on_commit(lambda: VerificationService.invalidate(*serials))
+                # Queued renders for these enrollments are now redundant
+                CertificateRenderJob.objects.filter(
+                    enrollment_id__in=[c.enrollment_id for c in certificates], status='pending'
+                ).update(status='completed', finished_at=timezone.now())
+        except Exception:
+            # No certificate was written, so none of the rendered PDFs is used
+            self.engine.template_generator.discard([c.pdf_path for c in certificates] + dropped)
+            raise
+        # Rendered for enrollments that were certified meanwhile
+        self.engine.template_generator.discard(dropped)
+        report.write_seconds = time.perf_counter() - phase
+
+        report.issued = len(certificates)
+        report.total_seconds = time.perf_counter() - began
+        return report
+
+    def _render(self, tasks, total: int, progress) -> List[Tuple[str, Optional[str], str]]:
+        """Render tasks inline, or across a spawned process pool when there are several."""
+        results = []
+        if self.workers <= 1 or len(tasks) <= 1:
+            for template_id, rows in tasks:
+                results.extend(render_certificate_chunk(template_id, rows))
+                if progress:
+                    progress(len(results), total)
+            return results
+
+        # Spawned workers set Django up themselves and open their own connections
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=django.setup,
+        ) as pool:
+            futures = {pool.submit(render_certificate_chunk, *task): task for task in tasks}
+            for future in as_completed(futures):
+                try:
+                    results.extend(future.result())
+                except Exception as e:
+                    # A crashed worker (BrokenProcessPool) fails its chunks, not the whole issue
+                    results.extend(chunk_failed(futures[future][1], e))
+                if progress:
+                    progress(len(results), total)
+        return results
@@ -1,22 +1,37 @@
 """
-Certification signals - Integration with Progression Engine.
+Certification signals - Integration with Progression Engine and the
+verification cache.
 Requirements: 2.1
 """
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from apps.progression.models import Enrollment
-from .services import CertificationEngine
+from .models import Certificate
+from .services import CertificateRenderQueue, VerificationService
 
 
 @receiver(post_save, sender=Enrollment)
 def on_enrollment_completed(sender, instance, **kwargs):
     """
     Signal handler for enrollment completion.
-    Generates certificate when enrollment reaches 100% completion.
+    Queues the certificate when enrollment reaches 100% completion; the
+    render_certificates worker renders it outside the request.
     Requirements: 2.1
     """
     # Only process if status changed to 'completed'
     if instance.status == 'completed':
-        engine = CertificationEngine()
-        engine.on_program_completed(instance)
+        CertificateRenderQueue().enqueue(instance)
+
+
+@receiver(post_save, sender=Certificate)
+@receiver(post_delete, sender=Certificate)
+def invalidate_verification(sender, instance, **kwargs):
+    """
+    Drop the cached verification result once a certificate change commits,
+    e.g. a cached 'not found' for a newly issued serial. Revocation is read
+    from the database on every lookup and does not depend on this.
+    """
+    serial_number = instance.serial_number
+    transaction.on_commit(lambda: VerificationService.invalidate(serial_number))
@@ -0,0 +1,96 @@
+"""
+Throttling - Per-client token buckets for public certificate endpoints.
+"""
+import math
+import time
+from functools import wraps
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+
+class TokenBucket:
+    """
+    Token bucket per client, kept in the cache.
+    Each client may burst up to capacity requests, then is refilled at
+    per_minute tokens a minute. Buckets live in the configured cache, so a
+    shared backend limits clients across processes; the read-modify-write is
+    not atomic, which only lets a racing client slip an extra request through.
+    """
+
+    KEY = 'throttle:{scope}:{client}'
+
+    def __init__(self, scope: str, capacity: int, per_minute: int):
+        self.scope = scope
+        self.capacity = capacity
+        self.rate = per_minute / 60.0
+
+    def consume(self, client: str) -> Tuple[bool, float]:
+        """
+        Take one token for a client.
+
+        Returns:
+            (allowed, seconds until the next token is available)
+        """
+        key = self.KEY.format(scope=self.scope, client=client)
+        now = time.time()
+        tokens, stamp = cache.get(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - stamp) * self.rate)
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        # An untouched bucket is full again after capacity / rate seconds
+        cache.set(key, (tokens, now), math.ceil(self.capacity / self.rate) + 1)
+
+        wait = 0.0 if allowed else (1 - tokens) / self.rate
+        return allowed, wait
+
+
+def client_ip(request) -> Optional[str]:
+    """
+    Client IP address for rate limiting.
+    X-Forwarded-For is set by the client, so it is only read behind
+    TRUSTED_PROXY_COUNT proxies: each appends the address it saw, and the
+    entry the outermost proxy appended is the first one a client cannot forge.
+    """
+    proxies = settings.TRUSTED_PROXY_COUNT
+    x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
+    if proxies > 0 and x_forwarded_for:
+        hops = [hop.strip() for hop in x_forwarded_for.split(",")]
+        if len(hops) >= proxies:
+            return hops[-proxies]
+    return request.META.get("REMOTE_ADDR")
+
+
+def check_verification_rate(request) -> Optional[HttpResponse]:
+    """
+    Take a verification token for the request's client.
+
+    Returns:
+        A 429 response with Retry-After if the client is over the limit, else None
+    """
+    bucket = TokenBucket(
+        'verify', settings.VERIFICATION_RATE_BURST, settings.VERIFICATION_RATE_PER_MINUTE
+    )
+    allowed, wait = bucket.consume(client_ip(request) or 'unknown')
+    if allowed:
+        return None
+    response = HttpResponse(
+        "Too many verification requests. Please try again shortly.", status=429
+    )
+    response["Retry-After"] = str(math.ceil(wait))
+    return response
+
+
+def throttle_verification(view):
+    """
+    Rate-limit a verification view per client IP.
+    Over-limit requests get 429 with Retry-After and never reach the view.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        return check_verification_rate(request) or view(request, *args, **kwargs)
+    return wrapper
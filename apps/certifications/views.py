@@ -11,7 +11,9 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from inertia import render
 
-from apps.certifications.models import Certificate, VerificationLog
+from apps.certifications.models import Certificate
+from apps.certifications.services import VerificationService
+from apps.certifications.throttling import throttle_verification
 from apps.progression.models import Enrollment
 
 
@@ -60,6 +62,7 @@ def certificate_download(request, pk):
     )
 
 
+@throttle_verification
 def verify_certificate(request, serial_number):
     """
     Public verification page for certificates.
@@ -67,44 +70,28 @@ def verify_certificate(request, serial_number):
 
     GET /certificates/verify/<serial_number>/
     """
-    # Try to find the certificate
-    certificate = Certificate.objects.filter(serial_number=serial_number).first()
+    # Cached lookup; revocation is always read from the database
+    verification = VerificationService().verify(
+        serial_number,
+        ip_address=_get_client_ip(request),
+        user_agent=request.META.get("HTTP_USER_AGENT", ""),
+    )
+    certificate = verification.certificate
+    result = verification.status
 
-    # Determine result
     if certificate is None:
-        result = "not_found"
         certificate_data = None
-    elif certificate.is_revoked:
-        result = "revoked"
-        certificate_data = {
-            "serialNumber": certificate.serial_number,
-            "studentName": certificate.student_name,
-            "programTitle": certificate.program_title,
-            "completionDate": certificate.completion_date.isoformat(),
-            "issueDate": certificate.issue_date.isoformat(),
-            "isRevoked": True,
-            "revocationReason": certificate.revocation_reason,
-        }
     else:
-        result = "valid"
         certificate_data = {
             "serialNumber": certificate.serial_number,
             "studentName": certificate.student_name,
             "programTitle": certificate.program_title,
             "completionDate": certificate.completion_date.isoformat(),
             "issueDate": certificate.issue_date.isoformat(),
-            "isRevoked": False,
+            "isRevoked": certificate.is_revoked,
         }
-
-    # Log verification attempt
-    VerificationLog.objects.create(
-        certificate=certificate,
-        serial_number_queried=serial_number,
-        ip_address=_get_client_ip(request),
-        user_agent=request.META.get("HTTP_USER_AGENT", ""),
-        result=result,
-        verified_at=timezone.now(),
-    )
+        if certificate.is_revoked:
+            certificate_data["revocationReason"] = certificate.revocation_reason
 
     return render(
         request,
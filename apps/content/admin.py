@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import ContentVersion, ParsedImage
+from .models import ContentBody, ContentVersion, ImageAsset, ParsedImage, PdfIngestionJob
 
 
 @admin.register(ContentVersion)
@@ -19,9 +19,33 @@ class ContentVersionAdmin(admin.ModelAdmin):
     raw_id_fields = ["node"]
 
 
+@admin.register(ImageAsset)
+class ImageAssetAdmin(admin.ModelAdmin):
+    list_display = ["key", "settings", "width", "height", "original_size", "optimized_size", "created_at"]
+    search_fields = ["key", "source_digest"]
+    ordering = ["-created_at"]
+
+
+@admin.register(ContentBody)
+class ContentBodyAdmin(admin.ModelAdmin):
+    list_display = ["content_hash", "chunk_count", "size", "created_at"]
+    search_fields = ["content_hash"]
+    ordering = ["-created_at"]
+    exclude = ["data"]
+
+
 @admin.register(ParsedImage)
 class ParsedImageAdmin(admin.ModelAdmin):
     list_display = ["content_version", "page_number", "width", "height", "file_size"]
     search_fields = ["content_version__node__title"]
     ordering = ["content_version", "page_number"]
-    raw_id_fields = ["content_version"]
+    raw_id_fields = ["content_version", "asset"]
+
+
+@admin.register(PdfIngestionJob)
+class PdfIngestionJobAdmin(admin.ModelAdmin):
+    list_display = ["source_file_name", "node", "status", "page_count", "attempts", "created_at"]
+    list_filter = ["status"]
+    search_fields = ["node__title", "source_file_name"]
+    ordering = ["-created_at"]
+    raw_id_fields = ["node", "created_by", "content_version"]
@@ -0,0 +1,125 @@
+"""
+Body store - Session HTML stored outside CurriculumNode.properties.
+"""
+import hashlib
+import json
+import zlib
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from django.utils import timezone
+
+from apps.content.models import ContentBody
+from apps.curriculum.models import CurriculumNode
+
+# A single HTML string, or the chunks of a paginated session
+Body = Union[str, List[str]]
+
+REF_KEY = 'content_body'
+LEGACY_KEY = 'content_html'
+
+
+def pack(body: Body) -> Tuple[bytes, str, int, int]:
+    """
+    Compress a session body.
+
+    Returns:
+        (compressed data, content hash, chunk count, uncompressed size)
+    """
+    chunks = [body] if isinstance(body, str) else list(body)
+    raw = json.dumps(chunks, ensure_ascii=False).encode('utf-8')
+    size = sum(len(chunk.encode('utf-8')) for chunk in chunks)
+    return zlib.compress(raw, 6), hashlib.sha256(raw).hexdigest(), len(chunks), size
+
+
+def unpack(data: bytes) -> Body:
+    """Inverse of pack: one chunk comes back as a string, several as a list."""
+    chunks = json.loads(zlib.decompress(bytes(data)).decode('utf-8'))
+    return chunks[0] if len(chunks) == 1 else chunks
+
+
+class ContentBodyStore:
+    """
+    Content-addressed storage of rendered session HTML.
+    Identical bodies share one row, so cloning a node only copies its
+    reference; editing a clone writes a new body and leaves the source alone.
+    Bodies no node points at any more are deleted by prune().
+    """
+
+    def put(self, node: CurriculumNode, body: Body) -> Dict[str, Any]:
+        """
+        Store a body and point the node at it. The node is not saved.
+
+        Args:
+            node: Session node the body belongs to
+            body: HTML string or list of paginated chunks
+
+        Returns:
+            The reference written to node.properties['content_body']
+        """
+        data, content_hash, chunk_count, size = pack(body)
+        stored, created = ContentBody.objects.get_or_create(
+            content_hash=content_hash,
+            defaults={'data': data, 'chunk_count': chunk_count, 'size': size}
+        )
+        if not created:
+            # Keep a reused body out of a concurrent prune until the node is saved
+            ContentBody.objects.filter(pk=stored.pk).update(stored_at=timezone.now())
+        ref = {'id': stored.pk, 'hash': content_hash, 'chunks': chunk_count, 'size': size}
+
+        properties = node.properties if node.properties is not None else {}
+        properties.pop(LEGACY_KEY, None)
+        properties[REF_KEY] = ref
+        properties['is_paginated'] = chunk_count > 1
+        node.properties = properties
+        return ref
+
+    def load(self, node: CurriculumNode) -> Body:
+        """
+        Body of a node, or '' if it has none.
+        Nodes not yet migrated still carry their HTML inline.
+        """
+        properties = node.properties or {}
+        ref: Optional[Dict[str, Any]] = properties.get(REF_KEY)
+        if not ref:
+            return properties.get(LEGACY_KEY, '')
+
+        data = (
+            ContentBody.objects.filter(pk=ref.get('id'), content_hash=ref.get('hash'))
+            .values_list('data', flat=True).first()
+        )
+        if data is None:
+            # Row replaced since the reference was written; the hash still identifies it
+            data = (
+                ContentBody.objects.filter(content_hash=ref.get('hash'))
+                .values_list('data', flat=True).first()
+            )
+        return unpack(data) if data is not None else ''
+
+    def unreferenced(self, stored_before: datetime) -> List[int]:
+        """Ids of bodies stored before the cutoff that no node points at."""
+        referenced = set(
+            CurriculumNode.objects.filter(properties__has_key=REF_KEY)
+            .values_list(f'properties__{REF_KEY}__hash', flat=True)
+            .iterator(chunk_size=2000)
+        )
+        stale = ContentBody.objects.filter(stored_at__lt=stored_before).values_list('pk', 'content_hash')
+        return [pk for pk, content_hash in stale.iterator(chunk_size=2000) if content_hash not in referenced]
+
+    def prune(self, stored_before: datetime, batch_size: int = 1000) -> int:
+        """
+        Delete bodies no node points at, batch_size rows per query.
+        Only bodies last stored before the cutoff are considered, so a body
+        written for a node that is not saved yet is kept.
+
+        Returns:
+            Number of bodies deleted
+        """
+        pks = self.unreferenced(stored_before)
+        deleted = 0
+        for start in range(0, len(pks), batch_size):
+            count, _ = ContentBody.objects.filter(
+                pk__in=pks[start:start + batch_size], stored_at__lt=stored_before
+            ).delete()
+            deleted += count
+        return deleted
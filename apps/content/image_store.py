@@ -0,0 +1,83 @@
+"""
+Image store - Content-addressed, deduplicated storage of parsed PDF images.
+"""
+import os
+from typing import Any, Dict, Iterable
+
+from django.core.files.base import ContentFile, File
+from django.core.files.storage import default_storage
+
+from apps.content.models import ImageAsset
+
+
+class ImageStore:
+    """
+    Stores original and optimized images once per content key.
+    Originals are addressed by the hash of their bytes and optimized files by
+    the hash of the source plus the optimizer settings, so the same logo on
+    every page, or every image of a re-parsed PDF, maps to existing files.
+    """
+
+    ORIGINAL_DIR = 'content/images/original'
+    OPTIMIZED_DIR = 'content/images/optimized'
+
+    def __init__(self, storage=None):
+        """
+        Args:
+            storage: Django storage backend (defaults to default_storage)
+        """
+        self.storage = storage or default_storage
+
+    def lookup(self, keys: Iterable[str]) -> Dict[str, ImageAsset]:
+        """Existing assets for the given keys, in one query."""
+        keys = set(keys)
+        if not keys:
+            return {}
+        return {asset.key: asset for asset in ImageAsset.objects.filter(key__in=keys)}
+
+    def put(self, image: Dict[str, Any], fingerprint: str) -> ImageAsset:
+        """
+        Write an image produced by ContentOptimizer.optimize_images and
+        record its asset. Files that already exist are not rewritten.
+
+        Args:
+            image: Optimizer output with 'key', 'source_digest', 'source' and,
+                unless Pillow could not decode it, optimized 'data'
+            fingerprint: Optimizer settings the image was encoded with
+
+        Returns:
+            The (possibly pre-existing) ImageAsset
+        """
+        original_path = self._save(
+            self.ORIGINAL_DIR, image['source_digest'], image.get('source_ext', 'bin'), image['source']
+        )
+        if image.get('data') is not None:
+            optimized_path = self._save(self.OPTIMIZED_DIR, image['key'], 'jpeg', image['data'])
+        else:
+            # Undecodable images are served as extracted
+            optimized_path = original_path
+
+        asset, _ = ImageAsset.objects.get_or_create(
+            key=image['key'],
+            defaults={
+                'source_digest': image['source_digest'],
+                'settings': fingerprint,
+                'original_path': original_path,
+                'optimized_path': optimized_path,
+                'width': image.get('width') or None,
+                'height': image.get('height') or None,
+                'original_size': image.get('original_size'),
+                'optimized_size': image.get('optimized_size') or image.get('original_size'),
+            }
+        )
+        return asset
+
+    def _save(self, directory: str, digest: str, ext: str, content) -> str:
+        """Save content under a hash-sharded path unless it is already there."""
+        path = os.path.join(directory, digest[:2], f'{digest}.{ext}')
+        if self.storage.exists(path):
+            return path
+        if isinstance(content, bytes):
+            return self.storage.save(path, ContentFile(content))
+        with open(content, 'rb') as f:
+            return self.storage.save(path, File(f))
@@ -0,0 +1,100 @@
+"""
+Image encoding for mobile delivery.
+
+Pure Pillow with no Django imports, so the functions here can run in
+spawned worker processes that never set Django up.
+"""
+import atexit
+import hashlib
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple, Union
+
+from PIL import Image
+
+# Raw bytes, or the path of a spooled image file
+ImageSource = Union[bytes, str]
+
+# (workers, pool) of this process's encoding pool, if one was started
+_pool: Optional[Tuple[int, ProcessPoolExecutor]] = None
+
+
+def source_digest(source: ImageSource) -> str:
+    """SHA-256 of an image's source bytes, read in blocks for spooled files."""
+    digest = hashlib.sha256()
+    if isinstance(source, bytes):
+        digest.update(source)
+    else:
+        with open(source, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def image_key(digest: str, fingerprint: str) -> str:
+    """Key of an optimized image: source hash plus the optimizer settings."""
+    return hashlib.sha256(f'{digest}:{fingerprint}'.encode()).hexdigest()
+
+
+def encode_for_mobile(
+    source: ImageSource,
+    max_width: int,
+    quality: int
+) -> Optional[Tuple[bytes, int, int]]:
+    """
+    Resize an image to max_width and re-encode it as JPEG.
+
+    Args:
+        source: Image bytes or path
+        max_width: Maximum width in pixels; aspect ratio is preserved
+        quality: JPEG quality
+
+    Returns:
+        (jpeg bytes, width, height), or None if Pillow cannot decode the image
+    """
+    try:
+        img = Image.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+
+        # Resize if too wide
+        if img.width > max_width:
+            ratio = max_width / img.width
+            new_height = int(img.height * ratio)
+            img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
+
+        # Convert to RGB if necessary (for JPEG)
+        if img.mode in ('RGBA', 'P'):
+            img = img.convert('RGB')
+
+        # Compress
+        output = io.BytesIO()
+        img.save(output, format='JPEG', quality=quality, optimize=True)
+        return output.getvalue(), img.width, img.height
+    except Exception:
+        return None
+
+
+def get_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    The process's encoding pool, created on first use. A request for a
+    different size replaces it, so a process never holds more than one.
+    Spawned rather than forked so workers never inherit database connections.
+    """
+    global _pool
+    if _pool is not None and _pool[0] != workers:
+        shutdown_pool()
+    if _pool is None:
+        _pool = (workers, ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+        ))
+    return _pool[1]
+
+
+@atexit.register
+def shutdown_pool() -> None:
+    """Stop the encoding pool's workers; the next get_pool() starts a new one."""
+    global _pool
+    if _pool is not None:
+        _pool[1].shutdown(wait=True)
+        _pool = None
@@ -0,0 +1,125 @@
+"""
+PDF ingestion service - Resumable background parsing of uploaded PDFs.
+"""
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from django.db import transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.content.models import PdfIngestionJob
+from apps.content.services import ContentParserService, PdfStream
+from apps.core.services.job_queue import JobQueue
+from apps.curriculum.models import CurriculumNode
+
+
+class PdfIngestionService(JobQueue):
+    """
+    Queues PDF uploads as PdfIngestionJob rows and processes them one page
+    range at a time. Each range is extracted, rendered and committed together
+    with its progress marker, so only the range in flight is held in memory
+    and a job picked up again after a crash continues where it stopped.
+    A range is only committed while this worker still owns the job.
+    """
+
+    model = PdfIngestionJob
+    STALE_AFTER = timedelta(minutes=15)
+    CLAIM_RELATED = ('node', 'content_version')
+
+    def __init__(self, parser: Optional[ContentParserService] = None):
+        self.parser = parser or ContentParserService()
+
+    def enqueue(
+        self,
+        parent_node: CurriculumNode,
+        pdf_path: str,
+        pdf_name: str,
+        page_ranges: Optional[List[Dict[str, Any]]] = None,
+        user=None
+    ) -> PdfIngestionJob:
+        """
+        Queue a PDF for parsing into sessions under a node.
+
+        Args:
+            parent_node: Parent curriculum node (typically a Unit)
+            pdf_path: Path to the stored PDF file
+            pdf_name: Original filename
+            page_ranges: Optional list of page ranges for sessions
+            user: Uploader
+
+        Returns:
+            The pending PdfIngestionJob
+        """
+        return PdfIngestionJob.objects.create(
+            node=parent_node,
+            created_by=user,
+            source_file_path=pdf_path,
+            source_file_name=pdf_name,
+            requested_ranges=page_ranges,
+        )
+
+    def claim_next(self) -> Optional[PdfIngestionJob]:
+        """
+        Claim the oldest pending job, or a running job whose worker died.
+
+        Returns:
+            The claimed job, or None if there is nothing to do
+        """
+        jobs = self.claim_batch(1)
+        return jobs[0] if jobs else None
+
+    def claim_updates(self, now) -> dict:
+        return {'started_at': Coalesce('started_at', now)}
+
+    def run(self, job: PdfIngestionJob) -> None:
+        """Plan a claimed job if needed, then ingest every range not yet done."""
+        with self.parser.open_pdf(job.source_file_path) as pdf:
+            if not job.ranges:
+                self._plan(job, pdf)
+            for index, range_info in enumerate(job.ranges):
+                if range_info.get('status') != 'done':
+                    self._ingest_range(job, pdf, index)
+        self._complete(job)
+
+    def _plan(self, job: PdfIngestionJob, pdf: PdfStream) -> None:
+        """Split the PDF into page ranges and record its content version."""
+        outline = self.parser.outline(pdf)
+        page_ranges = self.parser.plan_ranges(outline, job.requested_ranges)
+
+        with transaction.atomic():
+            job.content_version = self.parser.create_version(
+                job.node, job.source_file_path, job.source_file_name, outline
+            )
+            job.page_count = outline.page_count
+            job.ranges = [
+                {**r, 'status': 'pending', 'session_id': None} for r in page_ranges
+            ]
+            self.lock_owned(job)
+            job.heartbeat_at = timezone.now()
+            job.save(update_fields=[
+                'content_version', 'page_count', 'ranges', 'heartbeat_at', 'updated_at'
+            ])
+
+    def _ingest_range(self, job: PdfIngestionJob, pdf: PdfStream, index: int) -> None:
+        """Extract, render and store one page range as a session."""
+        range_info = job.ranges[index]
+        with transaction.atomic():
+            session = self.parser.ingest_range(
+                job.content_version, job.node, pdf, range_info, position=index
+            )
+            job.ranges[index] = {**range_info, 'status': 'done', 'session_id': session.id}
+            self.lock_owned(job)
+            job.heartbeat_at = timezone.now()
+            job.save(update_fields=['ranges', 'heartbeat_at', 'updated_at'])
+
+
+def run_ingestion_job(job_id: int) -> str:
+    """
+    Process one claimed job; the entry point for worker processes.
+
+    Returns:
+        The job's final status
+    """
+    job = PdfIngestionJob.objects.select_related('node', 'content_version').get(pk=job_id)
+    return PdfIngestionService().process(job).status
@@ -0,0 +1,130 @@
+"""
+Django management command benchmarking PDF extraction memory.
+
+Builds a synthetic PDF (text plus one distinct JPEG per page) and extracts
+it twice per document size, each run in a fresh process so peak RSS is not
+inherited from the previous run:
+
+    eager   PdfExtractor.extract - every page and image held in memory
+    stream  PdfExtractor.stream  - outline pass, then one page range at a
+            time with images spilled to the spool directory
+
+Peak RSS of the streaming run should stay roughly flat as pages grow.
+
+Usage:
+    python manage.py benchmark_pdf_extraction
+    python manage.py benchmark_pdf_extraction --pages=1000 --range-size=20
+"""
+import io
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+import fitz  # PyMuPDF
+from django.core.management.base import BaseCommand
+from PIL import Image
+
+
+class Command(BaseCommand):
+    help = 'Compare peak memory of eager and streaming PDF extraction on a synthetic PDF'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=1000)
+        parser.add_argument('--range-size', type=int, default=20, help='Pages per streamed range')
+        parser.add_argument('--image-size', type=int, default=256, help='Image edge in pixels')
+
+    def handle(self, *args, **options):
+        sizes = sorted({max(1, options['pages'] // 4), options['pages']})
+        context = multiprocessing.get_context('spawn')
+
+        with tempfile.TemporaryDirectory(prefix='pdf-bench-') as tmp:
+            for pages in sizes:
+                pdf_path = os.path.join(tmp, f'synthetic-{pages}.pdf')
+                _build_pdf(pdf_path, pages, options['image_size'])
+                size_mb = os.path.getsize(pdf_path) / (1024 * 1024)
+                self.stdout.write(f'{pages} pages ({size_mb:.1f} MB):')
+
+                for mode in ('eager', 'stream'):
+                    with ProcessPoolExecutor(1, mp_context=context, initializer=django.setup) as pool:
+                        result = pool.submit(_measure, mode, pdf_path, options['range_size']).result()
+                    self.stdout.write(
+                        f'  {mode:<7} {result["seconds"]:7.2f} s  '
+                        f'peak RSS {result["peak_mb"]:7.1f} MB  '
+                        f'(+{result["growth_mb"]:.1f} MB over baseline)  '
+                        f'{result["images"]} images'
+                    )
+
+
+def _build_pdf(path, pages, image_size):
+    """Write a synthetic PDF with a heading, body text and a distinct image per page."""
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        if i % 25 == 0:
+            page.insert_text((72, 60), f'Chapter {i // 25 + 1}', fontsize=20)
+        page.insert_text((72, 100), f'Page {i + 1}: ' + 'synthetic body text ' * 8, fontsize=10)
+        # Random pixels keep every image distinct and incompressible
+        buffer = io.BytesIO()
+        Image.frombytes('RGB', (image_size, image_size), os.urandom(image_size * image_size * 3)).save(
+            buffer, format='JPEG', quality=85
+        )
+        page.insert_image(fitz.Rect(72, 140, 72 + image_size, 140 + image_size), stream=buffer.getvalue())
+    doc.save(path)
+    doc.close()
+
+
+def _reset_peak_rss():
+    """Reset the peak RSS high-water mark where Linux allows it."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def _peak_rss_mb():
+    """Peak RSS of this process in MB (VmHWM on Linux, ru_maxrss elsewhere)."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS; only reached off Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024)
+
+
+def _measure(mode, pdf_path, range_size):
+    """Run one extraction mode in this (fresh) process and report its peak RSS."""
+    from apps.content.services import PdfExtractor
+
+    extractor = PdfExtractor()
+    _reset_peak_rss()
+    baseline = _peak_rss_mb()
+    began = time.perf_counter()
+    images = 0
+
+    if mode == 'eager':
+        content = extractor.extract(pdf_path)
+        images = len(content.images)
+        del content
+    else:
+        with extractor.stream(pdf_path) as pdf:
+            page_count = pdf.outline().page_count
+            for start in range(1, page_count + 1, range_size):
+                content = pdf.extract_range(start, start + range_size - 1)
+                images += len(content.images)
+                pdf.release(content)
+
+    peak = _peak_rss_mb()
+    return {
+        'seconds': time.perf_counter() - began,
+        'peak_mb': peak,
+        'growth_mb': peak - baseline,
+        'images': images,
+    }
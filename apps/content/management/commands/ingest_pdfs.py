@@ -0,0 +1,104 @@
+"""
+Django management command running the PDF ingestion worker.
+
+Claims queued PdfIngestionJob rows and parses them in a process pool, one
+job per process, so several large PDFs are ingested in parallel. Jobs left
+running by a crashed worker are reclaimed once their heartbeat goes stale
+and resume at their first unfinished page range.
+
+Usage:
+    python manage.py ingest_pdfs
+    python manage.py ingest_pdfs --workers=4
+    python manage.py ingest_pdfs --once
+    python manage.py ingest_pdfs --once --workers=0   # run inline, no pool
+"""
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.content.ingestion_service import PdfIngestionService, run_ingestion_job
+
+
+class Command(BaseCommand):
+    help = 'Process queued PDF ingestion jobs with a pool of worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Worker processes (default: CPU count); 0 runs jobs in this process',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit when the queue is empty instead of polling',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=5.0,
+            help='Seconds to wait between queue polls',
+        )
+
+    def handle(self, *args, **options):
+        service = PdfIngestionService()
+        if options['workers'] <= 0:
+            self._run_inline(service, options)
+        else:
+            self._run_pool(service, options)
+
+    def _run_inline(self, service, options):
+        while True:
+            job = service.claim_next()
+            if job is None:
+                if options['once']:
+                    return
+                time.sleep(options['poll_interval'])
+                continue
+            self._report(job.id, service.process(job).status)
+
+    def _run_pool(self, service, options):
+        workers = options['workers']
+        # Spawned workers set Django up themselves and open their own connections
+        connections.close_all()
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=django.setup,
+        )
+        in_flight = {}
+        try:
+            while True:
+                while len(in_flight) < workers:
+                    job = service.claim_next()
+                    if job is None:
+                        break
+                    in_flight[pool.submit(run_ingestion_job, job.id)] = job.id
+                    self.stdout.write(f'Job {job.id}: started ({job.source_file_name})')
+
+                if not in_flight:
+                    if options['once']:
+                        return
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                done, _ = wait(in_flight, timeout=options['poll_interval'], return_when=FIRST_COMPLETED)
+                for future in done:
+                    job_id = in_flight.pop(future)
+                    try:
+                        self._report(job_id, future.result())
+                    except Exception as e:
+                        # The job stays running and is reclaimed once its heartbeat is stale
+                        self.stderr.write(f'Job {job_id}: worker crashed: {e}')
+        finally:
+            pool.shutdown(wait=True)
+
+    def _report(self, job_id, status):
+        style = self.style.SUCCESS if status == 'completed' else self.style.ERROR
+        self.stdout.write(style(f'Job {job_id}: {status}'))
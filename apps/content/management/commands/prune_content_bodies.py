@@ -0,0 +1,60 @@
+"""
+Django management command deleting session bodies no node points at.
+
+Editing or deleting a session leaves its previous ContentBody row behind
+when no other node shares it. Bodies not stored for any node within the
+last --hours are checked against every node's reference and deleted in
+batches.
+
+Usage:
+    python manage.py prune_content_bodies
+    python manage.py prune_content_bodies --hours=48 --batch-size=500
+    python manage.py prune_content_bodies --dry-run
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.content.body_store import ContentBodyStore
+
+
+class Command(BaseCommand):
+    help = 'Delete stored session bodies that no curriculum node references'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours',
+            type=int,
+            default=24,
+            help='Keep bodies stored within this many hours',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Bodies deleted per statement',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report how many bodies would be deleted',
+        )
+
+    def handle(self, *args, **options):
+        if options['hours'] < 1:
+            raise CommandError('--hours must be at least 1')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+
+        store = ContentBodyStore()
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+
+        if options['dry_run']:
+            self.stdout.write(self.style.NOTICE('DRY RUN - No changes will be made'))
+            count = len(store.unreferenced(cutoff))
+            self.stdout.write(f'Would delete {count} unreferenced session bodies')
+            return
+
+        deleted = store.prune(cutoff, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} unreferenced session bodies'))
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-17 15:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0004_contentblock_delete_lessonblock_and_more'),
+        ('curriculum', '0005_curriculumnode_materialized_path'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PdfIngestionJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('source_file_path', models.CharField(max_length=500)),
+                ('source_file_name', models.CharField(max_length=255)),
+                ('requested_ranges', models.JSONField(blank=True, null=True)),
+                ('ranges', models.JSONField(blank=True, default=list)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('page_count', models.PositiveIntegerField(default=0)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('content_version', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ingestion_jobs', to='content.contentversion')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='pdf_ingestion_jobs', to=settings.AUTH_USER_MODEL)),
+                ('node', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pdf_ingestion_jobs', to='curriculum.curriculumnode')),
+            ],
+            options={
+                'db_table': 'pdf_ingestion_jobs',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'heartbeat_at'], name='pij_status_heartbeat_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 15:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0005_pdf_ingestion_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageAsset',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('source_digest', models.CharField(db_index=True, max_length=64)),
+                ('settings', models.CharField(max_length=50)),
+                ('original_path', models.CharField(max_length=500)),
+                ('optimized_path', models.CharField(max_length=500)),
+                ('width', models.PositiveIntegerField(blank=True, null=True)),
+                ('height', models.PositiveIntegerField(blank=True, null=True)),
+                ('original_size', models.PositiveIntegerField(blank=True, null=True)),
+                ('optimized_size', models.PositiveIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'image_assets',
+            },
+        ),
+        migrations.AddField(
+            model_name='parsedimage',
+            name='asset',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='parsed_images', to='content.imageasset'),
+        ),
+    ]
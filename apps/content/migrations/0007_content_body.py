@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0006_image_asset'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentBody',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64, unique=True)),
+                ('data', models.BinaryField()),
+                ('chunk_count', models.PositiveIntegerField(default=1)),
+                ('size', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'content_bodies',
+            },
+        ),
+    ]
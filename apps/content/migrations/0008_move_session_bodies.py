@@ -0,0 +1,79 @@
+"""
+Move session HTML out of CurriculumNode.properties into content_bodies.
+
+Each properties['content_html'] (a string or a list of paginated chunks)
+becomes a compressed ContentBody row and is replaced by a
+properties['content_body'] reference. Reversing puts the HTML back inline.
+"""
+import hashlib
+import json
+import zlib
+
+from django.db import migrations
+
+BATCH_SIZE = 200
+
+
+def _pack(body):
+    chunks = [body] if isinstance(body, str) else list(body)
+    raw = json.dumps(chunks, ensure_ascii=False).encode('utf-8')
+    size = sum(len(chunk.encode('utf-8')) for chunk in chunks)
+    return zlib.compress(raw, 6), hashlib.sha256(raw).hexdigest(), len(chunks), size
+
+
+def move_bodies_out(apps, schema_editor):
+    CurriculumNode = apps.get_model('curriculum', 'CurriculumNode')
+    ContentBody = apps.get_model('content', 'ContentBody')
+
+    nodes = CurriculumNode.objects.filter(properties__has_key='content_html').only('id', 'properties')
+    batch = []
+    for node in nodes.iterator(chunk_size=BATCH_SIZE):
+        body = node.properties.pop('content_html')
+        if body:
+            data, content_hash, chunk_count, size = _pack(body)
+            stored, _ = ContentBody.objects.get_or_create(
+                content_hash=content_hash,
+                defaults={'data': data, 'chunk_count': chunk_count, 'size': size}
+            )
+            node.properties['content_body'] = {
+                'id': stored.pk, 'hash': content_hash, 'chunks': chunk_count, 'size': size,
+            }
+            node.properties['is_paginated'] = chunk_count > 1
+        batch.append(node)
+        if len(batch) >= BATCH_SIZE:
+            CurriculumNode.objects.bulk_update(batch, ['properties'])
+            batch = []
+    if batch:
+        CurriculumNode.objects.bulk_update(batch, ['properties'])
+
+
+def move_bodies_in(apps, schema_editor):
+    CurriculumNode = apps.get_model('curriculum', 'CurriculumNode')
+    ContentBody = apps.get_model('content', 'ContentBody')
+
+    nodes = CurriculumNode.objects.filter(properties__has_key='content_body').only('id', 'properties')
+    batch = []
+    for node in nodes.iterator(chunk_size=BATCH_SIZE):
+        ref = node.properties.pop('content_body')
+        stored = ContentBody.objects.filter(content_hash=ref.get('hash')).first()
+        if stored is not None:
+            chunks = json.loads(zlib.decompress(bytes(stored.data)).decode('utf-8'))
+            node.properties['content_html'] = chunks[0] if len(chunks) == 1 else chunks
+        batch.append(node)
+        if len(batch) >= BATCH_SIZE:
+            CurriculumNode.objects.bulk_update(batch, ['properties'])
+            batch = []
+    if batch:
+        CurriculumNode.objects.bulk_update(batch, ['properties'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0007_content_body'),
+        ('curriculum', '0005_curriculumnode_materialized_path'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_bodies_out, move_bodies_in),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0008_move_session_bodies'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contentbody',
+            name='stored_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -1,8 +1,11 @@
 """
 Content models - PDF parsing, rich content blocks, and optimization.
 """
+import os
+
 from django.db import models
-from apps.core.models import TimeStampedModel
+from django.utils import timezone
+from apps.core.models import QueuedJob, TimeStampedModel
 
 
 class ContentVersion(TimeStampedModel):
@@ -41,6 +44,59 @@ class ContentVersion(TimeStampedModel):
         return self.node.children.filter(node_type='Session')
 
 
+class ImageAsset(models.Model):
+    """
+    Content-addressed image file shared by every parse that extracts it.
+    Keyed by the hash of the source bytes plus the optimizer settings, so an
+    image already optimized with the same settings is never encoded again.
+    """
+    key = models.CharField(max_length=64, unique=True)
+    source_digest = models.CharField(max_length=64, db_index=True)
+    # ContentOptimizer.fingerprint the optimized file was produced with
+    settings = models.CharField(max_length=50)
+    original_path = models.CharField(max_length=500)
+    optimized_path = models.CharField(max_length=500)
+    width = models.PositiveIntegerField(blank=True, null=True)
+    height = models.PositiveIntegerField(blank=True, null=True)
+    original_size = models.PositiveIntegerField(blank=True, null=True)
+    optimized_size = models.PositiveIntegerField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'image_assets'
+
+    def __str__(self):
+        return f"ImageAsset {self.key[:12]}"
+
+    @property
+    def ext(self) -> str:
+        """Format of the served file: jpeg, or the original's for undecodable images."""
+        return os.path.splitext(self.optimized_path)[1].lstrip('.')
+
+
+class ContentBody(models.Model):
+    """
+    Rendered session HTML, kept out of CurriculumNode.properties.
+    Stored once per content hash as zlib-compressed JSON (a list of HTML
+    chunks); nodes hold only a small {"id", "hash", ...} reference, so
+    loading or cloning a node never pulls the HTML along.
+    """
+    content_hash = models.CharField(max_length=64, unique=True)
+    data = models.BinaryField()
+    chunk_count = models.PositiveIntegerField(default=1)
+    # Uncompressed UTF-8 size of all chunks
+    size = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Last time a node was pointed at this body; pruning spares recent bodies
+    stored_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'content_bodies'
+
+    def __str__(self):
+        return f"ContentBody {self.content_hash[:12]}"
+
+
 class ParsedImage(models.Model):
     """
     Represents an image extracted from a PDF during parsing.
@@ -57,6 +113,13 @@ class ParsedImage(models.Model):
     width = models.PositiveIntegerField(blank=True, null=True)
     height = models.PositiveIntegerField(blank=True, null=True)
     file_size = models.PositiveIntegerField(blank=True, null=True)
+    asset = models.ForeignKey(
+        ImageAsset,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='parsed_images'
+    )
 
     class Meta:
         db_table = 'parsed_images'
@@ -107,3 +170,59 @@ class ContentBlock(TimeStampedModel):
     def __str__(self):
         return f"{self.get_block_type_display()} block #{self.position} in {self.node}"
 
+
+
+class PdfIngestionJob(QueuedJob):
+    """
+    Background job that parses an uploaded PDF into session nodes.
+    The PDF is split into page ranges when the job is planned; each range
+    records its own status so a crashed job resumes at the first range
+    that has not been written yet.
+    """
+    node = models.ForeignKey(
+        'curriculum.CurriculumNode',
+        on_delete=models.CASCADE,
+        related_name='pdf_ingestion_jobs'
+    )
+    created_by = models.ForeignKey(
+        'core.User',
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='pdf_ingestion_jobs'
+    )
+    source_file_path = models.CharField(max_length=500)
+    source_file_name = models.CharField(max_length=255)
+    # Ranges chosen by the uploader; None means detect them from headings
+    requested_ranges = models.JSONField(blank=True, null=True)
+    # Planned ranges with progress:
+    # [{"start": 1, "end": 12, "title": "...", "status": "pending"|"done", "session_id": 5}]
+    ranges = models.JSONField(default=list, blank=True)
+    content_version = models.ForeignKey(
+        ContentVersion,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='ingestion_jobs'
+    )
+    page_count = models.PositiveIntegerField(default=0)
+    started_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = 'pdf_ingestion_jobs'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'heartbeat_at'], name='pij_status_heartbeat_idx'),
+        ]
+
+    def __str__(self):
+        return f"Ingestion of {self.source_file_name} ({self.status})"
+
+    @property
+    def ranges_done(self) -> int:
+        return sum(1 for r in self.ranges if r.get('status') == 'done')
+
+    @property
+    def progress(self) -> dict:
+        """Completed and total page ranges."""
+        return {'done': self.ranges_done, 'total': len(self.ranges)}
@@ -2,17 +2,25 @@
 Content Parser Services - PDF extraction, session generation, and content optimization.
 """
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
-import io
+from itertools import chain, repeat
+from typing import Iterable, Iterator, List, Optional, Dict, Any
+import os
 import re
+import tempfile
 
 import fitz  # PyMuPDF
-from PIL import Image
 from django.utils import timezone
 
+from apps.content.body_store import ContentBodyStore
+from apps.content.image_store import ImageStore
+from apps.content.imaging import encode_for_mobile, get_pool, image_key, source_digest
 from apps.content.models import ContentVersion, ParsedImage
 from apps.curriculum.models import CurriculumNode
 
+# Text-only "dict" extraction: without TEXT_PRESERVE_IMAGES, MuPDF does not
+# decode every image on the page into the dict just to be skipped
+TEXT_DICT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
 
 @dataclass
 class ExtractedContent:
@@ -24,73 +32,173 @@ class ExtractedContent:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-class PdfExtractor:
+class PdfStream:
     """
-    Extracts text and images from PDF documents using PyMuPDF.
+    A PDF opened once for a whole parsing job.
+    Pages are read lazily, one page record at a time, and image payloads are
+    spilled to a temporary spool directory instead of being held as bytes,
+    so memory use depends on the page range being processed rather than on
+    the size of the document. Use as a context manager; closing it closes the
+    document and deletes the spool.
     """
     
-    def extract(self, pdf_path: str) -> ExtractedContent:
+    STORE_FLUSH_PAGES = 10
+    
+    def __init__(self, extractor: 'PdfExtractor', pdf_path: str):
+        self.extractor = extractor
+        self.pdf_path = pdf_path
+        self.doc = fitz.open(pdf_path)
+        self._spool = tempfile.TemporaryDirectory(prefix='pdf-spool-')
+    
+    def __enter__(self) -> 'PdfStream':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Close the document and delete spilled images."""
+        if self.doc is not None:
+            self.doc.close()
+            self.doc = None
+            self._spool.cleanup()
+    
+    @property
+    def page_count(self) -> int:
+        return len(self.doc)
+    
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self.extractor._metadata(self.doc)
+    
+    def iter_pages(
+        self,
+        start_page: int = 1,
+        end_page: Optional[int] = None,
+        text_only: bool = False
+    ) -> Iterator[Dict[str, Any]]:
         """
-        Extract all content from a PDF file.
+        Yield page records for a page range.
         
         Args:
-            pdf_path: Path to the PDF file
+            start_page: Starting page number (1-indexed)
+            end_page: Ending page number (inclusive); defaults to the last page
+            text_only: Skip text blocks and images (for planning passes)
             
-        Returns:
-            ExtractedContent with pages, images, headings, and metadata
+        Yields:
+            Dicts with 'page', 'text', 'headings' and, unless text_only,
+            'blocks' and 'images' (each image has a spool file 'path')
+        """
+        start_idx = max(0, start_page - 1)
+        end_idx = self.page_count if end_page is None else min(end_page, self.page_count)
+        spool_dir = None if text_only else self._spool.name
+        
+        for page_num in range(start_idx, end_idx):
+            yield self.extractor._page_record(self.doc, page_num, spool_dir, text_only)
+            if (page_num + 1) % self.STORE_FLUSH_PAGES == 0:
+                # MuPDF caches decoded objects of every page it has loaded;
+                # empty the cache so it does not grow with the document
+                fitz.TOOLS.store_shrink(100)
+    
+    def outline(self) -> ExtractedContent:
+        """
+        Page text and headings of the whole document, without blocks or
+        images: everything needed to plan session ranges.
         """
-        doc = fitz.open(pdf_path)
         pages = []
-        images = []
         headings = []
+        for record in self.iter_pages(text_only=True):
+            headings.extend(record.pop('headings'))
+            pages.append(record)
         
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            text = page.get_text()
-            pages.append({
-                'page': page_num + 1,
-                'text': text,
-                'blocks': self._extract_blocks(page)
-            })
-            
-            # Extract images from page
-            for img_index, img in enumerate(page.get_images(full=True)):
-                xref = img[0]
-                try:
-                    base_image = doc.extract_image(xref)
-                    images.append({
-                        'page': page_num + 1,
-                        'index': img_index,
-                        'data': base_image['image'],
-                        'ext': base_image['ext'],
-                        'width': base_image.get('width', 0),
-                        'height': base_image.get('height', 0)
-                    })
-                except Exception:
-                    # Skip images that can't be extracted
-                    pass
-            
-            # Extract headings from text blocks
-            page_headings = self._extract_headings(page)
-            headings.extend(page_headings)
-        
-        metadata = {
-            'title': doc.metadata.get('title', ''),
-            'author': doc.metadata.get('author', ''),
-            'subject': doc.metadata.get('subject', ''),
-            'creator': doc.metadata.get('creator', ''),
-        }
-        
-        doc.close()
+        return ExtractedContent(
+            pages=pages,
+            headings=headings,
+            page_count=len(pages),
+            metadata=self.metadata
+        )
+    
+    def extract_range(self, start_page: int, end_page: int) -> ExtractedContent:
+        """
+        Extract one page range. Images reference spool files; call release()
+        once the range has been rendered.
+        """
+        pages = []
+        images = []
+        headings = []
+        for record in self.iter_pages(start_page, end_page):
+            images.extend(record.pop('images'))
+            headings.extend(record.pop('headings'))
+            pages.append(record)
         
         return ExtractedContent(
             pages=pages,
             images=images,
             headings=headings,
             page_count=len(pages),
-            metadata=metadata
+            metadata={}
         )
     
+    def release(self, content: ExtractedContent) -> None:
+        """Delete the spool files of a processed range."""
+        for img in content.images:
+            path = img.get('path')
+            if path:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+
+class PdfExtractor:
+    """
+    Extracts text and images from PDF documents using PyMuPDF.
+    """
+    
+    def stream(self, pdf_path: str) -> PdfStream:
+        """
+        Open a PDF for lazy, page-by-page extraction.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            
+        Returns:
+            PdfStream to use as a context manager
+        """
+        return PdfStream(self, pdf_path)
+    
+    def iter_pages(
+        self,
+        pdf_path: str,
+        start_page: int = 1,
+        end_page: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield page records of a PDF lazily; see PdfStream.iter_pages.
+        Image spool files are removed once the generator is exhausted or closed.
+        """
+        with self.stream(pdf_path) as pdf:
+            yield from pdf.iter_pages(start_page, end_page)
+    
+    def extract(self, pdf_path: str) -> ExtractedContent:
+        """
+        Extract all content from a PDF file.
+        Holds every page and image in memory; prefer stream() for large PDFs.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            
+        Returns:
+            ExtractedContent with pages, images, headings, and metadata
+        """
+        doc = fitz.open(pdf_path)
+        try:
+            content = self._collect(doc, 0, len(doc))
+            content.metadata = self._metadata(doc)
+        finally:
+            doc.close()
+        return content
+    
     def extract_pages(self, pdf_path: str, start_page: int, end_page: int) -> ExtractedContent:
         """
         Extract content from a specific page range.
@@ -104,43 +212,23 @@ class PdfExtractor:
             ExtractedContent for the specified page range
         """
         doc = fitz.open(pdf_path)
+        try:
+            # Adjust for 0-indexed pages
+            return self._collect(doc, max(0, start_page - 1), min(end_page, len(doc)))
+        finally:
+            doc.close()
+    
+    def _collect(self, doc, start_idx: int, end_idx: int) -> ExtractedContent:
+        """Collect page records with in-memory image bytes into ExtractedContent."""
         pages = []
         images = []
         headings = []
         
-        # Adjust for 0-indexed pages
-        start_idx = max(0, start_page - 1)
-        end_idx = min(end_page, len(doc))
-        
         for page_num in range(start_idx, end_idx):
-            page = doc[page_num]
-            text = page.get_text()
-            pages.append({
-                'page': page_num + 1,
-                'text': text,
-                'blocks': self._extract_blocks(page)
-            })
-            
-            # Extract images
-            for img_index, img in enumerate(page.get_images(full=True)):
-                xref = img[0]
-                try:
-                    base_image = doc.extract_image(xref)
-                    images.append({
-                        'page': page_num + 1,
-                        'index': img_index,
-                        'data': base_image['image'],
-                        'ext': base_image['ext'],
-                        'width': base_image.get('width', 0),
-                        'height': base_image.get('height', 0)
-                    })
-                except Exception:
-                    pass
-            
-            page_headings = self._extract_headings(page)
-            headings.extend(page_headings)
-        
-        doc.close()
+            record = self._page_record(doc, page_num)
+            images.extend(record.pop('images'))
+            headings.extend(record.pop('headings'))
+            pages.append(record)
         
         return ExtractedContent(
             pages=pages,
@@ -150,6 +238,75 @@ class PdfExtractor:
             metadata={}
         )
     
+    def _page_record(
+        self,
+        doc,
+        page_num: int,
+        spool_dir: Optional[str] = None,
+        text_only: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Extract one page (0-indexed). The text dict is parsed once and shared
+        by block and heading extraction. Images are written to spool_dir when
+        given, otherwise kept as 'data' bytes.
+        """
+        page = doc[page_num]
+        text_dict = page.get_text("dict", flags=TEXT_DICT_FLAGS)
+        record = {
+            'page': page_num + 1,
+            'text': page.get_text(),
+            'headings': self._extract_headings(page, text_dict),
+        }
+        if text_only:
+            return record
+        
+        record['blocks'] = self._extract_blocks(page, text_dict)
+        record['images'] = self._extract_images(doc, page, page_num + 1, spool_dir)
+        return record
+    
+    def _extract_images(
+        self,
+        doc,
+        page,
+        page_number: int,
+        spool_dir: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Extract a page's images, spilling payloads to spool_dir if given."""
+        images = []
+        for img_index, img in enumerate(page.get_images(full=True)):
+            xref = img[0]
+            try:
+                base_image = doc.extract_image(xref)
+            except Exception:
+                # Skip images that can't be extracted
+                continue
+            
+            image = {
+                'page': page_number,
+                'index': img_index,
+                'ext': base_image['ext'],
+                'width': base_image.get('width', 0),
+                'height': base_image.get('height', 0)
+            }
+            if spool_dir is None:
+                image['data'] = base_image['image']
+            else:
+                path = os.path.join(spool_dir, f"{page_number}_{img_index}.{base_image['ext']}")
+                with open(path, 'wb') as f:
+                    f.write(base_image['image'])
+                image['path'] = path
+                image['original_size'] = len(base_image['image'])
+            images.append(image)
+        return images
+    
+    def _metadata(self, doc) -> Dict[str, Any]:
+        return {
+            'title': doc.metadata.get('title', ''),
+            'author': doc.metadata.get('author', ''),
+            'subject': doc.metadata.get('subject', ''),
+            'creator': doc.metadata.get('creator', ''),
+        }
+    
     def detect_sections(self, content: ExtractedContent) -> List[Dict[str, Any]]:
         """
         Detect chapter/section boundaries based on headings.
@@ -196,10 +353,12 @@ class PdfExtractor:
         
         return sections if sections else [{'start': 1, 'end': content.page_count, 'title': None}]
     
-    def _extract_blocks(self, page) -> List[Dict[str, Any]]:
+    def _extract_blocks(self, page, text_dict: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Extract text blocks with formatting info from a page."""
         blocks = []
-        for block in page.get_text("dict")["blocks"]:
+        if text_dict is None:
+            text_dict = page.get_text("dict", flags=TEXT_DICT_FLAGS)
+        for block in text_dict["blocks"]:
             if block.get("type") == 0:  # Text block
                 block_text = ""
                 max_size = 0
@@ -215,10 +374,12 @@ class PdfExtractor:
                 })
         return blocks
     
-    def _extract_headings(self, page) -> List[str]:
+    def _extract_headings(self, page, text_dict: Optional[Dict[str, Any]] = None) -> List[str]:
         """Extract potential headings based on font size."""
         headings = []
-        blocks = page.get_text("dict")["blocks"]
+        if text_dict is None:
+            text_dict = page.get_text("dict", flags=TEXT_DICT_FLAGS)
+        blocks = text_dict["blocks"]
         
         # Calculate average font size
         all_sizes = []
@@ -267,7 +428,8 @@ class SessionGenerator:
         self,
         parent: CurriculumNode,
         content: ExtractedContent,
-        page_ranges: List[Dict[str, Any]]
+        page_ranges: List[Dict[str, Any]],
+        start_position: int = 0
     ) -> List[CurriculumNode]:
         """
         Create session nodes from content based on page ranges.
@@ -276,13 +438,14 @@ class SessionGenerator:
             parent: Parent curriculum node (typically a Unit)
             content: Extracted PDF content
             page_ranges: List of dicts with 'start', 'end', and optional 'title'
+            start_position: Position of the first session among its siblings
             
         Returns:
             List of created session nodes
         """
         sessions = []
         
-        for i, range_info in enumerate(page_ranges):
+        for i, range_info in enumerate(page_ranges, start=start_position):
             title = range_info.get('title') or self.generate_title(content, range_info, i + 1)
             
             # Extract content for this page range
@@ -302,7 +465,6 @@ class SessionGenerator:
                         'start': start_page,
                         'end': end_page
                     },
-                    'content_html': '',  # Will be set by optimizer
                 }
             )
             session._session_content = session_content  # Temporary storage for optimization
@@ -402,16 +564,34 @@ class ContentOptimizer:
     DEFAULT_MAX_WIDTH = 800
     DEFAULT_MAX_SIZE_KB = 100
     DEFAULT_IMAGE_QUALITY = 85
+    # Smaller batches are encoded inline; pool round-trips would cost more
+    PARALLEL_MIN_IMAGES = 4
     
     def __init__(
         self,
         max_width: int = DEFAULT_MAX_WIDTH,
         max_size_kb: int = DEFAULT_MAX_SIZE_KB,
-        image_quality: int = DEFAULT_IMAGE_QUALITY
+        image_quality: int = DEFAULT_IMAGE_QUALITY,
+        image_store: Optional[ImageStore] = None,
+        workers: int = 1
     ):
+        """
+        Args:
+            workers: Encoding processes. The default encodes inline, which is
+                what ingest_pdfs workers need: they already run one job per
+                process, so a pool in each would multiply the process count.
+                Single-process callers may pass more; see imaging.get_pool.
+        """
         self.max_width = max_width
         self.max_size_kb = max_size_kb
         self.image_quality = image_quality
+        self.image_store = image_store
+        self.workers = max(workers, 1)
+    
+    @property
+    def fingerprint(self) -> str:
+        """Settings that change the encoded output; part of every image key."""
+        return f"w{self.max_width}-q{self.image_quality}"
     
     def optimize(self, content: ExtractedContent) -> ExtractedContent:
         """
@@ -436,55 +616,107 @@ class ContentOptimizer:
     def optimize_images(self, images: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Compress and resize images for mobile.
+        Identical sources are encoded once per call. With an image store,
+        sources already optimized under the same settings are not encoded
+        at all. Larger batches are encoded in a process pool.
         
         Args:
-            images: List of image dictionaries with 'data' bytes
+            images: List of image dictionaries with 'data' bytes or a spool file 'path'
             
         Returns:
-            List of optimized image dictionaries
+            List of optimized image dictionaries, each with its content 'key'.
+            Stored images carry 'asset_id' and their paths; new ones carry the
+            'source' that ContentParserService._store_images writes.
         """
-        optimized = []
-        
+        prepared = []
         for img_data in images:
-            if 'data' not in img_data:
+            if 'data' in img_data:
+                source = img_data['data']
+                original_size = len(source)
+            elif 'path' in img_data:
+                source = img_data['path']
+                original_size = img_data.get('original_size') or os.path.getsize(source)
+            else:
+                prepared.append((img_data, None, None, None, None))
+                continue
+            digest = source_digest(source)
+            key = image_key(digest, self.fingerprint)
+            prepared.append((img_data, source, original_size, digest, key))
+        
+        stored = {}
+        if self.image_store is not None:
+            stored = self.image_store.lookup(key for *_, key in prepared if key)
+        
+        # Encode each distinct source that is not stored yet
+        pending = {}
+        for _, source, _, _, key in prepared:
+            if source is not None and key not in stored:
+                pending.setdefault(key, source)
+        encoded = self._encode(pending)
+        
+        optimized = []
+        for img_data, source, original_size, digest, key in prepared:
+            if source is None:
                 optimized.append(img_data)
                 continue
             
-            try:
-                img = Image.open(io.BytesIO(img_data['data']))
-                original_size = len(img_data['data'])
-                
-                # Resize if too wide
-                if img.width > self.max_width:
-                    ratio = self.max_width / img.width
-                    new_height = int(img.height * ratio)
-                    img = img.resize((self.max_width, new_height), Image.Resampling.LANCZOS)
-                
-                # Convert to RGB if necessary (for JPEG)
-                if img.mode in ('RGBA', 'P'):
-                    img = img.convert('RGB')
-                
-                # Compress
-                output = io.BytesIO()
-                img.save(output, format='JPEG', quality=self.image_quality, optimize=True)
-                optimized_data = output.getvalue()
-                
+            base = {
+                'page': img_data['page'],
+                'index': img_data.get('index', 0),
+                'key': key,
+                'source_digest': digest,
+            }
+            asset = stored.get(key)
+            if asset is not None:
                 optimized.append({
-                    'page': img_data['page'],
-                    'index': img_data.get('index', 0),
-                    'data': optimized_data,
-                    'ext': 'jpeg',
-                    'width': img.width,
-                    'height': img.height,
-                    'original_size': original_size,
-                    'optimized_size': len(optimized_data)
+                    **base,
+                    'ext': asset.ext,
+                    'width': asset.width,
+                    'height': asset.height,
+                    'original_size': asset.original_size,
+                    'optimized_size': asset.optimized_size,
+                    'asset_id': asset.id,
+                    'original_path': asset.original_path,
+                    'optimized_path': asset.optimized_path,
                 })
-            except Exception:
+                continue
+            
+            base.update(source=source, source_ext=img_data.get('ext', 'bin'))
+            result = encoded[key]
+            if result is None:
                 # Keep original if optimization fails
-                optimized.append(img_data)
+                optimized.append({
+                    **base,
+                    'ext': img_data.get('ext'),
+                    'width': img_data.get('width'),
+                    'height': img_data.get('height'),
+                    'original_size': original_size,
+                })
+                continue
+            
+            data, width, height = result
+            optimized.append({
+                **base,
+                'data': data,
+                'ext': 'jpeg',
+                'width': width,
+                'height': height,
+                'original_size': original_size,
+                'optimized_size': len(data)
+            })
         
         return optimized
     
+    def _encode(self, sources: Dict[str, Any]) -> Dict[str, Any]:
+        """Encode sources by key, in the process pool when the batch is large enough."""
+        keys = list(sources)
+        args = ([sources[k] for k in keys], repeat(self.max_width), repeat(self.image_quality))
+        if self.workers > 1 and len(keys) >= self.PARALLEL_MIN_IMAGES:
+            results = get_pool(self.workers).map(encode_for_mobile, *args)
+        else:
+            results = map(encode_for_mobile, *args)
+        return dict(zip(keys, results))
+    
     def to_html(self, content: ExtractedContent) -> str:
         """
         Convert extracted content to HTML.
@@ -495,47 +727,49 @@ class ContentOptimizer:
         Returns:
             HTML string ready for rendering
         """
-        html_parts = []
-        
+        return '\n'.join(self.iter_html_pages(content))
+    
+    def iter_html_pages(self, content: ExtractedContent) -> Iterator[str]:
+        """Yield the HTML of each page, one page div at a time."""
         for page in content.pages:
-            page_html = f"<div class='page' data-page='{page['page']}'>"
-            
-            # Process blocks if available
-            blocks = page.get('blocks', [])
-            if blocks:
-                for block in blocks:
-                    text = block.get('text', '').strip()
-                    if not text:
-                        continue
-                    
-                    font_size = block.get('font_size', 12)
-                    
-                    # Determine element type based on font size
-                    if font_size >= 18:
-                        page_html += f"<h2>{self._escape_html(text)}</h2>"
-                    elif font_size >= 14:
-                        page_html += f"<h3>{self._escape_html(text)}</h3>"
-                    else:
-                        # Convert newlines to paragraphs
-                        paragraphs = text.split('\n\n')
-                        for para in paragraphs:
-                            para = para.strip()
-                            if para:
-                                page_html += f"<p>{self._escape_html(para)}</p>"
-            else:
-                # Fallback to raw text
-                text = page.get('text', '').strip()
-                if text:
-                    paragraphs = text.split('\n\n')
-                    for para in paragraphs:
-                        para = para.strip()
-                        if para:
-                            page_html += f"<p>{self._escape_html(para)}</p>"
-            
-            page_html += "</div>"
-            html_parts.append(page_html)
-        
-        return '\n'.join(html_parts)
+            yield self._page_html(page)
+    
+    def _page_html(self, page: Dict[str, Any]) -> str:
+        """Render one page; elements are collected in a list and joined once."""
+        parts = [f"<div class='page' data-page='{page['page']}'>"]
+        
+        # Process blocks if available
+        blocks = page.get('blocks', [])
+        if blocks:
+            for block in blocks:
+                text = block.get('text', '').strip()
+                if not text:
+                    continue
+                
+                font_size = block.get('font_size', 12)
+                
+                # Determine element type based on font size
+                if font_size >= 18:
+                    parts.append(f"<h2>{self._escape_html(text)}</h2>")
+                elif font_size >= 14:
+                    parts.append(f"<h3>{self._escape_html(text)}</h3>")
+                else:
+                    # Convert newlines to paragraphs
+                    self._append_paragraphs(parts, text)
+        else:
+            # Fallback to raw text
+            text = page.get('text', '').strip()
+            if text:
+                self._append_paragraphs(parts, text)
+        
+        parts.append("</div>")
+        return ''.join(parts)
+    
+    def _append_paragraphs(self, parts: List[str], text: str) -> None:
+        for para in text.split('\n\n'):
+            para = para.strip()
+            if para:
+                parts.append(f"<p>{self._escape_html(para)}</p>")
     
     def paginate(self, html: str, max_size_kb: Optional[int] = None) -> List[str]:
         """
@@ -553,30 +787,63 @@ class ContentOptimizer:
         if len(html.encode('utf-8')) <= max_bytes:
             return [html]
         
-        chunks = []
-        current_chunk = ""
-        
         # Split by page divs
         page_pattern = r"(<div class='page'[^>]*>.*?</div>)"
-        pages = re.split(page_pattern, html, flags=re.DOTALL)
+        parts = (part for part in re.split(page_pattern, html, flags=re.DOTALL) if part.strip())
+        chunks = list(self._chunk(parts, max_bytes))
         
-        for part in pages:
-            if not part.strip():
-                continue
-            
-            part_size = len(part.encode('utf-8'))
-            current_size = len(current_chunk.encode('utf-8'))
-            
-            if current_size + part_size > max_bytes and current_chunk:
-                chunks.append(current_chunk)
-                current_chunk = part
-            else:
-                current_chunk += part
+        return chunks if chunks else [html]
+    
+    def iter_chunks(
+        self,
+        pages: Iterable[str],
+        max_size_kb: Optional[int] = None
+    ) -> Iterator[str]:
+        """
+        Streaming equivalent of paginate(to_html(content)).
+        Consumes page HTML lazily (e.g. from iter_html_pages) and yields each
+        chunk as soon as it is full, holding at most one chunk in memory.
         
-        if current_chunk:
-            chunks.append(current_chunk)
+        Args:
+            pages: Page HTML strings
+            max_size_kb: Maximum size per chunk in KB
+            
+        Yields:
+            HTML chunks; a single newline-joined chunk if everything fits
+        """
+        max_bytes = (max_size_kb or self.max_size_kb) * 1024
+        pages = iter(pages)
+        
+        # Buffer pages until they are known to exceed one chunk
+        head = []
+        total = -1  # no newline before the first page
+        for page in pages:
+            head.append(page)
+            total += len(page.encode('utf-8')) + 1
+            if total > max_bytes:
+                break
+        else:
+            yield '\n'.join(head)
+            return
+        
+        yield from self._chunk(chain(head, pages), max_bytes)
+    
+    def _chunk(self, parts: Iterable[str], max_bytes: int) -> Iterator[str]:
+        """Greedily pack parts into chunks of at most max_bytes, sizing each part once."""
+        current = []
+        current_size = 0
         
-        return chunks if chunks else [html]
+        for part in parts:
+            part_size = len(part.encode('utf-8'))
+            if current_size + part_size > max_bytes and current:
+                yield ''.join(current)
+                current = []
+                current_size = 0
+            current.append(part)
+            current_size += part_size
+        
+        if current:
+            yield ''.join(current)
     
     def _escape_html(self, text: str) -> str:
         """Escape HTML special characters."""
@@ -599,11 +866,15 @@ class ContentParserService:
         self,
         pdf_extractor: Optional[PdfExtractor] = None,
         session_generator: Optional[SessionGenerator] = None,
-        optimizer: Optional[ContentOptimizer] = None
+        optimizer: Optional[ContentOptimizer] = None,
+        image_store: Optional[ImageStore] = None,
+        body_store: Optional[ContentBodyStore] = None
     ):
         self.pdf_extractor = pdf_extractor or PdfExtractor()
         self.session_generator = session_generator or SessionGenerator()
-        self.optimizer = optimizer or ContentOptimizer()
+        self.image_store = image_store or (optimizer and optimizer.image_store) or ImageStore()
+        self.optimizer = optimizer or ContentOptimizer(image_store=self.image_store)
+        self.body_store = body_store or ContentBodyStore()
     
     def parse_pdf(
         self,
@@ -624,24 +895,119 @@ class ContentParserService:
         Returns:
             Created ContentVersion record
         """
+        with self.open_pdf(pdf_path) as pdf:
+            outline = self.outline(pdf)
+            
+            # Auto-generate ranges if not provided
+            page_ranges = self.plan_ranges(outline, page_ranges)
+            
+            version = self.create_version(parent_node, pdf_path, pdf_name, outline)
+            
+            # Generate, optimize and store one session at a time
+            for position, range_info in enumerate(page_ranges):
+                self.ingest_range(version, parent_node, pdf, range_info, position)
+        
+        return version
+    
+    def open_pdf(self, pdf_path: str) -> PdfStream:
+        """Open a PDF for streaming extraction, raising PdfExtractionError on failure."""
+        return self._extract(self.pdf_extractor.stream, pdf_path)
+    
+    def outline(self, pdf: PdfStream) -> ExtractedContent:
+        """Outline an open PDF, raising PdfExtractionError on failure."""
+        return self._extract(pdf.outline)
+    
+    def _extract(self, func, *args):
+        """Call an extraction function, wrapping its errors in PdfExtractionError."""
         from apps.content.exceptions import PdfExtractionError
         
         try:
-            # Extract content from PDF
-            content = self.pdf_extractor.extract(pdf_path)
+            return func(*args)
         except Exception as e:
             raise PdfExtractionError(f"Failed to extract PDF: {str(e)}")
+    
+    def plan_ranges(
+        self,
+        outline: ExtractedContent,
+        page_ranges: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Resolve the session page ranges of a document.
         
-        # Auto-generate ranges if not provided
+        Args:
+            outline: Outline of the whole document (PdfStream.outline)
+            page_ranges: Requested ranges; detected from headings when None
+            
+        Returns:
+            Ranges with explicit 'start', 'end' and 'title'
+        """
         if page_ranges is None:
-            page_ranges = self.session_generator.auto_generate_ranges(content)
+            page_ranges = self.session_generator.auto_generate_ranges(outline)
+        return [
+            {
+                'start': r.get('start', 1),
+                'end': r.get('end', outline.page_count),
+                'title': r.get('title'),
+            }
+            for r in page_ranges
+        ]
+    
+    def ingest_range(
+        self,
+        version: ContentVersion,
+        parent_node: CurriculumNode,
+        pdf: PdfStream,
+        range_info: Dict[str, Any],
+        position: int
+    ) -> CurriculumNode:
+        """
+        Extract one page range and store it as a rendered session.
+        Only this range's pages and images are in memory while it runs.
+        
+        Args:
+            version: Content version being built
+            parent_node: Parent curriculum node
+            pdf: Open PDF stream
+            range_info: Planned range ('start', 'end', 'title')
+            position: Session position among its siblings
+            
+        Returns:
+            The created session node
+        """
+        content = self._extract(pdf.extract_range, range_info['start'], range_info['end'])
+        try:
+            session = self.session_generator.generate(
+                parent_node, content, [range_info], start_position=position
+            )[0]
+            self.render_session(version, session)
+        finally:
+            pdf.release(content)
+        return session
+    
+    def create_version(
+        self,
+        parent_node: CurriculumNode,
+        pdf_path: str,
+        pdf_name: str,
+        content: ExtractedContent
+    ) -> ContentVersion:
+        """
+        Record the next content version of a node for a parsed PDF.
         
+        Args:
+            parent_node: Parent curriculum node
+            pdf_path: Path to the PDF file
+            pdf_name: Original filename
+            content: Extracted content (or outline) of the whole PDF
+            
+        Returns:
+            Created ContentVersion record
+        """
         # Determine version number
         existing_versions = ContentVersion.objects.filter(node=parent_node)
         next_version = existing_versions.count() + 1
         
-        # Create content version record
-        version = ContentVersion.objects.create(
+        return ContentVersion.objects.create(
             node=parent_node,
             version=next_version,
             source_file_path=pdf_path,
@@ -650,28 +1016,29 @@ class ContentParserService:
             parsed_at=timezone.now(),
             metadata=content.metadata
         )
+    
+    def render_session(self, version: ContentVersion, session: CurriculumNode) -> None:
+        """
+        Optimize a generated session's content, store its HTML and images.
         
-        # Generate sessions
-        sessions = self.session_generator.generate(parent_node, content, page_ranges)
+        Args:
+            version: Content version the session belongs to
+            session: Session node returned by SessionGenerator.generate
+        """
+        session_content = getattr(session, '_session_content', None)
+        if not session_content:
+            return
         
-        # Optimize and store content for each session
-        for session in sessions:
-            session_content = getattr(session, '_session_content', None)
-            if session_content:
-                optimized = self.optimizer.optimize(session_content)
-                html_content = self.optimizer.to_html(optimized)
-                
-                # Paginate if needed
-                chunks = self.optimizer.paginate(html_content)
-                
-                session.properties['content_html'] = chunks[0] if len(chunks) == 1 else chunks
-                session.properties['is_paginated'] = len(chunks) > 1
-                session.save(skip_validation=True)
-                
-                # Store images
-                self._store_images(version, optimized.images)
+        optimized = self.optimizer.optimize(session_content)
         
-        return version
+        # Stream rendered pages straight through the paginator
+        chunks = list(self.optimizer.iter_chunks(self.optimizer.iter_html_pages(optimized)))
+        
+        self.body_store.put(session, chunks[0] if len(chunks) == 1 else chunks)
+        session.save(skip_validation=True)
+        
+        # Store images
+        self._store_images(version, optimized.images)
     
     def edit_content(
         self,
@@ -688,7 +1055,7 @@ class ContentParserService:
         Returns:
             Updated session node
         """
-        session.properties['content_html'] = new_html
+        self.body_store.put(session, new_html)
         session.save(skip_validation=True)
         
         # Mark the content version as manually edited
@@ -771,21 +1138,38 @@ class ContentParserService:
         version: ContentVersion,
         images: List[Dict[str, Any]]
     ) -> List[ParsedImage]:
-        """Store extracted images in the database."""
-        stored = []
+        """
+        Write images to the content-addressed store and record them for a version.
+        Images already in the store reuse their files; each new key is written
+        once even if it appears on several pages.
+        """
+        assets = {}
+        rows = []
         
         for img in images:
-            # In a real implementation, we'd save the image to storage
-            # and store the paths. For now, we just record metadata.
-            parsed_image = ParsedImage.objects.create(
+            key = img.get('key')
+            if key is None:
+                continue
+            
+            if img.get('asset_id'):
+                asset_id = img['asset_id']
+                original_path, optimized_path = img['original_path'], img['optimized_path']
+            else:
+                if key not in assets:
+                    assets[key] = self.image_store.put(img, self.optimizer.fingerprint)
+                asset = assets[key]
+                asset_id = asset.id
+                original_path, optimized_path = asset.original_path, asset.optimized_path
+            
+            rows.append(ParsedImage(
                 content_version=version,
-                original_path=f"content/{version.id}/original_{img['page']}_{img.get('index', 0)}.{img.get('ext', 'jpg')}",
-                optimized_path=f"content/{version.id}/optimized_{img['page']}_{img.get('index', 0)}.jpeg",
+                asset_id=asset_id,
+                original_path=original_path,
+                optimized_path=optimized_path,
                 page_number=img['page'],
                 width=img.get('width'),
                 height=img.get('height'),
                 file_size=img.get('optimized_size') or img.get('original_size')
-            )
-            stored.append(parsed_image)
+            ))
         
-        return stored
+        return ParsedImage.objects.bulk_create(rows)
@@ -20,4 +20,10 @@ urlpatterns = [
     
     # Reorder blocks (POST)
     path('blocks/reorder/', views.content_blocks_reorder, name='blocks.reorder'),
+    
+    # Queue a PDF for background parsing (POST)
+    path('pdf-ingest/', views.content_pdf_ingest, name='pdf_ingest'),
+    
+    # Ingestion job progress (GET)
+    path('pdf-ingest/<int:pk>/', views.content_pdf_ingest_status, name='pdf_ingest.status'),
 ]
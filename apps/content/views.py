@@ -1,4 +1,9 @@
 """Content app views - JSON endpoints for Course Builder."""
+import json
+import os
+import uuid
+
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
@@ -6,7 +11,8 @@ from django.shortcuts import get_object_or_404, redirect
 from django.views.decorators.http import require_POST
 from django.core.exceptions import PermissionDenied
 
-from .models import ContentBlock
+from .ingestion_service import PdfIngestionService
+from .models import ContentBlock, PdfIngestionJob
 from apps.curriculum.models import CurriculumNode
 from apps.core.utils import get_post_data, is_instructor, get_instructor_program_ids
 
@@ -184,3 +190,82 @@ def content_blocks_reorder(request):
         ContentBlock.objects.bulk_update(updated, ['position'])
     
     return JsonResponse({'status': 'reordered'})
+
+
+@login_required
+@require_POST
+def content_pdf_ingest(request):
+    """
+    Upload a PDF to be parsed into sessions in the background.
+    POST (multipart): node_id, file, optional page_ranges (JSON list)
+    Returns 202 with the queued job; poll content_pdf_ingest_status for progress.
+    """
+    node_id = request.POST.get('node_id')
+    pdf_file = request.FILES.get('file')
+
+    if not node_id:
+        return JsonResponse({'error': 'Node ID required'}, status=400)
+    if not pdf_file:
+        return JsonResponse({'error': 'PDF file required'}, status=400)
+    if not pdf_file.name.lower().endswith('.pdf'):
+        return JsonResponse({'error': 'Only PDF files are supported'}, status=400)
+
+    page_ranges = None
+    if request.POST.get('page_ranges'):
+        try:
+            page_ranges = json.loads(request.POST['page_ranges'])
+        except ValueError:
+            return JsonResponse({'error': 'Invalid page ranges'}, status=400)
+        if not isinstance(page_ranges, list) or not all(isinstance(r, dict) for r in page_ranges):
+            return JsonResponse({'error': 'Invalid page ranges'}, status=400)
+
+    # Authorization
+    if not is_instructor(request.user):
+        return JsonResponse({'error': 'Permission denied'}, status=403)
+
+    program_ids = get_instructor_program_ids(request.user)
+    node = get_object_or_404(CurriculumNode, pk=node_id)
+
+    if node.program_id not in program_ids:
+        return JsonResponse({'error': 'Permission denied'}, status=403)
+
+    upload_dir = os.path.join(settings.MEDIA_ROOT, 'content', 'uploads', str(node.id))
+    os.makedirs(upload_dir, exist_ok=True)
+    pdf_path = os.path.join(upload_dir, f"{uuid.uuid4().hex}.pdf")
+    with open(pdf_path, 'wb+') as destination:
+        for chunk in pdf_file.chunks():
+            destination.write(chunk)
+
+    job = PdfIngestionService().enqueue(
+        node, pdf_path, pdf_file.name, page_ranges=page_ranges, user=request.user
+    )
+
+    return JsonResponse({'id': job.id, 'status': job.status}, status=202)
+
+
+@login_required
+def content_pdf_ingest_status(request, pk: int):
+    """
+    Progress of a PDF ingestion job.
+    Returns JSON for Course Builder polling.
+    """
+    # Authorization
+    if not is_instructor(request.user):
+        return JsonResponse({'error': 'Permission denied'}, status=403)
+
+    job = get_object_or_404(PdfIngestionJob.objects.select_related('node'), pk=pk)
+    program_ids = get_instructor_program_ids(request.user)
+
+    if job.node.program_id not in program_ids:
+        return JsonResponse({'error': 'Permission denied'}, status=403)
+
+    return JsonResponse({
+        'id': job.id,
+        'status': job.status,
+        'fileName': job.source_file_name,
+        'pageCount': job.page_count,
+        'progress': job.progress,
+        'ranges': job.ranges,
+        'contentVersion': job.content_version_id,
+        'error': job.error,
+    })
@@ -0,0 +1,117 @@
+"""
+Conditional responses - ETag revalidation for Inertia pages.
+"""
+import hashlib
+from functools import wraps
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.contrib import messages
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+
+# Request headers that select a different rendering of the same URL
+INERTIA_HEADERS = (
+    "X-Inertia",
+    "X-Inertia-Version",
+    "X-Inertia-Partial-Data",
+    "X-Inertia-Partial-Component",
+)
+
+
+def shared_props_version(request) -> tuple:
+    """
+    Version of the props every page shares (see InertiaShareMiddleware).
+    Built from the loaded user and values read from the database, never
+    from cache stamps, so every process agrees on it: the platform settings
+    revision and, for signed-in users, their latest notification id (which
+    the unread count alone cannot tell apart from a read-then-received
+    pair) and the latest broadcast id.
+    """
+    from django.db.models import Max
+
+    from apps.notifications.models import Notification, NotificationBroadcast
+    from apps.notifications.services import NotificationService
+    from apps.platform.models import PlatformSettings
+
+    from .utils import get_user_access
+
+    user = request.user
+    user_part = None
+    if user.is_authenticated:
+        latest = (
+            Notification.objects.filter(recipient=user)
+            .order_by("-id")
+            .values_list("id", flat=True)
+            .first()
+        )
+        user_part = (
+            user.id,
+            user.email,
+            user.first_name,
+            user.last_name,
+            get_user_access(user).role,
+            NotificationService.get_unread_count(user),
+            latest,
+            NotificationBroadcast.objects.aggregate(latest=Max("id"))["latest"],
+        )
+
+    return (
+        user_part,
+        PlatformSettings.get_revision(),
+        # The page embeds a token for this secret; a rotated secret needs a new one
+        request.META.get("CSRF_COOKIE"),
+        getattr(settings, "INERTIA_VERSION", None),
+    )
+
+
+def page_etag(request, version) -> str:
+    """Strong ETag for a page version as rendered for this request."""
+    parts = (
+        version,
+        request.get_full_path(),
+        tuple(request.headers.get(header) for header in INERTIA_HEADERS),
+        shared_props_version(request),
+    )
+    return '"%s"' % hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+
+
+def conditional_page(version_key: Callable[..., Optional[tuple]]):
+    """
+    Answer repeat GETs of an Inertia page with 304 Not Modified.
+
+    version_key(request, *args, **kwargs) is called with the view's
+    arguments and returns a cheap tuple that changes whenever the page's
+    own props would. The ETag hashes it with the URL, the Inertia request
+    headers and the shared props, so a matching If-None-Match skips the
+    view entirely. Returning None (e.g. for an object the view would 404
+    on) renders without validators, as do non-GET requests and requests
+    with pending flash messages.
+
+    Responses are private and must be revalidated, and vary on Cookie and
+    the Inertia headers so browsers keep the HTML and JSON renderings apart.
+    Place it inside @login_required.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(request, *args, **kwargs)
+            # Flash messages are shared once and consumed by this response
+            if len(messages.get_messages(request)):
+                return view(request, *args, **kwargs)
+            version = version_key(request, *args, **kwargs)
+            if version is None:
+                return view(request, *args, **kwargs)
+
+            etag = page_etag(request, version)
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+            response.setdefault("ETag", etag)
+            patch_vary_headers(response, ("Cookie",) + INERTIA_HEADERS)
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return wrapper
+    return decorator
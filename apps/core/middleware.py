@@ -9,6 +9,7 @@ from inertia import share
 
 from apps.platform.models import PlatformSettings
 from apps.notifications.services import NotificationService
+from apps.core.utils import get_user_access
 
 
 
@@ -43,7 +44,7 @@ class InertiaShareMiddleware:
                         "firstName": request.user.first_name,
                         "lastName": request.user.last_name,
                         "fullName": request.user.get_full_name() or request.user.email,
-                        "role": self._get_user_role(request.user),
+                        "role": get_user_access(request.user).role,
                     },
                 },
             )
@@ -54,7 +55,7 @@ class InertiaShareMiddleware:
                 request,
                 notifications=lambda: {
                     "unread_count": NotificationService.get_unread_count(user),
-                    "items": NotificationService.get_recent(user, limit=10),
+                    "items": NotificationService.get_recent(user),
                 },
             )
         else:
@@ -63,7 +64,7 @@ class InertiaShareMiddleware:
 
         # Share platform branding from PlatformSettings
         try:
-            settings = PlatformSettings.get_settings()
+            settings = PlatformSettings.get_cached()
             # Get features with defaults from deployment mode
             features = settings.get_default_features_for_mode()
             if settings.features:
@@ -99,18 +100,3 @@ class InertiaShareMiddleware:
         share(request, flash=flash_messages)
 
         return self.get_response(request)
-
-    def _get_user_role(self, user) -> str:
-        """
-        Determine user role for dashboard redirect.
-
-        Returns: 'student', 'instructor', 'admin', or 'superadmin'
-        """
-        if user.is_superuser:
-            return "superadmin"
-        if user.is_staff:
-            return "admin"
-        # Check for instructor role (could be in groups or a field)
-        if hasattr(user, "groups") and user.groups.filter(name="Instructors").exists():
-            return "instructor"
-        return "student"
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_alter_program_level'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='program',
+            name='curriculum_revision',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
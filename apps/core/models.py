@@ -19,6 +19,55 @@ class TimeStampedModel(models.Model):
         abstract = True
 
 
+class DatabaseRevisionMixin:
+    """
+    For models with a revision column advanced in the database with F()
+    updates. Saving an existing row writes every other field, so an
+    instance loaded before the revision advanced never writes it back.
+    Set revision_field to the column's name.
+    """
+
+    revision_field = None
+
+    def save(self, *args, **kwargs):
+        if (
+            not self._state.adding
+            and not kwargs.get("force_insert")
+            and kwargs.get("update_fields") is None
+        ):
+            kwargs["update_fields"] = [
+                f.name
+                for f in self._meta.concrete_fields
+                if not f.primary_key and f.name != self.revision_field
+            ]
+        super().save(*args, **kwargs)
+
+
+class QueuedJob(TimeStampedModel):
+    """
+    An abstract base class model for background jobs processed by a
+    JobQueue (apps.core.services.job_queue). Workers claim a job by
+    setting it running and incrementing attempts; heartbeat_at shows
+    the claim is alive, so a job whose worker died can be claimed again.
+    """
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    ]
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        abstract = True
+
+
 class User(AbstractUser):
     """Custom User model for LMS."""
 
@@ -101,7 +150,7 @@ class InstructorCertification(models.Model):
         return f"{self.file_name} for {self.profile.user.email}"
 
 
-class Program(TimeStampedModel):
+class Program(DatabaseRevisionMixin, TimeStampedModel):
     """
     Program model - represents an academic program/course.
     Links to AcademicBlueprint for structure configuration.
@@ -175,6 +224,11 @@ class Program(TimeStampedModel):
     what_you_learn = models.JSONField(
         default=list, blank=True, help_text="List of learning outcomes"
     )
+    # Advanced in the database whenever a curriculum node changes
+    # (CurriculumGraphService.invalidate); derived data records the revision
+    # it was computed against
+    curriculum_revision = models.PositiveIntegerField(default=1, editable=False)
+    revision_field = "curriculum_revision"
 
     class Meta:
         db_table = "programs"
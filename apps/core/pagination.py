@@ -0,0 +1,44 @@
+"""
+Keyset pagination cursors - Opaque encodings of a page's last sort key.
+"""
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, Callable, Tuple
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the sort key of a page's last row as an opaque cursor.
+    Datetimes are written in ISO format and booleans as 0 or 1.
+    """
+    parts = []
+    for value in values:
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, bool):
+            value = int(value)
+        parts.append(str(value))
+    return base64.urlsafe_b64encode('|'.join(parts).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, *parsers: Callable[[str], Any]) -> Tuple:
+    """
+    Parse a cursor made by encode_cursor, one parser per value.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        parts = raw.split('|')
+        if len(parts) != len(parsers):
+            raise ValueError(f'Expected {len(parsers)} values')
+        return tuple(parse(part) for parse, part in zip(parsers, parts))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f'Invalid cursor: {cursor}') from e
+
+
+def parse_flag(value: str) -> bool:
+    """Parser for a boolean written by encode_cursor."""
+    return bool(int(value))
@@ -0,0 +1,224 @@
+"""
+Public program catalog - Precomputed snapshot of published programs.
+"""
+import hashlib
+import re
+from typing import Optional
+
+from django.core.cache import cache
+from django.db.models import Count, Max, Sum
+
+from apps.core.models import Program
+
+# (version, snapshot) of the last catalog this process loaded
+_catalog_snapshot = (None, None)
+
+
+def group_programs_by_level(
+    programs: list, course_levels: list, level_key: str = "level"
+) -> list:
+    """
+    Group program dictionaries by configured course level values.
+
+    Returns ordered groups using course_levels order with a fallback group for unknown levels.
+    """
+    level_map = {}
+    ordered_values = []
+    for level in course_levels or []:
+        value = (level or {}).get("value")
+        label = (level or {}).get("label")
+        if value:
+            level_map[value] = label or value
+            ordered_values.append(value)
+
+    groups = []
+    grouped = {value: [] for value in ordered_values}
+    unknown = []
+
+    for program in programs:
+        level_value = (program or {}).get(level_key) or ""
+        if level_value in grouped:
+            grouped[level_value].append(program)
+        else:
+            unknown.append(program)
+
+    for value in ordered_values:
+        groups.append(
+            {
+                "value": value,
+                "label": level_map.get(value, value),
+                "programs": grouped[value],
+            }
+        )
+
+    if unknown:
+        groups.append(
+            {"value": "unassigned", "label": "Unassigned", "programs": unknown}
+        )
+
+    return groups
+
+
+class ProgramCatalogService:
+    """
+    Serves the public catalog from a snapshot built once per version.
+    The snapshot holds the program cards (with lecture counts), categories,
+    course levels, the unfiltered level groups and a prefix index over the
+    words of name, description and category. Its version is read from the
+    database: the programs' count, latest updated_at and summed
+    curriculum_revision (advanced by every node change), and the platform
+    settings' updated_at, so course level edits regroup it. Only committed
+    changes are visible to other processes, so no invalidation is needed.
+    Warm requests cost the two version queries.
+    """
+
+    CACHE_TIMEOUT = 60 * 60 * 24
+    SNAPSHOT_KEY = "program_catalog:{version}"
+
+    # Relevance of a search term found in each field
+    FIELD_WEIGHTS = (("name", 3), ("category", 2), ("description", 1))
+
+    @classmethod
+    def get_snapshot(cls) -> dict:
+        """Get the current catalog snapshot, building it on a miss."""
+        global _catalog_snapshot
+        from apps.platform.models import PlatformSettings
+
+        version = cls.get_version()
+        snapshot_version, snapshot = _catalog_snapshot
+        if snapshot_version == version:
+            return snapshot
+
+        key = cls.SNAPSHOT_KEY.format(version=version)
+        snapshot = cache.get(key)
+        if snapshot is None:
+            platform_settings, created = PlatformSettings.objects.get_or_create(pk=1)
+            if created:
+                # The new settings row is part of the version
+                version = cls.get_version()
+                key = cls.SNAPSHOT_KEY.format(version=version)
+            snapshot = cls.build(platform_settings.get_course_levels())
+            cache.set(key, snapshot, cls.CACHE_TIMEOUT)
+        _catalog_snapshot = (version, snapshot)
+        return snapshot
+
+    @classmethod
+    def build(cls, course_levels: list) -> dict:
+        """Build a snapshot from the database: two queries."""
+        from apps.curriculum.models import CurriculumNode
+
+        programs = list(Program.objects.filter(is_published=True).order_by("name"))
+        lecture_counts = dict(
+            CurriculumNode.objects.filter(
+                program__is_published=True,
+                is_published=True,
+                node_type="lesson",
+                children__isnull=True,
+            )
+            .values("program_id")
+            .annotate(count=Count("id"))
+            .values_list("program_id", "count")
+        )
+
+        cards = [cls._card(p, lecture_counts.get(p.id, 0)) for p in programs]
+        # Every prefix of every word, so a search word is one dict lookup
+        index = {}
+        for card in cards:
+            for field, weight in cls.FIELD_WEIGHTS:
+                for token in cls.tokenize(card[field]):
+                    for end in range(1, len(token) + 1):
+                        weights = index.setdefault(token[:end], {})
+                        weights[card["id"]] = max(weights.get(card["id"], 0), weight)
+
+        return {
+            "programs": cards,
+            "categories": sorted({card["category"] for card in cards if card["category"]}),
+            "courseLevels": course_levels,
+            "groupedPrograms": group_programs_by_level(cards, course_levels),
+            "index": index,
+        }
+
+    @classmethod
+    def query(cls, search: str = "", category: str = "", level: str = "") -> dict:
+        """
+        Filter the catalog snapshot.
+
+        Args:
+            search: Words to match against name, description and category;
+                each word must prefix-match a word of the program
+            category: Case-insensitive category to keep
+            level: Level value to keep
+
+        Returns:
+            Dict with programs (by relevance when searching, else by name),
+            groupedPrograms, courseLevels and categories
+        """
+        snapshot = cls.get_snapshot()
+        if not (search or category or level):
+            return snapshot
+
+        programs = snapshot["programs"]
+        if search:
+            scores = cls._search(snapshot["index"], search)
+            programs = sorted(
+                (card for card in programs if card["id"] in scores),
+                key=lambda card: -scores[card["id"]],
+            )
+        if category:
+            programs = [card for card in programs if card["category"].lower() == category.lower()]
+        if level:
+            programs = [card for card in programs if card["level"] == level]
+
+        return {
+            **snapshot,
+            "programs": programs,
+            "groupedPrograms": group_programs_by_level(programs, snapshot["courseLevels"]),
+        }
+
+    @classmethod
+    def _search(cls, index: dict, search: str) -> dict:
+        """Score program ids matching every search word."""
+        scores: Optional[dict] = None
+        for term in cls.tokenize(search):
+            term_scores = index.get(term, {})
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {pk: score + term_scores[pk] for pk, score in scores.items() if pk in term_scores}
+        return scores or {}
+
+    @staticmethod
+    def tokenize(text: str) -> list:
+        return re.findall(r"\w+", (text or "").lower())
+
+    @staticmethod
+    def _card(program: Program, lecture_count: int) -> dict:
+        price_data = program.custom_pricing or {}
+        return {
+            "id": program.id,
+            "name": program.name,
+            "code": program.code or "",
+            "description": program.description or "",
+            "created_at": program.created_at.isoformat(),
+            "thumbnail": program.thumbnail.url if program.thumbnail else None,
+            "category": program.category or "",
+            "level": program.level or "beginner",
+            "badge_type": program.badge_type,
+            "duration_hours": program.duration_hours,
+            "video_hours": program.video_hours,
+            "lecture_count": lecture_count,
+            "price": price_data.get("price", 0),
+            "original_price": price_data.get("original_price"),
+            "rating": 4.5,  # TODO: Calculate from reviews when implemented
+        }
+
+    @classmethod
+    def get_version(cls) -> str:
+        """Get the current catalog version from the database: two queries."""
+        from apps.platform.models import PlatformSettings
+
+        programs = Program.objects.aggregate(
+            count=Count("id"), updated=Max("updated_at"), revisions=Sum("curriculum_revision")
+        )
+        parts = (programs["count"], programs["updated"], programs["revisions"], PlatformSettings.get_revision())
+        return hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
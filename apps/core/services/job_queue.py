@@ -0,0 +1,204 @@
+"""
+Job queue - Durable background queues backed by QueuedJob rows.
+"""
+import threading
+from datetime import timedelta
+from typing import List, Optional, Sequence, Type
+
+from django.db import DatabaseError, OperationalError, connection
+from django.db.models import F, Q, QuerySet
+from django.utils import timezone
+
+from apps.core.models import QueuedJob
+
+
+class JobLost(Exception):
+    """The job was reclaimed by another worker while this one processed it."""
+
+
+class Heartbeat:
+    """
+    Refreshes heartbeat_at of claimed jobs from a daemon thread while a
+    worker processes them. The thread has its own database connection, so
+    beats commit even while the worker holds a long transaction open.
+    Beats stop once none of the jobs is owned by this worker any more.
+    """
+
+    def __init__(self, queue: "JobQueue", jobs: Sequence[QueuedJob]):
+        self.queue = queue
+        self.jobs = list(jobs)
+        self.interval = queue.HEARTBEAT_INTERVAL.total_seconds()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="job-heartbeat", daemon=True)
+
+    def __enter__(self) -> "Heartbeat":
+        if self.jobs:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self) -> None:
+        try:
+            while not self._stopped.wait(self.interval):
+                try:
+                    if not self.queue.owned(*self.jobs).update(heartbeat_at=timezone.now()):
+                        return
+                except DatabaseError:
+                    # Try again on the next beat; a job only goes stale after several misses
+                    connection.close()
+        finally:
+            connection.close()
+
+
+class JobQueue:
+    """
+    Base class for durable queues of QueuedJob rows.
+
+    Workers claim jobs with conditional UPDATEs, so concurrent workers never
+    run the same job, and a Heartbeat keeps the claims fresh while a batch
+    is processed. A running job whose heartbeat is older than STALE_AFTER
+    is claimed again. Each claim increments attempts, which identifies it:
+    progress and outcomes are only written while the claim is still the
+    job's latest, so a worker that stalled past STALE_AFTER cannot overwrite
+    the new owner's work.
+
+    Subclasses set model and implement run(), which does the job's work
+    and finishes with _complete(). Work committed in steps should call
+    lock_owned() inside each step's transaction before committing it.
+    """
+
+    model: Type[QueuedJob] = None
+    # A running job whose heartbeat is older than this is considered crashed
+    STALE_AFTER = timedelta(minutes=10)
+    HEARTBEAT_INTERVAL = timedelta(minutes=1)
+    MAX_ATTEMPTS = 3
+    BATCH_SIZE = 10
+    # Relations loaded with claimed jobs
+    CLAIM_RELATED: Sequence[str] = ()
+
+    def claim_batch(self, limit: Optional[int] = None) -> List[QueuedJob]:
+        """
+        Claim up to limit pending jobs, or running jobs whose worker died.
+        Jobs claimed more than MAX_ATTEMPTS times are failed instead.
+
+        Returns:
+            The claimed jobs, oldest first
+        """
+        limit = limit or self.BATCH_SIZE
+        now = timezone.now()
+        claimable = self.model.objects.filter(
+            Q(status="pending") | Q(status="running", heartbeat_at__lt=now - self.STALE_AFTER)
+        ).order_by("created_at", "id").values_list("pk", "status", "heartbeat_at", "attempts")
+
+        claimed = []
+        # Look past the limit so jobs lost to another worker or given up on leave room for others
+        for pk, status, heartbeat_at, attempts in claimable[:limit * 2]:
+            if len(claimed) == limit:
+                break
+            if not self.model.objects.filter(pk=pk, status=status, heartbeat_at=heartbeat_at).update(
+                status="running",
+                heartbeat_at=now,
+                attempts=F("attempts") + 1,
+                **self.claim_updates(now),
+            ):
+                continue
+            if attempts >= self.MAX_ATTEMPTS:
+                self.model.objects.filter(pk=pk, status="running", attempts=attempts + 1).update(
+                    status="failed",
+                    error=f"Gave up after {self.MAX_ATTEMPTS} attempts",
+                    finished_at=now,
+                    updated_at=now,
+                )
+                continue
+            claimed.append(pk)
+
+        jobs = self.model.objects.filter(pk__in=claimed).order_by("created_at", "id")
+        if self.CLAIM_RELATED:
+            jobs = jobs.select_related(*self.CLAIM_RELATED)
+        return list(jobs)
+
+    def claim_updates(self, now) -> dict:
+        """Extra fields set when a job is claimed."""
+        return {}
+
+    def owned(self, *jobs: QueuedJob) -> QuerySet:
+        """Rows of the given jobs that are still running under these claims."""
+        if not jobs:
+            return self.model.objects.none()
+        claims = Q()
+        for job in jobs:
+            claims |= Q(pk=job.pk, attempts=job.attempts)
+        return self.model.objects.filter(claims, status="running")
+
+    def lock_owned(self, job: QueuedJob) -> None:
+        """
+        Lock the job row for the rest of the current transaction, or raise
+        JobLost so the transaction rolls back if the job was reclaimed.
+        Call it last, right before the step commits, so the lock is short.
+        """
+        if self.owned(job).select_for_update().values_list("pk", flat=True).first() is None:
+            raise JobLost(job.pk)
+
+    def process_batch(self, jobs: List[QueuedJob]) -> List[QueuedJob]:
+        """
+        Run a batch of claimed jobs one after another under one heartbeat.
+
+        Returns:
+            The jobs: completed, failed, back to pending after a database
+            error, or as left by the worker that reclaimed them
+        """
+        with Heartbeat(self, jobs):
+            for job in jobs:
+                self._process(job)
+        return jobs
+
+    def process(self, job: QueuedJob) -> QueuedJob:
+        """Run one claimed job; see process_batch()."""
+        return self.process_batch([job])[0]
+
+    def run(self, job: QueuedJob) -> None:
+        """Do the job's work and finish it with _complete()."""
+        raise NotImplementedError
+
+    def _process(self, job: QueuedJob) -> None:
+        try:
+            self.run(job)
+        except JobLost:
+            # The new owner carries on from the last committed step
+            job.refresh_from_db()
+        except OperationalError as e:
+            # Transient database trouble (lock timeouts, dropped connections):
+            # requeue so the job resumes at its first unfinished step
+            self._give_up(job, str(e), retry=job.attempts < self.MAX_ATTEMPTS)
+        except Exception as e:
+            self._give_up(job, str(e), retry=False)
+
+    def _give_up(self, job: QueuedJob, error: str, retry: bool) -> None:
+        try:
+            if retry:
+                self._release(job, error)
+            else:
+                self._fail(job, error)
+        except JobLost:
+            job.refresh_from_db()
+
+    def _finish(self, job: QueuedJob, **fields) -> None:
+        """Write the job's fields if this worker still owns it, else raise JobLost."""
+        fields["updated_at"] = timezone.now()
+        if not self.owned(job).update(**fields):
+            raise JobLost(job.pk)
+        for name, value in fields.items():
+            setattr(job, name, value)
+
+    def _complete(self, job: QueuedJob, **fields) -> None:
+        self._finish(job, status="completed", error="", finished_at=timezone.now(), **fields)
+
+    def _release(self, job: QueuedJob, error: str) -> None:
+        self._finish(job, status="pending", error=error)
+
+    def _fail(self, job: QueuedJob, error: str) -> None:
+        self._finish(job, status="failed", error=error, finished_at=timezone.now())
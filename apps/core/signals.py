@@ -0,0 +1,26 @@
+"""
+Core signals - Memoized user access invalidation.
+"""
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from apps.progression.models import InstructorAssignment
+from .models import User
+from .utils import get_user_access
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def on_user_groups_changed(sender, instance, reverse, **kwargs):
+    """Group membership feeds the memoized role."""
+    if not reverse:
+        get_user_access(instance).clear()
+
+
+@receiver(post_save, sender=InstructorAssignment)
+@receiver(post_delete, sender=InstructorAssignment)
+def on_instructor_assignment_changed(sender, instance, **kwargs):
+    """Assignments feed the memoized program ids of the instructor object at hand."""
+    field = InstructorAssignment._meta.get_field("instructor")
+    instructor = field.get_cached_value(instance, default=None)
+    if instructor is not None:
+        get_user_access(instructor).clear()
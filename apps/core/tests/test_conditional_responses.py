@@ -0,0 +1,167 @@
+"""
+Tests for ETag revalidation of public and course player pages.
+Tests 304 handling, Vary headers and the version keys of each page.
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.core.models import Program, User
+from apps.curriculum.models import CurriculumNode
+from apps.events.models import Event, EventRegistration
+from apps.platform.models import PlatformSettings
+from apps.progression.models import Enrollment, NodeCompletion
+
+
+@pytest.fixture
+def program(db):
+    return Program.objects.create(
+        name="Cached Course", code="ETAG-1", is_published=True, category="Science"
+    )
+
+
+@pytest.fixture
+def student(client):
+    user = User.objects.create_user(username="etag", email="etag@example.com", password="x")
+    client.force_login(user)
+    return user
+
+
+def _get(client, url, etag=None, **headers):
+    if etag:
+        headers["HTTP_IF_NONE_MATCH"] = etag
+    return client.get(url, HTTP_X_INERTIA="true", **headers)
+
+
+@pytest.mark.django_db
+class TestConditionalPages:
+
+    def test_repeat_request_is_not_modified(self, client, program):
+        first = _get(client, "/programs/")
+        assert first.status_code == 200
+        assert "ETag" in first
+
+        repeat = _get(client, "/programs/", first["ETag"])
+        assert repeat.status_code == 304
+        assert repeat.content == b""
+        assert repeat["ETag"] == first["ETag"]
+        for header in ("Cookie", "X-Inertia", "X-Inertia-Partial-Data"):
+            assert header in repeat["Vary"]
+        assert "private" in repeat["Cache-Control"]
+
+    def test_program_edit_changes_etag(self, client, program):
+        etag = _get(client, "/programs/")["ETag"]
+        program.description = "Now with labs."
+        program.save()
+        response = _get(client, "/programs/", etag)
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+
+    def test_etag_does_not_depend_on_the_cache(self, client, program, student):
+        url = f"/programs/{program.id}/"
+        etag = _get(client, url)["ETag"]
+        cache.clear()
+        assert _get(client, url, etag).status_code == 304
+
+    def test_platform_settings_edit_changes_etag(self, client, program):
+        etag = _get(client, "/programs/")["ETag"]
+        platform_settings = PlatformSettings.get_settings()
+        platform_settings.institution_name = "Renamed Institute"
+        platform_settings.save()
+        assert _get(client, "/programs/", etag).status_code == 200
+
+    def test_curriculum_change_changes_program_detail(self, client, program):
+        url = f"/programs/{program.id}/"
+        etag = _get(client, url)["ETag"]
+        CurriculumNode.objects.create(
+            program=program, node_type="Session", title="New", position=0, is_published=True
+        )
+        assert _get(client, url, etag).status_code == 200
+
+    def test_rendering_headers_and_query_change_etag(self, client, program):
+        etag = _get(client, "/programs/")["ETag"]
+        partial = _get(
+            client, "/programs/", etag,
+            HTTP_X_INERTIA_PARTIAL_DATA="programs",
+            HTTP_X_INERTIA_PARTIAL_COMPONENT="Public/Programs",
+        )
+        assert partial.status_code == 200
+        assert _get(client, "/programs/?search=course", etag).status_code == 200
+
+    def test_enrollment_changes_program_detail(self, client, program, student):
+        url = f"/programs/{program.id}/"
+        etag = _get(client, url)["ETag"]
+        assert _get(client, url, etag).status_code == 304
+
+        Enrollment.objects.create(user=student, program=program, status="active")
+        response = _get(client, url, etag)
+        assert response.status_code == 200
+        assert response.json()["props"]["enrollmentStatus"] == "enrolled"
+
+    def test_unpublished_program_is_not_validated(self, client, program):
+        program.is_published = False
+        program.save()
+        assert _get(client, f"/programs/{program.id}/").status_code == 404
+
+    def test_event_registration_changes_etag(self, client, student):
+        now = timezone.now()
+        event = Event.objects.create(
+            title="Open Day", start_datetime=now, end_datetime=now + timedelta(hours=2),
+            location="Campus", is_published=True,
+        )
+        url = f"/events/{event.slug}/"
+        etag = _get(client, url)["ETag"]
+        assert _get(client, url, etag).status_code == 304
+
+        EventRegistration.objects.create(event=event, user=student)
+        assert _get(client, url, etag).status_code == 200
+
+
+@pytest.mark.django_db
+class TestCoursePlayer:
+
+    @pytest.fixture
+    def session(self, program, student):
+        enrollment = Enrollment.objects.create(user=student, program=program, status="active")
+        node = CurriculumNode.objects.create(
+            program=program, node_type="Session", title="Intro", position=0, is_published=True
+        )
+        CurriculumNode.objects.create(
+            program=program, node_type="Session", title="Later", position=1,
+            is_published=True, unlock_after_days=3,
+        )
+        return enrollment, node
+
+    def test_completion_changes_etag(self, client, session):
+        enrollment, node = session
+        url = f"/student/programs/{enrollment.id}/session/{node.id}/"
+        etag = _get(client, url)["ETag"]
+        assert _get(client, url, etag).status_code == 304
+
+        NodeCompletion.objects.create(
+            enrollment=enrollment, node=node, completion_type="view", completed_at=timezone.now()
+        )
+        response = _get(client, url, etag)
+        assert response.status_code == 200
+        assert response.json()["props"]["isCompleted"]
+
+    def test_drip_unlock_changes_etag(self, client, session):
+        enrollment, node = session
+        url = f"/student/programs/{enrollment.id}/session/{node.id}/"
+        etag = _get(client, url)["ETag"]
+
+        Enrollment.objects.filter(pk=enrollment.pk).update(
+            created_at=timezone.now() - timedelta(days=3, minutes=1)
+        )
+        assert _get(client, url, etag).status_code == 200
+
+    def test_other_students_enrollment_is_not_validated(self, client, session):
+        enrollment, node = session
+        outsider = User.objects.create_user(username="other", email="other@example.com")
+        client.force_login(outsider)
+        response = client.get(f"/student/programs/{enrollment.id}/session/{node.id}/")
+        assert response.status_code == 404
+        assert "ETag" not in response
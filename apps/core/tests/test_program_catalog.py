@@ -0,0 +1,120 @@
+"""
+Tests for the precomputed public program catalog.
+Tests snapshot reuse, database versioning, search and the per-user overlay.
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.core.models import Program, User
+from apps.core.services.catalog import ProgramCatalogService
+from apps.curriculum.models import CurriculumNode
+from apps.platform.models import PlatformSettings
+from apps.progression.models import Enrollment
+
+
+@pytest.fixture
+def programs(db):
+    return [
+        Program.objects.create(
+            name="Python Fundamentals", code="CAT-1", is_published=True, level="beginner",
+            category="Programming", description="Variables, loops and functions.",
+        ),
+        Program.objects.create(
+            name="Data Analysis", code="CAT-2", is_published=True, level="intermediate",
+            category="Data Science", description="Pandas and Python notebooks.",
+        ),
+        Program.objects.create(
+            name="Draft Course", code="CAT-3", is_published=False, level="beginner",
+            category="Programming",
+        ),
+    ]
+
+
+def _catalog(client, **params):
+    response = client.get("/programs/", params, HTTP_X_INERTIA="true")
+    return response.json()["props"]
+
+
+@pytest.mark.django_db
+class TestCatalogSnapshot:
+
+    def test_warm_snapshot_only_reads_version(self, programs):
+        ProgramCatalogService.get_snapshot()
+        with CaptureQueriesContext(connection) as ctx:
+            catalog = ProgramCatalogService.query(search="python")
+        # The programs aggregate and the platform settings revision
+        assert len(ctx.captured_queries) == 2
+        assert [p["name"] for p in catalog["programs"]] == ["Python Fundamentals", "Data Analysis"]
+
+    def test_fresh_install_snapshot_stays_warm(self, programs):
+        PlatformSettings.objects.all().delete()
+        ProgramCatalogService.get_snapshot()
+        assert PlatformSettings.objects.exists()
+        with CaptureQueriesContext(connection) as ctx:
+            ProgramCatalogService.get_snapshot()
+        assert len(ctx.captured_queries) == 2
+
+    def test_snapshot_contents(self, programs):
+        snapshot = ProgramCatalogService.get_snapshot()
+        assert [p["name"] for p in snapshot["programs"]] == ["Data Analysis", "Python Fundamentals"]
+        assert snapshot["categories"] == ["Data Science", "Programming"]
+        grouped = {g["value"]: [p["id"] for p in g["programs"]] for g in snapshot["groupedPrograms"]}
+        assert grouped["beginner"] == [programs[0].id]
+
+    def test_publishing_invalidates(self, programs):
+        ProgramCatalogService.get_snapshot()
+        programs[2].is_published = True
+        programs[2].save()
+        assert len(ProgramCatalogService.get_snapshot()["programs"]) == 3
+
+    def test_published_lesson_updates_lecture_count(self, programs):
+        ProgramCatalogService.get_snapshot()
+        CurriculumNode.objects.create(
+            program=programs[0], node_type="lesson", title="Intro", position=0, is_published=True
+        )
+        card = next(p for p in ProgramCatalogService.get_snapshot()["programs"] if p["id"] == programs[0].id)
+        assert card["lecture_count"] == 1
+
+    def test_change_without_signals_is_seen(self, programs):
+        ProgramCatalogService.get_snapshot()
+        Program.objects.filter(pk=programs[2].pk).update(is_published=True, updated_at=timezone.now())
+        assert len(ProgramCatalogService.get_snapshot()["programs"]) == 3
+
+    def test_course_level_edit_regroups(self, programs):
+        ProgramCatalogService.get_snapshot()
+        platform_settings = PlatformSettings.get_settings()
+        platform_settings.course_levels = [{"value": "intermediate", "label": "Intermediate"}]
+        platform_settings.save()
+
+        groups = [g["value"] for g in ProgramCatalogService.get_snapshot()["groupedPrograms"]]
+        assert groups == ["intermediate", "unassigned"]
+
+    def test_search_every_word_prefix_matches(self, programs):
+        names = lambda **kw: [p["name"] for p in ProgramCatalogService.query(**kw)["programs"]]
+        assert names(search="pyth") == ["Python Fundamentals", "Data Analysis"]
+        assert names(search="python notebooks") == ["Data Analysis"]
+        assert names(search="data", category="data science") == ["Data Analysis"]
+        assert names(search="cobol") == []
+        assert names(search="pythonic") == []
+        assert names(level="intermediate") == ["Data Analysis"]
+
+
+@pytest.mark.django_db
+class TestCatalogView:
+
+    def test_overlay_is_per_user(self, client, programs):
+        user = User.objects.create_user(username="learner", email="learner@example.com", password="x")
+        Enrollment.objects.create(user=user, program=programs[0], status="active")
+
+        anonymous = _catalog(client)
+        assert anonymous["userEnrollments"] == []
+        assert len(anonymous["programs"]) == 2
+
+        client.force_login(user)
+        props = _catalog(client, search="python")
+        assert props["userEnrollments"] == [programs[0].id]
+        assert props["filters"]["search"] == "python"
+        assert "index" not in props
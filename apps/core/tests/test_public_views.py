@@ -21,6 +21,12 @@ HYPOTHESIS_SETTINGS = settings(
 )
 
 
+@pytest.fixture(autouse=True)
+def unbuffered_verification_logs(settings):
+    """These tests assert one log row per verification as it happens."""
+    settings.VERIFICATION_LOG_BUFFER_SIZE = 1
+
+
 # =============================================================================
 # Property 12: Certificate Verification Detail Display
 # =============================================================================
@@ -0,0 +1,90 @@
+"""
+Tests for request-scoped caching of shared Inertia props.
+Tests the process-level PlatformSettings snapshot and the memoized
+UserAccess role/program lookups.
+"""
+
+import pytest
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.models import Program, User
+from apps.core.utils import get_instructor_program_ids, get_user_access, is_instructor
+from apps.platform.models import PlatformSettings
+from apps.progression.models import InstructorAssignment
+
+
+@pytest.mark.django_db
+class TestPlatformSettingsSnapshot:
+
+    def test_snapshot_served_without_queries(self):
+        PlatformSettings.get_cached()
+        with CaptureQueriesContext(connection) as ctx:
+            settings = PlatformSettings.get_cached()
+        assert len(ctx.captured_queries) == 0
+        assert settings.pk == 1
+
+    def test_save_invalidates_snapshot(self, django_capture_on_commit_callbacks):
+        PlatformSettings.get_cached()
+        settings = PlatformSettings.get_settings()
+        settings.institution_name = "Renamed Institute"
+        with django_capture_on_commit_callbacks(execute=True):
+            settings.save()
+        assert PlatformSettings.get_cached().institution_name == "Renamed Institute"
+
+    def test_rollback_keeps_snapshot_version(self):
+        PlatformSettings.get_cached()
+        version = cache.get(PlatformSettings.SNAPSHOT_VERSION_KEY)
+        with pytest.raises(RuntimeError), transaction.atomic():
+            PlatformSettings.get_settings().save()
+            raise RuntimeError
+        assert cache.get(PlatformSettings.SNAPSHOT_VERSION_KEY) == version
+
+    def test_snapshot_copies_are_independent(self):
+        first = PlatformSettings.get_cached()
+        first.institution_name = "Mutated"
+        assert PlatformSettings.get_cached().institution_name != "Mutated"
+
+
+@pytest.mark.django_db
+class TestUserAccess:
+
+    def test_role_and_instructor_checks_share_one_query(self):
+        user = User.objects.create_user(username="inst", email="inst@example.com", password="x")
+        user.groups.add(Group.objects.get_or_create(name="Instructors")[0])
+        with CaptureQueriesContext(connection) as ctx:
+            assert get_user_access(user).role == "instructor"
+            assert is_instructor(user)
+            assert is_instructor(user)
+        assert len(ctx.captured_queries) == 1
+
+    def test_group_change_clears_memo(self):
+        user = User.objects.create_user(username="student", email="student@example.com", password="x")
+        assert not is_instructor(user)
+        user.groups.add(Group.objects.get_or_create(name="Instructors")[0])
+        assert is_instructor(user)
+
+    def test_program_ids_memoized_and_refreshed_on_assignment(self):
+        user = User.objects.create_user(username="inst2", email="inst2@example.com", password="x")
+        first = Program.objects.create(name="First", code="ACC-1")
+        second = Program.objects.create(name="Second", code="ACC-2")
+        InstructorAssignment.objects.create(instructor=user, program=first)
+        assert get_instructor_program_ids(user) == [first.id]
+        with CaptureQueriesContext(connection) as ctx:
+            get_instructor_program_ids(user)
+        assert len(ctx.captured_queries) == 0
+        
+        InstructorAssignment.objects.create(instructor=user, program=second)
+        assert sorted(get_instructor_program_ids(user)) == sorted([first.id, second.id])
+
+    def test_shared_props_request_queries(self, client):
+        user = User.objects.create_user(username="page", email="page@example.com", password="x")
+        client.force_login(user)
+        client.get("/dashboard/", HTTP_X_INERTIA="true")
+        with CaptureQueriesContext(connection) as ctx:
+            client.get("/dashboard/", HTTP_X_INERTIA="true")
+        sql = [q["sql"] for q in ctx.captured_queries]
+        assert not any("platform_settings" in s for s in sql)
+        assert sum("auth_group" in s for s in sql) <= 1
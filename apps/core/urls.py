@@ -145,6 +145,7 @@ urlpatterns = [
     path("instructor/gradebook/", views.instructor_gradebook, name="instructor.gradebook"),
     path("instructor/programs/<int:pk>/gradebook/", views.instructor_program_gradebook, name="instructor.program_gradebook"),
     path("instructor/programs/<int:pk>/gradebook/save/", views.instructor_program_gradebook_save, name="instructor.program_gradebook_save"),
+    path("instructor/programs/<int:pk>/gradebook/export/", views.instructor_program_gradebook_export, name="instructor.program_gradebook_export"),
     path("instructor/gradebook/<int:enrollment_id>/", views.instructor_grade_entry, name="instructor.grade_entry"),
     # Instructor Announcements
     path("instructor/announcements/", views.instructor_announcements_index, name="instructor.announcements"),
@@ -158,6 +159,7 @@ urlpatterns = [
     path("instructor/submissions/<int:submission_id>/grade/", views.instructor_assignment_grade, name="instructor.assignment_grade"),
     # Student Quiz Taking
     path("student/quiz/<int:quiz_id>/", views.student_quiz_start, name="student.quiz_start"),
+    path("student/quiz/<int:quiz_id>/autosave/", views.student_quiz_autosave, name="student.quiz_autosave"),
     path("student/quiz/<int:quiz_id>/submit/", views.student_quiz_submit, name="student.quiz_submit"),
     path("student/quiz/<int:quiz_id>/results/", views.student_quiz_results, name="student.quiz_results"),
     # Student Assignments
@@ -21,24 +21,86 @@ def get_post_data(request) -> dict:
 
     return {}
 
+class UserAccess:
+    """
+    Role and program access of a user, computed once and memoized on the user
+    object. request.user is loaded per request, so the memo lives exactly as
+    long as the request; group changes clear it (see core signals).
+    """
+
+    INSTRUCTOR_GROUP = "Instructors"
+
+    def __init__(self, user):
+        self.user = user
+        self._in_instructor_group = None
+        self._instructor_program_ids = None
+
+    @property
+    def in_instructor_group(self) -> bool:
+        if self._in_instructor_group is None:
+            self._in_instructor_group = hasattr(self.user, "groups") and self.user.groups.filter(
+                name=self.INSTRUCTOR_GROUP
+            ).exists()
+        return self._in_instructor_group
+
+    @property
+    def is_instructor(self) -> bool:
+        """Instructor or higher."""
+        if not self.user.is_authenticated:
+            return False
+        if self.user.is_superuser or self.user.is_staff:
+            return True
+        return self.in_instructor_group
+
+    @property
+    def role(self) -> str:
+        """'student', 'instructor', 'admin', or 'superadmin'."""
+        if self.user.is_superuser:
+            return "superadmin"
+        if self.user.is_staff:
+            return "admin"
+        if self.in_instructor_group:
+            return "instructor"
+        return "student"
+
+    @property
+    def instructor_program_ids(self) -> list:
+        """Programs the user may manage; all programs for superusers/staff."""
+        if self._instructor_program_ids is None:
+            if self.user.is_superuser or self.user.is_staff:
+                from apps.core.models import Program
+                program_ids = Program.objects.values_list("id", flat=True)
+            else:
+                from apps.progression.models import InstructorAssignment
+                program_ids = InstructorAssignment.objects.filter(
+                    instructor=self.user
+                ).values_list("program_id", flat=True)
+            self._instructor_program_ids = list(program_ids)
+        return list(self._instructor_program_ids)
+
+    def clear(self):
+        """Forget memoized lookups after the user's groups or assignments change."""
+        self._in_instructor_group = None
+        self._instructor_program_ids = None
+
+
+def get_user_access(user) -> UserAccess:
+    """Get the memoized UserAccess for a user object."""
+    access = getattr(user, "_user_access", None)
+    if access is None:
+        access = UserAccess(user)
+        user._user_access = access
+    return access
+
 def is_instructor(user) -> bool:
     """Check if user is instructor (or higher)."""
-    if not user.is_authenticated:
-        return False
-    if user.is_superuser or user.is_staff:
-        return True
-    return hasattr(user, "groups") and user.groups.filter(name="Instructors").exists()
+    return get_user_access(user).is_instructor
 
 def get_instructor_program_ids(user) -> list:
     """Get list of program IDs assigned to this instructor.
     Superusers/staff get access to all programs.
     """
-    if user.is_superuser or user.is_staff:
-        from apps.core.models import Program
-        return list(Program.objects.values_list("id", flat=True))
-    
-    from apps.progression.models import InstructorAssignment
-    return list(InstructorAssignment.objects.filter(instructor=user).values_list("program_id", flat=True))
+    return get_user_access(user).instructor_program_ids
 
 def require_instructor(user):
     """
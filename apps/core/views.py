@@ -18,9 +18,17 @@ from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 from django.views.decorators.csrf import ensure_csrf_cookie
 from inertia import render
 
-from apps.certifications.models import Certificate, VerificationLog
-from apps.core.models import Program, User
-from apps.core.utils import get_instructor_program_ids, get_post_data, is_instructor
+from apps.certifications.services import VerificationService
+from apps.certifications.throttling import check_verification_rate
+from apps.core.conditional import conditional_page
+from apps.core.models import Program, ProgramResource, User
+from apps.core.services.catalog import ProgramCatalogService, group_programs_by_level
+from apps.core.utils import (
+    get_instructor_program_ids,
+    get_post_data,
+    get_user_access,
+    is_instructor,
+)
 
 
 def get_dashboard_url(role: str) -> str:
@@ -31,58 +39,7 @@ def get_dashboard_url(role: str) -> str:
 
 def _get_user_role(user: User) -> str:
     """Determine user role for dashboard redirect."""
-    if user.is_superuser:
-        return "superadmin"
-    if user.is_staff:
-        return "admin"
-    if hasattr(user, "groups") and user.groups.filter(name="Instructors").exists():
-        return "instructor"
-    return "student"
-
-
-def _group_programs_by_level(
-    programs: list, course_levels: list, level_key: str = "level"
-) -> list:
-    """
-    Group program dictionaries by configured course level values.
-
-    Returns ordered groups using course_levels order with a fallback group for unknown levels.
-    """
-    level_map = {}
-    ordered_values = []
-    for level in course_levels or []:
-        value = (level or {}).get("value")
-        label = (level or {}).get("label")
-        if value:
-            level_map[value] = label or value
-            ordered_values.append(value)
-
-    groups = []
-    grouped = {value: [] for value in ordered_values}
-    unknown = []
-
-    for program in programs:
-        level_value = (program or {}).get(level_key) or ""
-        if level_value in grouped:
-            grouped[level_value].append(program)
-        else:
-            unknown.append(program)
-
-    for value in ordered_values:
-        groups.append(
-            {
-                "value": value,
-                "label": level_map.get(value, value),
-                "programs": grouped[value],
-            }
-        )
-
-    if unknown:
-        groups.append(
-            {"value": "unassigned", "label": "Unassigned", "programs": unknown}
-        )
-
-    return groups
+    return get_user_access(user).role
 
 
 # =============================================================================
@@ -188,122 +145,119 @@ def contact_page(request):
     return render(request, "Public/Contact")
 
 
-def public_programs_list(request):
-    """
-    Public catalog of published programs.
-    """
-    from django.db.models import Count
-
-    from apps.curriculum.models import CurriculumNode
+def _user_program_ids(user) -> tuple:
+    """Programs the user is enrolled in and has pending requests for."""
     from apps.progression.models import Enrollment, EnrollmentRequest
 
-    # Base query
-    programs_query = Program.objects.filter(is_published=True)
-
-    # Search filtering
-    search = request.GET.get("search", "")
-    if search:
-        programs_query = programs_query.filter(name__icontains=search)
-
-    # Category filtering
-    category = request.GET.get("category", "")
-    if category:
-        programs_query = programs_query.filter(category__iexact=category)
-
-    level = request.GET.get("level", "")
-    if level:
-        programs_query = programs_query.filter(level=level)
-
-    programs = list(programs_query.order_by("name"))
-
-    # Get lecture counts per program
-    lecture_counts = dict(
-        CurriculumNode.objects.filter(
-            program__in=programs,
-            is_published=True,
-            node_type="lesson",
-            children__isnull=True,
+    if not user.is_authenticated:
+        return [], []
+    enrollments = list(
+        Enrollment.objects.filter(user=user).values_list("program_id", flat=True)
+    )
+    pending_requests = list(
+        EnrollmentRequest.objects.filter(user=user, status="pending").values_list(
+            "program_id", flat=True
         )
-        .values("program_id")
-        .annotate(count=Count("id"))
-        .values_list("program_id", "count")
     )
+    return enrollments, pending_requests
 
-    # Build programs data with new fields
-    programs_data = []
-    for p in programs:
-        # Get thumbnail URL
-        thumbnail_url = p.thumbnail.url if p.thumbnail else None
-
-        # Calculate price display
-        price_data = p.custom_pricing or {}
-        price = price_data.get("price", 0)
-        original_price = price_data.get("original_price")
-
-        programs_data.append(
-            {
-                "id": p.id,
-                "name": p.name,
-                "code": p.code or "",
-                "description": p.description or "",
-                "created_at": p.created_at.isoformat(),
-                "thumbnail": thumbnail_url,
-                "category": p.category or "",
-                "level": p.level or "beginner",
-                "badge_type": p.badge_type,
-                "duration_hours": p.duration_hours,
-                "video_hours": p.video_hours,
-                "lecture_count": lecture_counts.get(p.id, 0),
-                "price": price,
-                "original_price": original_price,
-                "rating": 4.5,  # TODO: Calculate from reviews when implemented
-            }
-        )
 
-    # Get unique categories for filtering
-    categories = list(
-        Program.objects.filter(is_published=True, category__isnull=False)
-        .exclude(category="")
-        .values_list("category", flat=True)
-        .distinct()
+def _programs_list_version(request) -> tuple:
+    """Catalog stamp plus the user's overlay; filters are part of the URL."""
+    enrollments, pending_requests = _user_program_ids(request.user)
+    return (
+        ProgramCatalogService.get_version(),
+        tuple(enrollments),
+        tuple(pending_requests),
     )
 
-    # Get user enrollment data if authenticated
-    user_enrollments = []
-    user_pending_requests = []
-    if request.user.is_authenticated:
-        user_enrollments = list(
-            Enrollment.objects.filter(user=request.user).values_list(
-                "program_id", flat=True
-            )
-        )
-        user_pending_requests = list(
-            EnrollmentRequest.objects.filter(
-                user=request.user, status="pending"
-            ).values_list("program_id", flat=True)
-        )
 
-    from apps.platform.models import PlatformSettings
+@conditional_page(_programs_list_version)
+def public_programs_list(request):
+    """
+    Public catalog of published programs.
+    Served from the precomputed catalog snapshot; only the enrollment and
+    pending-request overlay is read per user.
+    """
+    search = request.GET.get("search", "")
+    category = request.GET.get("category", "")
+    level = request.GET.get("level", "")
+    catalog = ProgramCatalogService.query(search=search, category=category, level=level)
 
-    platform_settings = PlatformSettings.get_settings()
-    course_levels = platform_settings.get_course_levels()
-    grouped_programs = _group_programs_by_level(programs_data, course_levels)
+    # Get user enrollment data if authenticated
+    user_enrollments, user_pending_requests = _user_program_ids(request.user)
 
     return render(
         request,
         "Public/Programs",
         {
-            "programs": programs_data,
-            "groupedPrograms": grouped_programs,
-            "courseLevels": course_levels,
+            "programs": catalog["programs"],
+            "groupedPrograms": catalog["groupedPrograms"],
+            "courseLevels": catalog["courseLevels"],
             "filters": {"search": search, "category": category, "level": level},
-            "categories": categories,
+            "categories": catalog["categories"],
             "userEnrollments": user_enrollments,
             "userPendingRequests": user_pending_requests,
         },
     )
 
 
+def _program_detail_version(request, pk: int) -> Optional[tuple]:
+    """
+    Version of a program detail page: the program, its curriculum_revision
+    and the catalog version (the catalog covers related programs), the
+    instructors and resources, and the user's enrollment or request.
+    """
+    from django.db.models import Count
+
+    from apps.progression.models import Enrollment, EnrollmentRequest, InstructorAssignment
+
+    is_preview = request.session.get("preview_program_id") == pk
+    program = (
+        Program.objects.filter(pk=pk)
+        .values("updated_at", "curriculum_revision", "is_published")
+        .first()
+    )
+    if program is None or not (program["is_published"] or is_preview):
+        return None
+
+    enrollment = None
+    if request.user.is_authenticated:
+        enrollment = (
+            Enrollment.objects.filter(user=request.user, program_id=pk)
+            .annotate(completed=Count("completions"))
+            .values_list("id", "status", "completed")
+            .first()
+        )
+        if enrollment is None:
+            enrollment = EnrollmentRequest.objects.filter(
+                user=request.user, program_id=pk, status="pending"
+            ).exists()
+
+    return (
+        is_preview,
+        program["updated_at"],
+        program["curriculum_revision"],
+        ProgramCatalogService.get_version(),
+        tuple(
+            InstructorAssignment.objects.filter(program_id=pk).values_list(
+                "id",
+                "role",
+                "instructor__first_name",
+                "instructor__last_name",
+                "instructor__email",
+            )
+        ),
+        tuple(
+            ProgramResource.objects.filter(program_id=pk).values_list(
+                "id", "title", "file", "resource_type"
+            )
+        ),
+        enrollment,
+    )
+
+
+@conditional_page(_program_detail_version)
 def public_program_detail(request, pk: int):
     """
     Public course detail page with full course information.
@@ -496,7 +450,7 @@ def public_program_detail(request, pk: int):
     # Get course levels for displaying label
     from apps.platform.models import PlatformSettings
 
-    platform_settings = PlatformSettings.get_settings()
+    platform_settings = PlatformSettings.get_cached()
     course_levels = platform_settings.get_course_levels()
 
     return render(
@@ -518,6 +472,7 @@ def public_program_detail(request, pk: int):
 def verify_certificate_page(request):
     """
     Certificate verification page.
+    Only lookups are rate-limited; the empty form is always served.
     """
     result = None
 
@@ -527,12 +482,16 @@ def verify_certificate_page(request):
         serial_number = data.get("serial_number", "").strip().upper()
 
         if serial_number:
-            # Look up certificate
-            certificate = (
-                Certificate.objects.filter(serial_number=serial_number)
-                .select_related("enrollment")
-                .first()
+            throttled = check_verification_rate(request)
+            if throttled:
+                return throttled
+            # Cached lookup; revocation is always read from the database
+            verification = VerificationService().verify(
+                serial_number,
+                ip_address=_get_client_ip(request),
+                user_agent=request.META.get("HTTP_USER_AGENT", "")[:500],
             )
+            certificate = verification.certificate
 
             # Determine result
             if certificate:
@@ -552,20 +511,8 @@ def verify_certificate_page(request):
                         ),
                     },
                 }
-                log_result = "revoked" if certificate.is_revoked else "valid"
             else:
                 result = {"found": False}
-                log_result = "not_found"
-
-            # Log verification attempt
-            VerificationLog.objects.create(
-                certificate=certificate,
-                serial_number_queried=serial_number,
-                ip_address=_get_client_ip(request),
-                user_agent=request.META.get("HTTP_USER_AGENT", "")[:500],
-                result=log_result,
-                verified_at=timezone.now(),
-            )
 
     return render(
         request,
@@ -914,21 +861,20 @@ def dashboard(request):
 
 def _get_student_dashboard_data(user) -> dict:
     """Get dashboard data for students."""
-    from apps.curriculum.models import CurriculumNode
     from apps.progression.models import Enrollment, NodeCompletion
+    from apps.progression.services import ProgressCounterService
 
     # Get active enrollments with progress
-    enrollments = Enrollment.objects.filter(
-        user=user, status__in=["active", "completed"]
-    ).select_related("program", "program__blueprint")
+    enrollments = list(
+        Enrollment.objects.filter(
+            user=user, status__in=["active", "completed"]
+        ).select_related("program", "program__blueprint")
+    )
+    ProgressCounterService.refresh_stale(enrollments)
 
     enrollment_data = []
     for enrollment in enrollments:
-        total_nodes = CurriculumNode.objects.filter(
-            program=enrollment.program, is_published=True, children__isnull=True
-        ).count()
-        completed_nodes = enrollment.completions.count()
-        progress = (completed_nodes / total_nodes * 100) if total_nodes > 0 else 0
+        progress = enrollment.progress_percent
 
         enrollment_data.append(
             {
@@ -1106,7 +1052,7 @@ def _get_registration_enabled(request) -> bool:
     from apps.platform.models import PlatformSettings
 
     try:
-        settings = PlatformSettings.get_settings()
+        settings = PlatformSettings.get_cached()
         return settings.is_feature_enabled("self_registration")
     except Exception:
         return True  # Default enabled
@@ -1216,9 +1162,9 @@ def admin_programs(request):
 
     from apps.platform.models import PlatformSettings
 
-    platform_settings = PlatformSettings.get_settings()
+    platform_settings = PlatformSettings.get_cached()
     course_levels = platform_settings.get_course_levels()
-    grouped_programs = _group_programs_by_level(programs_data, course_levels)
+    grouped_programs = group_programs_by_level(programs_data, course_levels)
 
     return render(
         request,
@@ -1382,7 +1328,7 @@ def admin_program_create(request):
                     "mode": "create",
                     "blueprints": _get_blueprints_for_form(),
                     "instructors": _get_instructors_for_form(),
-                    "courseLevels": PlatformSettings.get_settings().get_course_levels(),
+                    "courseLevels": PlatformSettings.get_cached().get_course_levels(),
                     "errors": errors,
                     "formData": data,
                 },
@@ -1417,7 +1363,7 @@ def admin_program_create(request):
             "mode": "create",
             "blueprints": _get_blueprints_for_form(),
             "instructors": _get_instructors_for_form(),
-            "courseLevels": PlatformSettings.get_settings().get_course_levels(),
+            "courseLevels": PlatformSettings.get_cached().get_course_levels(),
         },
     )
 
@@ -1455,7 +1401,7 @@ def admin_program_edit(request, pk: int):
                     "program": _serialize_program(program),
                     "blueprints": _get_blueprints_for_form(),
                     "instructors": _get_instructors_for_form(),
-                    "courseLevels": PlatformSettings.get_settings().get_course_levels(),
+                    "courseLevels": PlatformSettings.get_cached().get_course_levels(),
                     "errors": errors,
                 },
             )
@@ -1503,7 +1449,7 @@ def admin_program_edit(request, pk: int):
             "currentInstructorIds": current_instructors,
             "blueprints": _get_blueprints_for_form(),
             "instructors": _get_instructors_for_form(),
-            "courseLevels": PlatformSettings.get_settings().get_course_levels(),
+            "courseLevels": PlatformSettings.get_cached().get_course_levels(),
             "canChangeBlueprint": not Enrollment.objects.filter(
                 program=program
             ).exists(),
@@ -1536,7 +1482,7 @@ def admin_program_content(request, pk: int):
         program.description = data.get("description", "")
         program.category = data.get("category", "")
 
-        platform_settings = PlatformSettings.get_settings()
+        platform_settings = PlatformSettings.get_cached()
         course_levels = platform_settings.get_course_levels()
         valid_level_values = {
             (level or {}).get("value") for level in (course_levels or [])
@@ -1577,7 +1523,7 @@ def admin_program_content(request, pk: int):
     # GET - show content form
 
     # Get platform settings
-    platform_settings = PlatformSettings.get_settings()
+    platform_settings = PlatformSettings.get_cached()
     course_levels = platform_settings.get_course_levels()
     # Logic: only show categories if explicitly configured in platform settings.
     categories = platform_settings.program_categories or []
@@ -1652,6 +1598,7 @@ def admin_program_publish(request, pk: int):
 
     from apps.core.services.validation import ProgramValidationService
     from apps.curriculum.models import CurriculumNode
+    from apps.curriculum.services import CurriculumGraphService
 
     program = get_object_or_404(Program, pk=pk)
 
@@ -1674,6 +1621,7 @@ def admin_program_publish(request, pk: int):
     # Cascade unpublish: when program becomes unpublished, unpublish all child nodes
     if was_published and not program.is_published:
         CurriculumNode.objects.filter(program=program).update(is_published=False)
+        CurriculumGraphService.invalidate(program.id)
         messages.success(request, f"Program '{program.name}' unpublished.")
     else:
         messages.success(request, f"Program '{program.name}' published successfully.")
@@ -2146,9 +2094,9 @@ def instructor_programs(request):
 
     from apps.platform.models import PlatformSettings
 
-    platform_settings = PlatformSettings.get_settings()
+    platform_settings = PlatformSettings.get_cached()
     course_levels = platform_settings.get_course_levels()
-    grouped_programs = _group_programs_by_level(programs_data, course_levels)
+    grouped_programs = group_programs_by_level(programs_data, course_levels)
 
     return render(
         request,
@@ -2355,14 +2303,10 @@ def _get_students_for_program(program_id: int, user) -> list:
     Get student statistics for a program.
     Extracted from api_instructor_program_students for use with Inertia partial reload.
     """
+    from django.db.models import Count
     from django.shortcuts import get_object_or_404
 
-    from apps.assessments.models import (
-        Assignment,
-        AssignmentSubmission,
-        Quiz,
-        QuizAttempt,
-    )
+    from apps.assessments.gradebook_service import GradebookService
     from apps.curriculum.models import CurriculumNode
     from apps.progression.models import Enrollment, NodeCompletion
 
@@ -2370,59 +2314,44 @@ def _get_students_for_program(program_id: int, user) -> list:
     program = get_object_or_404(Program, pk=program_id, id__in=program_ids)
 
     # Get enrolled students
-    enrollments = (
+    enrollments = list(
         Enrollment.objects.filter(program=program, status="active")
         .select_related("user")
         .order_by("user__last_name", "user__first_name")
     )
 
+    # Quiz and assignment outcomes come from the shared gradebook aggregation
+    gradebook = GradebookService(program).build(enrollments)
+
     # Get curriculum counts for progress calculation
     total_lessons = CurriculumNode.objects.filter(
         program=program, node_type="lesson", is_published=True
     ).count()
-    total_quizzes = Quiz.objects.filter(
-        node__program=program, is_published=True
-    ).count()
-    total_assignments = Assignment.objects.filter(
-        program=program, is_published=True
-    ).count()
-
-    # Prefetch completions and attempts
-    enrollment_ids = [e.id for e in enrollments]
-
-    # Node completions by enrollment
-    completions = NodeCompletion.objects.filter(
-        enrollment_id__in=enrollment_ids
-    ).select_related("node")
-
-    completions_by_enrollment = {}
-    for c in completions:
-        if c.enrollment_id not in completions_by_enrollment:
-            completions_by_enrollment[c.enrollment_id] = {"lessons": 0}
-        if c.node.node_type == "lesson":
-            completions_by_enrollment[c.enrollment_id]["lessons"] += 1
+    total_quizzes = len(gradebook.quizzes)
+    total_assignments = len(gradebook.assignments)
+
+    # Lesson completions by enrollment
+    completions_by_enrollment = {
+        row["enrollment_id"]: {"lessons": row["lessons"]}
+        for row in NodeCompletion.objects.filter(
+            enrollment__in=enrollments, node__node_type="lesson"
+        )
+        .values("enrollment_id")
+        .annotate(lessons=Count("id"))
+    }
 
-    # Quiz attempts by enrollment
-    quiz_attempts = QuizAttempt.objects.filter(
-        enrollment_id__in=enrollment_ids, passed=True
-    )
     quizzes_passed_by_enrollment = {}
-    for attempt in quiz_attempts:
-        if attempt.enrollment_id not in quizzes_passed_by_enrollment:
-            quizzes_passed_by_enrollment[attempt.enrollment_id] = set()
-        quizzes_passed_by_enrollment[attempt.enrollment_id].add(attempt.quiz_id)
-
-    # Assignment submissions by enrollment
-    assignment_subs = AssignmentSubmission.objects.filter(
-        enrollment_id__in=enrollment_ids, status="graded"
-    )
     assignments_passed_by_enrollment = {}
-    for sub in assignment_subs:
-        if sub.enrollment_id not in assignments_passed_by_enrollment:
-            assignments_passed_by_enrollment[sub.enrollment_id] = set()
-        # Consider passed if final score >= 50%
-        if sub.score and sub.score >= 50:
-            assignments_passed_by_enrollment[sub.enrollment_id].add(sub.assignment_id)
+    for e, quiz_row, assignment_row, _ in gradebook.rows():
+        quizzes_passed_by_enrollment[e.id] = {
+            q.id for q, cell in zip(gradebook.quizzes, quiz_row) if cell.passed
+        }
+        # Consider passed if graded with a score >= 50%
+        assignments_passed_by_enrollment[e.id] = {
+            a.id
+            for a, cell in zip(gradebook.assignments, assignment_row)
+            if cell.status == "graded" and cell.raw_score and cell.raw_score >= 50
+        }
 
     students_data = []
     for e in enrollments:
@@ -2562,130 +2491,47 @@ def instructor_program_gradebook(request, pk: int):
 
     from django.shortcuts import get_object_or_404
 
-    from apps.assessments.models import (
-        Assignment,
-        AssignmentSubmission,
-        Quiz,
-        QuizAttempt,
-    )
-    from apps.progression.models import Enrollment
+    from apps.assessments.gradebook_service import GradebookService
 
     program_ids = get_instructor_program_ids(request.user)
     program = get_object_or_404(Program, pk=pk, id__in=program_ids)
 
     grading_config = program.blueprint.grading_logic if program.blueprint else {}
 
-    # Get all quizzes and assignments for the program
-    quizzes = list(
-        Quiz.objects.filter(node__program=program, is_published=True).order_by(
-            "created_at"
-        )
-    )
-    assignments = list(
-        Assignment.objects.filter(program=program, is_published=True).order_by(
-            "created_at"
-        )
-    )
-
-    # Get enrolled students with their grades
-    enrollments = (
-        Enrollment.objects.filter(program=program)
-        .select_related("user")
-        .order_by("user__last_name", "user__first_name")
-    )
-
-    # Prefetch quiz attempts and assignment submissions for all enrollments
-    enrollment_ids = [e.id for e in enrollments]
-
-    quiz_attempts = QuizAttempt.objects.filter(
-        enrollment_id__in=enrollment_ids
-    ).select_related("quiz")
-
-    assignment_submissions = AssignmentSubmission.objects.filter(
-        enrollment_id__in=enrollment_ids
-    ).select_related("assignment")
-
-    # Index attempts/submissions by enrollment
-    quiz_attempts_by_enrollment = {}
-    for attempt in quiz_attempts:
-        if attempt.enrollment_id not in quiz_attempts_by_enrollment:
-            quiz_attempts_by_enrollment[attempt.enrollment_id] = {}
-        quiz_id = attempt.quiz_id
-        # Keep best score per quiz
-        if quiz_id not in quiz_attempts_by_enrollment[attempt.enrollment_id]:
-            quiz_attempts_by_enrollment[attempt.enrollment_id][quiz_id] = attempt
-        elif attempt.score and (
-            quiz_attempts_by_enrollment[attempt.enrollment_id][quiz_id].score is None
-            or attempt.score
-            > quiz_attempts_by_enrollment[attempt.enrollment_id][quiz_id].score
-        ):
-            quiz_attempts_by_enrollment[attempt.enrollment_id][quiz_id] = attempt
-
-    submissions_by_enrollment = {}
-    for sub in assignment_submissions:
-        if sub.enrollment_id not in submissions_by_enrollment:
-            submissions_by_enrollment[sub.enrollment_id] = {}
-        submissions_by_enrollment[sub.enrollment_id][sub.assignment_id] = sub
+    # Aggregate every student x quiz/assignment cell in a fixed number of queries
+    gradebook = GradebookService(program, grading_config).build()
+    quizzes = gradebook.quizzes
+    assignments = gradebook.assignments
 
     students_data = []
-    for e in enrollments:
+    for e, quiz_row, assignment_row, overall in gradebook.rows():
         # Get manual grades from enrollment
         manual_grades = (
             e.grades if hasattr(e, "grades") and e.grades else {"components": {}}
         )
 
-        # Build quiz scores
-        quiz_scores = []
-        for q in quizzes:
-            attempt = quiz_attempts_by_enrollment.get(e.id, {}).get(q.id)
-            quiz_scores.append(
-                {
-                    "quizId": q.id,
-                    "title": q.title,
-                    "score": float(attempt.score)
-                    if attempt and attempt.score
-                    else None,
-                    "passed": attempt.passed if attempt else None,
-                    "attemptCount": QuizAttempt.objects.filter(
-                        enrollment=e, quiz=q
-                    ).count(),
-                }
-            )
-
-        # Build assignment scores
-        assignment_scores = []
-        for a in assignments:
-            sub = submissions_by_enrollment.get(e.id, {}).get(a.id)
-            assignment_scores.append(
-                {
-                    "assignmentId": a.id,
-                    "title": a.title,
-                    "weight": a.weight,
-                    "score": sub.get_final_score() if sub and sub.score else None,
-                    "status": sub.status if sub else "not_submitted",
-                    "isLate": sub.is_late if sub else False,
-                }
-            )
-
-        # Calculate overall score
-        total_weight = 0
-        weighted_score = 0
-
-        # Quiz component (assume equal weight split)
-        quiz_weight = grading_config.get("quiz_weight", 30)  # Default 30%
-        quiz_total = len(quizzes)
-        quiz_sum = sum(qs["score"] or 0 for qs in quiz_scores)
-        if quiz_total > 0:
-            weighted_score += (quiz_sum / quiz_total) * (quiz_weight / 100)
-            total_weight += quiz_weight
-
-        # Assignment component
-        for asc in assignment_scores:
-            if asc["score"] is not None:
-                weighted_score += asc["score"] * (asc["weight"] / 100)
-            total_weight += asc["weight"]
+        quiz_scores = [
+            {
+                "quizId": q.id,
+                "title": q.title,
+                "score": cell.best_score,
+                "passed": cell.passed,
+                "attemptCount": cell.attempt_count,
+            }
+            for q, cell in zip(quizzes, quiz_row)
+        ]
 
-        overall = (weighted_score / total_weight * 100) if total_weight > 0 else None
+        assignment_scores = [
+            {
+                "assignmentId": a.id,
+                "title": a.title,
+                "weight": a.weight,
+                "score": cell.score,
+                "status": cell.status,
+                "isLate": cell.is_late,
+            }
+            for a, cell in zip(assignments, assignment_row)
+        ]
 
         students_data.append(
             {
@@ -2695,7 +2541,7 @@ def instructor_program_gradebook(request, pk: int):
                 "grades": manual_grades,
                 "quizScores": quiz_scores,
                 "assignmentScores": assignment_scores,
-                "overallScore": round(overall, 1) if overall else None,
+                "overallScore": overall,
                 "isPublished": getattr(e, "grades_published", False),
             }
         )
@@ -2756,6 +2602,49 @@ def instructor_program_gradebook_save(request, pk: int):
     return redirect("core:instructor.program_gradebook", pk=pk)
 
 
+@login_required
+def instructor_program_gradebook_export(request, pk: int):
+    """
+    Stream the full gradebook of a program as CSV (default) or XLSX.
+    Enrollments are processed in chunks so memory stays flat for large programs.
+    """
+    if not is_instructor(request.user):
+        return redirect("/dashboard/")
+
+    import tempfile
+
+    from django.http import FileResponse, StreamingHttpResponse
+    from django.shortcuts import get_object_or_404
+
+    from apps.assessments.gradebook_export import GradebookExporter
+
+    program_ids = get_instructor_program_ids(request.user)
+    program = get_object_or_404(Program, pk=pk, id__in=program_ids)
+
+    export_format = request.GET.get("format", "csv")
+    if export_format not in GradebookExporter.FORMATS:
+        export_format = "csv"
+
+    exporter = GradebookExporter(program)
+    filename = exporter.filename(export_format)
+
+    if export_format == "xlsx":
+        # XLSX is a zip archive, so it is spooled to a temp file and streamed from disk
+        spool = tempfile.TemporaryFile()
+        exporter.write_xlsx(spool)
+        spool.seek(0)
+        return FileResponse(
+            spool,
+            as_attachment=True,
+            filename=filename,
+            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        )
+
+    response = StreamingHttpResponse(exporter.iter_csv(), content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
 # Note: instructor_content and instructor_content_edit functions removed
 # Content editing is now handled by Course Builder via instructor_node_update
 
@@ -3257,14 +3146,16 @@ def student_quiz_start(request, quiz_id: int):
     """
     Start a quiz attempt.
     """
-    from apps.assessments.models import Quiz, QuizAttempt
+    from apps.assessments.models import Quiz
+    from apps.assessments.quiz_attempt_service import (
+        QuizAttemptService,
+        QuizPayloadService,
+    )
     from apps.progression.models import Enrollment
 
     try:
-        quiz = (
-            Quiz.objects.select_related("node", "node__program")
-            .prefetch_related("questions")
-            .get(pk=quiz_id, is_published=True)
+        quiz = Quiz.objects.select_related("node", "node__program").get(
+            pk=quiz_id, is_published=True
         )
     except Quiz.DoesNotExist:
         messages.error(request, "Quiz not found or not published")
@@ -3279,68 +3170,18 @@ def student_quiz_start(request, quiz_id: int):
         messages.error(request, "You are not enrolled in this program")
         return redirect("/dashboard/")
 
-    # Check attempts remaining
-    existing_attempts = QuizAttempt.objects.filter(
-        enrollment=enrollment, quiz=quiz
-    ).count()
-    if existing_attempts >= quiz.max_attempts:
+    # Resume the in-progress attempt or claim the next attempt number
+    attempt_service = QuizAttemptService()
+    attempt = attempt_service.start(enrollment, quiz)
+    if attempt is None:
         messages.error(request, "You have used all your attempts for this quiz")
         return redirect("core:student.quiz_results", quiz_id=quiz_id)
 
-    # Check for in-progress attempt
-    in_progress = QuizAttempt.objects.filter(
-        enrollment=enrollment, quiz=quiz, submitted_at__isnull=True
-    ).first()
-
-    if in_progress:
-        # Resume existing attempt
-        attempt = in_progress
-    else:
-        # Start new attempt
-        attempt = QuizAttempt.objects.create(
-            enrollment=enrollment,
-            quiz=quiz,
-            attempt_number=existing_attempts + 1,
-            started_at=timezone.now(),
-        )
-
-    # Serialize questions (without answers for student view)
-    # Serialize questions (without answers for student view)
-    import random
-
-    quiz_questions = quiz.questions.all().prefetch_related(
-        "options", "matching_pairs", "gap_answers"
-    )
-
-    questions = []
-    for q in quiz_questions:
-        q_data = {
-            "id": q.id,
-            "type": q.question_type,
-            "text": q.text,
-            "points": q.points,
-        }
-
-        if q.question_type in ["mcq", "mcq_multi"]:
-            opts = list(q.options.all())
-            if quiz.shuffle_options:
-                random.shuffle(opts)
-            else:
-                opts.sort(key=lambda x: x.position)
-            q_data["options"] = [o.text for o in opts]
-
-        elif q.question_type == "matching":
-            q_data["pairs"] = [
-                {"left_text": p.left_text, "right_text": p.right_text}
-                for p in q.matching_pairs.all()
-            ]
-
-        elif q.question_type == "ordering":
-            items = list(q.answer_data.get("correct_order", []))
-            random.shuffle(items)
-            q_data["items"] = items
+    # Restore autosaved answers when resuming
+    answers = attempt_service.journal_answers(attempt)
 
-        questions.append(q_data)
+    # Cached question payload (without answers), shuffled by the attempt's seed
+    questions = QuizPayloadService.for_attempt(quiz, attempt)
 
     return render(
         request,
@@ -3357,29 +3198,69 @@ def student_quiz_start(request, quiz_id: int):
                 "id": attempt.id,
                 "attemptNumber": attempt.attempt_number,
                 "startedAt": attempt.started_at.isoformat(),
-                "answers": attempt.answers,
+                "answers": answers,
+                "journalSequence": attempt_service.last_sequence(attempt),
             },
             "questions": questions,
-            "attemptsRemaining": quiz.max_attempts
-            - existing_attempts
-            - (0 if in_progress else 1),
+            "attemptsRemaining": quiz.max_attempts - attempt.attempt_number,
         },
     )
 
 
+@login_required
+def student_quiz_autosave(request, quiz_id: int):
+    """
+    Checkpoint in-progress quiz answers.
+    Expects {"attemptId", "sequence", "answers": {question_id: answer}} with
+    only the answers changed since the last checkpoint.
+    """
+    from django.http import JsonResponse
+
+    from apps.assessments.models import QuizAttempt
+    from apps.assessments.quiz_attempt_service import QuizAttemptService
+
+    if request.method != "POST":
+        return JsonResponse({"error": "Method not allowed"}, status=405)
+
+    data = get_post_data(request)
+    attempt = QuizAttempt.objects.filter(
+        pk=data.get("attemptId"),
+        quiz_id=quiz_id,
+        enrollment__user=request.user,
+        submitted_at__isnull=True,
+    ).first()
+    if not attempt:
+        return JsonResponse({"error": "No quiz attempt in progress"}, status=404)
+
+    try:
+        sequence = int(data.get("sequence", 0))
+    except (ValueError, TypeError):
+        sequence = 0
+    answers = data.get("answers")
+    if not isinstance(answers, dict):
+        return JsonResponse({"error": "answers must be an object"}, status=400)
+
+    saved = QuizAttemptService().autosave(attempt, answers, sequence)
+    return JsonResponse({"saved": saved, "sequence": sequence})
+
+
 @login_required
 def student_quiz_submit(request, quiz_id: int):
     """
     Submit quiz answers and calculate score.
     """
     from apps.assessments.models import Quiz, QuizAttempt
+    from apps.assessments.quiz_attempt_service import (
+        QuizAttemptService,
+        QuizPayloadService,
+    )
     from apps.progression.models import Enrollment
 
     if request.method != "POST":
         return redirect("core:student.quiz_start", quiz_id=quiz_id)
 
     try:
-        quiz = Quiz.objects.get(pk=quiz_id)
+        quiz = Quiz.objects.select_related("node__program").get(pk=quiz_id)
     except Quiz.DoesNotExist:
         messages.error(request, "Quiz not found")
         return redirect("/dashboard/")
@@ -3400,18 +3281,18 @@ def student_quiz_submit(request, quiz_id: int):
         messages.error(request, "No quiz attempt in progress")
         return redirect("core:student.quiz_start", quiz_id=quiz_id)
 
-    # Save answers
+    # Coalesce autosaved answers with the submitted ones, map shuffled
+    # option indices back, then score and close the attempt
     data = get_post_data(request)
-    attempt.answers = data.get("answers", {})
-    attempt.submitted_at = timezone.now()
+    attempt_service = QuizAttemptService()
+    answers = {**attempt_service.journal_answers(attempt), **data.get("answers", {})}
+    answers = QuizPayloadService.unshuffle_answers(quiz, attempt, answers)
+    if not attempt_service.submit(attempt, answers):
+        # A concurrent request already submitted this attempt
+        return redirect("core:student.quiz_results", quiz_id=quiz_id)
 
-    # Calculate score
-    points_earned, points_possible, percentage, passed = attempt.calculate_score()
-    attempt.points_earned = points_earned
-    attempt.points_possible = points_possible
-    attempt.score = percentage
-    attempt.passed = passed
-    attempt.save()
+    percentage = attempt.score
+    passed = attempt.passed
 
     if passed is True:
         messages.success(request, f"Congratulations! You passed with {percentage}%!")
@@ -4528,7 +4409,7 @@ def serialize_program_data(program):
     """
     from apps.platform.models import PlatformSettings
     
-    platform_settings = PlatformSettings.get_settings()
+    platform_settings = PlatformSettings.get_cached()
     
     return {
         "program": {
@@ -4929,6 +4810,11 @@ def _sync_quiz_questions(node, questions_data: list):
     if removed_ids:
         Question.objects.filter(id__in=removed_ids).delete()
 
+    # Question rows are updated with .update(), which bypasses the post_save signal
+    from apps.assessments.answer_key_service import AnswerKeyService
+
+    AnswerKeyService.invalidate(quiz.id)
+
     # Update node properties with db_ids for frontend tracking
     node.properties["questions"] = updated_questions
     node.properties["quiz_id"] = quiz.id
@@ -5089,6 +4975,7 @@ def instructor_node_reorder(request, program_id: int):
         return redirect("/dashboard/")
 
     from apps.curriculum.models import CurriculumNode
+    from apps.curriculum.services import CurriculumGraphService
     from apps.progression.models import InstructorAssignment
 
     if not (
@@ -5109,6 +4996,7 @@ def instructor_node_reorder(request, program_id: int):
         CurriculumNode.objects.filter(pk=node_id, program_id=program_id).update(
             position=idx
         )
+    CurriculumGraphService.invalidate(program_id)
 
     messages.success(request, "Order updated")
     return redirect("core:instructor.program_manage", pk=program_id)
@@ -5403,7 +5291,9 @@ def _clone_node(source_node, target_parent, target_program):
 
     from apps.curriculum.models import CurriculumNode
 
-    # Prepare properties - clear any IDs that reference the source
+    # Prepare properties - clear any IDs that reference the source.
+    # Session HTML is only referenced here (content_body), so the clone
+    # shares the stored body until it is edited.
     cloned_properties = copy.deepcopy(source_node.properties or {})
     cloned_properties.pop("quiz_id", None)  # Will be regenerated if quiz is cloned
     cloned_properties.pop("assignment_id", None)
@@ -5529,7 +5419,7 @@ def instructor_node_discussions(request, node_id: int):
             "author_id": t.user.id,
             "is_pinned": t.is_pinned,
             "is_locked": t.is_locked,
-            "replies_count": t.posts.count(),
+            "replies_count": t.post_count,
             "created_at": t.created_at.isoformat(),
         }
         for t in threads
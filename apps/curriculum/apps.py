@@ -5,3 +5,7 @@ class CurriculumConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.curriculum"
     verbose_name = "Curriculum"
+
+    def ready(self):
+        """Import signals when app is ready."""
+        import apps.curriculum.signals  # noqa: F401
@@ -0,0 +1,92 @@
+"""
+Django management command benchmarking curriculum subtree, ancestor and depth lookups.
+
+Builds a synthetic program inside a transaction that is rolled back afterwards,
+then compares the recursive per-level walks with materialized path range queries.
+
+Usage:
+    python manage.py benchmark_curriculum_tree
+    python manage.py benchmark_curriculum_tree --years=10 --units=10 --sessions=49
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.models import Program
+from apps.curriculum.models import CurriculumNode
+from apps.curriculum.repositories import CurriculumNodeRepository
+
+
+class _Rollback(Exception):
+    """Raised to discard the synthetic program."""
+
+
+class Command(BaseCommand):
+    help = 'Benchmark curriculum tree lookups on a synthetic program (default 5,010 nodes)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--years', type=int, default=10)
+        parser.add_argument('--units', type=int, default=10, help='Units per year')
+        parser.add_argument('--sessions', type=int, default=49, help='Sessions per unit')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(options)
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _run(self, options):
+        program = Program.objects.create(name='Benchmark Program', code='BENCH-TREE')
+        years = self._bulk_level(program, [None], options['years'], 'Year')
+        units = self._bulk_level(program, years, options['units'], 'Unit')
+        sessions = self._bulk_level(program, units, options['sessions'], 'Session')
+        count = CurriculumNodeRepository().rebuild_paths(program.id)
+        self.stdout.write(f'Synthetic program: {count} nodes')
+        
+        year = CurriculumNode.objects.get(pk=years[0])
+        session = CurriculumNode.objects.get(pk=sessions[-1])
+        
+        self._report('subtree (recursive walk)', lambda: self._legacy_descendants(year))
+        self._report('subtree (path range)', lambda: list(year.descendants_queryset()))
+        self._report('ancestors (parent walk)', lambda: self._legacy_ancestors(session))
+        self._report('ancestors (path ids)', lambda: session.get_ancestors())
+        self._report('depth (parent walk)', lambda: len(self._legacy_ancestors(session)))
+        self._report('depth (column)', lambda: session.get_depth())
+
+    def _bulk_level(self, program, parent_ids, per_parent, node_type):
+        nodes = [
+            CurriculumNode(
+                program=program, parent_id=parent_id, node_type=node_type,
+                title=f'{node_type} {i}', position=i, is_published=True,
+            )
+            for parent_id in parent_ids
+            for i in range(per_parent)
+        ]
+        return [node.pk for node in CurriculumNode.objects.bulk_create(nodes, batch_size=500)]
+
+    def _legacy_descendants(self, node):
+        descendants = []
+        for child in CurriculumNode.objects.filter(parent=node):
+            descendants.append(child)
+            descendants.extend(self._legacy_descendants(child))
+        return descendants
+
+    def _legacy_ancestors(self, node):
+        ancestors = []
+        parent_id = node.parent_id
+        while parent_id is not None:
+            parent = CurriculumNode.objects.get(pk=parent_id)
+            ancestors.insert(0, parent)
+            parent_id = parent.parent_id
+        return ancestors
+
+    def _report(self, label, func):
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            func()
+            elapsed = (time.perf_counter() - start) * 1000
+        self.stdout.write(f'  {label:<28} {elapsed:9.2f} ms  {len(ctx.captured_queries):5d} queries')
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-17 15:20
+
+from django.db import migrations, models
+
+PATH_SEGMENT_WIDTH = 10
+
+
+def populate_paths(apps, schema_editor):
+    """Compute the materialized path and depth for every existing node."""
+    CurriculumNode = apps.get_model('curriculum', 'CurriculumNode')
+    parents = dict(CurriculumNode.objects.values_list('id', 'parent_id'))
+    paths = {}
+
+    def compute(node_id):
+        if node_id not in paths:
+            parent_id = parents[node_id]
+            prefix = compute(parent_id) if parent_id in parents else ''
+            paths[node_id] = prefix + str(node_id).zfill(PATH_SEGMENT_WIDTH)
+        return paths[node_id]
+
+    batch = []
+    for node in CurriculumNode.objects.only('id').iterator():
+        node.path = compute(node.id)
+        node.depth = len(node.path) // PATH_SEGMENT_WIDTH - 1
+        batch.append(node)
+        if len(batch) >= 500:
+            CurriculumNode.objects.bulk_update(batch, ['path', 'depth'])
+            batch = []
+    if batch:
+        CurriculumNode.objects.bulk_update(batch, ['path', 'depth'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculum', '0004_coursechangerequest_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='curriculumnode',
+            name='depth',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='curriculumnode',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(populate_paths, migrations.RunPython.noop),
+    ]
@@ -3,9 +3,28 @@ Curriculum models - Curriculum nodes and tree structure.
 Migrated from Laravel CurriculumNode model.
 """
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Substr
 from django.core.exceptions import ValidationError
 from apps.core.models import TimeStampedModel
 
+# Width of each zero-padded ID segment in CurriculumNode.path
+PATH_SEGMENT_WIDTH = 10
+
+
+def path_segment(node_id: int) -> str:
+    """Encode a node ID as a fixed-width materialized path segment."""
+    return str(node_id).zfill(PATH_SEGMENT_WIDTH)
+
+
+def path_upper_bound(path: str) -> str:
+    """
+    Return the smallest path greater than every descendant of `path`.
+    Paths are digit-only and fixed-width per segment, so descendants of P are
+    exactly the paths in the open range (P, P + 1) under any collation.
+    """
+    return str(int(path) + 1).zfill(len(path))
+
 
 class CurriculumNode(TimeStampedModel):
     """
@@ -38,6 +57,10 @@ class CurriculumNode(TimeStampedModel):
     unlock_after_days = models.PositiveIntegerField(null=True, blank=True, help_text='Days after enrollment to unlock')
     is_preview = models.BooleanField(default=False, help_text='Allow non-enrolled users to view')
 
+    # Materialized path index: concatenated fixed-width ancestor IDs ending with own ID
+    path = models.CharField(max_length=255, blank=True, default='', db_index=True, editable=False)
+    depth = models.PositiveIntegerField(default=0, editable=False)
+
     class Meta:
         db_table = 'curriculum_nodes'
         ordering = ['position']
@@ -50,13 +73,44 @@ class CurriculumNode(TimeStampedModel):
         return f"{self.node_type}: {self.title}"
 
     def get_depth(self) -> int:
-        """Calculate the depth of this node in the tree (0 = root)."""
-        depth = 0
-        node = self
-        while node.parent is not None:
-            depth += 1
-            node = node.parent
-        return depth
+        """Get the depth of this node in the tree (0 = root)."""
+        if self.parent_id is None:
+            return 0
+        if self._path_matches_parent():
+            return self.depth
+        return self.parent.get_depth() + 1
+
+    def _path_matches_parent(self) -> bool:
+        """Whether the stored path still reflects the node's current parent."""
+        width = PATH_SEGMENT_WIDTH
+        if self.pk is None or len(self.path) < 2 * width or not self.path.endswith(path_segment(self.pk)):
+            return False
+        return int(self.path[-2 * width:-width]) == self.parent_id
+
+    def _expected_path(self) -> str:
+        """Compute this node's materialized path from its parent."""
+        if self.parent_id is None:
+            return path_segment(self.pk)
+        parent_path = self.parent.path or self.parent._expected_path()
+        return parent_path + path_segment(self.pk)
+
+    def descendants_queryset(self):
+        """
+        All descendants as a single indexed range query on the materialized path.
+        A node without a path (bulk-inserted before rebuild_paths) falls back
+        to following parent links, one query per level.
+        """
+        if not self.path:
+            seen = set()
+            level = [self.pk] if self.pk is not None else []
+            while level:
+                children = CurriculumNode.objects.filter(parent_id__in=level).values_list('id', flat=True)
+                level = [pk for pk in children if pk not in seen and pk != self.pk]
+                seen.update(level)
+            return CurriculumNode.objects.filter(pk__in=seen)
+        return CurriculumNode.objects.filter(
+            path__gt=self.path, path__lt=path_upper_bound(self.path)
+        )
 
     def get_label(self) -> str:
         """Get the label for this node's type from the blueprint."""
@@ -69,20 +123,32 @@ class CurriculumNode(TimeStampedModel):
 
     def get_ancestors(self):
         """Return list of ancestor nodes from root to parent."""
-        ancestors = []
-        node = self.parent
-        while node is not None:
-            ancestors.insert(0, node)
-            node = node.parent
-        return ancestors
+        if not self.path:
+            ancestors = []
+            node = self.parent
+            while node is not None:
+                ancestors.insert(0, node)
+                node = node.parent
+            return ancestors
+        ancestor_ids = [
+            int(self.path[i:i + PATH_SEGMENT_WIDTH])
+            for i in range(0, len(self.path) - PATH_SEGMENT_WIDTH, PATH_SEGMENT_WIDTH)
+        ]
+        if not ancestor_ids:
+            return []
+        return list(CurriculumNode.objects.filter(pk__in=ancestor_ids).order_by('depth'))
 
     def get_descendants(self):
-        """Return all descendant nodes recursively."""
-        descendants = []
-        for child in self.children.all():
-            descendants.append(child)
-            descendants.extend(child.get_descendants())
-        return descendants
+        """Return all descendant nodes in sibling preorder."""
+        from apps.curriculum.services import CurriculumGraphService
+        
+        if self.pk is None:
+            return []
+        graph = CurriculumGraphService.get_graph(self.program_id)
+        return sorted(
+            self.descendants_queryset(),
+            key=lambda node: graph.index.get(node.pk, len(graph)),
+        )
 
     def clean(self):
         """Validate node against blueprint constraints."""
@@ -111,6 +177,30 @@ class CurriculumNode(TimeStampedModel):
         if not kwargs.pop('skip_validation', False):
             self.full_clean()
         super().save(*args, **kwargs)
+        self._sync_path()
+
+    def _sync_path(self):
+        """
+        Keep the materialized path and depth consistent after a save.
+        On a move, rewrites the whole subtree's paths in a single UPDATE.
+        """
+        old_path = self.path
+        new_path = self._expected_path()
+        if old_path == new_path:
+            return
+        new_depth = len(new_path) // PATH_SEGMENT_WIDTH - 1
+        
+        if old_path:
+            old_depth = len(old_path) // PATH_SEGMENT_WIDTH - 1
+            CurriculumNode.objects.filter(
+                path__gt=old_path, path__lt=path_upper_bound(old_path)
+            ).update(
+                path=Concat(Value(new_path), Substr('path', len(old_path) + 1)),
+                depth=F('depth') + (new_depth - old_depth),
+            )
+        CurriculumNode.objects.filter(pk=self.pk).update(path=new_path, depth=new_depth)
+        self.path = new_path
+        self.depth = new_depth
 
 
 class CourseChangeRequest(TimeStampedModel):
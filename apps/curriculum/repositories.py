@@ -2,11 +2,11 @@
 Curriculum repositories - Data access layer for curriculum nodes.
 """
 from typing import List, Optional
-from django.db import connection
 from django.db.models import QuerySet
 
-from .models import CurriculumNode
+from .models import CurriculumNode, PATH_SEGMENT_WIDTH, path_segment
 from .exceptions import MaxDepthExceededException
+from .services import CurriculumGraphService
 
 
 class CurriculumNodeRepository:
@@ -14,11 +14,9 @@ class CurriculumNodeRepository:
 
     def get_tree_for_program(self, program_id: int) -> List[CurriculumNode]:
         """
-        Get the complete curriculum tree for a program using recursive CTE.
-        Returns nodes ordered by depth and position.
+        Get the complete curriculum tree for a program in a single query.
+        Returns root nodes ordered by position, with children attached.
         """
-        # For SQLite compatibility, use Django ORM with prefetch
-        # For PostgreSQL, we could use raw SQL with recursive CTE
         nodes = CurriculumNode.objects.filter(
             program_id=program_id
         ).select_related('parent').order_by('position')
@@ -45,6 +43,7 @@ class CurriculumNodeRepository:
     def get_subtree(self, node_id: int) -> List[CurriculumNode]:
         """
         Get a node and all its descendants.
+        Descendants are fetched with one range query on the materialized path.
         """
         try:
             root = CurriculumNode.objects.get(pk=node_id)
@@ -52,7 +51,7 @@ class CurriculumNodeRepository:
             return []
         
         descendants = [root]
-        descendants.extend(root.get_descendants())
+        descendants.extend(root.descendants_queryset().order_by('path'))
         return descendants
 
     def get_ancestors(self, node_id: int) -> List[CurriculumNode]:
@@ -103,11 +102,10 @@ class CurriculumNodeRepository:
 
     def _get_subtree_depth(self, node: CurriculumNode) -> int:
         """Get the maximum depth of the subtree rooted at node."""
-        max_depth = 0
-        for child in node.children.all():
-            child_depth = 1 + self._get_subtree_depth(child)
-            max_depth = max(max_depth, child_depth)
-        return max_depth
+        graph = CurriculumGraphService.get_graph(node.program_id)
+        if node.pk not in graph:
+            return 0
+        return graph.subtree_height(node.pk)
 
     def reorder_siblings(self, node_ids: List[int]) -> List[CurriculumNode]:
         """
@@ -123,6 +121,33 @@ class CurriculumNodeRepository:
         
         return nodes
 
+    def rebuild_paths(self, program_id: int) -> int:
+        """
+        Recompute materialized paths and depths for every node of a program.
+        Used after bulk inserts that bypass CurriculumNode.save().
+        
+        Returns:
+            Number of nodes updated
+        """
+        nodes = list(
+            CurriculumNode.objects.filter(program_id=program_id).only('id', 'parent_id')
+        )
+        node_map = {node.pk: node for node in nodes}
+        paths = {}
+        
+        def compute(node):
+            if node.pk not in paths:
+                parent = node_map.get(node.parent_id)
+                prefix = compute(parent) if parent is not None else ''
+                paths[node.pk] = prefix + path_segment(node.pk)
+            return paths[node.pk]
+        
+        for node in nodes:
+            node.path = compute(node)
+            node.depth = len(node.path) // PATH_SEGMENT_WIDTH - 1
+        CurriculumNode.objects.bulk_update(nodes, ['path', 'depth'], batch_size=500)
+        return len(nodes)
+
     def get_siblings(self, node_id: int) -> QuerySet:
         """Get all siblings of a node (same parent)."""
         node = CurriculumNode.objects.get(pk=node_id)
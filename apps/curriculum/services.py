@@ -1,8 +1,13 @@
 """
-Curriculum services - Node properties handling and validation.
+Curriculum services - Node properties handling, validation and compiled trees.
 """
-from typing import Dict, Any
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
 
 from .models import CurriculumNode
 
@@ -55,3 +60,209 @@ class NodePropertiesService:
             )
         
         return True
+
+
+@dataclass(frozen=True)
+class GraphNode:
+    """Lightweight, immutable view of a curriculum node inside a CurriculumGraph."""
+    id: int
+    parent_id: Optional[int]
+    title: str
+    node_type: str
+    code: Optional[str]
+    position: int
+    is_published: bool
+    depth: int
+    preorder: int
+    is_leaf: bool
+
+
+@dataclass(frozen=True)
+class CurriculumGraph:
+    """
+    Compiled, immutable curriculum tree for a single program.
+    Nodes are stored in preorder; children are kept in sibling order
+    (position, id) so any traversal can be answered without queries.
+    """
+    program_id: int
+    version: str
+    nodes: Tuple[GraphNode, ...]
+    child_ids: Dict[Optional[int], Tuple[int, ...]] = field(repr=False)
+    subtree_end: Tuple[int, ...] = field(repr=False)
+    index: Dict[int, int] = field(repr=False)
+
+    @classmethod
+    def compile(cls, program_id: int, rows: List[Dict[str, Any]], version: str = '') -> 'CurriculumGraph':
+        """
+        Compile a graph from flat node rows.
+        
+        Args:
+            program_id: The program the rows belong to
+            rows: Dicts with id, parent_id, title, node_type, code, position, is_published
+            version: Version stamp the graph was compiled for
+            
+        Returns:
+            The compiled CurriculumGraph
+        """
+        row_map = {row['id']: row for row in rows}
+        children: Dict[Optional[int], List[Dict[str, Any]]] = {}
+        for row in rows:
+            parent_id = row['parent_id']
+            if parent_id is not None and parent_id not in row_map:
+                continue  # Orphaned rows are unreachable from the roots
+            children.setdefault(parent_id, []).append(row)
+        for siblings in children.values():
+            siblings.sort(key=lambda r: (r['position'], r['id']))
+        
+        nodes: List[GraphNode] = []
+        subtree_end: List[int] = []
+        stack = [(row, 0, False) for row in reversed(children.get(None, []))]
+        while stack:
+            row, depth, exiting = stack.pop()
+            if exiting:
+                subtree_end[row['_preorder']] = len(nodes)
+                continue
+            preorder = len(nodes)
+            row['_preorder'] = preorder
+            nodes.append(GraphNode(
+                id=row['id'],
+                parent_id=row['parent_id'],
+                title=row['title'],
+                node_type=row['node_type'],
+                code=row['code'],
+                position=row['position'],
+                is_published=row['is_published'],
+                depth=depth,
+                preorder=preorder,
+                is_leaf=row['id'] not in children,
+            ))
+            subtree_end.append(preorder + 1)
+            stack.append((row, depth, True))
+            for child in reversed(children.get(row['id'], [])):
+                stack.append((child, depth + 1, False))
+        
+        return cls(
+            program_id=program_id,
+            version=version,
+            nodes=tuple(nodes),
+            child_ids={
+                parent_id: tuple(r['id'] for r in siblings)
+                for parent_id, siblings in children.items()
+            },
+            subtree_end=tuple(subtree_end),
+            index={node.id: node.preorder for node in nodes},
+        )
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, node_id: int) -> bool:
+        return node_id in self.index
+
+    def get(self, node_id: int) -> GraphNode:
+        """Return the graph node with the given ID."""
+        return self.nodes[self.index[node_id]]
+
+    def roots(self, published_only: bool = False) -> List[GraphNode]:
+        """Return root nodes in sibling order."""
+        return self.children(None, published_only)
+
+    def children(self, node_id: Optional[int], published_only: bool = False) -> List[GraphNode]:
+        """Return the children of a node (or the roots for None) in sibling order."""
+        result = [self.get(child_id) for child_id in self.child_ids.get(node_id, ())]
+        if published_only:
+            result = [node for node in result if node.is_published]
+        return result
+
+    def has_children(self, node_id: int, published_only: bool = False) -> bool:
+        """Whether a node has any (optionally published) children."""
+        return bool(self.children(node_id, published_only))
+
+    def descendant_ids(self, node_id: int) -> List[int]:
+        """Return IDs of all descendants of a node in preorder."""
+        start = self.index[node_id]
+        return [node.id for node in self.nodes[start + 1:self.subtree_end[start]]]
+
+    def ancestor_ids(self, node_id: int) -> List[int]:
+        """Return IDs of all ancestors of a node from root to parent."""
+        ancestors = []
+        parent_id = self.get(node_id).parent_id
+        while parent_id is not None:
+            ancestors.insert(0, parent_id)
+            parent_id = self.get(parent_id).parent_id
+        return ancestors
+
+    def depth(self, node_id: int) -> int:
+        """Return the depth of a node (0 = root)."""
+        return self.get(node_id).depth
+
+    def subtree_height(self, node_id: int) -> int:
+        """Return the maximum depth of the subtree rooted at a node, relative to it."""
+        start = self.index[node_id]
+        base = self.nodes[start].depth
+        return max(node.depth for node in self.nodes[start:self.subtree_end[start]]) - base
+
+
+class CurriculumGraphService:
+    """
+    Serves compiled curriculum graphs from Django's cache framework.
+    Graphs are keyed by a per-program version stamp that is bumped once the
+    transaction saving, deleting or reordering a node commits, so a reader
+    never caches uncommitted rows under the new stamp. Stamps are shared
+    through the configured cache (see CACHES); they also expire after
+    VERSION_TIMEOUT, which bounds how long a process-local cache can serve
+    a graph another process has changed.
+    """
+
+    CACHE_TIMEOUT = 60 * 60 * 24
+    VERSION_TIMEOUT = 60 * 5
+    VERSION_KEY = 'curriculum_graph:version:{program_id}'
+    GRAPH_KEY = 'curriculum_graph:{program_id}:{version}'
+    FIELDS = ('id', 'parent_id', 'title', 'node_type', 'code', 'position', 'is_published')
+
+    @classmethod
+    def get_graph(cls, program_id: int) -> CurriculumGraph:
+        """
+        Get the compiled graph for a program, compiling it on a cache miss.
+        
+        Args:
+            program_id: The program to get the graph for
+            
+        Returns:
+            The CurriculumGraph for the program's current version
+        """
+        version = cls.get_version(program_id)
+        key = cls.GRAPH_KEY.format(program_id=program_id, version=version)
+        graph = cache.get(key)
+        if graph is None:
+            rows = list(
+                CurriculumNode.objects.filter(program_id=program_id).values(*cls.FIELDS)
+            )
+            graph = CurriculumGraph.compile(program_id, rows, version)
+            cache.set(key, graph, cls.CACHE_TIMEOUT)
+        return graph
+
+    @classmethod
+    def get_version(cls, program_id: int) -> str:
+        """Get the current version stamp for a program, creating one if missing."""
+        key = cls.VERSION_KEY.format(program_id=program_id)
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, uuid.uuid4().hex, cls.VERSION_TIMEOUT)
+            version = cache.get(key)
+        return version
+
+    @classmethod
+    def invalidate(cls, program_id: int) -> None:
+        """
+        Record a curriculum change: advance the program's curriculum_revision
+        in the current transaction and bump the version stamp on commit so
+        the next read recompiles the graph.
+        """
+        from apps.core.models import Program
+
+        Program.objects.filter(pk=program_id).update(
+            curriculum_revision=F('curriculum_revision') + 1
+        )
+        key = cls.VERSION_KEY.format(program_id=program_id)
+        transaction.on_commit(lambda: cache.set(key, uuid.uuid4().hex, cls.VERSION_TIMEOUT))
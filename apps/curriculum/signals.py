@@ -0,0 +1,23 @@
+"""
+Curriculum signals - Compiled graph invalidation.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.core.models import Program
+from .models import CurriculumNode
+from .services import CurriculumGraphService
+
+
+@receiver(post_save, sender=CurriculumNode)
+@receiver(post_delete, sender=CurriculumNode)
+def on_curriculum_node_changed(sender, instance, **kwargs):
+    """Invalidate the program's compiled graph when a node changes."""
+    CurriculumGraphService.invalidate(instance.program_id)
+
+
+@receiver(post_save, sender=Program)
+def on_program_saved(sender, instance, created, **kwargs):
+    """Start new programs from a fresh graph version."""
+    if created:
+        CurriculumGraphService.invalidate(instance.pk)
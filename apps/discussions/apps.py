@@ -3,3 +3,7 @@ from django.apps import AppConfig
 class DiscussionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.discussions'
+
+    def ready(self):
+        """Import signals when app is ready."""
+        import apps.discussions.signals  # noqa: F401
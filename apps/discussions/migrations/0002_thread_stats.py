@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:55
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def backfill_stats(apps, schema_editor):
+    """Count the posts of every existing thread and record the latest one."""
+    DiscussionThread = apps.get_model('discussions', 'DiscussionThread')
+    threads = DiscussionThread.objects.annotate(
+        actual_count=Count('posts'),
+        actual_last=Max('posts__created_at'),
+    ).only('id')
+
+    batch = []
+    for thread in threads.iterator(chunk_size=500):
+        if not thread.actual_count:
+            continue
+        thread.post_count = thread.actual_count
+        thread.last_post_at = thread.actual_last
+        batch.append(thread)
+        if len(batch) >= 500:
+            DiscussionThread.objects.bulk_update(batch, ['post_count', 'last_post_at'])
+            batch = []
+    if batch:
+        DiscussionThread.objects.bulk_update(batch, ['post_count', 'last_post_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('discussions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='discussionthread',
+            name='last_post_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='discussionthread',
+            name='post_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='discussionthread',
+            index=models.Index(fields=['node', '-is_pinned', '-created_at'], name='thread_node_listing_idx'),
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,122 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE discussion_search_fts USING fts5("
+    "title, body, content='discussion_search_documents', content_rowid='id', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER discussion_search_ai AFTER INSERT ON discussion_search_documents BEGIN "
+    "INSERT INTO discussion_search_fts(rowid, title, body) VALUES (new.id, new.title, new.body); "
+    "END",
+    "CREATE TRIGGER discussion_search_ad AFTER DELETE ON discussion_search_documents BEGIN "
+    "INSERT INTO discussion_search_fts(discussion_search_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); "
+    "END",
+    "CREATE TRIGGER discussion_search_au AFTER UPDATE ON discussion_search_documents BEGIN "
+    "INSERT INTO discussion_search_fts(discussion_search_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO discussion_search_fts(rowid, title, body) VALUES (new.id, new.title, new.body); "
+    "END",
+]
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS discussion_search_au",
+    "DROP TRIGGER IF EXISTS discussion_search_ad",
+    "DROP TRIGGER IF EXISTS discussion_search_ai",
+    "DROP TABLE IF EXISTS discussion_search_fts",
+]
+
+MYSQL_FORWARD = [
+    "ALTER TABLE discussion_search_documents ADD FULLTEXT INDEX discussion_search_ft (title, body)",
+]
+MYSQL_REVERSE = [
+    "ALTER TABLE discussion_search_documents DROP INDEX discussion_search_ft",
+]
+
+POSTGRESQL_FORWARD = [
+    "ALTER TABLE discussion_search_documents ADD COLUMN search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(body, '')), 'B')"
+    ") STORED",
+    "CREATE INDEX discussion_search_vector_idx ON discussion_search_documents USING GIN (search_vector)",
+]
+POSTGRESQL_REVERSE = [
+    "DROP INDEX IF EXISTS discussion_search_vector_idx",
+    "ALTER TABLE discussion_search_documents DROP COLUMN IF EXISTS search_vector",
+]
+
+FULLTEXT_SQL = {
+    'sqlite': (SQLITE_FORWARD, SQLITE_REVERSE),
+    'mysql': (MYSQL_FORWARD, MYSQL_REVERSE),
+    'postgresql': (POSTGRESQL_FORWARD, POSTGRESQL_REVERSE),
+}
+
+
+def create_fulltext_index(apps, schema_editor):
+    forward, _ = FULLTEXT_SQL.get(schema_editor.connection.vendor, ([], []))
+    for statement in forward:
+        schema_editor.execute(statement)
+
+
+def drop_fulltext_index(apps, schema_editor):
+    _, reverse = FULLTEXT_SQL.get(schema_editor.connection.vendor, ([], []))
+    for statement in reverse:
+        schema_editor.execute(statement)
+
+
+def backfill_documents(apps, schema_editor):
+    """Index every existing thread and post; the full-text index follows the rows."""
+    DiscussionThread = apps.get_model('discussions', 'DiscussionThread')
+    DiscussionPost = apps.get_model('discussions', 'DiscussionPost')
+    DiscussionSearchDocument = apps.get_model('discussions', 'DiscussionSearchDocument')
+
+    batch = []
+    threads = DiscussionThread.objects.values_list('id', 'node_id', 'title', 'content')
+    for pk, node_id, title, content in threads.iterator(chunk_size=500):
+        batch.append(DiscussionSearchDocument(
+            kind='thread', object_id=pk, thread_id=pk, node_id=node_id, title=title, body=content
+        ))
+        if len(batch) >= 500:
+            DiscussionSearchDocument.objects.bulk_create(batch)
+            batch = []
+    posts = DiscussionPost.objects.values_list('id', 'thread_id', 'thread__node_id', 'content')
+    for pk, thread_id, node_id, content in posts.iterator(chunk_size=500):
+        batch.append(DiscussionSearchDocument(
+            kind='post', object_id=pk, thread_id=thread_id, node_id=node_id, body=content
+        ))
+        if len(batch) >= 500:
+            DiscussionSearchDocument.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        DiscussionSearchDocument.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('discussions', '0002_thread_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DiscussionSearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('thread', 'Thread'), ('post', 'Post')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('node_id', models.BigIntegerField(db_index=True)),
+                ('title', models.CharField(blank=True, max_length=255)),
+                ('body', models.TextField()),
+                ('thread', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_documents', to='discussions.discussionthread')),
+            ],
+            options={
+                'db_table': 'discussion_search_documents',
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+        migrations.RunPython(backfill_documents, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from apps.curriculum.models import CurriculumNode
 from apps.core.models import TimeStampedModel
@@ -14,6 +14,16 @@ class DiscussionThread(TimeStampedModel):
     is_pinned = models.BooleanField(default=False)
     is_locked = models.BooleanField(default=False)
 
+    # Denormalized post stats, maintained by the DiscussionPost signals in
+    # signals.py; ThreadStatsService.rebuild repairs rows written without them
+    post_count = models.PositiveIntegerField(default=0)
+    last_post_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['node', '-is_pinned', '-created_at'], name='thread_node_listing_idx'),
+        ]
+
     def __str__(self):
         return f"{self.title} - {self.node.title}"
 
@@ -26,5 +36,37 @@ class DiscussionPost(TimeStampedModel):
     content = models.TextField()
     parent = models.ForeignKey('self', null=True, blank=True, on_delete=models.CASCADE, related_name='replies')
 
+    def save(self, *args, **kwargs):
+        # post_save updates the thread's stats; commit both or neither
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     def __str__(self):
         return f"Post by {self.user} in {self.thread.title}"
+
+
+class DiscussionSearchDocument(models.Model):
+    """
+    Searchable text of one thread or post.
+    Kept in step by the discussion signals. The database's full-text index
+    over it (SQLite FTS5, MySQL FULLTEXT or a PostgreSQL tsvector column)
+    is created by migration 0003 and queried through apps.discussions.search.
+    """
+    KIND_CHOICES = [
+        ('thread', 'Thread'),
+        ('post', 'Post'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    thread = models.ForeignKey(DiscussionThread, on_delete=models.CASCADE, related_name='search_documents')
+    node_id = models.BigIntegerField(db_index=True)
+    title = models.CharField(max_length=255, blank=True)
+    body = models.TextField()
+
+    class Meta:
+        db_table = 'discussion_search_documents'
+        unique_together = ['kind', 'object_id']
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}"
@@ -0,0 +1,263 @@
+"""
+Discussion search - Full-text search over threads and posts.
+
+Each database engine gets its native full-text index, chosen by the
+connection's vendor like the indexes in migration 0003:
+SQLite FTS5, MySQL FULLTEXT or a PostgreSQL tsvector column. All of them
+index DiscussionSearchDocument rows, which the discussion signals keep in
+step with threads and posts, and return hits best match first.
+"""
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from itertools import chain, islice
+from typing import List, Optional
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.db.models import Case, IntegerField, When
+from rest_framework.filters import BaseFilterBackend
+
+from .models import DiscussionPost, DiscussionSearchDocument, DiscussionThread
+
+
+@dataclass
+class SearchHit:
+    kind: str
+    object_id: int
+    thread_id: int
+
+
+class DiscussionSearchBackend(ABC):
+    """
+    Abstract base class for ranked full-text queries against the engine's
+    discussion index.
+    """
+
+    TABLE = DiscussionSearchDocument._meta.db_table
+
+    def search(
+        self,
+        query: str,
+        kind: Optional[str] = None,
+        node_id: Optional[int] = None,
+        limit: int = 100,
+    ) -> List[SearchHit]:
+        """
+        Find threads and posts matching a query, best match first.
+        
+        Args:
+            query: User-entered search text
+            kind: 'thread' or 'post' to restrict hits, or None for both
+            node_id: Restrict hits to one curriculum node
+            limit: Maximum number of hits
+            
+        Returns:
+            List of SearchHit
+        """
+        if not query.strip():
+            return []
+        sql, params = self.build(query, kind, node_id, limit)
+        if sql is None:
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [SearchHit(*row) for row in cursor.fetchall()]
+
+    @abstractmethod
+    def build(self, query, kind, node_id, limit):
+        """
+        Build the engine's search query.
+        
+        Args:
+            query: Non-blank user-entered search text
+            kind: 'thread' or 'post' to restrict hits, or None for both
+            node_id: Restrict hits to one curriculum node
+            limit: Maximum number of hits
+            
+        Returns:
+            (sql, params) selecting kind, object_id and thread_id best match
+            first, or (None, []) if the query can match nothing
+        """
+        pass
+
+    @staticmethod
+    def _filters(kind, node_id, prefix=''):
+        clauses, params = [], []
+        if kind:
+            clauses.append(f'{prefix}kind = %s')
+            params.append(kind)
+        if node_id is not None:
+            clauses.append(f'{prefix}node_id = %s')
+            params.append(node_id)
+        return ''.join(f' AND {c}' for c in clauses), params
+
+
+class SQLiteSearchBackend(DiscussionSearchBackend):
+    """FTS5 external-content table, ranked by bm25 with titles weighted up."""
+
+    FTS_TABLE = 'discussion_search_fts'
+
+    def build(self, query, kind, node_id, limit):
+        # Quote each word so FTS5 query syntax in user input is inert
+        terms = re.findall(r'\w+', query)
+        if not terms:
+            return None, []
+        match = ' '.join(f'"{term}"' for term in terms)
+        where, params = self._filters(kind, node_id, prefix='d.')
+        sql = (
+            f'SELECT d.kind, d.object_id, d.thread_id FROM {self.FTS_TABLE} '
+            f'JOIN {self.TABLE} d ON d.id = {self.FTS_TABLE}.rowid '
+            f'WHERE {self.FTS_TABLE} MATCH %s{where} '
+            f'ORDER BY bm25({self.FTS_TABLE}, 2.0, 1.0) LIMIT %s'
+        )
+        return sql, [match, *params, limit]
+
+
+class MySQLSearchBackend(DiscussionSearchBackend):
+    """InnoDB FULLTEXT index on (title, body) in natural language mode."""
+
+    def build(self, query, kind, node_id, limit):
+        where, params = self._filters(kind, node_id)
+        match = 'MATCH(title, body) AGAINST (%s IN NATURAL LANGUAGE MODE)'
+        sql = (
+            f'SELECT kind, object_id, thread_id FROM {self.TABLE} '
+            f'WHERE {match}{where} ORDER BY {match} DESC LIMIT %s'
+        )
+        return sql, [query, *params, query, limit]
+
+
+class PostgreSQLSearchBackend(DiscussionSearchBackend):
+    """Generated, GIN-indexed tsvector column ranked with ts_rank_cd."""
+
+    def build(self, query, kind, node_id, limit):
+        where, params = self._filters(kind, node_id)
+        sql = (
+            f"SELECT kind, object_id, thread_id FROM {self.TABLE}, "
+            f"websearch_to_tsquery('english', %s) AS query "
+            f"WHERE search_vector @@ query{where} "
+            f"ORDER BY ts_rank_cd(search_vector, query) DESC LIMIT %s"
+        )
+        return sql, [query, *params, limit]
+
+
+BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'mysql': MySQLSearchBackend,
+    'postgresql': PostgreSQLSearchBackend,
+}
+
+
+def get_search_backend() -> DiscussionSearchBackend:
+    """The search backend for the default database connection's vendor."""
+    try:
+        return BACKENDS[connection.vendor]()
+    except KeyError:
+        raise ImproperlyConfigured(f'No discussion search backend for {connection.vendor!r} databases')
+
+
+class DiscussionSearchIndex:
+    """Incremental maintenance of DiscussionSearchDocument rows."""
+
+    @staticmethod
+    def index_thread(thread: DiscussionThread) -> None:
+        DiscussionSearchDocument.objects.update_or_create(
+            kind='thread',
+            object_id=thread.pk,
+            defaults={
+                'thread_id': thread.pk,
+                'node_id': thread.node_id,
+                'title': thread.title,
+                'body': thread.content,
+            },
+        )
+
+    @staticmethod
+    def index_post(post: DiscussionPost) -> None:
+        DiscussionSearchDocument.objects.update_or_create(
+            kind='post',
+            object_id=post.pk,
+            defaults={
+                'thread_id': post.thread_id,
+                'node_id': post.thread.node_id,
+                'title': '',
+                'body': post.content,
+            },
+        )
+
+    @staticmethod
+    def remove(kind: str, object_id: int) -> None:
+        DiscussionSearchDocument.objects.filter(kind=kind, object_id=object_id).delete()
+
+    @staticmethod
+    def rebuild(batch_size: int = 1000) -> int:
+        """
+        Recreate every search document from threads and posts.
+        
+        Returns:
+            Number of documents written
+        """
+        threads = DiscussionThread.objects.values_list('id', 'node_id', 'title', 'content')
+        posts = DiscussionPost.objects.values_list('id', 'thread_id', 'thread__node_id', 'content')
+        documents = chain(
+            (
+                DiscussionSearchDocument(
+                    kind='thread', object_id=pk, thread_id=pk, node_id=node_id, title=title, body=content
+                )
+                for pk, node_id, title, content in threads.iterator(chunk_size=batch_size)
+            ),
+            (
+                DiscussionSearchDocument(
+                    kind='post', object_id=pk, thread_id=thread_id, node_id=node_id, body=content
+                )
+                for pk, thread_id, node_id, content in posts.iterator(chunk_size=batch_size)
+            ),
+        )
+
+        DiscussionSearchDocument.objects.all().delete()
+        written = 0
+        while True:
+            batch = list(islice(documents, batch_size))
+            if not batch:
+                return written
+            written += len(DiscussionSearchDocument.objects.bulk_create(batch))
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    ?search= filter backed by the full-text index, ordered by relevance.
+    Views set search_kind: 'thread' matches threads by their own text or
+    any of their posts; 'post' matches posts only. At most MAX_HITS hits
+    are considered, which keeps each query bounded as the forum grows.
+    """
+
+    MAX_HITS = 500
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '')
+        if not query.strip():
+            return queryset
+
+        kind = getattr(view, 'search_kind', 'thread')
+        # Narrow the index query itself, so a node's matches are not crowded
+        # out of MAX_HITS by other nodes
+        node = request.query_params.get('node', '')
+        hits = get_search_backend().search(
+            query,
+            kind=None if kind == 'thread' else kind,
+            node_id=int(node) if node.isdigit() else None,
+            limit=self.MAX_HITS,
+        )
+        # A thread ranks at its best-matching document
+        ids = list(dict.fromkeys(
+            hit.thread_id if kind == 'thread' else hit.object_id for hit in hits
+        ))
+        if not ids:
+            return queryset.none()
+
+        relevance = Case(
+            *[When(pk=pk, then=position) for position, pk in enumerate(ids)],
+            output_field=IntegerField(),
+        )
+        return queryset.filter(pk__in=ids).order_by(relevance)
@@ -20,7 +20,7 @@ class DiscussionPostSerializer(serializers.ModelSerializer):
 
     def get_is_owner(self, obj):
         request = self.context.get('request')
-        return request.user == obj.user if request else False
+        return obj.user_id == request.user.id if request else False
 
     def create(self, validated_data):
         request = self.context.get('request')
@@ -29,7 +29,7 @@ class DiscussionPostSerializer(serializers.ModelSerializer):
 
 class DiscussionThreadSerializer(serializers.ModelSerializer):
     user = UserMiniSerializer(read_only=True)
-    posts_count = serializers.IntegerField(source='posts.count', read_only=True)
+    posts_count = serializers.IntegerField(source='post_count', read_only=True)
     latest_post_at = serializers.SerializerMethodField()
     is_owner = serializers.SerializerMethodField()
 
@@ -39,12 +39,11 @@ class DiscussionThreadSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'user', 'created_at', 'updated_at', 'posts_count', 'latest_post_at', 'is_owner']
 
     def get_latest_post_at(self, obj):
-        latest = obj.posts.order_by('-created_at').first()
-        return latest.created_at if latest else obj.created_at
+        return obj.last_post_at or obj.created_at
 
     def get_is_owner(self, obj):
         request = self.context.get('request')
-        return request.user == obj.user if request else False
+        return obj.user_id == request.user.id if request else False
         
     def create(self, validated_data):
         request = self.context.get('request')
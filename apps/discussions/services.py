@@ -0,0 +1,194 @@
+"""
+Discussion services - Denormalized thread statistics and paginated feeds.
+"""
+from datetime import datetime
+from typing import Iterable, Optional
+
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from apps.core.pagination import decode_cursor, encode_cursor, parse_flag
+
+from .models import DiscussionPost, DiscussionThread
+
+
+class ThreadStatsService:
+    """
+    Keeps DiscussionThread.post_count and last_post_at in step with the
+    thread's posts. Each change is a single conditional UPDATE, so
+    concurrent replies never lose an increment.
+    """
+
+    @staticmethod
+    def record_post(post: DiscussionPost) -> None:
+        """Count a newly created post against its thread."""
+        DiscussionThread.objects.filter(pk=post.thread_id).update(
+            post_count=F('post_count') + 1,
+            last_post_at=Greatest(Coalesce('last_post_at', Value(post.created_at)), Value(post.created_at)),
+        )
+
+    @staticmethod
+    def record_post_deleted(post: DiscussionPost) -> None:
+        """Uncount a deleted post, recomputing last_post_at from the posts left."""
+        latest = (
+            DiscussionPost.objects.filter(thread=OuterRef('pk'))
+            .order_by('-created_at')
+            .values('created_at')[:1]
+        )
+        DiscussionThread.objects.filter(pk=post.thread_id, post_count__gt=0).update(
+            post_count=F('post_count') - 1,
+            last_post_at=Subquery(latest),
+        )
+
+    @staticmethod
+    def rebuild(thread_ids: Optional[Iterable[int]] = None) -> int:
+        """
+        Recompute stats from the posts table.
+        
+        Args:
+            thread_ids: Threads to rebuild, or None for every thread
+            
+        Returns:
+            Number of threads whose stored stats were wrong
+        """
+        threads = DiscussionThread.objects.annotate(
+            actual_count=Count('posts'),
+            actual_last=Max('posts__created_at'),
+        ).only('id', 'post_count', 'last_post_at')
+        if thread_ids is not None:
+            threads = threads.filter(pk__in=list(thread_ids))
+
+        drifted = []
+        for thread in threads.iterator(chunk_size=1000):
+            if thread.post_count != thread.actual_count or thread.last_post_at != thread.actual_last:
+                thread.post_count = thread.actual_count
+                thread.last_post_at = thread.actual_last
+                drifted.append(thread)
+        DiscussionThread.objects.bulk_update(drifted, ['post_count', 'last_post_at'], batch_size=1000)
+        return len(drifted)
+
+
+class DiscussionFeedService:
+    """
+    Keyset-paginated discussion pages for the course player.
+    Threads are listed pinned first, then newest first; replies to a thread
+    or to a post (DiscussionPost.parent) oldest first. Each page seeks past
+    an opaque cursor instead of counting an offset, so a page costs the
+    same few queries however deep it is and however busy the node.
+    """
+
+    PAGE_SIZE = 20
+    MAX_PAGE_SIZE = 100
+
+    @classmethod
+    def thread_page(cls, node_id: int, cursor: Optional[str] = None, limit: int = None) -> dict:
+        """
+        Get a page of a node's threads, without their replies.
+        
+        Args:
+            node_id: Curriculum node whose threads to list
+            cursor: Cursor returned with the previous page, or None
+            limit: Page size, capped at MAX_PAGE_SIZE
+            
+        Returns:
+            Dict with threads and nextCursor (None on the last page)
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        limit = cls._limit(limit)
+        threads = DiscussionThread.objects.filter(node_id=node_id).select_related('user')
+        if cursor:
+            pinned, created_at, pk = decode_cursor(cursor, parse_flag, datetime.fromisoformat, int)
+            threads = threads.filter(
+                Q(is_pinned__lt=pinned)
+                | Q(is_pinned=pinned, created_at__lt=created_at)
+                | Q(is_pinned=pinned, created_at=created_at, pk__lt=pk)
+            )
+        threads = list(threads.order_by('-is_pinned', '-created_at', '-id')[:limit + 1])
+
+        next_cursor = None
+        if len(threads) > limit:
+            threads = threads[:limit]
+            last = threads[-1]
+            next_cursor = encode_cursor(last.is_pinned, last.created_at, last.pk)
+        return {
+            'threads': [cls.serialize_thread(thread) for thread in threads],
+            'nextCursor': next_cursor,
+        }
+
+    @classmethod
+    def reply_page(
+        cls,
+        thread_id: int,
+        parent_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = None,
+    ) -> dict:
+        """
+        Get a page of replies, oldest first.
+        
+        Args:
+            thread_id: Thread the replies belong to
+            parent_id: Post whose replies to list, or None for direct replies to the thread
+            cursor: Cursor returned with the previous page, or None
+            limit: Page size, capped at MAX_PAGE_SIZE
+            
+        Returns:
+            Dict with posts (each with its replyCount) and nextCursor
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        limit = cls._limit(limit)
+        posts = DiscussionPost.objects.filter(thread_id=thread_id, parent_id=parent_id).select_related('user')
+        if cursor:
+            created_at, pk = decode_cursor(cursor, datetime.fromisoformat, int)
+            posts = posts.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk))
+        posts = list(
+            posts.annotate(reply_count=Count('replies')).order_by('created_at', 'id')[:limit + 1]
+        )
+
+        next_cursor = None
+        if len(posts) > limit:
+            posts = posts[:limit]
+            next_cursor = encode_cursor(posts[-1].created_at, posts[-1].pk)
+        return {
+            'posts': [cls.serialize_post(post) for post in posts],
+            'nextCursor': next_cursor,
+        }
+
+    @staticmethod
+    def serialize_thread(thread: DiscussionThread) -> dict:
+        return {
+            'id': thread.id,
+            'title': thread.title,
+            'content': thread.content,
+            'isPinned': thread.is_pinned,
+            'isLocked': thread.is_locked,
+            'createdAt': thread.created_at.isoformat(),
+            'postCount': thread.post_count,
+            'lastPostAt': thread.last_post_at.isoformat() if thread.last_post_at else None,
+            'user': {
+                'id': thread.user.id,
+                'name': thread.user.get_full_name() or thread.user.email,
+            },
+        }
+
+    @staticmethod
+    def serialize_post(post: DiscussionPost) -> dict:
+        return {
+            'id': post.id,
+            'parentId': post.parent_id,
+            'content': post.content,
+            'createdAt': post.created_at.isoformat(),
+            'replyCount': post.reply_count,
+            'user': {
+                'id': post.user.id,
+                'name': post.user.get_full_name() or post.user.email,
+            },
+        }
+
+    @classmethod
+    def _limit(cls, limit: Optional[int]) -> int:
+        return min(max(limit or cls.PAGE_SIZE, 1), cls.MAX_PAGE_SIZE)
@@ -0,0 +1,30 @@
+"""
+Discussion signals - Thread stats and search index maintenance.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import DiscussionPost, DiscussionThread
+from .search import DiscussionSearchIndex
+from .services import ThreadStatsService
+
+
+@receiver(post_save, sender=DiscussionThread)
+def on_thread_saved(sender, instance, **kwargs):
+    """Index the thread's current title and content."""
+    DiscussionSearchIndex.index_thread(instance)
+
+
+@receiver(post_save, sender=DiscussionPost)
+def on_post_saved(sender, instance, created, **kwargs):
+    """Count a new post against its thread and index its content."""
+    if created:
+        ThreadStatsService.record_post(instance)
+    DiscussionSearchIndex.index_post(instance)
+
+
+@receiver(post_delete, sender=DiscussionPost)
+def on_post_deleted(sender, instance, **kwargs):
+    """Uncount and unindex a deleted post, including posts removed by cascade."""
+    ThreadStatsService.record_post_deleted(instance)
+    DiscussionSearchIndex.remove('post', instance.pk)
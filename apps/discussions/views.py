@@ -1,19 +1,32 @@
-from rest_framework import viewsets, permissions, filters
+from rest_framework import viewsets, permissions
+from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import DiscussionThread, DiscussionPost
+from .search import FullTextSearchFilter
 from .serializers import DiscussionThreadSerializer, DiscussionPostSerializer
 
+
+class DiscussionPagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
 class DiscussionThreadViewSet(viewsets.ModelViewSet):
     """
     API for managing discussion threads.
-    Filter by user or node_id.
+    Filter by user or node_id; ?search= ranks threads by full-text
+    relevance of the thread or any of its posts.
+    Post counts and latest post times are read from the thread's
+    denormalized stats, so a page costs the same queries at any size.
     """
-    queryset = DiscussionThread.objects.all().order_by('-is_pinned', '-created_at')
+    queryset = DiscussionThread.objects.select_related('user').order_by('-is_pinned', '-created_at', '-id')
     serializer_class = DiscussionThreadSerializer
+    pagination_class = DiscussionPagination
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter]
     filterset_fields = ['node', 'user']
-    search_fields = ['title', 'content']
+    search_kind = 'thread'
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -21,13 +34,15 @@ class DiscussionThreadViewSet(viewsets.ModelViewSet):
 class DiscussionPostViewSet(viewsets.ModelViewSet):
     """
     API for managing discussion posts (replies).
-    Filter by thread_id.
+    Filter by thread_id; ?search= ranks posts by full-text relevance.
     """
-    queryset = DiscussionPost.objects.all().order_by('created_at')
+    queryset = DiscussionPost.objects.select_related('user').order_by('created_at', 'id')
     serializer_class = DiscussionPostSerializer
+    pagination_class = DiscussionPagination
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter]
     filterset_fields = ['thread', 'user']
+    search_kind = 'post'
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
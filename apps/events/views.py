@@ -3,13 +3,14 @@ Events views - Public event pages using Inertia.
 """
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.db.models import Count, Max, Q
 from django.shortcuts import get_object_or_404, redirect
 from inertia import render
 
+from apps.core.conditional import conditional_page
 from .models import Event, EventRegistration
 
 
-
 def index(request):
     """
     Renders the events listing page with published events.
@@ -48,6 +49,25 @@ def index(request):
     })
 
 
+def _detail_version(request, slug):
+    """
+    Version of an event page: the archive sidebar covers every published
+    event, so one aggregate over them all, plus the user's registration.
+    """
+    stats = Event.objects.filter(is_published=True).aggregate(
+        event_id=Max('id', filter=Q(slug=slug)),
+        count=Count('id'),
+        updated_at=Max('updated_at'),
+    )
+    if stats['event_id'] is None:
+        return None
+    registered = request.user.is_authenticated and EventRegistration.objects.filter(
+        event_id=stats['event_id'], user=request.user
+    ).exists()
+    return (stats['event_id'], stats['count'], stats['updated_at'], registered)
+
+
+@conditional_page(_detail_version)
 def detail(request, slug):
     """
     Renders the single event detail page.
@@ -63,7 +83,6 @@ def detail(request, slug):
     
     # Calculate Archives (Months with events)
     from django.db.models.functions import TruncMonth
-    from django.db.models import Count
     
     archive_qs = (
         Event.objects.filter(is_published=True)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Notification, NotificationPreference
+from .models import Notification, NotificationBroadcast, NotificationFanoutJob, NotificationPreference
 
 
 @admin.register(Notification)
@@ -16,3 +16,20 @@ class NotificationPreferenceAdmin(admin.ModelAdmin):
     list_display = ['user', 'in_app_enabled', 'email_enabled', 'email_digest']
     list_filter = ['in_app_enabled', 'email_enabled', 'email_digest']
     search_fields = ['user__email']
+
+
+@admin.register(NotificationBroadcast)
+class NotificationBroadcastAdmin(admin.ModelAdmin):
+    list_display = ['id', 'program', 'notification_type', 'title', 'created_at']
+    list_filter = ['notification_type', 'priority', 'created_at']
+    search_fields = ['program__name', 'title', 'message']
+    readonly_fields = ['created_at']
+    ordering = ['-created_at']
+
+
+@admin.register(NotificationFanoutJob)
+class NotificationFanoutJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'announcement', 'status', 'delivered', 'attempts', 'created_at', 'finished_at']
+    list_filter = ['status']
+    readonly_fields = ['created_at', 'heartbeat_at', 'finished_at']
+    ordering = ['-created_at']
@@ -0,0 +1,131 @@
+"""
+Notification fan-out service - Delivers announcements off the request path.
+"""
+from typing import List
+
+from django.conf import settings
+from django.db import transaction
+
+from apps.core.services.job_queue import JobQueue
+from apps.progression.models import Announcement, Enrollment
+
+from .models import (
+    BroadcastExclusion,
+    Notification,
+    NotificationBroadcast,
+    NotificationFanoutJob,
+    NotificationPreference,
+)
+from .services import UnreadCountCache
+
+
+class NotificationFanoutService(JobQueue):
+    """
+    Durable queue of announcement deliveries, backed by NotificationFanoutJob
+    rows. Creating an announcement only records a job; the
+    fanout_notifications worker claims jobs and delivers each one either as
+    a single NotificationBroadcast (large audiences) or as per-user
+    Notification rows inserted CHUNK_SIZE recipients at a time.
+    """
+
+    model = NotificationFanoutJob
+    CLAIM_RELATED = ('announcement__program',)
+    CHUNK_SIZE = 1000
+    NOTIFICATION_TYPE = 'announcement'
+
+    def enqueue(self, announcement: Announcement) -> NotificationFanoutJob:
+        """Queue delivery of an announcement, at most once per announcement."""
+        job, _ = NotificationFanoutJob.objects.get_or_create(announcement=announcement)
+        return job
+
+    def run(self, job: NotificationFanoutJob) -> None:
+        """
+        Deliver one announcement and complete its job.
+        A job that has not delivered any chunk yet becomes a broadcast when
+        its audience reaches NOTIFICATION_BROADCAST_MIN_RECIPIENTS; otherwise
+        it resumes the per-user fan-out after job.cursor.
+        """
+        announcement = job.announcement
+        audience = self.audience(announcement)
+        content = self._content(announcement)
+
+        if job.cursor == 0 and audience.count() >= settings.NOTIFICATION_BROADCAST_MIN_RECIPIENTS:
+            with transaction.atomic():
+                broadcast, created = NotificationBroadcast.objects.get_or_create(
+                    announcement=announcement,
+                    defaults={'program_id': announcement.program_id, **content},
+                )
+                if created:
+                    self._exclude_outside_audience(broadcast, announcement)
+                self._complete(job)
+                UnreadCountCache.invalidate_broadcasts()
+            return
+
+        while True:
+            user_ids = list(audience.filter(user_id__gt=job.cursor).order_by('user_id')[:self.CHUNK_SIZE])
+            if not user_ids:
+                break
+            recipients = self.recipients(user_ids)
+            with transaction.atomic():
+                Notification.objects.bulk_create(
+                    [
+                        Notification(
+                            recipient_id=user_id,
+                            related_program_id=announcement.program_id,
+                            related_announcement_id=announcement.pk,
+                            **content,
+                        )
+                        for user_id in recipients
+                    ],
+                    ignore_conflicts=True,
+                )
+                # The cursor commits with its chunk, so a retry resumes after it
+                job.cursor = user_ids[-1]
+                job.delivered += len(recipients)
+                self.lock_owned(job)
+                job.save(update_fields=['cursor', 'delivered', 'updated_at'])
+                UnreadCountCache.invalidate(*recipients)
+        self._complete(job)
+
+    def audience(self, announcement: Announcement):
+        """User ids of the students enrolled in the program when it was announced."""
+        return Enrollment.objects.filter(
+            program_id=announcement.program_id,
+            status='active',
+            enrolled_at__lte=announcement.created_at,
+        ).values_list('user_id', flat=True)
+
+    def recipients(self, user_ids: List[int]) -> List[int]:
+        """The user ids whose preferences allow in-app announcements."""
+        muted = {
+            preference.user_id
+            for preference in NotificationPreference.objects.filter(user_id__in=user_ids)
+            if not preference.allows_in_app(self.NOTIFICATION_TYPE)
+        }
+        return [user_id for user_id in user_ids if user_id not in muted]
+
+    def _exclude_outside_audience(self, broadcast: NotificationBroadcast, announcement: Announcement) -> None:
+        """
+        Record the students enrolled before a broadcast who are not in the
+        announcement's audience (not active, or enrolled after it was made),
+        so the broadcast reaches the same students per-user rows would.
+        """
+        outside = Enrollment.objects.filter(
+            program_id=broadcast.program_id,
+            enrolled_at__lte=broadcast.created_at,
+        ).exclude(
+            pk__in=self.audience(announcement).values('pk')
+        ).values_list('user_id', flat=True)
+        BroadcastExclusion.objects.bulk_create(
+            [BroadcastExclusion(broadcast=broadcast, user_id=user_id) for user_id in outside],
+            batch_size=self.CHUNK_SIZE,
+        )
+
+    def _content(self, announcement: Announcement) -> dict:
+        content = announcement.content
+        return {
+            'notification_type': self.NOTIFICATION_TYPE,
+            'title': f'New Announcement: {announcement.title}',
+            'message': content[:200] + ('...' if len(content) > 200 else ''),
+            'action_url': f'/student/programs/{announcement.program_id}/announcements/',
+        }
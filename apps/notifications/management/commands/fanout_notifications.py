@@ -0,0 +1,66 @@
+"""
+Django management command running the announcement fan-out worker.
+
+Claims queued NotificationFanoutJob rows and delivers each announcement to
+the program's students: one shared broadcast for large audiences, otherwise
+per-user notifications inserted in bounded chunks. A job left running by a
+crashed worker is reclaimed once its heartbeat goes stale and resumes after
+the last chunk it committed.
+
+Usage:
+    python manage.py fanout_notifications
+    python manage.py fanout_notifications --once
+    python manage.py fanout_notifications --batch-size=20 --poll-interval=2
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.notifications.fanout_service import NotificationFanoutService
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued announcement notifications'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=NotificationFanoutService.BATCH_SIZE,
+            help='Announcements claimed per batch',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit when the queue is empty instead of polling',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=5.0,
+            help='Seconds to wait between queue polls',
+        )
+
+    def handle(self, *args, **options):
+        service = NotificationFanoutService()
+        while True:
+            jobs = service.claim_batch(options['batch_size'])
+            if not jobs:
+                if options['once']:
+                    return
+                time.sleep(options['poll_interval'])
+                continue
+
+            began = time.perf_counter()
+            service.process_batch(jobs)
+            elapsed = time.perf_counter() - began
+
+            delivered = sum(job.delivered for job in jobs)
+            completed = sum(1 for job in jobs if job.status == 'completed')
+            self.stdout.write(self.style.SUCCESS(
+                f'Delivered {completed}/{len(jobs)} announcements '
+                f'({delivered} notifications) in {elapsed:.2f} s'
+            ))
+            for job in jobs:
+                if job.status != 'completed':
+                    self.stderr.write(f'Job {job.id} ({job.status}): {job.error}')
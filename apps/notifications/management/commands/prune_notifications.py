@@ -0,0 +1,62 @@
+"""
+Django management command deleting old read notifications.
+
+Notifications read more than NOTIFICATION_RETENTION_DAYS ago are deleted in
+batches, so the notifications table stays bounded without long locks.
+Unread notifications and program broadcasts are kept.
+
+Usage:
+    python manage.py prune_notifications
+    python manage.py prune_notifications --days=30 --batch-size=5000
+    python manage.py prune_notifications --dry-run
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.notifications.models import Notification
+from apps.notifications.services import NotificationService
+
+
+class Command(BaseCommand):
+    help = 'Delete notifications that were read longer ago than the retention period'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.NOTIFICATION_RETENTION_DAYS,
+            help='Keep notifications read within this many days',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Notifications deleted per statement',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report how many notifications would be deleted',
+        )
+
+    def handle(self, *args, **options):
+        if options['days'] < 0:
+            raise CommandError('--days must not be negative')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+        
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        
+        if options['dry_run']:
+            self.stdout.write(self.style.NOTICE('DRY RUN - No changes will be made'))
+            count = Notification.objects.filter(is_read=True, read_at__lt=cutoff).count()
+            self.stdout.write(f'Would delete {count} notifications read before {cutoff:%Y-%m-%d}')
+            return
+        
+        deleted = NotificationService.prune_read(cutoff, batch_size=options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Deleted {deleted} notifications read before {cutoff:%Y-%m-%d}')
+        )
@@ -0,0 +1,110 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_alter_program_level'),
+        ('notifications', '0002_notification_updated_at'),
+        ('progression', '0007_enrollment_progress_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BroadcastReceipt',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('read_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'notification_broadcast_receipts',
+            },
+        ),
+        migrations.CreateModel(
+            name='NotificationBroadcast',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('notification_type', models.CharField(choices=[('enrollment_approved', 'Enrollment Approved'), ('enrollment_rejected', 'Enrollment Rejected'), ('grade_published', 'Grade Published'), ('assignment_graded', 'Assignment Graded'), ('quiz_graded', 'Quiz Graded'), ('announcement', 'New Announcement'), ('instructor_approved', 'Instructor Approved'), ('instructor_rejected', 'Instructor Rejected'), ('program_approved', 'Program Approved'), ('program_changes_requested', 'Program Changes Requested'), ('system', 'System Notification')], max_length=50)),
+                ('title', models.CharField(max_length=255)),
+                ('message', models.TextField()),
+                ('priority', models.CharField(choices=[('low', 'Low'), ('normal', 'Normal'), ('high', 'High')], default='normal', max_length=10)),
+                ('action_url', models.CharField(blank=True, max_length=500, null=True)),
+            ],
+            options={
+                'db_table': 'notification_broadcasts',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='NotificationFanoutJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('cursor', models.BigIntegerField(default=0)),
+                ('delivered', models.PositiveIntegerField(default=0)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'notification_fanout_jobs',
+                'ordering': ['created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='related_announcement_id',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(condition=models.Q(('related_announcement_id__isnull', False)), fields=('recipient', 'related_announcement_id'), name='notification_unique_announcement'),
+        ),
+        migrations.AddField(
+            model_name='broadcastreceipt',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='broadcast_receipts', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='notificationbroadcast',
+            name='announcement',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='notification_broadcast', to='progression.announcement'),
+        ),
+        migrations.AddField(
+            model_name='notificationbroadcast',
+            name='program',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notification_broadcasts', to='core.program'),
+        ),
+        migrations.AddField(
+            model_name='broadcastreceipt',
+            name='broadcast',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='receipts', to='notifications.notificationbroadcast'),
+        ),
+        migrations.AddField(
+            model_name='notificationfanoutjob',
+            name='announcement',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='notification_fanout_job', to='progression.announcement'),
+        ),
+        migrations.AddIndex(
+            model_name='notificationbroadcast',
+            index=models.Index(fields=['program', '-created_at'], name='notificatio_program_ff9231_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='broadcastreceipt',
+            unique_together={('broadcast', 'user')},
+        ),
+        migrations.AddIndex(
+            model_name='notificationfanoutjob',
+            index=models.Index(fields=['status', 'heartbeat_at'], name='notif_job_status_hb_idx'),
+        ),
+    ]
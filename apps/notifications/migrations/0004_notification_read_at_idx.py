@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0003_announcement_fanout'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['is_read', 'read_at'], name='notification_read_at_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0004_notification_read_at_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BroadcastExclusion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('broadcast', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exclusions', to='notifications.notificationbroadcast')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='broadcast_exclusions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'notification_broadcast_exclusions',
+                'unique_together': {('broadcast', 'user')},
+            },
+        ),
+    ]
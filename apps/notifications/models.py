@@ -3,7 +3,7 @@ Notification models for in-app notifications.
 """
 
 from django.db import models
-from apps.core.models import TimeStampedModel
+from apps.core.models import QueuedJob, TimeStampedModel
 
 
 class Notification(TimeStampedModel):
@@ -48,6 +48,7 @@ class Notification(TimeStampedModel):
     related_program_id = models.IntegerField(null=True, blank=True)
     related_enrollment_id = models.IntegerField(null=True, blank=True)
     related_assessment_id = models.IntegerField(null=True, blank=True)
+    related_announcement_id = models.IntegerField(null=True, blank=True)
     
     class Meta:
         db_table = 'notifications'
@@ -55,6 +56,16 @@ class Notification(TimeStampedModel):
         indexes = [
             models.Index(fields=['recipient', 'is_read', '-created_at']),
             models.Index(fields=['recipient', '-created_at']),
+            models.Index(fields=['is_read', 'read_at'], name='notification_read_at_idx'),
+        ]
+        constraints = [
+            # Announcement fan-out inserts with ignore_conflicts, so a retried
+            # chunk never notifies a student twice
+            models.UniqueConstraint(
+                fields=['recipient', 'related_announcement_id'],
+                condition=models.Q(related_announcement_id__isnull=False),
+                name='notification_unique_announcement',
+            ),
         ]
 
     def __str__(self):
@@ -97,3 +108,122 @@ class NotificationPreference(TimeStampedModel):
 
     def __str__(self):
         return f"NotificationPreference: {self.user}"
+
+    def allows_in_app(self, notification_type):
+        """Whether the user wants in-app notifications of this type."""
+        if not self.in_app_enabled:
+            return False
+        return self.type_preferences.get(notification_type, {}).get('in_app', True) is not False
+
+
+class NotificationBroadcast(TimeStampedModel):
+    """
+    One notification shared by every student of a program.
+    Used instead of per-user rows for large audiences: the audience is the
+    program's enrollments made before the broadcast, minus the students
+    recorded in BroadcastExclusion rows because their enrollment was not
+    active when it was sent. Per-user read state lives in BroadcastReceipt
+    rows written on read.
+    """
+
+    announcement = models.OneToOneField(
+        'progression.Announcement',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='notification_broadcast'
+    )
+    program = models.ForeignKey(
+        'core.Program',
+        on_delete=models.CASCADE,
+        related_name='notification_broadcasts'
+    )
+    notification_type = models.CharField(max_length=50, choices=Notification.NOTIFICATION_TYPES)
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    priority = models.CharField(max_length=10, choices=Notification.PRIORITY_LEVELS, default='normal')
+    action_url = models.CharField(max_length=500, blank=True, null=True)
+
+    class Meta:
+        db_table = 'notification_broadcasts'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['program', '-created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.notification_type}: {self.title} → {self.program}"
+
+
+class BroadcastReceipt(models.Model):
+    """Per-user read marker for a NotificationBroadcast."""
+
+    broadcast = models.ForeignKey(
+        NotificationBroadcast,
+        on_delete=models.CASCADE,
+        related_name='receipts'
+    )
+    user = models.ForeignKey(
+        'core.User',
+        on_delete=models.CASCADE,
+        related_name='broadcast_receipts'
+    )
+    read_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'notification_broadcast_receipts'
+        unique_together = ['broadcast', 'user']
+
+    def __str__(self):
+        return f"{self.user} read {self.broadcast_id}"
+
+
+class BroadcastExclusion(models.Model):
+    """
+    A student enrolled in a broadcast's program whose enrollment was not
+    active when it was sent, so the broadcast is not addressed to them.
+    """
+
+    broadcast = models.ForeignKey(
+        NotificationBroadcast,
+        on_delete=models.CASCADE,
+        related_name='exclusions'
+    )
+    user = models.ForeignKey(
+        'core.User',
+        on_delete=models.CASCADE,
+        related_name='broadcast_exclusions'
+    )
+
+    class Meta:
+        db_table = 'notification_broadcast_exclusions'
+        unique_together = ['broadcast', 'user']
+
+    def __str__(self):
+        return f"{self.user} excluded from {self.broadcast_id}"
+
+
+class NotificationFanoutJob(QueuedJob):
+    """
+    Queued delivery of an announcement to a program's students.
+    Written by the announcement post_save signal; the fanout_notifications
+    worker delivers it in bounded chunks, recording the last user id
+    delivered so a retried job resumes where it stopped.
+    """
+    announcement = models.OneToOneField(
+        'progression.Announcement',
+        on_delete=models.CASCADE,
+        related_name='notification_fanout_job'
+    )
+    cursor = models.BigIntegerField(default=0)
+    delivered = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'notification_fanout_jobs'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'heartbeat_at'], name='notif_job_status_hb_idx'),
+        ]
+
+    def __str__(self):
+        return f"Fan-out of announcement {self.announcement_id} ({self.status})"
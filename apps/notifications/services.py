@@ -2,13 +2,124 @@
 Notification service - Helper methods for creating notifications.
 """
 
+import uuid
+from datetime import datetime
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, OuterRef, Q, Subquery
 from django.utils import timezone
-from .models import Notification
+
+from apps.core.pagination import decode_cursor, encode_cursor
+from .models import BroadcastReceipt, Notification, NotificationBroadcast, NotificationPreference
+
+
+class UnreadCountCache:
+    """
+    Per-user unread notification counts in Django's cache, together with
+    the recent items shown in the page header.
+    Counts are adjusted in place as notifications are created and read, and
+    are keyed by a broadcast version stamp, so a new program broadcast makes
+    every count recompute once. The recent items share the version stamp and
+    are dropped whenever the count changes. Entries expire after
+    CACHE_TIMEOUT, which bounds drift from changes the counter does not see
+    (enrollment status, preferences, admin edits).
+
+    Invalidation happens once the surrounding transaction commits, so a
+    count is never dropped before the recount can see the new rows.
+    Web processes and workers only see each other's changes through a
+    shared cache backend (CACHE_BACKEND database or redis), not locmem.
+    """
+
+    CACHE_TIMEOUT = 60 * 5
+    VERSION_KEY = 'notifications:broadcast_version'
+    COUNT_KEY = 'notifications:unread:{user_id}:{version}'
+    RECENT_KEY = 'notifications:recent:{user_id}:{version}'
+
+    @classmethod
+    def get(cls, user_id, compute):
+        """Get a user's cached count, calling compute() on a miss."""
+        key = cls.key(user_id)
+        count = cache.get(key)
+        if count is None:
+            count = compute()
+            cache.set(key, count, cls.CACHE_TIMEOUT)
+        return count
+
+    @classmethod
+    def get_recent(cls, user_id, compute):
+        """Get a user's cached recent items, calling compute() on a miss."""
+        key = cls.RECENT_KEY.format(user_id=user_id, version=cls.get_version())
+        items = cache.get(key)
+        if items is None:
+            items = compute()
+            cache.set(key, items, cls.CACHE_TIMEOUT)
+        return items
+
+    @classmethod
+    def adjust(cls, user_id, delta):
+        """Add delta to a cached count; a missing count is left to recompute."""
+        try:
+            cache.incr(cls.key(user_id), delta)
+        except ValueError:
+            pass
+        cls.drop_recent(user_id)
+
+    @classmethod
+    def reset(cls, user_id):
+        """Record that a user has nothing unread."""
+        cache.set(cls.key(user_id), 0, cls.CACHE_TIMEOUT)
+        cls.drop_recent(user_id)
+
+    @classmethod
+    def drop_recent(cls, *user_ids):
+        """Drop cached recent items on commit so the next read reloads them."""
+        def delete():
+            version = cls.get_version()
+            cache.delete_many([cls.RECENT_KEY.format(user_id=pk, version=version) for pk in user_ids])
+        transaction.on_commit(delete)
+
+    @classmethod
+    def invalidate(cls, *user_ids):
+        """Drop cached counts and recent items on commit so the next read recomputes them."""
+        def delete():
+            version = cls.get_version()
+            cache.delete_many([
+                key.format(user_id=pk, version=version)
+                for pk in user_ids
+                for key in (cls.COUNT_KEY, cls.RECENT_KEY)
+            ])
+        transaction.on_commit(delete)
+
+    @classmethod
+    def invalidate_broadcasts(cls):
+        """Bump the broadcast version stamp on commit, dropping every cached count and recent list."""
+        transaction.on_commit(lambda: cache.set(cls.VERSION_KEY, uuid.uuid4().hex, None))
+
+    @classmethod
+    def get_version(cls):
+        """Get the current broadcast version stamp, creating one if missing."""
+        version = cache.get(cls.VERSION_KEY)
+        if version is None:
+            cache.add(cls.VERSION_KEY, uuid.uuid4().hex, None)
+            version = cache.get(cls.VERSION_KEY)
+        return version
+
+    @classmethod
+    def key(cls, user_id):
+        return cls.COUNT_KEY.format(user_id=user_id, version=cls.get_version())
 
 
 class NotificationService:
     """Service class for creating and managing notifications."""
-    
+
+    # Feed order is (created_at, source, id) descending; a notification sorts
+    # ahead of a broadcast created at the same instant
+    NOTIFICATION_RANK = 1
+    BROADCAST_RANK = 0
+    # Items shown in the page header; get_recent caches this many
+    RECENT_LIMIT = 10
+
     @staticmethod
     def create(
         recipient,
@@ -38,7 +149,7 @@ class NotificationService:
         Returns:
             Created Notification instance
         """
-        return Notification.objects.create(
+        notification = Notification.objects.create(
             recipient=recipient,
             notification_type=notification_type,
             title=title,
@@ -49,6 +160,8 @@ class NotificationService:
             related_enrollment_id=related_enrollment_id,
             related_assessment_id=related_assessment_id,
         )
+        UnreadCountCache.adjust(notification.recipient_id, 1)
+        return notification
     
     @staticmethod
     def bulk_create(
@@ -87,37 +200,109 @@ class NotificationService:
             )
             for recipient in recipients
         ]
-        return Notification.objects.bulk_create(notifications)
+        created = Notification.objects.bulk_create(notifications)
+        UnreadCountCache.invalidate(*{n.recipient_id for n in created})
+        return created
     
     @staticmethod
     def mark_as_read(notification_id, user):
         """Mark a single notification as read."""
-        return Notification.objects.filter(
+        updated = Notification.objects.filter(
             id=notification_id,
             recipient=user,
             is_read=False
         ).update(is_read=True, read_at=timezone.now())
+        if updated:
+            UnreadCountCache.adjust(user.pk, -updated)
+        return updated
+    
+    @staticmethod
+    def mark_broadcast_as_read(broadcast_id, user):
+        """Record that a user has read a broadcast addressed to them."""
+        if not NotificationService.visible_broadcasts(user).filter(pk=broadcast_id).exists():
+            return 0
+        _, created = BroadcastReceipt.objects.get_or_create(
+            broadcast_id=broadcast_id,
+            user=user,
+            defaults={'read_at': timezone.now()},
+        )
+        if created:
+            UnreadCountCache.adjust(user.pk, -1)
+        return int(created)
     
     @staticmethod
     def mark_all_as_read(user):
-        """Mark all notifications for a user as read."""
-        return Notification.objects.filter(
+        """Mark all notifications and broadcasts for a user as read."""
+        now = timezone.now()
+        count = Notification.objects.filter(
             recipient=user,
             is_read=False
-        ).update(is_read=True, read_at=timezone.now())
+        ).update(is_read=True, read_at=now)
+        unread = NotificationService.visible_broadcasts(user).exclude(receipts__user=user)
+        receipts = BroadcastReceipt.objects.bulk_create(
+            [BroadcastReceipt(broadcast_id=pk, user=user, read_at=now) for pk in unread.values_list('pk', flat=True)],
+            ignore_conflicts=True,
+        )
+        UnreadCountCache.reset(user.pk)
+        return count + len(receipts)
     
     @staticmethod
     def get_unread_count(user):
-        """Get count of unread notifications for a user."""
+        """Get count of unread notifications and broadcasts for a user, cached."""
+        return UnreadCountCache.get(user.pk, lambda: NotificationService.count_unread(user))
+
+    @staticmethod
+    def count_unread(user):
+        """Count unread notifications and broadcasts for a user in the database."""
         return Notification.objects.filter(
             recipient=user,
             is_read=False
-        ).count()
+        ).count() + NotificationService.visible_broadcasts(user).exclude(receipts__user=user).count()
+
+    @staticmethod
+    def get_total_count(user):
+        """Get count of all notifications and broadcasts for a user."""
+        return (
+            Notification.objects.filter(recipient=user).count()
+            + NotificationService.visible_broadcasts(user).count()
+        )
+
+    @staticmethod
+    def visible_broadcasts(user):
+        """
+        Broadcasts addressed to a user: those of programs the user was
+        enrolled in when they were sent, unless the user was left out of the
+        audience (see BroadcastExclusion), minus muted types. Like per-user
+        notifications, they stay visible once the enrollment completes.
+        """
+        # One filter() call, so both conditions hold for the same enrollment
+        broadcasts = NotificationBroadcast.objects.filter(
+            program__enrollments__user=user,
+            program__enrollments__enrolled_at__lte=F('created_at'),
+        ).exclude(exclusions__user=user)
+        preference = NotificationService.get_preference(user)
+        if preference is not None:
+            muted = [t for t, _ in Notification.NOTIFICATION_TYPES if not preference.allows_in_app(t)]
+            if muted:
+                broadcasts = broadcasts.exclude(notification_type__in=muted)
+        return broadcasts
+
+    @staticmethod
+    def get_preference(user):
+        """
+        Get a user's NotificationPreference, or None, memoized on the user
+        object. request.user is loaded per request, so every feed and count
+        of a request shares one query.
+        """
+        if not hasattr(user, '_notification_preference'):
+            user._notification_preference = NotificationPreference.objects.filter(user=user).first()
+        return user._notification_preference
 
     @staticmethod
-    def get_recent(user, limit=10):
+    def get_recent(user, limit=RECENT_LIMIT):
         """
         Get recent notifications for a user.
+        The RECENT_LIMIT newest items are cached alongside the unread count.
         
         Args:
             user: User instance
@@ -126,24 +311,165 @@ class NotificationService:
         Returns:
             List of notification dicts ready for frontend
         """
+        def load():
+            notifications, _ = NotificationService.get_feed(user, limit=limit)
+            return notifications
+
+        if limit != NotificationService.RECENT_LIMIT:
+            return load()
+        return UnreadCountCache.get_recent(user.pk, load)
+
+    @staticmethod
+    def get_feed(user, cursor=None, limit=20):
+        """
+        Get a keyset-paginated page of a user's notifications and broadcasts.
+        Each page seeks past the cursor on the (recipient, created_at) index,
+        so deep pages cost the same as the first.
+        
+        Args:
+            user: User instance
+            cursor: Opaque cursor from the previous page, or None for the first
+            limit: Maximum number of items to return
+            
+        Returns:
+            Tuple of (notification dicts, cursor for the next page or None)
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        position = decode_cursor(cursor, datetime.fromisoformat, int, int) if cursor else None
+        notifications = NotificationService._seek(
+            Notification.objects.filter(recipient=user),
+            NotificationService.NOTIFICATION_RANK,
+            position,
+        )[:limit + 1]
+        broadcasts = NotificationService._seek(
+            NotificationService.visible_broadcasts(user).annotate(
+                read_at=Subquery(
+                    BroadcastReceipt.objects.filter(broadcast=OuterRef('pk'), user=user).values('read_at')[:1]
+                )
+            ),
+            NotificationService.BROADCAST_RANK,
+            position,
+        )[:limit + 1]
+
+        items = sorted(
+            [((n.created_at, NotificationService.NOTIFICATION_RANK, n.id), NotificationService.serialize(n))
+             for n in notifications]
+            + [((b.created_at, NotificationService.BROADCAST_RANK, b.id), NotificationService.serialize_broadcast(b))
+               for b in broadcasts],
+            key=lambda item: item[0],
+            reverse=True,
+        )
+        page = items[:limit]
+        next_cursor = None
+        if len(items) > limit:
+            next_cursor = encode_cursor(*page[-1][0])
+        return [data for _, data in page], next_cursor
+
+    @staticmethod
+    def _seek(queryset, rank, position):
+        """Order a feed source newest first, keeping only items after position."""
+        queryset = queryset.order_by('-created_at', '-id')
+        if position is None:
+            return queryset
+        created_at, cursor_rank, cursor_id = position
+        after = Q(created_at__lt=created_at)
+        if rank == cursor_rank:
+            after |= Q(created_at=created_at, id__lt=cursor_id)
+        elif rank < cursor_rank:
+            after |= Q(created_at=created_at)
+        return queryset.filter(after)
+
+    @staticmethod
+    def get_page(user, offset, limit):
+        """
+        Get a page of a user's notifications and broadcasts, newest first.
+        
+        Args:
+            user: User instance
+            offset: Number of newer items to skip
+            limit: Maximum number of items to return
+            
+        Returns:
+            List of notification dicts ready for frontend
+        """
+        end = offset + limit
         notifications = Notification.objects.filter(
             recipient=user
-        ).order_by('-created_at')[:limit]
+        ).order_by('-created_at')[:end]
+        broadcasts = NotificationService.visible_broadcasts(user).annotate(
+            read_at=Subquery(
+                BroadcastReceipt.objects.filter(broadcast=OuterRef('pk'), user=user).values('read_at')[:1]
+            )
+        ).order_by('-created_at')[:end]
         
-        return [
-            {
-                'id': n.id,
-                'type': n.notification_type,
-                'title': n.title,
-                'message': n.message,
-                'priority': n.priority,
-                'is_read': n.is_read,
-                'action_url': n.action_url,
-                'created_at': n.created_at.isoformat(),
-                'read_at': n.read_at.isoformat() if n.read_at else None,
-            }
-            for n in notifications
-        ]
+        items = sorted(
+            [(n.created_at, NotificationService.serialize(n)) for n in notifications]
+            + [(b.created_at, NotificationService.serialize_broadcast(b)) for b in broadcasts],
+            key=lambda item: item[0],
+            reverse=True,
+        )
+        return [data for _, data in items[offset:end]]
+
+    @staticmethod
+    def prune_read(read_before, batch_size=1000):
+        """
+        Delete notifications read before a cutoff, batch_size rows per query.
+        Unread notifications are never pruned, so unread counts are unaffected.
+        
+        Args:
+            read_before: Datetime; notifications read earlier are deleted
+            batch_size: Maximum rows deleted per statement
+            
+        Returns:
+            Number of notifications deleted
+        """
+        stale = Notification.objects.filter(is_read=True, read_at__lt=read_before)
+        deleted = 0
+        while True:
+            pks = list(stale.values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                return deleted
+            count, _ = Notification.objects.filter(pk__in=pks).delete()
+            deleted += count
+
+    @staticmethod
+    def serialize(notification):
+        """Notification dict for the frontend."""
+        n = notification
+        return {
+            'id': n.id,
+            'type': n.notification_type,
+            'title': n.title,
+            'message': n.message,
+            'priority': n.priority,
+            'is_read': n.is_read,
+            'action_url': n.action_url,
+            'read_url': f'/notifications/{n.id}/read/',
+            'created_at': n.created_at.isoformat(),
+            'read_at': n.read_at.isoformat() if n.read_at else None,
+        }
+
+    @staticmethod
+    def serialize_broadcast(broadcast):
+        """
+        Broadcast dict for the frontend, in the notification shape.
+        Expects read_at annotated with the user's receipt time.
+        """
+        b = broadcast
+        return {
+            'id': f'broadcast-{b.id}',
+            'type': b.notification_type,
+            'title': b.title,
+            'message': b.message,
+            'priority': b.priority,
+            'is_read': b.read_at is not None,
+            'action_url': b.action_url,
+            'read_url': f'/notifications/broadcasts/{b.id}/read/',
+            'created_at': b.created_at.isoformat(),
+            'read_at': b.read_at.isoformat() if b.read_at else None,
+        }
     
     # =========================================================================
     # Convenience methods for specific notification types
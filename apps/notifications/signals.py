@@ -5,24 +5,15 @@ Django signals for notification triggers.
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
-from apps.progression.models import Announcement, Enrollment
-from .services import NotificationService
+from apps.progression.models import Announcement
+from .fanout_service import NotificationFanoutService
 
 
 @receiver(post_save, sender=Announcement)
 def announcement_created(sender, instance, created, **kwargs):
     """
-    Send notifications to enrolled students when a new announcement is created.
+    Queue delivery of a new announcement to the program's enrolled students.
+    The fanout_notifications worker does the delivery, off the request path.
     """
     if created:
-        # Get all active enrollments for this program
-        enrolled_users = Enrollment.objects.filter(
-            program=instance.program,
-            status='active'
-        ).select_related('user').values_list('user', flat=True)
-        
-        from apps.core.models import User
-        users = User.objects.filter(id__in=enrolled_users)
-        
-        if users.exists():
-            NotificationService.notify_announcement(instance, users)
+        NotificationFanoutService().enqueue(instance)
@@ -0,0 +1,211 @@
+"""
+Tests for announcement fan-out.
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+
+from apps.core.models import Program
+from apps.notifications.fanout_service import NotificationFanoutService
+from apps.notifications.models import (
+    BroadcastReceipt,
+    Notification,
+    NotificationBroadcast,
+    NotificationFanoutJob,
+    NotificationPreference,
+)
+from apps.notifications.services import NotificationService
+from apps.progression.models import Announcement, Enrollment
+
+User = get_user_model()
+
+
+class FanoutTestCase(TestCase):
+    """Program with five active students, one muted and one dropped student."""
+
+    def setUp(self):
+        self.program = Program.objects.create(name='Fan-out Program')
+        self.instructor = User.objects.create_user(username='instructor', email='instructor@example.com')
+        self.students = [self.enroll(f'student{i}') for i in range(5)]
+        self.muted = self.enroll('muted')
+        NotificationPreference.objects.create(
+            user=self.muted, type_preferences={'announcement': {'in_app': False}}
+        )
+        self.dropped = self.enroll('dropped', status='dropped')
+
+    def enroll(self, username, status='active'):
+        user = User.objects.create_user(username=username, email=f'{username}@example.com')
+        Enrollment.objects.create(user=user, program=self.program, status=status)
+        return user
+
+    def announce(self, title='Welcome'):
+        return Announcement.objects.create(
+            program=self.program, author=self.instructor, title=title, content='Read the syllabus.'
+        )
+
+    def drain(self):
+        service = NotificationFanoutService()
+        return service.process_batch(service.claim_batch())
+
+
+class AnnouncementFanoutTests(FanoutTestCase):
+    """Test cases for per-user announcement delivery."""
+
+    def test_creating_announcement_only_queues(self):
+        """Test that the request path writes a job and no notifications."""
+        announcement = self.announce()
+
+        self.assertEqual(Notification.objects.count(), 0)
+        job = NotificationFanoutJob.objects.get(announcement=announcement)
+        self.assertEqual(job.status, 'pending')
+
+    def test_delivers_to_active_students_respecting_preferences(self):
+        """Test that muted and inactive students get no notification."""
+        announcement = self.announce()
+        late = self.enroll('late')
+
+        job, = self.drain()
+
+        self.assertEqual(job.status, 'completed')
+        self.assertEqual(job.delivered, 5)
+        self.assertEqual(
+            set(Notification.objects.values_list('recipient_id', flat=True)),
+            {s.id for s in self.students},
+        )
+        notification = Notification.objects.filter(recipient=self.students[0]).get()
+        self.assertEqual(notification.title, 'New Announcement: Welcome')
+        self.assertEqual(notification.related_announcement_id, announcement.id)
+        self.assertFalse(Notification.objects.filter(recipient__in=[self.muted, self.dropped, late]).exists())
+
+    @patch.object(NotificationFanoutService, 'CHUNK_SIZE', 2)
+    def test_failed_chunk_resumes_without_duplicates(self):
+        """Test that a retried job resumes after its last committed chunk."""
+        self.announce()
+        real_bulk_create = Notification.objects.bulk_create
+        calls = []
+
+        def flaky(*args, **kwargs):
+            calls.append(1)
+            if len(calls) == 2:
+                raise OperationalError('database is locked')
+            return real_bulk_create(*args, **kwargs)
+
+        with patch.object(Notification.objects, 'bulk_create', side_effect=flaky):
+            job, = self.drain()
+        self.assertEqual(job.status, 'pending')
+        self.assertEqual(Notification.objects.count(), 2)
+
+        job, = self.drain()
+
+        self.assertEqual(job.status, 'completed')
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(Notification.objects.count(), 5)
+
+    def test_redelivery_does_not_duplicate(self):
+        """Test that delivering a job again from the start inserts nothing new."""
+        self.announce()
+        job, = self.drain()
+        NotificationFanoutJob.objects.filter(pk=job.pk).update(status='pending', cursor=0)
+
+        self.drain()
+
+        self.assertEqual(Notification.objects.count(), 5)
+
+    def test_command_drains_queue(self):
+        """Test the fanout_notifications worker command."""
+        self.announce('First')
+        self.announce('Second')
+
+        call_command('fanout_notifications', '--once', '--batch-size=1')
+
+        self.assertEqual(NotificationFanoutJob.objects.filter(status='completed').count(), 2)
+        self.assertEqual(Notification.objects.count(), 10)
+
+
+@override_settings(NOTIFICATION_BROADCAST_MIN_RECIPIENTS=3)
+class BroadcastTests(FanoutTestCase):
+    """Test cases for shared broadcasts with per-user read markers."""
+
+    def setUp(self):
+        super().setUp()
+        self.announce()
+        self.drain()
+        self.broadcast = NotificationBroadcast.objects.get()
+
+    def test_large_audience_gets_one_broadcast(self):
+        """Test that no per-user rows are written for a broadcast."""
+        self.assertEqual(Notification.objects.count(), 0)
+        self.assertEqual(self.broadcast.title, 'New Announcement: Welcome')
+        self.assertEqual(NotificationFanoutJob.objects.get().status, 'completed')
+
+    def test_broadcast_visibility(self):
+        """Test that only active, unmuted students enrolled before it see a broadcast."""
+        late = self.enroll('late')
+        outsider = User.objects.create_user(username='outsider', email='outsider@example.com')
+
+        self.assertEqual(NotificationService.get_unread_count(self.students[0]), 1)
+        for user in (self.muted, self.dropped, late, outsider):
+            self.assertEqual(NotificationService.get_unread_count(user), 0)
+            self.assertEqual(NotificationService.get_recent(user), [])
+
+    def test_broadcast_stays_visible_after_completion(self):
+        """Test that students who complete the program keep the broadcast."""
+        student = self.students[0]
+        Enrollment.objects.filter(user=student).update(status='completed')
+
+        item, = NotificationService.get_recent(student)
+        self.assertEqual(item['id'], f'broadcast-{self.broadcast.id}')
+        self.assertEqual(NotificationService.count_unread(student), 1)
+
+    def test_enrolling_before_delivery_is_not_enough(self):
+        """Test that students enrolled after the announcement but before delivery are left out."""
+        announcement = self.announce('Second')
+        between = self.enroll('between')
+        Enrollment.objects.filter(user=between).update(enrolled_at=announcement.created_at + timedelta(microseconds=1))
+
+        self.drain()
+
+        broadcast = NotificationBroadcast.objects.get(announcement=announcement)
+        self.assertTrue(broadcast.exclusions.filter(user=between).exists())
+        self.assertEqual(NotificationService.get_recent(between), [])
+
+    def test_mark_broadcast_as_read(self):
+        """Test that reading a broadcast only marks it for that student."""
+        student, other = self.students[:2]
+
+        self.assertEqual(NotificationService.mark_broadcast_as_read(self.broadcast.id, student), 1)
+        self.assertEqual(NotificationService.mark_broadcast_as_read(self.broadcast.id, student), 0)
+        self.assertEqual(NotificationService.mark_broadcast_as_read(self.broadcast.id, self.muted), 0)
+
+        item, = NotificationService.get_recent(student)
+        self.assertEqual(item['id'], f'broadcast-{self.broadcast.id}')
+        self.assertTrue(item['is_read'])
+        self.assertEqual(NotificationService.get_unread_count(student), 0)
+        self.assertEqual(NotificationService.get_unread_count(other), 1)
+
+    def test_recent_merges_broadcasts_and_notifications(self):
+        """Test that the feed interleaves both sources newest first."""
+        student = self.students[0]
+        NotificationService.create(recipient=student, notification_type='system', title='Later', message='x')
+
+        titles = [item['title'] for item in NotificationService.get_recent(student)]
+
+        self.assertEqual(titles, ['Later', 'New Announcement: Welcome'])
+        self.assertEqual(NotificationService.mark_all_as_read(student), 2)
+        self.assertEqual(NotificationService.get_unread_count(student), 0)
+        self.assertEqual(BroadcastReceipt.objects.filter(user=student).count(), 1)
+
+    def test_broadcast_read_view(self):
+        """Test the broadcast read endpoint."""
+        student = self.students[0]
+        self.client.force_login(student)
+
+        response = self.client.post(f'/notifications/broadcasts/{self.broadcast.id}/read/')
+
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(BroadcastReceipt.objects.filter(user=student, broadcast=self.broadcast).exists())
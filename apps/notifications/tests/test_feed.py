@@ -0,0 +1,169 @@
+"""
+Tests for cached unread counts, the keyset feed and notification pruning.
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.notifications.models import Notification
+from apps.notifications.services import NotificationService
+
+User = get_user_model()
+
+
+class NotificationFeedTestCase(TestCase):
+    """User with five notifications, oldest first."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', email='test@example.com')
+        self.notifications = [self.notify(f'Notification {i}') for i in range(5)]
+
+    def notify(self, title, recipient=None):
+        return NotificationService.create(
+            recipient=recipient or self.user,
+            notification_type='system',
+            title=title,
+            message='x',
+        )
+
+
+class UnreadCountCacheTests(NotificationFeedTestCase):
+    """Test cases for the cached unread counter."""
+
+    def test_count_is_cached_and_kept_current(self):
+        """Test that writes adjust the cached count without recounting."""
+        self.assertEqual(NotificationService.get_unread_count(self.user), 5)
+
+        self.notify('Another')
+        with self.assertNumQueries(0):
+            self.assertEqual(NotificationService.get_unread_count(self.user), 6)
+
+        NotificationService.mark_as_read(self.notifications[0].id, self.user)
+        NotificationService.mark_as_read(self.notifications[0].id, self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(NotificationService.get_unread_count(self.user), 5)
+
+        NotificationService.mark_all_as_read(self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(NotificationService.get_unread_count(self.user), 0)
+
+    def test_bulk_create_invalidates_recipients(self):
+        """Test that bulk-created notifications show up in cached counts."""
+        other = User.objects.create_user(username='other', email='other@example.com')
+        self.assertEqual(NotificationService.get_unread_count(self.user), 5)
+        self.assertEqual(NotificationService.get_unread_count(other), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            NotificationService.bulk_create([self.user, other], 'system', 'Bulk', 'x')
+
+        self.assertEqual(NotificationService.get_unread_count(self.user), 6)
+        self.assertEqual(NotificationService.get_unread_count(other), 1)
+
+    def test_invalidation_waits_for_commit(self):
+        """Test that counts are only dropped once the new rows are committed."""
+        self.assertEqual(NotificationService.get_unread_count(self.user), 5)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            NotificationService.bulk_create([self.user], 'system', 'Bulk', 'x')
+            with self.assertNumQueries(0):
+                self.assertEqual(NotificationService.get_unread_count(self.user), 5)
+
+        self.assertEqual(len(callbacks), 1)
+
+
+class RecentItemsCacheTests(NotificationFeedTestCase):
+    """Test cases for the cached header items."""
+
+    def test_recent_items_are_cached_until_the_count_changes(self):
+        """Test that the header items are reloaded when notifications are created or read."""
+        self.assertEqual(len(NotificationService.get_recent(self.user)), 5)
+        with self.assertNumQueries(0):
+            self.assertEqual(NotificationService.get_recent(self.user)[0]['title'], 'Notification 4')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.notify('Another')
+        self.assertEqual(NotificationService.get_recent(self.user)[0]['title'], 'Another')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            NotificationService.mark_as_read(self.notifications[4].id, self.user)
+        self.assertTrue(NotificationService.get_recent(self.user)[1]['is_read'])
+
+    def test_cold_header_loads_the_preference_once(self):
+        """Test that the count and the items share one preference query."""
+        user = User.objects.get(pk=self.user.pk)
+
+        # Notification and broadcast counts, the preference, then one query per feed source
+        with self.assertNumQueries(5):
+            NotificationService.get_unread_count(user)
+            NotificationService.get_recent(user)
+
+
+class KeysetFeedTests(NotificationFeedTestCase):
+    """Test cases for the cursor-paginated feed."""
+
+    def test_pages_cover_feed_once_in_order(self):
+        """Test that following cursors visits every notification exactly once."""
+        # Same timestamp for two rows exercises the id tie-breaker
+        Notification.objects.filter(pk=self.notifications[2].pk).update(
+            created_at=self.notifications[3].created_at
+        )
+        seen = []
+        cursor = None
+        while True:
+            page, cursor = NotificationService.get_feed(self.user, cursor=cursor, limit=2)
+            seen.extend(item['id'] for item in page)
+            if cursor is None:
+                break
+
+        expected = list(
+            Notification.objects.filter(recipient=self.user)
+            .order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor(self):
+        """Test that a malformed cursor is rejected."""
+        with self.assertRaises(ValueError):
+            NotificationService.get_feed(self.user, cursor='not-a-cursor')
+
+    def test_feed_view(self):
+        """Test the JSON feed endpoint."""
+        self.client.force_login(self.user)
+
+        response = self.client.get('/notifications/feed/?limit=3')
+        data = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([n['title'] for n in data['notifications']],
+                         ['Notification 4', 'Notification 3', 'Notification 2'])
+        self.assertEqual(data['unread_count'], 5)
+
+        response = self.client.get(f'/notifications/feed/?limit=3&cursor={data["next_cursor"]}')
+        data = response.json()
+        self.assertEqual([n['title'] for n in data['notifications']], ['Notification 1', 'Notification 0'])
+        self.assertIsNone(data['next_cursor'])
+
+        response = self.client.get('/notifications/feed/?cursor=bad')
+        self.assertEqual(response.status_code, 400)
+
+
+class PruneNotificationsTests(NotificationFeedTestCase):
+    """Test cases for the prune_notifications command."""
+
+    def test_prunes_only_old_read_notifications(self):
+        """Test that unread and recently read notifications are kept."""
+        old = timezone.now() - timedelta(days=100)
+        Notification.objects.filter(pk__in=[n.pk for n in self.notifications[:3]]).update(
+            is_read=True, read_at=old
+        )
+        NotificationService.mark_as_read(self.notifications[3].id, self.user)
+
+        call_command('prune_notifications', '--days=90', '--batch-size=2')
+
+        self.assertEqual(
+            set(Notification.objects.values_list('pk', flat=True)),
+            {self.notifications[3].pk, self.notifications[4].pk},
+        )
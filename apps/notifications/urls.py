@@ -11,9 +11,15 @@ urlpatterns = [
     # Full notifications page
     path('', views.notifications_index, name='index'),
     
+    # Cursor-paginated feed (JSON)
+    path('feed/', views.notifications_feed, name='feed'),
+    
     # Mark a single notification as read
     path('<int:pk>/read/', views.mark_read, name='read'),
     
+    # Mark a program broadcast as read
+    path('broadcasts/<int:pk>/read/', views.mark_broadcast_read, name='broadcast_read'),
+    
     # Mark all notifications as read
     path('mark-all-read/', views.mark_all_read, name='mark_all_read'),
 ]
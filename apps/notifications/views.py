@@ -4,10 +4,10 @@ Notification views - Inertia-based views for notification management.
 
 from django.shortcuts import redirect
 from django.contrib.auth.decorators import login_required
-from django.views.decorators.http import require_POST
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET, require_POST
 from inertia import render
 
-from .models import Notification
 from .services import NotificationService
 
 
@@ -21,27 +21,9 @@ def notifications_index(request):
     per_page = 20
     
     user = request.user
-    queryset = Notification.objects.filter(recipient=user).order_by('-created_at')
-    
-    total = queryset.count()
+    total = NotificationService.get_total_count(user)
     offset = (page - 1) * per_page
-    notifications = queryset[offset:offset + per_page]
-    
-    # Serialize notifications
-    notifications_data = [
-        {
-            'id': n.id,
-            'type': n.notification_type,
-            'title': n.title,
-            'message': n.message,
-            'priority': n.priority,
-            'is_read': n.is_read,
-            'action_url': n.action_url,
-            'created_at': n.created_at.isoformat(),
-            'read_at': n.read_at.isoformat() if n.read_at else None,
-        }
-        for n in notifications
-    ]
+    notifications_data = NotificationService.get_page(user, offset, per_page)
     
     return render(request, 'Notifications/Index', {
         'notifications': notifications_data,
@@ -56,6 +38,32 @@ def notifications_index(request):
     })
 
 
+@login_required
+@require_GET
+def notifications_feed(request):
+    """
+    Keyset-paginated notification feed as JSON.
+    Pass the returned next_cursor as ?cursor= to get the following page.
+    """
+    try:
+        limit = min(max(int(request.GET.get('limit', 20)), 1), 100)
+    except ValueError:
+        limit = 20
+    
+    try:
+        notifications, next_cursor = NotificationService.get_feed(
+            request.user, cursor=request.GET.get('cursor'), limit=limit
+        )
+    except ValueError:
+        return JsonResponse({'error': 'Invalid cursor'}, status=400)
+    
+    return JsonResponse({
+        'notifications': notifications,
+        'next_cursor': next_cursor,
+        'unread_count': NotificationService.get_unread_count(request.user),
+    })
+
+
 @login_required
 @require_POST
 def mark_read(request, pk):
@@ -72,6 +80,21 @@ def mark_read(request, pk):
     return redirect('/')
 
 
+@login_required
+@require_POST
+def mark_broadcast_read(request, pk):
+    """
+    Mark a program broadcast as read for the current user.
+    Returns redirect back to the referring page.
+    """
+    NotificationService.mark_broadcast_as_read(pk, request.user)
+    
+    referer = request.META.get('HTTP_REFERER')
+    if referer:
+        return redirect(referer)
+    return redirect('/')
+
+
 @login_required
 @require_POST
 def mark_all_read(request):
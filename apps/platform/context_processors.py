@@ -9,7 +9,7 @@ def platform_branding(request):
     Add platform branding to template context from PlatformSettings.
     """
     try:
-        settings = PlatformSettings.get_settings()
+        settings = PlatformSettings.get_cached()
         return {
             'platform_branding': {
                 'logo_url': settings.logo.url if settings.logo else None,
@@ -2,9 +2,16 @@
 Platform settings models - Single-tenant configuration.
 """
 
-from django.db import models
+import copy
+import uuid
+
+from django.core.cache import cache
+from django.db import models, transaction
 from apps.core.models import TimeStampedModel
 
+# Process-level (version, settings) snapshot served by PlatformSettings.get_cached()
+_settings_snapshot = (None, None)
+
 
 class PresetBlueprint(TimeStampedModel):
     """Preset blueprints for regulatory compliance."""
@@ -114,10 +121,14 @@ class PlatformSettings(TimeStampedModel):
         verbose_name = "Platform Settings"
         verbose_name_plural = "Platform Settings"
 
+    SNAPSHOT_VERSION_KEY = "platform_settings:version"
+
     def save(self, *args, **kwargs):
         """Ensure only one instance exists (singleton pattern)."""
         self.pk = 1
         super().save(*args, **kwargs)
+        # Bump after commit so no process reloads the pre-save row under the new stamp
+        transaction.on_commit(self.invalidate_cache)
 
     def delete(self, *args, **kwargs):
         """Prevent deletion of platform settings."""
@@ -129,6 +140,44 @@ class PlatformSettings(TimeStampedModel):
         settings, _ = cls.objects.get_or_create(pk=1)
         return settings
 
+    @classmethod
+    def get_revision(cls):
+        """The settings' updated_at, read from the database; every save changes it."""
+        return cls.objects.filter(pk=1).values_list("updated_at", flat=True).first()
+
+    @classmethod
+    def get_cached(cls):
+        """
+        Get a copy of the platform settings snapshot.
+        
+        The snapshot is kept in process memory and reloaded when the version
+        stamp in the configured cache changes; save() bumps it once its
+        transaction commits. Other processes only see the bump through a
+        shared cache backend (CACHE_BACKEND database or redis), not locmem.
+        Each call returns a copy, so callers cannot mutate the snapshot.
+        Use get_settings() when the instance will be modified.
+        """
+        global _settings_snapshot
+        version = cache.get(cls.SNAPSHOT_VERSION_KEY)
+        if version is None:
+            cache.add(cls.SNAPSHOT_VERSION_KEY, uuid.uuid4().hex, None)
+            version = cache.get(cls.SNAPSHOT_VERSION_KEY)
+        snapshot_version, settings = _settings_snapshot
+        if settings is None or snapshot_version != version:
+            settings, created = cls.objects.get_or_create(pk=1)
+            if created:
+                # Creating the row bumps the stamp through save() once committed
+                version = cache.get(cls.SNAPSHOT_VERSION_KEY)
+            _settings_snapshot = (version, settings)
+        return copy.deepcopy(settings)
+
+    @classmethod
+    def invalidate_cache(cls):
+        """Force every process to reload its settings snapshot."""
+        global _settings_snapshot
+        _settings_snapshot = (None, None)
+        cache.set(cls.SNAPSHOT_VERSION_KEY, uuid.uuid4().hex, None)
+
     def __str__(self):
         return f"{self.institution_name} Settings"
 
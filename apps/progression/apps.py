@@ -5,3 +5,7 @@ class ProgressionConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.progression"
     verbose_name = "Progression"
+
+    def ready(self):
+        """Import signals when app is ready."""
+        import apps.progression.signals  # noqa: F401
@@ -0,0 +1,67 @@
+"""
+Django management command for reconciling denormalized enrollment progress counters.
+
+Usage:
+    python manage.py reconcile_progress_counters
+    python manage.py reconcile_progress_counters --program-id=1
+    python manage.py reconcile_progress_counters --dry-run
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.models import Program
+from apps.progression.models import Enrollment
+from apps.progression.services import ProgressCounterService
+
+
+class Command(BaseCommand):
+    help = 'Recount enrollment progress counters and repair any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--program-id',
+            type=int,
+            help='Only reconcile enrollments of this program',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report drift without writing corrected counters',
+        )
+
+    def handle(self, *args, **options):
+        program_ids = Program.objects.values_list('id', flat=True)
+        if options['program_id']:
+            if not Program.objects.filter(pk=options['program_id']).exists():
+                raise CommandError(f"Program with ID {options['program_id']} does not exist")
+            program_ids = [options['program_id']]
+        
+        if options['dry_run']:
+            self.stdout.write(self.style.NOTICE('DRY RUN - No changes will be made'))
+        
+        compared = [f for f in Enrollment.COUNTER_FIELDS if f != 'counters_revision']
+        total_checked = 0
+        total_drifted = 0
+        for program_id in program_ids:
+            current = {
+                row['id']: row
+                for row in Enrollment.objects.filter(program_id=program_id).values('id', *compared)
+            }
+            rebuilt = ProgressCounterService.rebuild(program_id, save=not options['dry_run'])
+            
+            drifted = [
+                e for e in rebuilt
+                if any(getattr(e, f) != current.get(e.pk, {}).get(f) for f in compared)
+            ]
+            total_checked += len(rebuilt)
+            total_drifted += len(drifted)
+            for enrollment in drifted:
+                self.stdout.write(
+                    f'  Program {program_id}, enrollment {enrollment.pk}: '
+                    f'{current[enrollment.pk]["completion_count"]} -> {enrollment.completion_count} completions'
+                )
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Checked {total_checked} enrollments, {total_drifted} had drifted counters'
+            )
+        )
@@ -104,6 +104,23 @@ class Enrollment(TimeStampedModel):
     grades_published = models.BooleanField(default=False)
     completed_at = models.DateTimeField(blank=True, null=True)
 
+    # Denormalized progress counters, maintained by ProgressCounterService
+    completion_count = models.PositiveIntegerField(default=0)
+    leaf_node_count = models.PositiveIntegerField(default=0)
+    completable_count = models.PositiveIntegerField(default=0)
+    completable_completed_count = models.PositiveIntegerField(default=0)
+    subtree_counters = models.JSONField(default=dict, blank=True)  # {root_id: [completed, completable]}
+    counters_revision = models.PositiveIntegerField(default=0)  # Program.curriculum_revision
+
+    COUNTER_FIELDS = [
+        "completion_count",
+        "leaf_node_count",
+        "completable_count",
+        "completable_completed_count",
+        "subtree_counters",
+        "counters_revision",
+    ]
+
     class Meta:
         db_table = "enrollments"
         unique_together = ["user", "program"]
@@ -115,6 +132,13 @@ class Enrollment(TimeStampedModel):
     def __str__(self):
         return f"{self.user} - {self.program}"
 
+    @property
+    def progress_percent(self) -> float:
+        """Portal progress: completions over published leaf nodes."""
+        if not self.leaf_node_count:
+            return 0.0
+        return self.completion_count / self.leaf_node_count * 100
+
 
 class Announcement(TimeStampedModel):
     """
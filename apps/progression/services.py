@@ -4,9 +4,13 @@ Handles sequential locking, prerequisite checking, and progress calculation.
 """
 from dataclasses import dataclass
 from typing import Optional, List, Set, Dict, Any
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
 from django.utils import timezone
 
-from apps.curriculum.models import CurriculumNode
+from apps.curriculum.models import PATH_SEGMENT_WIDTH, CurriculumNode
+from apps.curriculum.services import CurriculumGraphService
 from apps.progression.models import NodeCompletion, Enrollment
 
 
@@ -213,6 +217,106 @@ class PrerequisiteLockChecker:
         return node.completion_rules.get('prerequisites', [])
 
 
+class BatchUnlockEvaluator:
+    """
+    Evaluates access for every node of a program in a single in-memory pass.
+    Produces the same AccessResult semantics as ProgressionEngine.can_access
+    without per-node queries.
+    Requirements: 5.1, 5.2
+    """
+
+    def __init__(
+        self,
+        sequential_checker: Optional[SequentialLockChecker] = None,
+        prerequisite_checker: Optional[PrerequisiteLockChecker] = None,
+        schedule_checker: Optional[ScheduleLockChecker] = None
+    ):
+        self.sequential_checker = sequential_checker or SequentialLockChecker()
+        self.prerequisite_checker = prerequisite_checker or PrerequisiteLockChecker()
+        self.schedule_checker = schedule_checker or ScheduleLockChecker()
+
+    def evaluate(
+        self,
+        enrollment: Enrollment,
+        nodes: List[CurriculumNode],
+        completed_ids: Set[int],
+        sequential: bool = True
+    ) -> Dict[int, AccessResult]:
+        """
+        Compute access results for all given nodes.
+        
+        Args:
+            enrollment: The student's enrollment
+            nodes: All curriculum nodes of the program
+            completed_ids: Set of completed node IDs for this enrollment
+            sequential: Whether sequential locking applies
+            
+        Returns:
+            Dict mapping node ID to AccessResult
+        """
+        blocking_siblings = (
+            self.get_blocking_siblings(nodes, completed_ids) if sequential else {}
+        )
+        
+        results = {}
+        for node in nodes:
+            schedule_result = self.schedule_checker.is_unlocked(enrollment, node)
+            if not schedule_result.can_access:
+                results[node.id] = schedule_result
+                continue
+            
+            if node.id in completed_ids:
+                results[node.id] = AccessResult(can_access=True, status='completed')
+                continue
+            
+            blocker_id = blocking_siblings.get(node.id)
+            if blocker_id is not None:
+                results[node.id] = AccessResult(
+                    can_access=False,
+                    status='locked',
+                    lock_reason='sequential',
+                    blocking_nodes=[blocker_id]
+                )
+                continue
+            
+            results[node.id] = self.prerequisite_checker.are_prerequisites_met(
+                node, completed_ids
+            )
+        
+        return results
+
+    def get_blocking_siblings(
+        self,
+        nodes: List[CurriculumNode],
+        completed_ids: Set[int]
+    ) -> Dict[int, int]:
+        """
+        Map each sequentially locked node to the sibling blocking it.
+        A node is blocked by the first uncompleted sibling positioned before it.
+        
+        Args:
+            nodes: All curriculum nodes of the program
+            completed_ids: Set of completed node IDs
+            
+        Returns:
+            Dict mapping locked node ID to blocking sibling ID
+        """
+        siblings_by_parent: Dict[Optional[int], List[CurriculumNode]] = {}
+        for node in nodes:
+            siblings_by_parent.setdefault(node.parent_id, []).append(node)
+        
+        blocking = {}
+        for siblings in siblings_by_parent.values():
+            siblings.sort(key=lambda n: (n.position, n.id))
+            first_uncompleted = None
+            for sibling in siblings:
+                if first_uncompleted is not None:
+                    blocking[sibling.id] = first_uncompleted
+                elif sibling.id not in completed_ids:
+                    first_uncompleted = sibling.id
+        return blocking
+
+
 class ProgressCalculator:
     """
     Calculates progress percentage for enrollments.
@@ -234,10 +338,20 @@ class ProgressCalculator:
         Returns:
             Progress percentage (0.0 to 100.0)
         """
-        if subtree_root:
-            all_nodes = self.get_subtree_nodes(subtree_root)
-        else:
-            all_nodes = list(enrollment.program.curriculum_nodes.all())
+        if subtree_root is None or subtree_root.parent_id is None:
+            ProgressCounterService.refresh(enrollment)
+            if subtree_root is None:
+                completed_count = enrollment.completable_completed_count
+                completable_count = enrollment.completable_count
+            else:
+                completed_count, completable_count = (
+                    enrollment.subtree_counters.get(str(subtree_root.id), [0, 0])
+                )
+            if not completable_count:
+                return 100.0
+            return (completed_count / completable_count) * 100
+        
+        all_nodes = self.get_subtree_nodes(subtree_root)
         
         completable_nodes = self.get_completable_nodes(all_nodes)
         
@@ -282,10 +396,231 @@ class ProgressCalculator:
         Returns:
             List of all nodes in the subtree
         """
-        nodes = [root]
-        for child in root.children.all():
-            nodes.extend(self.get_subtree_nodes(child))
-        return nodes
+        return [root] + root.get_descendants()
+
+
+class ProgressCounterService:
+    """
+    Maintains the denormalized progress counters on Enrollment.
+    Counters are adjusted as completions are recorded and deleted, and
+    rebuilt in bulk whenever the program's curriculum_revision (advanced in
+    the database on every node change) differs from the revision they were
+    computed against. Out-of-band changes (e.g. queryset deletes of
+    completions) are repaired by the reconcile_progress_counters command.
+    """
+
+    @staticmethod
+    def _revisions(enrollments: List[Enrollment]) -> Dict[int, int]:
+        """Current curriculum revision per program, from loaded programs or one query."""
+        revisions = {}
+        missing = set()
+        for enrollment in enrollments:
+            if Enrollment.program.is_cached(enrollment):
+                revisions[enrollment.program_id] = enrollment.program.curriculum_revision
+            else:
+                missing.add(enrollment.program_id)
+        if missing - revisions.keys():
+            from apps.core.models import Program
+            revisions.update(
+                Program.objects.filter(pk__in=missing - revisions.keys()).values_list(
+                    'id', 'curriculum_revision'
+                )
+            )
+        return revisions
+
+    @classmethod
+    def refresh(cls, enrollment: Enrollment) -> Enrollment:
+        """
+        Reload an enrollment's counters, rebuilding them if the curriculum changed.
+        
+        Args:
+            enrollment: The enrollment to refresh in place
+            
+        Returns:
+            The same enrollment with current counters
+        """
+        row = Enrollment.objects.filter(pk=enrollment.pk).values(
+            *Enrollment.COUNTER_FIELDS, 'program__curriculum_revision'
+        ).get()
+        for field_name in Enrollment.COUNTER_FIELDS:
+            setattr(enrollment, field_name, row[field_name])
+        if enrollment.counters_revision != row['program__curriculum_revision']:
+            cls._apply_rebuild(enrollment.program_id, [enrollment])
+        return enrollment
+
+    @classmethod
+    def refresh_stale(cls, enrollments: List[Enrollment]) -> None:
+        """
+        Rebuild counters for any of the given (freshly loaded) enrollments
+        whose curriculum revision is out of date. Fresh enrollments cost no
+        queries when their programs were loaded with them (select_related).
+        """
+        if not enrollments:
+            return
+        revisions = cls._revisions(enrollments)
+        stale_by_program: Dict[int, List[Enrollment]] = {}
+        for enrollment in enrollments:
+            if enrollment.counters_revision != revisions.get(enrollment.program_id):
+                stale_by_program.setdefault(enrollment.program_id, []).append(enrollment)
+        
+        for program_id, stale in stale_by_program.items():
+            cls._apply_rebuild(program_id, stale)
+
+    @classmethod
+    def _apply_rebuild(cls, program_id: int, enrollments: List[Enrollment]) -> None:
+        """Rebuild and copy the new counters onto the given instances."""
+        rebuilt = {e.pk: e for e in cls.rebuild(program_id, [e.pk for e in enrollments])}
+        for enrollment in enrollments:
+            source = rebuilt.get(enrollment.pk)
+            if source is not None:
+                for field_name in Enrollment.COUNTER_FIELDS:
+                    setattr(enrollment, field_name, getattr(source, field_name))
+
+    @staticmethod
+    def _curriculum_summary(program_id: int) -> Dict[str, Any]:
+        """
+        Collect per-node completability, leaf and root information for a
+        program. Read from the database, not the cached graph, so counters
+        stamped with a revision always reflect that revision's nodes.
+        """
+        from apps.core.models import Program
+        from apps.curriculum.services import CurriculumGraph
+
+        revision = Program.objects.filter(pk=program_id).values_list(
+            'curriculum_revision', flat=True
+        ).first()
+        rows = list(
+            CurriculumNode.objects.filter(program_id=program_id).values(
+                *CurriculumGraphService.FIELDS, 'completion_rules'
+            )
+        )
+        graph = CurriculumGraph.compile(program_id, rows)
+        completable_ids = {
+            row['id'] for row in rows
+            if row['completion_rules'] and row['completion_rules'].get('is_completable', True)
+        }
+        root_of: Dict[int, int] = {}
+        for node in graph.nodes:
+            root_of[node.id] = node.id if node.parent_id is None else root_of[node.parent_id]
+        
+        subtree_totals: Dict[str, int] = {str(node.id): 0 for node in graph.roots()}
+        for node_id in completable_ids:
+            if node_id in root_of:
+                subtree_totals[str(root_of[node_id])] += 1
+        
+        return {
+            'revision': revision or 0,
+            'completable_ids': completable_ids,
+            'root_of': root_of,
+            'leaf_node_count': sum(1 for n in graph.nodes if n.is_published and n.is_leaf),
+            'subtree_totals': subtree_totals,
+        }
+
+    @classmethod
+    def rebuild(
+        cls,
+        program_id: int,
+        enrollment_ids: Optional[List[int]] = None,
+        save: bool = True
+    ) -> List[Enrollment]:
+        """
+        Recompute counters from scratch for a program's enrollments in bulk.
+        
+        Args:
+            program_id: The program whose enrollments to rebuild
+            enrollment_ids: Optional subset of enrollments to rebuild
+            save: Whether to persist the recomputed counters
+            
+        Returns:
+            The rebuilt enrollments (counter fields only)
+        """
+        summary = cls._curriculum_summary(program_id)
+        completable_ids = summary['completable_ids']
+        root_of = summary['root_of']
+        
+        enrollments = Enrollment.objects.filter(program_id=program_id).only('id', 'program_id')
+        completions = NodeCompletion.objects.filter(enrollment__program_id=program_id)
+        if enrollment_ids is not None:
+            enrollments = enrollments.filter(pk__in=enrollment_ids)
+            completions = completions.filter(enrollment_id__in=enrollment_ids)
+        
+        counters = {}
+        for enrollment in enrollments:
+            enrollment.completion_count = 0
+            enrollment.leaf_node_count = summary['leaf_node_count']
+            enrollment.completable_count = len(completable_ids)
+            enrollment.completable_completed_count = 0
+            enrollment.subtree_counters = {
+                root_id: [0, total] for root_id, total in summary['subtree_totals'].items()
+            }
+            enrollment.counters_revision = summary['revision']
+            counters[enrollment.pk] = enrollment
+        
+        for enrollment_id, node_id in completions.values_list('enrollment_id', 'node_id').iterator():
+            enrollment = counters.get(enrollment_id)
+            if enrollment is None:
+                continue
+            enrollment.completion_count += 1
+            if node_id in completable_ids:
+                enrollment.completable_completed_count += 1
+                root_id = root_of.get(node_id)
+                if root_id is not None:
+                    enrollment.subtree_counters[str(root_id)][0] += 1
+        
+        rebuilt = list(counters.values())
+        if save:
+            Enrollment.objects.bulk_update(rebuilt, Enrollment.COUNTER_FIELDS, batch_size=500)
+        return rebuilt
+
+    @classmethod
+    def record_completion(cls, completion: NodeCompletion) -> None:
+        """Atomically apply a newly created completion to its enrollment's counters."""
+        cls._apply_completion(completion, 1)
+
+    @classmethod
+    def record_completion_deleted(cls, completion: NodeCompletion) -> None:
+        """Atomically remove a deleted completion from its enrollment's counters."""
+        cls._apply_completion(completion, -1)
+
+    @classmethod
+    def _apply_completion(cls, completion: NodeCompletion, delta: int) -> None:
+        """
+        Add delta to the counters a completion contributes to. Falls back to
+        a rebuild of the enrollment if its counters are stale or the node is
+        gone; does nothing if the enrollment itself is gone.
+        """
+        with transaction.atomic():
+            row = (
+                Enrollment.objects.select_for_update()
+                .filter(pk=completion.enrollment_id)
+                .values('program_id', 'subtree_counters', 'counters_revision')
+                .first()
+            )
+            if row is None:
+                return
+            node = (
+                CurriculumNode.objects.filter(pk=completion.node_id)
+                .values('path', 'completion_rules', 'program__curriculum_revision')
+                .first()
+            )
+            if node is None or row['counters_revision'] != node['program__curriculum_revision']:
+                cls.rebuild(row['program_id'], [completion.enrollment_id])
+                return
+            
+            updates = {'completion_count': Greatest(F('completion_count') + delta, 0)}
+            rules = node['completion_rules']
+            if rules and rules.get('is_completable', True):
+                updates['completable_completed_count'] = Greatest(
+                    F('completable_completed_count') + delta, 0
+                )
+                # The root is the first segment of the node's materialized path
+                root_id = str(int(node['path'][:PATH_SEGMENT_WIDTH] or completion.node_id))
+                subtree_counters = row['subtree_counters'] or {}
+                if root_id in subtree_counters:
+                    subtree_counters[root_id][0] = max(subtree_counters[root_id][0] + delta, 0)
+                    updates['subtree_counters'] = subtree_counters
+            
+            Enrollment.objects.filter(pk=completion.enrollment_id).update(**updates)
 
 
 class CompletionTriggerHandler:
@@ -433,6 +768,18 @@ class ProgressionEngine:
         self.progress_calculator = progress_calculator or ProgressCalculator()
         self.completion_handler = completion_handler or CompletionTriggerHandler()
         self.schedule_checker = schedule_checker or ScheduleLockChecker()
+        self.batch_evaluator = BatchUnlockEvaluator(
+            self.sequential_checker,
+            self.prerequisite_checker,
+            self.schedule_checker
+        )
+
+    def _is_sequential(self, enrollment: Enrollment) -> bool:
+        """Whether the program's blueprint enforces sequential progression."""
+        progression_rules = {}
+        if enrollment.program.blueprint:
+            progression_rules = enrollment.program.blueprint.progression_rules or {}
+        return progression_rules.get('sequential', True)
 
     def can_access(
         self,
@@ -464,11 +811,7 @@ class ProgressionEngine:
         ).values_list('node_id', flat=True))
         
         # Check sequential lock
-        progression_rules = {}
-        if enrollment.program.blueprint:
-            progression_rules = enrollment.program.blueprint.progression_rules or {}
-        
-        if progression_rules.get('sequential', True):
+        if self._is_sequential(enrollment):
             seq_result = self.sequential_checker.is_unlocked(
                 enrollment, node, completed_ids
             )
@@ -504,21 +847,23 @@ class ProgressionEngine:
         Returns:
             The NodeCompletion record
         """
-        completion, created = NodeCompletion.objects.get_or_create(
-            enrollment=enrollment,
-            node=node,
-            defaults={
-                'completed_at': timezone.now(),
-                'completion_type': completion_type,
-                'metadata': metadata
-            }
-        )
-        
-        # Check for program completion
-        if self.check_program_completion(enrollment):
-            enrollment.status = 'completed'
-            enrollment.completed_at = timezone.now()
-            enrollment.save()
+        with transaction.atomic():
+            # Progress counters are incremented by the NodeCompletion post_save signal
+            completion, created = NodeCompletion.objects.get_or_create(
+                enrollment=enrollment,
+                node=node,
+                defaults={
+                    'completed_at': timezone.now(),
+                    'completion_type': completion_type,
+                    'metadata': metadata
+                }
+            )
+            
+            # Check for program completion against the updated counters
+            if self.check_program_completion(enrollment):
+                enrollment.status = 'completed'
+                enrollment.completed_at = timezone.now()
+                enrollment.save()
         
         return completion
 
@@ -528,6 +873,8 @@ class ProgressionEngine:
     ) -> List[Dict[str, Any]]:
         """
         Get unlock status for all nodes in a program.
+        Loads nodes and completions once and evaluates every lock in memory,
+        so the query count does not grow with the size of the tree.
         
         Args:
             enrollment: The student's enrollment
@@ -540,6 +887,11 @@ class ProgressionEngine:
             enrollment=enrollment
         ).values_list('node_id', flat=True))
         
+        results = self.batch_evaluator.evaluate(
+            enrollment, nodes, completed_ids,
+            sequential=self._is_sequential(enrollment)
+        )
+        
         statuses = []
         for node in nodes:
             if node.id in completed_ids:
@@ -550,7 +902,7 @@ class ProgressionEngine:
                     'blocking_nodes': None
                 })
             else:
-                result = self.can_access(enrollment, node)
+                result = results[node.id]
                 statuses.append({
                     'node_id': node.id,
                     'status': result.status,
@@ -0,0 +1,21 @@
+"""
+Progression signals - Progress counter maintenance.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import NodeCompletion
+from .services import ProgressCounterService
+
+
+@receiver(post_save, sender=NodeCompletion)
+def on_node_completion_created(sender, instance, created, **kwargs):
+    """Increment the enrollment's progress counters for a new completion."""
+    if created:
+        ProgressCounterService.record_completion(instance)
+
+
+@receiver(post_delete, sender=NodeCompletion)
+def on_node_completion_deleted(sender, instance, **kwargs):
+    """Decrement the enrollment's progress counters for a deleted completion."""
+    ProgressCounterService.record_completion_deleted(instance)
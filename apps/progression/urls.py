@@ -23,6 +23,16 @@ urlpatterns = [
         views.session_discussion_post,
         name="student.session.discussion",
     ),
+    path(
+        "student/programs/<int:pk>/session/<int:node_id>/discussions/",
+        views.session_discussion_threads,
+        name="student.session.discussion.threads",
+    ),
+    path(
+        "student/programs/<int:pk>/session/<int:node_id>/discussions/<int:thread_id>/replies/",
+        views.session_discussion_replies,
+        name="student.session.discussion.replies",
+    ),
     # Notes CRUD endpoints
     path(
         "student/programs/<int:pk>/session/<int:node_id>/notes/",
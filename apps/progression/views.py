@@ -5,20 +5,23 @@ Requirements: 1.1-1.6, 2.1-2.5, 3.1-3.7, 4.1-4.7
 
 from typing import Optional
 from django.contrib.auth.decorators import login_required
-from django.db.models import Count, Q
+from django.db.models import Count, Max, Q, Sum
 from django.shortcuts import get_object_or_404, redirect
 from django.utils import timezone
 from inertia import render
 
+from apps.core.conditional import conditional_page
 from apps.core.models import Program, User
 from apps.curriculum.models import CurriculumNode
+from apps.curriculum.services import CurriculumGraph, CurriculumGraphService
 from apps.progression.models import Enrollment, NodeCompletion, InstructorAssignment
+from apps.content.body_store import ContentBodyStore
 from apps.content.models import ContentBlock
 from apps.assessments.models import AssessmentResult
 from apps.assessments.models import Rubric
 from apps.practicum.models import PracticumSubmission, SubmissionReview
 from apps.certifications.models import Certificate
-from apps.progression.services import ProgressionEngine
+from apps.progression.services import ProgressionEngine, ProgressCounterService
 from apps.core.utils import serialize_user
 
 
@@ -36,15 +39,16 @@ def student_dashboard(request):
     user = request.user
 
     # Get active enrollments with progress
-    enrollments = Enrollment.objects.filter(
-        user=user, status__in=["active", "completed"]
-    ).select_related("program", "program__blueprint")
+    enrollments = list(
+        Enrollment.objects.filter(
+            user=user, status__in=["active", "completed"]
+        ).select_related("program", "program__blueprint")
+    )
+    ProgressCounterService.refresh_stale(enrollments)
 
     enrollment_data = []
     for enrollment in enrollments:
-        total_nodes = _get_completable_nodes_count(enrollment.program)
-        completed_nodes = enrollment.completions.count()
-        progress = (completed_nodes / total_nodes * 100) if total_nodes > 0 else 0
+        progress = enrollment.progress_percent
 
         enrollment_data.append(
             {
@@ -111,11 +115,12 @@ def program_list(request):
     if status_filter:
         enrollments = enrollments.filter(status=status_filter)
 
+    enrollments = list(enrollments)
+    ProgressCounterService.refresh_stale(enrollments)
+
     enrollment_data = []
     for enrollment in enrollments:
-        total_nodes = _get_completable_nodes_count(enrollment.program)
-        completed_nodes = enrollment.completions.count()
-        progress = (completed_nodes / total_nodes * 100) if total_nodes > 0 else 0
+        progress = enrollment.progress_percent
         
         # Get thumbnail URL
         thumbnail_url = enrollment.program.thumbnail.url if enrollment.program.thumbnail else None
@@ -180,8 +185,8 @@ def program_view(request, pk: int):
     def find_first_available_node(nodes):
         """Recursively find first incomplete, unlocked leaf node."""
         for node in nodes:
-            children = node.children.filter(is_published=True).order_by("position")
-            if children.exists():
+            children = graph.children(node.id, published_only=True)
+            if children:
                 # It's a section, recurse into children
                 result = find_first_available_node(children)
                 if result:
@@ -200,8 +205,8 @@ def program_view(request, pk: int):
     def find_first_leaf_node(nodes):
         """Recursively find the first leaf node regardless of status."""
         for node in nodes:
-            children = node.children.filter(is_published=True).order_by("position")
-            if children.exists():
+            children = graph.children(node.id, published_only=True)
+            if children:
                 result = find_first_leaf_node(children)
                 if result:
                     return result
@@ -210,13 +215,8 @@ def program_view(request, pk: int):
         return None
 
     # Get root nodes
-    root_nodes = (
-        CurriculumNode.objects.filter(
-            program=program, parent__isnull=True, is_published=True
-        )
-        .prefetch_related("children")
-        .order_by("position")
-    )
+    graph = CurriculumGraphService.get_graph(program.id)
+    root_nodes = graph.roots(published_only=True)
 
     # Find target node: first incomplete unlocked, or first leaf if all complete
     target_node = find_first_available_node(root_nodes)
@@ -226,13 +226,14 @@ def program_view(request, pk: int):
     # If we found a lesson, render the course player
     if target_node:
         # Reuse session_viewer logic to render course player
+        target_node = CurriculumNode.objects.get(pk=target_node.id)
         return _render_course_player(request, enrollment, target_node, completions, status_map)
     
     # Fallback: If no lessons exist, show an empty state in course player
-    curriculum_tree = _build_curriculum_tree(root_nodes, completions, enrollment, status_map)
+    curriculum_tree = _build_curriculum_tree(root_nodes, completions, enrollment, status_map, graph)
     
-    total_nodes = _get_completable_nodes_count(program)
-    progress = (len(completions) / total_nodes * 100) if total_nodes > 0 else 0
+    ProgressCounterService.refresh_stale([enrollment])
+    progress = enrollment.progress_percent
 
     return render(
         request,
@@ -271,19 +272,14 @@ def _render_course_player(request, enrollment, node, completions, status_map):
     # Check unlock status
     unlock_status = _check_unlock_status(enrollment, node)
 
-    # Get content from properties
-    content_html = node.properties.get("content_html", "")
+    # Session HTML lives in the body store; only the player loads it
+    content_html = ContentBodyStore().load(node)
 
     # Get curriculum tree for Sidebar
-    root_nodes = (
-        CurriculumNode.objects.filter(
-            program=program, parent__isnull=True, is_published=True
-        )
-        .prefetch_related("children")
-        .order_by("position")
-    )
+    graph = CurriculumGraphService.get_graph(program.id)
+    root_nodes = graph.roots(published_only=True)
     
-    curriculum_tree = _build_curriculum_tree(root_nodes, completions, enrollment, status_map)
+    curriculum_tree = _build_curriculum_tree(root_nodes, completions, enrollment, status_map, graph)
 
     # Get content blocks
     blocks = ContentBlock.objects.filter(node=node).order_by('position')
@@ -300,8 +296,8 @@ def _render_course_player(request, enrollment, node, completions, status_map):
     siblings = _get_sibling_navigation(node, enrollment.id)
 
     # Calculate progress
-    total_nodes = _get_completable_nodes_count(program)
-    progress = (len(completions) / total_nodes * 100) if total_nodes > 0 else 0
+    ProgressCounterService.refresh_stale([enrollment])
+    progress = enrollment.progress_percent
 
     return render(
         request,
@@ -340,7 +336,68 @@ def _render_course_player(request, enrollment, node, completions, status_map):
 # =============================================================================
 
 
+def _session_version(request, pk: int, node_id: int) -> Optional[tuple]:
+    """
+    Version of a course player page. The program's curriculum_revision
+    covers every node of the program (titles, bodies, unlock rules); the rest are
+    aggregates over the enrollment's completions and the node's blocks,
+    threads and notes. Drip and scheduled unlocks are counted against the
+    current time, so a node unlocking changes the version.
+    """
+    from apps.discussions.models import DiscussionThread
+    from .models import StudentNote
+
+    enrollment = (
+        Enrollment.objects.filter(pk=pk, user=request.user)
+        .annotate(completed=Count("completions"), last_completion=Max("completions__id"))
+        .values(
+            "program_id", "program__curriculum_revision", "status", "created_at",
+            "completed", "last_completion",
+        )
+        .first()
+    )
+    if enrollment is None:
+        return None
+
+    now = timezone.now()
+    unlocked = CurriculumNode.objects.filter(program_id=enrollment["program_id"]).aggregate(
+        scheduled=Count("id", filter=Q(unlock_date__lte=now)),
+        drip=Count(
+            "id", filter=Q(unlock_after_days__lte=(now - enrollment["created_at"]).days)
+        ),
+    )
+    return (
+        enrollment["program__curriculum_revision"],
+        enrollment["status"],
+        enrollment["completed"],
+        enrollment["last_completion"],
+        unlocked["scheduled"],
+        unlocked["drip"],
+        tuple(
+            ContentBlock.objects.filter(node_id=node_id)
+            .aggregate(count=Count("id"), updated_at=Max("updated_at"))
+            .values()
+        ),
+        tuple(
+            DiscussionThread.objects.filter(node_id=node_id)
+            .aggregate(
+                count=Count("id"),
+                updated_at=Max("updated_at"),
+                posts=Sum("post_count"),
+                last_post_at=Max("last_post_at"),
+            )
+            .values()
+        ),
+        tuple(
+            StudentNote.objects.filter(enrollment_id=pk, node_id=node_id)
+            .aggregate(count=Count("id"), updated_at=Max("updated_at"))
+            .values()
+        ),
+    )
+
+
 @login_required
+@conditional_page(_session_version)
 def session_viewer(request, pk: int, node_id: int):
     """
     View session content and handle mark-as-complete.
@@ -376,29 +433,23 @@ def session_viewer(request, pk: int, node_id: int):
     # Get siblings for navigation
     siblings = _get_sibling_navigation(node, enrollment.id)
 
-    # Get content from properties
-    content_html = node.properties.get("content_html", "")
+    # Session HTML lives in the body store; only the player loads it
+    content_html = ContentBodyStore().load(node)
 
     # Get curriculum tree for Sidebar
-    root_nodes = (
-        CurriculumNode.objects.filter(
-            program=enrollment.program, parent__isnull=True, is_published=True
-        )
-        .prefetch_related("children")
-        .order_by("position")
-    )
+    graph = CurriculumGraphService.get_graph(enrollment.program.id)
+    root_nodes = graph.roots(published_only=True)
     completions = list(enrollment.completions.values_list("node_id", flat=True))
     # Get unlock status map for sidebar
     engine = ProgressionEngine()
     unlock_statuses = engine.get_unlock_status(enrollment)
     status_map = {s['node_id']: s for s in unlock_statuses}
     
-    curriculum_tree = _build_curriculum_tree(root_nodes, completions, enrollment, status_map)
+    curriculum_tree = _build_curriculum_tree(root_nodes, completions, enrollment, status_map, graph)
 
-    # Calculate progress
-    total_nodes = _get_completable_nodes_count(enrollment.program)
-    completed_count = len(completions)
-    progress = (completed_count / total_nodes * 100) if total_nodes > 0 else 0
+    # Calculate progress (counters may have changed by the completion above)
+    ProgressCounterService.refresh(enrollment)
+    progress = enrollment.progress_percent
 
     # Get content blocks
     blocks = ContentBlock.objects.filter(node=node).order_by('position')
@@ -411,36 +462,10 @@ def session_viewer(request, pk: int, node_id: int):
         for b in blocks
     ]
 
-    # Get discussions for this node
-    from apps.discussions.models import DiscussionThread
-    discussions_qs = DiscussionThread.objects.filter(node=node).select_related('user').prefetch_related('posts__user').order_by('-is_pinned', '-created_at')
-    discussions_data = [
-        {
-            "id": thread.id,
-            "title": thread.title,
-            "content": thread.content,
-            "isPinned": thread.is_pinned,
-            "isLocked": thread.is_locked,
-            "createdAt": thread.created_at.isoformat(),
-            "user": {
-                "id": thread.user.id,
-                "name": thread.user.get_full_name() or thread.user.email,
-            },
-            "posts": [
-                {
-                    "id": post.id,
-                    "content": post.content,
-                    "createdAt": post.created_at.isoformat(),
-                    "user": {
-                        "id": post.user.id,
-                        "name": post.user.get_full_name() or post.user.email,
-                    },
-                }
-                for post in thread.posts.all()
-            ],
-        }
-        for thread in discussions_qs
-    ]
+    # First page of discussions; later pages and replies come from the
+    # session discussion endpoints. Evaluated only when the prop is sent.
+    from apps.discussions.services import DiscussionFeedService
+    discussions = lambda: DiscussionFeedService.thread_page(node.id)
 
     # Get notes for this student/node
     from .models import StudentNote
@@ -483,7 +508,7 @@ def session_viewer(request, pk: int, node_id: int):
             "isCompleted": is_completed,
             "isLocked": not unlock_status["is_unlocked"],
             "lockReason": unlock_status.get("reason"),
-            "discussions": discussions_data,
+            "discussions": discussions,
             "notes": notes_data,
         },
     )
@@ -531,6 +556,63 @@ def session_discussion_post(request, pk: int, node_id: int):
     return redirect("progression:student.session", pk=pk, node_id=node_id)
 
 
+@login_required
+def session_discussion_threads(request, pk: int, node_id: int):
+    """
+    GET: A page of a node's discussion threads as JSON.
+    Pass the returned nextCursor as ?cursor= for the following page.
+    """
+    from django.http import JsonResponse
+
+    from apps.discussions.services import DiscussionFeedService
+
+    enrollment = get_object_or_404(Enrollment, pk=pk, user=request.user)
+    node = get_object_or_404(CurriculumNode, pk=node_id, program_id=enrollment.program_id)
+
+    try:
+        page = DiscussionFeedService.thread_page(
+            node.id, cursor=request.GET.get("cursor"), limit=_int_param(request, "limit")
+        )
+    except ValueError:
+        return JsonResponse({"error": "Invalid cursor"}, status=400)
+    return JsonResponse(page)
+
+
+@login_required
+def session_discussion_replies(request, pk: int, node_id: int, thread_id: int):
+    """
+    GET: A page of replies in a discussion thread as JSON.
+    ?parent=<post id> lists replies to that post instead of to the thread.
+    """
+    from django.http import JsonResponse
+
+    from apps.discussions.models import DiscussionThread
+    from apps.discussions.services import DiscussionFeedService
+
+    enrollment = get_object_or_404(Enrollment, pk=pk, user=request.user)
+    thread = get_object_or_404(
+        DiscussionThread, pk=thread_id, node_id=node_id, node__program_id=enrollment.program_id
+    )
+
+    try:
+        page = DiscussionFeedService.reply_page(
+            thread.id,
+            parent_id=_int_param(request, "parent"),
+            cursor=request.GET.get("cursor"),
+            limit=_int_param(request, "limit"),
+        )
+    except ValueError:
+        return JsonResponse({"error": "Invalid cursor"}, status=400)
+    return JsonResponse(page)
+
+
+def _int_param(request, name: str) -> Optional[int]:
+    try:
+        return int(request.GET[name])
+    except (KeyError, ValueError):
+        return None
+
+
 @login_required
 def session_note_create(request, pk: int, node_id: int):
     """
@@ -616,14 +698,16 @@ def _build_curriculum_tree(
     nodes, 
     completions: list, 
     enrollment: Enrollment, 
-    status_map: dict = None
+    status_map: dict = None,
+    graph: Optional[CurriculumGraph] = None
 ) -> list:
-    """Build curriculum tree with completion and unlock status."""
+    """Build curriculum tree with completion and unlock status from the compiled graph."""
     result = []
     status_map = status_map or {}
+    graph = graph or CurriculumGraphService.get_graph(enrollment.program_id)
     
     for node in nodes:
-        children = node.children.filter(is_published=True).order_by("position")
+        children = graph.children(node.id, published_only=True)
         
         node_status = status_map.get(node.id, {})
         status_key = node_status.get('status', 'locked') # default locked if unknown
@@ -643,9 +727,9 @@ def _build_curriculum_tree(
             "isLocked": is_locked,
             "lockReason": node_status.get('lock_reason'),
             "unlocksAt": node_status.get('unlocks_at'),
-            "hasChildren": children.exists(),
+            "hasChildren": bool(children),
             "children": (
-                _build_curriculum_tree(children, completions, enrollment, status_map)
+                _build_curriculum_tree(children, completions, enrollment, status_map, graph)
                 if children
                 else []
             ),
@@ -1346,16 +1430,11 @@ def instructor_program_detail(request, pk: int):
     program = assignment.program
 
     # Get curriculum tree
-    root_nodes = (
-        CurriculumNode.objects.filter(
-            program=program, parent__isnull=True, is_published=True
-        )
-        .prefetch_related("children")
-        .order_by("position")
-    )
+    graph = CurriculumGraphService.get_graph(program.id)
+    root_nodes = graph.roots(published_only=True)
 
     # Build curriculum tree with completion stats
-    curriculum_tree = _build_instructor_curriculum_tree(root_nodes, program)
+    curriculum_tree = _build_instructor_curriculum_tree(root_nodes, program, graph)
 
     # Get hierarchy labels from blueprint
     hierarchy_labels = []
@@ -1369,12 +1448,9 @@ def instructor_program_detail(request, pk: int):
     completed = enrollments.filter(status="completed").count()
 
     # Average progress
-    total_progress = 0
-    for enrollment in enrollments.filter(status="active"):
-        total_nodes = _get_completable_nodes_count(program)
-        completed_nodes = enrollment.completions.count()
-        if total_nodes > 0:
-            total_progress += completed_nodes / total_nodes * 100
+    active_enrollments = list(enrollments.filter(status="active"))
+    ProgressCounterService.refresh_stale(active_enrollments)
+    total_progress = sum(e.progress_percent for e in active_enrollments)
     avg_progress = (total_progress / active) if active > 0 else 0
 
     print(f"DEBUG: Program Resources: {list(program.resources.values('title', 'file'))}")
@@ -1421,20 +1497,32 @@ def instructor_program_detail(request, pk: int):
     print(f"DEBUG: Program Resources: {list(program.resources.values('title', 'file'))}")
 
 
-def _build_instructor_curriculum_tree(nodes, program) -> list:
+def _build_instructor_curriculum_tree(
+    nodes,
+    program,
+    graph: Optional[CurriculumGraph] = None,
+    stats: Optional[tuple] = None,
+) -> list:
     """Build curriculum tree with completion stats for instructor view."""
     result = []
-    for node in nodes:
-        children = node.children.filter(is_published=True).order_by("position")
-
-        # Get completion count for this node
-        completion_count = NodeCompletion.objects.filter(
-            node=node, enrollment__program=program
-        ).count()
-
+    graph = graph or CurriculumGraphService.get_graph(program.id)
+    if stats is None:
+        # Completions per node and active students, for the whole tree at once
+        completion_counts = dict(
+            NodeCompletion.objects.filter(enrollment__program=program)
+            .values("node_id")
+            .annotate(count=Count("id"))
+            .values_list("node_id", "count")
+        )
         total_enrollments = Enrollment.objects.filter(
             program=program, status="active"
         ).count()
+        stats = (completion_counts, total_enrollments)
+    completion_counts, total_enrollments = stats
+
+    for node in nodes:
+        children = graph.children(node.id, published_only=True)
+        completion_count = completion_counts.get(node.id, 0)
 
         node_data = {
             "id": node.id,
@@ -1443,9 +1531,11 @@ def _build_instructor_curriculum_tree(nodes, program) -> list:
             "code": node.code or "",
             "completionCount": completion_count,
             "totalStudents": total_enrollments,
-            "hasChildren": children.exists(),
+            "hasChildren": bool(children),
             "children": (
-                _build_instructor_curriculum_tree(children, program) if children else []
+                _build_instructor_curriculum_tree(children, program, graph, stats)
+                if children
+                else []
             ),
         }
         result.append(node_data)
@@ -1493,12 +1583,12 @@ def instructor_students(request, pk: int):
     enrollments = enrollments[offset : offset + per_page]
 
     # Build student data with progress
-    total_nodes = _get_completable_nodes_count(program)
+    enrollments = list(enrollments)
+    ProgressCounterService.refresh_stale(enrollments)
     students_data = []
 
     for enrollment in enrollments:
-        completed_nodes = enrollment.completions.count()
-        progress = (completed_nodes / total_nodes * 100) if total_nodes > 0 else 0
+        progress = enrollment.progress_percent
 
         # Get last activity
         last_completion = enrollment.completions.order_by("-completed_at").first()
@@ -1564,13 +1654,8 @@ def instructor_student_detail(request, pk: int, enrollment_id: int):
     )
 
     # Get curriculum tree with completion status
-    root_nodes = (
-        CurriculumNode.objects.filter(
-            program=program, parent__isnull=True, is_published=True
-        )
-        .prefetch_related("children")
-        .order_by("position")
-    )
+    graph = CurriculumGraphService.get_graph(program.id)
+    root_nodes = graph.roots(published_only=True)
 
     completions = list(enrollment.completions.values_list("node_id", flat=True))
     
@@ -1578,7 +1663,7 @@ def instructor_student_detail(request, pk: int, enrollment_id: int):
     # This might need a specialized builder if instructor needs to see more details
     # For now, reusing the student-facing one but could be adapted
     status_map = {} # Instructors see everything as accessible
-    curriculum_tree = _build_curriculum_tree(root_nodes, completions, enrollment, status_map)
+    curriculum_tree = _build_curriculum_tree(root_nodes, completions, enrollment, status_map, graph)
 
     # Get activity log
     activity_log = (
@@ -1615,16 +1700,11 @@ def instructor_student_detail(request, pk: int, enrollment_id: int):
     )
 
     # Get curriculum tree with completion status
-    root_nodes = (
-        CurriculumNode.objects.filter(
-            program=program, parent__isnull=True, is_published=True
-        )
-        .prefetch_related("children")
-        .order_by("position")
-    )
+    graph = CurriculumGraphService.get_graph(program.id)
+    root_nodes = graph.roots(published_only=True)
 
     completions = list(enrollment.completions.values_list("node_id", flat=True))
-    curriculum_tree = _build_curriculum_tree(root_nodes, completions, enrollment)
+    curriculum_tree = _build_curriculum_tree(root_nodes, completions, enrollment, graph=graph)
 
     # Calculate progress
     total_nodes = _get_completable_nodes_count(program)
@@ -2163,12 +2243,12 @@ def admin_enrollments(request):
     enrollments_query = enrollments_query.order_by("-enrolled_at")
     enrollments = enrollments_query[(page - 1) * per_page : page * per_page]
 
+    enrollments = list(enrollments)
+    ProgressCounterService.refresh_stale(enrollments)
+
     enrollments_data = []
     for e in enrollments:
-        # Calculate progress
-        total_nodes = _get_completable_nodes_count(e.program)
-        completed_nodes = e.completions.count()
-        progress = (completed_nodes / total_nodes * 100) if total_nodes > 0 else 0
+        progress = e.progress_percent
 
         enrollments_data.append(
             {
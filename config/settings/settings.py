@@ -129,6 +129,38 @@ elif DB_ENGINE == "postgresql":
         }
     }
 
+# =============================================================================
+# Cache (Environment-controlled)
+# =============================================================================
+
+# Compiled curricula, answer keys, the program catalog and unread counts are
+# cached under version stamps that every app process must see. Production
+# runs several Passenger processes, so it defaults to the database cache
+# (create its table with `python manage.py createcachetable`); a single
+# development server may use the per-process memory cache.
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "locmem" if DEBUG else "database")
+
+if CACHE_BACKEND == "locmem":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+elif CACHE_BACKEND == "database":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "crossview_cache",
+        }
+    }
+elif CACHE_BACKEND == "redis":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("CACHE_LOCATION", "redis://127.0.0.1:6379"),
+        }
+    }
+
 # =============================================================================
 # CORS & CSRF Settings (Required for Inertia/SPA)
 # =============================================================================
@@ -240,6 +272,26 @@ CURRICULUM_NODE_REQUIRED_PROPERTIES = {
     "Section": [],
 }
 
+# Public certificate verification: per-IP token bucket (burst size and
+# sustained requests per minute). Clients are told apart by REMOTE_ADDR;
+# behind reverse proxies set TRUSTED_PROXY_COUNT to the number of proxies
+# that append to X-Forwarded-For, so the client address is read from it
+VERIFICATION_RATE_BURST = int(os.getenv("VERIFICATION_RATE_BURST", "20"))
+VERIFICATION_RATE_PER_MINUTE = int(os.getenv("VERIFICATION_RATE_PER_MINUTE", "30"))
+TRUSTED_PROXY_COUNT = int(os.getenv("TRUSTED_PROXY_COUNT", "0"))
+
+# VerificationLog rows are spooled to files in this directory and bulk
+# inserted per BUFFER_SIZE rows, FLUSH_SECONDS, or process exit
+VERIFICATION_LOG_SPOOL_DIR = os.getenv("VERIFICATION_LOG_SPOOL_DIR", str(BASE_DIR / "var" / "verification_logs"))
+VERIFICATION_LOG_BUFFER_SIZE = int(os.getenv("VERIFICATION_LOG_BUFFER_SIZE", "100"))
+VERIFICATION_LOG_FLUSH_SECONDS = float(os.getenv("VERIFICATION_LOG_FLUSH_SECONDS", "5"))
+
+# Announcements reaching at least this many students are delivered as one
+# shared broadcast with per-user read markers instead of a row per student
+NOTIFICATION_BROADCAST_MIN_RECIPIENTS = int(os.getenv("NOTIFICATION_BROADCAST_MIN_RECIPIENTS", "500"))
+# Read notifications older than this are deleted by prune_notifications
+NOTIFICATION_RETENTION_DAYS = int(os.getenv("NOTIFICATION_RETENTION_DAYS", "90"))
+
 # =============================================================================
 # Logging (Environment-controlled verbosity)
 # =============================================================================
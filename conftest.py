@@ -8,6 +8,43 @@ import pytest
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        '--run-benchmarks',
+        action='store_true',
+        default=False,
+        help='Run tests marked benchmark (timing-dependent, skipped by default)',
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip timing benchmarks unless asked for; they depend on the machine's load."""
+    if config.getoption('--run-benchmarks'):
+        return
+    skip = pytest.mark.skip(reason='benchmark; run with --run-benchmarks')
+    for item in items:
+        if 'benchmark' in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Isolate cached state (e.g. compiled curriculum graphs) between tests."""
+    from django.core.cache import cache
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def verification_log_spool(settings, tmp_path):
+    """Spool each test's verification log rows into its own directory."""
+    settings.VERIFICATION_LOG_SPOOL_DIR = str(tmp_path / 'verification_logs')
+    yield
+    from apps.certifications.services import VerificationLogSpool
+    VerificationLogSpool.reset()
+
+
 @pytest.fixture
 def valid_hierarchy_structure():
     """Return a valid hierarchy structure for testing."""
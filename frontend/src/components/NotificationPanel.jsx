@@ -112,7 +112,7 @@ export default function NotificationPanel() {
         // Mark as read if unread
         if (!notification.is_read) {
             router.post(
-                `/notifications/${notification.id}/read/`,
+                notification.read_url,
                 {},
                 {
                     preserveScroll: true,
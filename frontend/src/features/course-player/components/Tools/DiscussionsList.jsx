@@ -1,26 +1,116 @@
-import React from 'react';
-import { Box, Typography, Avatar, List, ListItem, ListItemAvatar, ListItemText, Divider, Chip } from '@mui/material';
+import React, { useEffect, useState } from 'react';
+import axios from 'axios';
+import { Box, Typography, Avatar, List, ListItem, Divider, Chip, Button } from '@mui/material';
 import { ChatBubbleOutline, PushPin } from '@mui/icons-material';
 
-const DiscussionsList = ({ discussions = [] }) => {
-    // Format relative time
-    const formatTime = (isoString) => {
-        if (!isoString) return '';
-        const date = new Date(isoString);
-        const now = new Date();
-        const diffMs = now - date;
-        const diffMins = Math.floor(diffMs / 60000);
-        const diffHours = Math.floor(diffMs / 3600000);
-        const diffDays = Math.floor(diffMs / 86400000);
-
-        if (diffMins < 1) return 'just now';
-        if (diffMins < 60) return `${diffMins}m ago`;
-        if (diffHours < 24) return `${diffHours}h ago`;
-        if (diffDays < 7) return `${diffDays}d ago`;
-        return date.toLocaleDateString();
+// Format relative time
+const formatTime = (isoString) => {
+    if (!isoString) return '';
+    const date = new Date(isoString);
+    const now = new Date();
+    const diffMs = now - date;
+    const diffMins = Math.floor(diffMs / 60000);
+    const diffHours = Math.floor(diffMs / 3600000);
+    const diffDays = Math.floor(diffMs / 86400000);
+
+    if (diffMins < 1) return 'just now';
+    if (diffMins < 60) return `${diffMins}m ago`;
+    if (diffHours < 24) return `${diffHours}h ago`;
+    if (diffDays < 7) return `${diffDays}d ago`;
+    return date.toLocaleDateString();
+};
+
+/**
+ * Replies to a thread (parentId null) or to a post, fetched a page at a time
+ * when first expanded.
+ */
+const Replies = ({ baseUrl, threadId, parentId = null, count }) => {
+    const [posts, setPosts] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
+    const [expanded, setExpanded] = useState(false);
+    const [loading, setLoading] = useState(false);
+
+    const loadPage = (cursor) => {
+        setLoading(true);
+        axios
+            .get(`${baseUrl}${threadId}/replies/`, {
+                params: { parent: parentId ?? undefined, cursor: cursor ?? undefined },
+            })
+            .then(({ data }) => {
+                setPosts((current) => (cursor ? [...current, ...data.posts] : data.posts));
+                setNextCursor(data.nextCursor);
+                setExpanded(true);
+            })
+            .finally(() => setLoading(false));
     };
 
-    if (!discussions || discussions.length === 0) {
+    if (!count) return null;
+
+    if (!expanded) {
+        return (
+            <Button size="small" disabled={loading} onClick={() => loadPage(null)} sx={{ textTransform: 'none', px: 0 }}>
+                {count === 1 ? 'View 1 reply' : `View ${count} replies`}
+            </Button>
+        );
+    }
+
+    return (
+        <Box sx={{ pl: 4, pt: 1, width: '100%' }}>
+            {posts.map((post) => (
+                <Box key={post.id} sx={{ mb: 1.5, display: 'flex', gap: 1 }}>
+                    <Avatar sx={{ width: 24, height: 24, fontSize: 11 }}>
+                        {post.user?.name?.[0] || '?'}
+                    </Avatar>
+                    <Box sx={{ flexGrow: 1 }}>
+                        <Box sx={{ display: 'flex', alignItems: 'center', gap: 1 }}>
+                            <Typography variant="caption" fontWeight={600}>
+                                {post.user?.name || 'Anonymous'}
+                            </Typography>
+                            <Typography variant="caption" color="text.secondary">
+                                {formatTime(post.createdAt)}
+                            </Typography>
+                        </Box>
+                        <Typography variant="body2">
+                            {post.content}
+                        </Typography>
+                        <Replies baseUrl={baseUrl} threadId={threadId} parentId={post.id} count={post.replyCount} />
+                    </Box>
+                </Box>
+            ))}
+            {nextCursor && (
+                <Button size="small" disabled={loading} onClick={() => loadPage(nextCursor)} sx={{ textTransform: 'none', px: 0 }}>
+                    More replies
+                </Button>
+            )}
+        </Box>
+    );
+};
+
+const DiscussionsList = ({ nodeId, enrollmentId, discussions }) => {
+    const [threads, setThreads] = useState(discussions?.threads || []);
+    const [nextCursor, setNextCursor] = useState(discussions?.nextCursor || null);
+    const [loading, setLoading] = useState(false);
+
+    const baseUrl = `/student/programs/${enrollmentId}/session/${nodeId}/discussions/`;
+
+    // A reload of the discussions prop (e.g. after posting) restarts the list
+    useEffect(() => {
+        setThreads(discussions?.threads || []);
+        setNextCursor(discussions?.nextCursor || null);
+    }, [discussions]);
+
+    const loadMore = () => {
+        setLoading(true);
+        axios
+            .get(baseUrl, { params: { cursor: nextCursor } })
+            .then(({ data }) => {
+                setThreads((current) => [...current, ...data.threads]);
+                setNextCursor(data.nextCursor);
+            })
+            .finally(() => setLoading(false));
+    };
+
+    if (threads.length === 0) {
         return (
             <Box sx={{ 
                 display: 'flex', 
@@ -52,7 +142,7 @@ const DiscussionsList = ({ discussions = [] }) => {
     return (
         <Box sx={{ overflowY: 'auto', height: '100%' }}>
             <List disablePadding>
-                {discussions.map((thread, index) => (
+                {threads.map((thread, index) => (
                     <React.Fragment key={thread.id}>
                         <ListItem 
                             alignItems="flex-start" 
@@ -97,36 +187,20 @@ const DiscussionsList = ({ discussions = [] }) => {
                                 {thread.content}
                             </Typography>
 
-                            {/* Replies */}
-                            {thread.posts && thread.posts.length > 0 && (
-                                <Box sx={{ pl: 4, pt: 1, width: '100%' }}>
-                                    {thread.posts.map((post) => (
-                                        <Box key={post.id} sx={{ mb: 1.5, display: 'flex', gap: 1 }}>
-                                            <Avatar sx={{ width: 24, height: 24, fontSize: 11 }}>
-                                                {post.user?.name?.[0] || '?'}
-                                            </Avatar>
-                                            <Box>
-                                                <Box sx={{ display: 'flex', alignItems: 'center', gap: 1 }}>
-                                                    <Typography variant="caption" fontWeight={600}>
-                                                        {post.user?.name || 'Anonymous'}
-                                                    </Typography>
-                                                    <Typography variant="caption" color="text.secondary">
-                                                        {formatTime(post.createdAt)}
-                                                    </Typography>
-                                                </Box>
-                                                <Typography variant="body2">
-                                                    {post.content}
-                                                </Typography>
-                                            </Box>
-                                        </Box>
-                                    ))}
-                                </Box>
-                            )}
+                            {/* Replies, loaded on demand */}
+                            <Replies baseUrl={baseUrl} threadId={thread.id} count={thread.postCount} />
                         </ListItem>
-                        {index < discussions.length - 1 && <Divider />}
+                        {index < threads.length - 1 && <Divider />}
                     </React.Fragment>
                 ))}
             </List>
+            {nextCursor && (
+                <Box sx={{ display: 'flex', justifyContent: 'center', p: 1.5 }}>
+                    <Button size="small" disabled={loading} onClick={loadMore} sx={{ textTransform: 'none' }}>
+                        Load more discussions
+                    </Button>
+                </Box>
+            )}
         </Box>
     );
 };
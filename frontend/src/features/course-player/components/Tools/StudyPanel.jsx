@@ -23,7 +23,7 @@ import {
 } from '@mui/icons-material';
 import DiscussionsList from './DiscussionsList';
 
-const StudyPanel = ({ nodeId, enrollmentId, discussions = [], notes = [], currentVideoTimestamp, onClose }) => {
+const StudyPanel = ({ nodeId, enrollmentId, discussions, notes = [], currentVideoTimestamp, onClose }) => {
     const [activeTab, setActiveTab] = useState(0); // 0 = Discussions, 1 = Notes
     const [isComposing, setIsComposing] = useState(false);
     const [message, setMessage] = useState('');
@@ -211,7 +211,7 @@ const StudyPanel = ({ nodeId, enrollmentId, discussions = [], notes = [], curren
                     )}
 
                     <Box sx={{ flexGrow: 1, overflow: 'hidden' }}>
-                        <DiscussionsList discussions={discussions} />
+                        <DiscussionsList nodeId={nodeId} enrollmentId={enrollmentId} discussions={discussions} />
                     </Box>
                 </>
             ) : (
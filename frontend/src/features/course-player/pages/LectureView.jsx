@@ -15,7 +15,7 @@ const LectureView = ({
     prevNode, 
     nextNode, 
     isCompleted,
-    discussions = [],
+    discussions,
     notes = []
 }) => {
     // Local State
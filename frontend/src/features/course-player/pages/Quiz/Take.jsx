@@ -1,5 +1,6 @@
 import { useState, useEffect, useRef } from 'react';
 import { Head, router } from '@inertiajs/react';
+import axios from 'axios';
 import {
   Box,
   Container,
@@ -37,6 +38,33 @@ export default function Take({ quiz, attempt, questions, attemptsRemaining }) {
   );
   const [submitting, setSubmitting] = useState(false);
   const timerRef = useRef(null);
+  const answersRef = useRef(answers);
+  const dirtyRef = useRef(new Set());
+  const sequenceRef = useRef(attempt.journalSequence || 0);
+
+  // Checkpoint changed answers every few seconds
+  useEffect(() => {
+    const interval = setInterval(() => {
+      if (dirtyRef.current.size === 0) return;
+      const changed = {};
+      dirtyRef.current.forEach((id) => {
+        changed[id] = answersRef.current[id];
+      });
+      dirtyRef.current = new Set();
+      sequenceRef.current += 1;
+      axios
+        .post(`/student/quiz/${quiz.id}/autosave/`, {
+          attemptId: attempt.id,
+          sequence: sequenceRef.current,
+          answers: changed,
+        })
+        .catch(() => {
+          // Retry these answers with the next checkpoint
+          Object.keys(changed).forEach((id) => dirtyRef.current.add(id));
+        });
+    }, 5000);
+    return () => clearInterval(interval);
+  }, []);
 
   // Calculate elapsed time for resuming
   useEffect(() => {
@@ -66,6 +94,8 @@ export default function Take({ quiz, attempt, questions, attemptsRemaining }) {
   }, [timeRemaining !== null]);
 
   const handleAnswerChange = (questionId, value) => {
+    answersRef.current = { ...answersRef.current, [questionId]: value };
+    dirtyRef.current.add(String(questionId));
     setAnswers((prev) => ({
       ...prev,
       [questionId]: value,
@@ -0,0 +1,143 @@
+"""
+Tests for compiled quiz answer keys.
+Tests that cached keys score like the question models, are invalidated
+on edits, and that warm scoring runs without per-question queries.
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from hypothesis import given, settings, HealthCheck, strategies as st
+
+from apps.assessments.answer_key_service import AnswerKeyService, CompiledQuestion
+from apps.assessments.models import (
+    Question, QuestionGapAnswer, QuestionMatchingPair, QuestionOption, Quiz, QuizAttempt,
+)
+from apps.core.models import Program, User
+from apps.curriculum.models import CurriculumNode
+from apps.progression.models import Enrollment
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def quiz():
+    program = Program.objects.create(name='Answer Key Program', code='AK-1')
+    node = CurriculumNode.objects.create(program=program, title='Lesson', node_type='lesson')
+    return Quiz.objects.create(node=node, title='Key Quiz', pass_threshold=50)
+
+
+def _add_questions(quiz, count):
+    """Add `count` rounds of one question per auto-graded type."""
+    for i in range(count):
+        mcq = Question.objects.create(quiz=quiz, question_type='mcq', text='mcq', points=2, position=i, answer_data={})
+        for pos in range(3):
+            QuestionOption.objects.create(question=mcq, text=str(pos), is_correct=(pos == 1), position=pos)
+        multi = Question.objects.create(quiz=quiz, question_type='mcq_multi', text='multi', points=2, position=i, answer_data={})
+        for pos in range(3):
+            QuestionOption.objects.create(question=multi, text=str(pos), is_correct=(pos != 1), position=pos)
+        match = Question.objects.create(quiz=quiz, question_type='matching', text='match', points=4, position=i, answer_data={})
+        QuestionMatchingPair.objects.create(question=match, left_text='A', right_text='1', position=0)
+        QuestionMatchingPair.objects.create(question=match, left_text='B', right_text='2', position=1)
+        gap = Question.objects.create(quiz=quiz, question_type='fill_blank', text='gap', points=2, position=i, answer_data={})
+        QuestionGapAnswer.objects.create(question=gap, gap_index=0, accepted_answers=[' Red ', 'PINK'])
+        Question.objects.create(quiz=quiz, question_type='true_false', text='tf', points=1, position=i, answer_data={'correct': True})
+
+
+def _full_answers(quiz):
+    answers = {}
+    for q in quiz.questions.all():
+        answers[str(q.id)] = {
+            'mcq': 1, 'mcq_multi': [0, 2], 'matching': {'A': '1', 'B': '3'},
+            'fill_blank': {'0': 'red'}, 'true_false': True,
+        }[q.question_type]
+    return answers
+
+
+def _attempt(quiz, answers):
+    user = User.objects.create_user(username=f'ak-{User.objects.count()}', email=f'ak{User.objects.count()}@example.com', password='x')
+    enrollment = Enrollment.objects.create(user=user, program=quiz.node.program)
+    return QuizAttempt.objects.create(
+        enrollment=enrollment, quiz=quiz, attempt_number=1, started_at=timezone.now(), answers=answers,
+    )
+
+
+class TestAnswerKeyScoring:
+
+    def test_calculate_score(self, quiz):
+        _add_questions(quiz, 1)
+        attempt = _attempt(quiz, _full_answers(quiz))
+        # mcq 2 + multi 2 + gap 2 + tf 1; partially correct matching earns nothing here
+        assert attempt.calculate_score() == (7, 11, 63.64, True)
+
+    def test_warm_scoring_makes_no_queries(self, quiz):
+        _add_questions(quiz, 10)
+        attempt = _attempt(quiz, _full_answers(quiz))
+        attempt.calculate_score()
+        
+        with CaptureQueriesContext(connection) as ctx:
+            result = attempt.calculate_score()
+        # Only the quiz revision is read; the 50 questions come from the cache
+        assert len(ctx.captured_queries) == 1
+        assert result[1] == 110
+
+    def test_revision_is_read_from_database(self, quiz):
+        _add_questions(quiz, 1)
+        attempt = _attempt(quiz, _full_answers(quiz))
+        revision = AnswerKeyService.get_key(quiz.id).revision
+
+        # Another process's edit only leaves the bumped row behind
+        Quiz.objects.filter(pk=quiz.pk).update(pass_threshold=100)
+        AnswerKeyService.invalidate(quiz.id)
+        assert AnswerKeyService.get_key(quiz.id).revision == revision + 1
+        assert attempt.calculate_score()[3] is False
+
+    def test_stale_quiz_save_keeps_revision(self, quiz):
+        stale = Quiz.objects.get(pk=quiz.pk)
+        Question.objects.create(quiz=quiz, question_type='true_false', text='tf', points=1, answer_data={'correct': True})
+        revision = AnswerKeyService.get_revision(quiz.id)
+
+        stale.title = 'Renamed'
+        stale.save()
+        assert AnswerKeyService.get_revision(quiz.id) == revision + 1
+
+    def test_option_edit_invalidates_key(self, quiz):
+        q = Question.objects.create(quiz=quiz, question_type='mcq', text='q', points=1, answer_data={})
+        opt0 = QuestionOption.objects.create(question=q, text='a', is_correct=True, position=0)
+        opt1 = QuestionOption.objects.create(question=q, text='b', is_correct=False, position=1)
+        assert q.check_answer(0) == (True, 1)
+        
+        opt0.is_correct = False
+        opt0.save()
+        opt1.is_correct = True
+        opt1.save()
+        assert q.check_answer(0) == (False, 0)
+        assert q.check_answer(1) == (True, 1)
+
+    def test_gap_delete_and_threshold_edit_invalidate_key(self, quiz):
+        q = Question.objects.create(quiz=quiz, question_type='fill_blank', text='q', points=2, answer_data={})
+        QuestionGapAnswer.objects.create(question=q, gap_index=0, accepted_answers=['x'])
+        second = QuestionGapAnswer.objects.create(question=q, gap_index=1, accepted_answers=['y'])
+        attempt = _attempt(quiz, {str(q.id): {'0': 'x', '1': 'n'}})
+        assert attempt.calculate_score() == (0, 2, 0.0, False)
+        
+        second.delete()
+        assert attempt.calculate_score() == (2, 2, 100.0, True)
+        
+        quiz.pass_threshold = 101
+        quiz.save()
+        attempt.quiz.refresh_from_db()
+        assert attempt.calculate_score()[3] is False
+
+    @settings(max_examples=25, suppress_health_check=[HealthCheck.function_scoped_fixture], deadline=None)
+    @given(
+        accepted=st.lists(st.text(max_size=6), min_size=1, max_size=3),
+        submitted=st.text(max_size=6),
+    )
+    def test_compiled_gap_matches_normalization(self, quiz, accepted, submitted):
+        q = Question(quiz=quiz, question_type='fill_blank', points=1, text='q', answer_data={})
+        q.save()
+        QuestionGapAnswer.objects.create(question=q, gap_index=0, accepted_answers=accepted)
+        expected = submitted.lower().strip() in [a.lower().strip() for a in accepted]
+        assert CompiledQuestion.compile(q).check({'0': submitted})[0] is expected
+        assert AnswerKeyService.get_key(quiz.id).get(q.id).check({'0': submitted})[0] is expected
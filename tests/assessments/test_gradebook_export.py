@@ -0,0 +1,129 @@
+"""
+Tests for the streaming gradebook export.
+Tests row contents, grading-strategy totals, chunked iteration,
+the CSV endpoint and the management command.
+"""
+import csv
+import io
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.assessments.gradebook_export import GradebookExporter
+from apps.assessments.models import Assignment, AssignmentSubmission, Quiz, QuizAttempt, Rubric
+from apps.blueprints.models import AcademicBlueprint
+from apps.core.models import Program, User
+from apps.curriculum.models import CurriculumNode
+from apps.progression.models import Enrollment
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def program():
+    blueprint = AcademicBlueprint.objects.create(
+        name='Export Blueprint',
+        hierarchy_structure=['Unit', 'Session'],
+        grading_logic={
+            'type': 'weighted',
+            'components': [{'name': 'exam', 'weight': 0.6}, {'name': 'project', 'weight': 0.4}],
+        },
+    )
+    program = Program.objects.create(name='Export Program', code='EXP-1', blueprint=blueprint)
+    node = CurriculumNode.objects.create(program=program, node_type='Unit', title='Unit')
+    owner = User.objects.create_user(username='rubric-owner', email='owner@example.com', password='x')
+    rubric = Rubric.objects.create(
+        name='Essay', owner=owner, max_score=20,
+        dimensions=[{'name': 'Clarity', 'weight': 1, 'max_score': 10},
+                    {'name': 'Depth', 'weight': 1, 'max_score': 10}],
+    )
+    quiz = Quiz.objects.create(node=node, title='Quiz A', is_published=True)
+    assignment = Assignment.objects.create(
+        program=program, title='Essay', description='', instructions='',
+        weight=70, rubric=rubric, is_published=True,
+    )
+    for i in range(5):
+        user = User.objects.create_user(
+            username=f'export-s{i}', email=f'export-s{i}@example.com', password='x'
+        )
+        enrollment = Enrollment.objects.create(
+            user=user, program=program,
+            grades={'components': {'exam': '80', 'project': 50}},
+        )
+        QuizAttempt.objects.create(
+            enrollment=enrollment, quiz=quiz, attempt_number=1,
+            started_at=timezone.now(), score=Decimal('90.00'), passed=True,
+        )
+        AssignmentSubmission.objects.create(
+            enrollment=enrollment, assignment=assignment, status='graded',
+            submitted_at=timezone.now(), score=Decimal('15.00'),
+            dimension_scores={'Clarity': 8, 'Depth': 7},
+        )
+    return program
+
+
+class TestGradebookExporter:
+
+    def test_header_and_rows(self, program):
+        rows = list(GradebookExporter(program).iter_rows())
+        header, first = rows[0], rows[1]
+        assert header == [
+            'Enrollment ID', 'Student', 'Email', 'Enrollment Status',
+            'Quiz A - Best Score', 'Quiz A - Attempts',
+            'Essay - Score', 'Essay - Status', 'Essay - Clarity', 'Essay - Depth',
+            'Overall Score', 'Program Total', 'Program Status', 'Letter Grade',
+        ]
+        assert len(rows) == 6
+        values = dict(zip(header, first))
+        assert values['Quiz A - Best Score'] == 90.0
+        assert values['Quiz A - Attempts'] == 1
+        assert values['Essay - Clarity'] == 8
+        # WeightedGradingStrategy: 80 * 0.6 + 50 * 0.4
+        assert values['Program Total'] == 68.0
+        assert values['Program Status'] == 'Pass'
+        assert values['Letter Grade'] == 'B'
+
+    def test_blank_and_invalid_components(self, program):
+        enrollments = list(Enrollment.objects.filter(program=program).order_by('id'))
+        enrollments[0].grades = {'components': {'exam': '', 'project': None}}
+        enrollments[1].grades = {'components': {'exam': '70', 'project': 'n/a'}}
+        Enrollment.objects.bulk_update(enrollments[:2], ['grades'])
+        
+        rows = list(GradebookExporter(program).iter_rows())
+        values = {row[0]: dict(zip(rows[0], row)) for row in rows[1:]}
+        assert len(values) == 5
+        assert values[enrollments[0].id]['Program Total'] == 0.0
+        assert values[enrollments[0].id]['Program Status'] == 'Referral'
+        assert values[enrollments[1].id]['Program Total'] is None
+
+    def test_chunks_cover_every_enrollment_once(self, program):
+        exporter = GradebookExporter(program, chunk_size=2)
+        ids = [row[0] for row in list(exporter.iter_rows())[1:]]
+        assert sorted(ids) == sorted(Enrollment.objects.filter(program=program).values_list('id', flat=True))
+        assert len(ids) == len(set(ids))
+
+    def test_csv_endpoint_streams(self, client, program):
+        staff = User.objects.create_user(username='staff', email='staff@example.com', password='x', is_staff=True)
+        client.force_login(staff)
+        response = client.get(f'/instructor/programs/{program.id}/gradebook/export/')
+        assert response.streaming
+        assert response['Content-Disposition'] == 'attachment; filename="gradebook-EXP-1.csv"'
+        body = b''.join(response.streaming_content).decode()
+        rows = list(csv.reader(io.StringIO(body)))
+        assert len(rows) == 6
+
+    def test_management_command_writes_csv(self, program):
+        out = io.StringIO()
+        call_command('export_gradebook', program_id=program.id, chunk_size=2, stdout=out)
+        rows = list(csv.reader(io.StringIO(out.getvalue())))
+        assert rows[0][0] == 'Enrollment ID'
+        assert len(rows) == 6
+
+    def test_xlsx_export(self, program, tmp_path):
+        openpyxl = pytest.importorskip('openpyxl')
+        path = tmp_path / 'gradebook.xlsx'
+        GradebookExporter(program).write_xlsx(str(path))
+        sheet = openpyxl.load_workbook(path).active
+        assert sheet.max_row == 6
@@ -0,0 +1,101 @@
+"""
+Tests for the GradebookService aggregation.
+Tests best-score/attempt-count aggregation, late penalties, weighted overall
+and that query count does not grow with students × items.
+"""
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.assessments.gradebook_service import GradebookService
+from apps.assessments.models import Assignment, AssignmentSubmission, Quiz, QuizAttempt
+from apps.blueprints.models import AcademicBlueprint
+from apps.core.models import Program, User
+from apps.curriculum.models import CurriculumNode
+from apps.progression.models import Enrollment
+
+pytestmark = pytest.mark.django_db
+
+
+def _make_gradebook(code, num_students, num_quizzes, num_assignments=1):
+    blueprint = AcademicBlueprint.objects.create(
+        name=f'Gradebook Blueprint {code}',
+        hierarchy_structure=['Unit', 'Session'],
+        grading_logic={'type': 'weighted', 'components': [], 'quiz_weight': 40},
+    )
+    program = Program.objects.create(name=f'Gradebook {code}', code=code, blueprint=blueprint)
+    node = CurriculumNode.objects.create(program=program, node_type='Unit', title='Unit')
+    quizzes = [
+        Quiz.objects.create(node=node, title=f'Quiz {i}', is_published=True)
+        for i in range(num_quizzes)
+    ]
+    assignments = [
+        Assignment.objects.create(
+            program=program, title=f'Assignment {i}', description='', instructions='',
+            weight=60, late_penalty_percent=10, is_published=True,
+        )
+        for i in range(num_assignments)
+    ]
+    enrollments = []
+    for i in range(num_students):
+        user = User.objects.create_user(
+            username=f'{code}-s{i}', email=f'{code}-s{i}@example.com', password='testpass123'
+        )
+        enrollments.append(Enrollment.objects.create(user=user, program=program))
+    return program, quizzes, assignments, enrollments
+
+
+def _attempt(enrollment, quiz, number, score, passed):
+    return QuizAttempt.objects.create(
+        enrollment=enrollment, quiz=quiz, attempt_number=number,
+        started_at=timezone.now(), score=Decimal(score), passed=passed,
+    )
+
+
+class TestGradebookAggregation:
+
+    def test_best_score_and_attempt_count(self):
+        program, quizzes, assignments, enrollments = _make_gradebook('GB-1', 1, 2)
+        _attempt(enrollments[0], quizzes[0], 1, '40.00', False)
+        _attempt(enrollments[0], quizzes[0], 2, '85.00', True)
+        
+        matrix = GradebookService(program).build()
+        cell, untouched = matrix.quiz_cells[0]
+        assert cell.best_score == 85.0
+        assert cell.attempt_count == 2
+        assert cell.passed is True
+        assert untouched.attempt_count == 0 and untouched.best_score is None
+
+    def test_assignment_late_penalty_and_overall(self):
+        program, quizzes, assignments, enrollments = _make_gradebook('GB-2', 1, 1)
+        _attempt(enrollments[0], quizzes[0], 1, '50.00', False)
+        AssignmentSubmission.objects.create(
+            enrollment=enrollments[0], assignment=assignments[0], status='graded',
+            submitted_at=timezone.now(), is_late=True, score=Decimal('80.00'),
+        )
+        
+        matrix = GradebookService(program).build()
+        assignment_cell = matrix.assignment_cells[0][0]
+        assert assignment_cell.score == pytest.approx(72.0)
+        assert assignment_cell.raw_score == 80.0
+        # (50 * 0.4 + 72 * 0.6) / 100 weight * 100
+        assert matrix.overall[0] == pytest.approx(63.2)
+
+    def test_query_count_independent_of_matrix_size(self):
+        counts = []
+        for code, students, quizzes_count in (('GB-S', 2, 2), ('GB-L', 8, 6)):
+            program, quizzes, assignments, enrollments = _make_gradebook(code, students, quizzes_count)
+            for enrollment in enrollments:
+                for quiz in quizzes:
+                    _attempt(enrollment, quiz, 1, '60.00', False)
+                    _attempt(enrollment, quiz, 2, '75.00', True)
+            
+            with CaptureQueriesContext(connection) as ctx:
+                matrix = GradebookService(program).build()
+            assert len(matrix.enrollments) == students
+            counts.append(len(ctx.captured_queries))
+        
+        assert counts[0] == counts[1]
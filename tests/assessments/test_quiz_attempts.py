@@ -0,0 +1,216 @@
+"""
+Tests for exam-burst quiz start/submit.
+Tests the cached question payload, deterministic per-attempt shuffling,
+race-safe attempt numbering and idempotent submission.
+"""
+import json
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.db.models import QuerySet
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.assessments.answer_key_service import AnswerKeyService
+from apps.assessments.models import Question, QuestionOption, Quiz, QuizAttempt
+from apps.assessments.quiz_attempt_service import QuizAttemptService, QuizPayloadService
+from apps.core.models import Program, User
+from apps.curriculum.models import CurriculumNode
+from apps.progression.models import Enrollment
+
+pytestmark = pytest.mark.django_db
+
+INERTIA = {'HTTP_X_INERTIA': 'true'}
+
+
+@pytest.fixture
+def quiz():
+    program = Program.objects.create(name='Burst Program', code='BURST-1')
+    node = CurriculumNode.objects.create(program=program, title='Lesson', node_type='lesson')
+    quiz = Quiz.objects.create(
+        node=node, title='Burst Quiz', is_published=True, max_attempts=2,
+        pass_threshold=100, shuffle_options=True,
+    )
+    for i in range(5):
+        q = Question.objects.create(quiz=quiz, question_type='mcq', text=f'Q{i}', points=1, position=i, answer_data={})
+        for pos in range(5):
+            QuestionOption.objects.create(question=q, text=f'Q{i} option {pos}', is_correct=(pos == 3), position=pos)
+    return quiz
+
+
+@pytest.fixture
+def enrollment(quiz):
+    user = User.objects.create_user(username='burst', email='burst@example.com', password='x')
+    return Enrollment.objects.create(user=user, program=quiz.node.program, status='active')
+
+
+class TestQuizPayload:
+
+    def test_payload_cached_until_question_edit(self, quiz):
+        QuizPayloadService.get_payload(quiz.id)
+        with CaptureQueriesContext(connection) as ctx:
+            payload = QuizPayloadService.get_payload(quiz.id)
+        # Only the quiz revision is read
+        assert len(ctx.captured_queries) == 1
+        assert payload[0]['options'][3] == 'Q0 option 3'
+        
+        question = quiz.questions.first()
+        question.text = 'Edited'
+        question.save()
+        assert QuizPayloadService.get_payload(quiz.id)[0]['text'] == 'Edited'
+
+    def test_loaded_quiz_revision_skips_revision_read(self, quiz, enrollment):
+        attempt = QuizAttemptService().start(enrollment, quiz)
+        QuizPayloadService.for_attempt(Quiz.objects.get(pk=quiz.pk), attempt)
+        fresh = Quiz.objects.get(pk=quiz.pk)
+        with CaptureQueriesContext(connection) as ctx:
+            QuizPayloadService.for_attempt(fresh, attempt)
+        assert len(ctx.captured_queries) == 0
+
+        # Row-level updates skip the signals, so invalidate like the quiz builder does
+        Question.objects.filter(quiz=quiz, position=0).update(text='Edited')
+        AnswerKeyService.invalidate(quiz.id)
+        payload = QuizPayloadService.for_attempt(Quiz.objects.get(pk=quiz.pk), attempt)
+        assert payload[0]['text'] == 'Edited'
+
+    def test_shuffle_is_deterministic_per_attempt(self, quiz, enrollment):
+        attempt = QuizAttemptService().start(enrollment, quiz)
+        first = QuizPayloadService.for_attempt(quiz, attempt)
+        assert QuizPayloadService.for_attempt(quiz, attempt) == first
+        assert sorted(first[0]['options']) == QuizPayloadService.get_payload(quiz.id)[0]['options']
+
+    def test_unshuffle_maps_displayed_index_to_position(self, quiz, enrollment):
+        attempt = QuizAttemptService().start(enrollment, quiz)
+        displayed = QuizPayloadService.for_attempt(quiz, attempt)
+        answers = {
+            str(q['id']): q['options'].index(f"{q['text']} option 3") for q in displayed
+        }
+        remapped = QuizPayloadService.unshuffle_answers(quiz, attempt, answers)
+        assert set(remapped.values()) == {3}
+
+
+class TestQuizAttemptLifecycle:
+
+    def test_start_resumes_in_progress_attempt(self, quiz, enrollment):
+        service = QuizAttemptService()
+        first = service.start(enrollment, quiz)
+        assert service.start(enrollment, quiz).pk == first.pk
+
+    def test_start_survives_concurrent_create(self, quiz, enrollment):
+        real_aggregate = QuerySet.aggregate
+        winner = []
+        
+        def racing_aggregate(queryset, *args, **kwargs):
+            if not winner:
+                # Another request claims attempt 1 after our in-progress check
+                winner.append(QuizAttempt.objects.create(
+                    enrollment=enrollment, quiz=quiz, attempt_number=1, started_at=timezone.now(),
+                ))
+                return {'last': None}
+            return real_aggregate(queryset, *args, **kwargs)
+        
+        with mock.patch.object(QuerySet, 'aggregate', autospec=True, side_effect=racing_aggregate):
+            attempt = QuizAttemptService().start(enrollment, quiz)
+        assert attempt.pk == winner[0].pk
+        assert QuizAttempt.objects.filter(enrollment=enrollment, quiz=quiz).count() == 1
+
+    def test_attempt_limit(self, quiz, enrollment):
+        service = QuizAttemptService()
+        for _ in range(quiz.max_attempts):
+            assert service.submit(service.start(enrollment, quiz), {}) is True
+        assert service.start(enrollment, quiz) is None
+
+    def test_double_submit_is_noop(self, quiz, enrollment):
+        service = QuizAttemptService()
+        attempt = service.start(enrollment, quiz)
+        stale = QuizAttempt.objects.get(pk=attempt.pk)
+        assert service.submit(attempt, {}) is True
+        assert service.submit(stale, {}) is False
+
+    def test_views_score_shuffled_answers(self, client, quiz, enrollment):
+        client.force_login(enrollment.user)
+        response = client.get(f'/student/quiz/{quiz.id}/', **INERTIA)
+        props = json.loads(response.content)['props']
+        answers = {
+            str(q['id']): q['options'].index(f"{q['text']} option 3") for q in props['questions']
+        }
+        assert props['attemptsRemaining'] == 1
+        
+        client.post(
+            f'/student/quiz/{quiz.id}/submit/',
+            data=json.dumps({'answers': answers}),
+            content_type='application/json',
+        )
+        attempt = QuizAttempt.objects.get(enrollment=enrollment)
+        assert attempt.passed is True
+        assert attempt.points_earned == 5
+
+
+class TestAnswerJournal:
+
+    def test_journal_replay_latest_checkpoint_wins(self, quiz, enrollment):
+        service = QuizAttemptService()
+        attempt = service.start(enrollment, quiz)
+        q1, q2 = [str(q.id) for q in quiz.questions.all()[:2]]
+        service.autosave(attempt, {q1: 0, q2: 1}, sequence=1)
+        service.autosave(attempt, {q1: 4}, sequence=3)
+        service.autosave(attempt, {q1: 2}, sequence=2)  # Late delivery of an older checkpoint
+        service.autosave(attempt, {'999999': 1, 'bogus': 1}, sequence=4)
+        
+        assert service.journal_answers(attempt) == {q1: 4, q2: 1}
+        assert service.last_sequence(attempt) == 3
+
+    def test_autosave_does_not_write_attempt_rows(self, client, quiz, enrollment):
+        client.force_login(enrollment.user)
+        props = json.loads(client.get(f'/student/quiz/{quiz.id}/', **INERTIA).content)['props']
+        attempt_id = props['attempt']['id']
+        question_id = str(props['questions'][0]['id'])
+        
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.post(
+                f'/student/quiz/{quiz.id}/autosave/',
+                data=json.dumps({'attemptId': attempt_id, 'sequence': 1, 'answers': {question_id: 2}}),
+                content_type='application/json',
+            )
+        assert response.json() == {'saved': 1, 'sequence': 1}
+        writes = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith(('INSERT', 'UPDATE'))]
+        assert not any('quiz_attempts' in sql for sql in writes)
+
+    def test_resume_and_submit_coalesce_journal(self, client, quiz, enrollment):
+        client.force_login(enrollment.user)
+        props = json.loads(client.get(f'/student/quiz/{quiz.id}/', **INERTIA).content)['props']
+        attempt_id = props['attempt']['id']
+        correct = {
+            str(q['id']): q['options'].index(f"{q['text']} option 3") for q in props['questions']
+        }
+        client.post(
+            f'/student/quiz/{quiz.id}/autosave/',
+            data=json.dumps({'attemptId': attempt_id, 'sequence': 1, 'answers': correct}),
+            content_type='application/json',
+        )
+        
+        # Connection dropped: reloading the page restores the answers
+        resumed = json.loads(client.get(f'/student/quiz/{quiz.id}/', **INERTIA).content)['props']
+        assert resumed['attempt']['id'] == attempt_id
+        assert resumed['attempt']['answers'] == correct
+        assert resumed['attempt']['journalSequence'] == 1
+        
+        client.post(
+            f'/student/quiz/{quiz.id}/submit/', data=json.dumps({'answers': {}}),
+            content_type='application/json',
+        )
+        attempt = QuizAttempt.objects.get(pk=attempt_id)
+        assert attempt.points_earned == 5
+        assert not attempt.journal_entries.exists()
+
+    def test_autosave_rejects_other_users_attempt(self, client, quiz, enrollment):
+        attempt = QuizAttemptService().start(enrollment, quiz)
+        other = User.objects.create_user(username='other', email='other@example.com', password='x')
+        client.force_login(other)
+        response = client.post(
+            f'/student/quiz/{quiz.id}/autosave/',
+            data=json.dumps({'attemptId': attempt.id, 'answers': {}}),
+            content_type='application/json',
+        )
+        assert response.status_code == 404
@@ -0,0 +1,173 @@
+"""
+Tests for bulk cohort certificate issuance.
+Tests batch serial allocation, eligibility filtering, constant query count,
+render failures, queued-job hand-off and the issue_certificates command.
+"""
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.blueprints.models import AcademicBlueprint
+from apps.certifications.models import Certificate, CertificateRenderJob, CertificateTemplate
+from apps.certifications.services import BulkCertificateIssuer, SerialNumberGenerator, render_certificate_chunk
+from apps.core.models import Program, User
+from apps.progression.models import Enrollment
+
+pytestmark = pytest.mark.django_db
+
+
+def fake_generate(template, data):
+    return f"certificates/{data['serial_number']}.pdf"
+
+
+@pytest.fixture
+def program():
+    CertificateTemplate.objects.create(
+        name="Default",
+        template_html="{{student_name}} {{program_title}} {{completion_date}} {{serial_number}}",
+        is_default=True,
+    )
+    blueprint = AcademicBlueprint.objects.create(
+        name="Cohort Blueprint",
+        hierarchy_structure=["Year"],
+        grading_logic={"type": "weighted", "components": []},
+        certificate_enabled=True,
+    )
+    return Program.objects.create(name="Cohort Program", blueprint=blueprint)
+
+
+def enroll(program, count, status='completed', start=0):
+    return [
+        Enrollment.objects.create(
+            user=User.objects.create(username=f"cohort{i}", email=f"cohort{i}@example.com", first_name="C", last_name=str(i)),
+            program=program,
+            status=status,
+        )
+        for i in range(start, start + count)
+    ]
+
+
+class TestSerialBatch:
+
+    def test_batch_is_unique_and_avoids_existing_serials(self, program):
+        enrollment, = enroll(program, 1)
+        Certificate.objects.create(
+            enrollment=enrollment, template=CertificateTemplate.objects.get(), serial_number='LMS-2026-AAAAAA',
+            student_name='x', program_title='x', completion_date='2026-01-01', issue_date='2026-01-01', pdf_path='x.pdf',
+        )
+        draws = iter(['AAAAAA', 'AAAAAA', 'BBBBBB', 'AAAAAA', 'CCCCCC'])
+
+        with patch('apps.certifications.services.random.choices', side_effect=lambda alphabet, k: list(next(draws))), \
+                patch('apps.certifications.services.datetime') as mock_datetime:
+            mock_datetime.now.return_value.year = 2026
+            serials = SerialNumberGenerator().generate_batch(2)
+
+        assert sorted(serials) == ['LMS-2026-BBBBBB', 'LMS-2026-CCCCCC']
+
+    def test_batch_checks_uniqueness_in_chunks(self, django_assert_num_queries):
+        generator = SerialNumberGenerator()
+
+        with django_assert_num_queries(3):
+            serials = generator.generate_batch(1200)
+
+        assert len(set(serials)) == 1200
+        assert all(generator.validate_format(s) for s in serials)
+
+
+@patch('apps.certifications.services.TemplateGenerator.generate', side_effect=fake_generate)
+class TestBulkCertificateIssuer:
+
+    def test_issues_to_eligible_enrollments_only(self, mock_generate, program):
+        completed = enroll(program, 6)
+        enroll(program, 2, status='active', start=6)
+        BulkCertificateIssuer(workers=1).issue(Enrollment.objects.filter(pk=completed[0].pk))
+
+        report = BulkCertificateIssuer(workers=1).issue(Enrollment.objects.filter(program=program))
+
+        assert (report.requested, report.issued, report.skipped, report.failed) == (8, 5, 3, 0)
+        assert Certificate.objects.count() == 6
+        assert set(Certificate.objects.values_list('enrollment_id', flat=True)) == {e.id for e in completed}
+        for certificate in Certificate.objects.all():
+            assert certificate.pdf_path == f"certificates/{certificate.serial_number}.pdf"
+        # The render queue has nothing left to do for the cohort
+        assert not CertificateRenderJob.objects.filter(status='pending').exists()
+
+    def test_queries_scale_per_render_chunk_not_per_certificate(self, mock_generate, program):
+        def queries_for(count, start):
+            enroll(program, count, start=start)
+            with CaptureQueriesContext(connection) as ctx:
+                report = BulkCertificateIssuer(workers=1).issue(
+                    Enrollment.objects.filter(program=program, certificates__isnull=True)
+                )
+            assert report.issued == count
+            return len(ctx.captured_queries)
+
+        large, small = queries_for(60, start=0), queries_for(5, start=60)
+        # Only the per-chunk template load scales, with cohort size / RENDER_CHUNK
+        assert large - small == 60 // BulkCertificateIssuer.RENDER_CHUNK
+
+    def test_render_failures_are_reported_and_not_written(self, mock_generate, program):
+        enroll(program, 3)
+        calls = []
+
+        def flaky(template, data):
+            calls.append(data)
+            if len(calls) == 2:
+                raise RuntimeError('render failed')
+            return fake_generate(template, data)
+
+        mock_generate.side_effect = flaky
+        report = BulkCertificateIssuer(workers=1).issue(Enrollment.objects.filter(program=program))
+
+        assert (report.issued, report.failed) == (2, 1)
+        assert 'render failed' in report.errors[0]
+        assert Certificate.objects.count() == 2
+
+    def test_missing_template_fails_its_chunk(self, mock_generate, program):
+        results = render_certificate_chunk(0, [{'serial_number': 'LMS-2026-AAAAAA'}, {'serial_number': 'LMS-2026-BBBBBB'}])
+
+        assert [(serial, path) for serial, path, _ in results] == [('LMS-2026-AAAAAA', None), ('LMS-2026-BBBBBB', None)]
+        assert all('does not exist' in error for _, _, error in results)
+
+    def test_enrollment_certified_meanwhile_is_skipped(self, mock_generate, program, settings, tmp_path):
+        settings.MEDIA_ROOT = str(tmp_path)
+        (tmp_path / 'certificates').mkdir()
+        enrollments = enroll(program, 3)
+        template = CertificateTemplate.objects.get()
+
+        def worker_certifies_last(template_, data):
+            if not Certificate.objects.exists():
+                # The render worker certifies an enrollment while the cohort renders
+                Certificate.objects.create(
+                    enrollment=enrollments[2], template=template, serial_number='LMS-2026-WORKER',
+                    student_name='x', program_title='x', completion_date='2026-01-01',
+                    issue_date='2026-01-01', pdf_path='x.pdf',
+                )
+            pdf_path = fake_generate(template_, data)
+            (tmp_path / pdf_path).write_bytes(b'%PDF')
+            return pdf_path
+
+        mock_generate.side_effect = worker_certifies_last
+        report = BulkCertificateIssuer(workers=1).issue(Enrollment.objects.filter(program=program))
+
+        assert (report.issued, report.skipped) == (2, 1)
+        assert Certificate.objects.filter(enrollment=enrollments[2]).count() == 1
+        # The PDF rendered for the skipped enrollment is deleted, the issued ones kept
+        issued = Certificate.objects.exclude(serial_number='LMS-2026-WORKER').values_list('pdf_path', flat=True)
+        assert sorted(p.name for p in (tmp_path / 'certificates').iterdir()) == sorted(
+            path.split('/')[-1] for path in issued
+        )
+
+    def test_command_reports_throughput(self, mock_generate, program):
+        enroll(program, 4)
+        out = StringIO()
+
+        call_command('issue_certificates', f'--program={program.pk}', '--workers=0', stdout=out)
+
+        assert 'Issued 4 of 4' in out.getvalue()
+        assert 'certificates/s' in out.getvalue()
+        assert Certificate.objects.count() == 4
@@ -0,0 +1,188 @@
+"""
+Tests for background certificate rendering.
+Tests that completion queues instead of rendering, batch processing,
+stale-job reclaiming, the worker command and the template compilation cache.
+"""
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.db.models import F
+from django.utils import timezone
+from hypothesis import given, settings, strategies as st
+
+from apps.blueprints.models import AcademicBlueprint
+from apps.certifications.models import Certificate, CertificateRenderJob, CertificateTemplate
+from apps.certifications.services import CertificateRenderQueue, TemplateGenerator
+from apps.core.models import Program, User
+from apps.progression.models import Enrollment
+
+TEMPLATE_HTML = (
+    "<html><head><style>h1 { color: navy; }</style></head><body>"
+    "<h1>{{student_name}}</h1><p>{{program_title}} {{completion_date}} {{serial_number}}</p>"
+    "</body></html>"
+)
+
+
+def make_blueprint(certificate_enabled=True):
+    return AcademicBlueprint.objects.create(
+        name="Queue Blueprint",
+        hierarchy_structure=["Year"],
+        grading_logic={"type": "weighted", "components": []},
+        certificate_enabled=certificate_enabled,
+    )
+
+
+def complete_enrollments(program, count):
+    return [
+        Enrollment.objects.create(
+            user=User.objects.create(
+                username=f"grad{i}", email=f"grad{i}@example.com", first_name="Grad", last_name=str(i)
+            ),
+            program=program,
+            status='completed',
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.django_db
+class TestCertificateRenderQueue:
+
+    @pytest.fixture(autouse=True)
+    def default_template(self):
+        return CertificateTemplate.objects.create(name="Default", template_html=TEMPLATE_HTML, is_default=True)
+
+    @pytest.fixture
+    def program(self):
+        return Program.objects.create(name="Queued Program", blueprint=make_blueprint())
+
+    @patch('apps.certifications.services.TemplateGenerator.generate')
+    def test_completion_queues_without_rendering(self, mock_generate, program):
+        enrollment, = complete_enrollments(program, 1)
+        enrollment.save()  # Later saves of a completed enrollment must not queue again
+
+        mock_generate.assert_not_called()
+        assert Certificate.objects.count() == 0
+        assert CertificateRenderJob.objects.filter(enrollment=enrollment, status='pending').count() == 1
+
+    @patch('apps.certifications.services.TemplateGenerator.generate')
+    def test_batch_renders_with_one_template_lookup(self, mock_generate, program):
+        mock_generate.side_effect = lambda template, data: f"certificates/{data['serial_number']}.pdf"
+        enrollments = complete_enrollments(program, 5)
+        queue = CertificateRenderQueue()
+
+        with patch.object(
+            TemplateGenerator, 'get_template_for_enrollment', wraps=queue.engine.template_generator.get_template_for_enrollment
+        ) as lookup:
+            jobs = queue.process_batch(queue.claim_batch())
+
+        assert lookup.call_count == 1
+        assert mock_generate.call_count == 5
+        assert [job.status for job in jobs] == ['completed'] * 5
+        for enrollment in enrollments:
+            job = CertificateRenderJob.objects.get(enrollment=enrollment)
+            assert job.certificate.enrollment_id == enrollment.id
+        assert queue.claim_batch() == []
+
+    def test_disabled_blueprint_completes_without_certificate(self):
+        program = Program.objects.create(name="No Certs", blueprint=make_blueprint(certificate_enabled=False))
+        complete_enrollments(program, 1)
+        queue = CertificateRenderQueue()
+
+        job, = queue.process_batch(queue.claim_batch())
+
+        assert job.status == 'completed'
+        assert job.certificate is None
+
+    def test_missing_template_fails_job(self, program, default_template):
+        default_template.delete()
+        complete_enrollments(program, 1)
+        queue = CertificateRenderQueue()
+
+        job, = queue.process_batch(queue.claim_batch())
+
+        assert job.status == 'failed'
+        assert 'No default template' in job.error
+
+    @patch('apps.certifications.services.TemplateGenerator.generate', return_value='certificates/x.pdf')
+    def test_stale_running_job_is_reclaimed(self, mock_generate, program):
+        complete_enrollments(program, 1)
+        queue = CertificateRenderQueue()
+        job, = queue.claim_batch()
+        assert queue.claim_batch() == []
+
+        CertificateRenderJob.objects.filter(pk=job.pk).update(
+            heartbeat_at=timezone.now() - queue.STALE_AFTER - timedelta(minutes=1)
+        )
+        reclaimed, = queue.claim_batch()
+
+        assert reclaimed.pk == job.pk
+        assert reclaimed.attempts == 2
+
+    @patch('apps.certifications.services.TemplateGenerator.generate', return_value='certificates/x.pdf')
+    def test_reclaimed_job_rolls_back_its_certificate(self, mock_generate, program):
+        complete_enrollments(program, 1)
+        queue = CertificateRenderQueue()
+        job, = queue.claim_batch()
+        original = queue.engine.template_generator.get_template_for_enrollment
+
+        def reclaimed_before_rendering(enrollment):
+            # Another worker takes the job over after this one stalled; its claim
+            # commits outside the transaction this worker renders the certificate in
+            CertificateRenderJob.objects.filter(pk=job.pk).update(attempts=F('attempts') + 1)
+            return original(enrollment)
+
+        with patch.object(
+            queue.engine.template_generator, 'get_template_for_enrollment', side_effect=reclaimed_before_rendering
+        ):
+            job, = queue.process_batch([job])
+
+        assert job.status == 'running'
+        assert job.attempts == 2
+        assert Certificate.objects.count() == 0
+
+    @patch('apps.certifications.services.TemplateGenerator.generate', return_value='certificates/x.pdf')
+    def test_worker_command_drains_queue(self, mock_generate, program):
+        complete_enrollments(program, 3)
+
+        call_command('render_certificates', '--once', '--batch-size=2')
+
+        assert CertificateRenderJob.objects.filter(status='completed').count() == 3
+        assert Certificate.objects.count() == 3
+
+
+@pytest.mark.django_db
+class TestTemplateCompilation:
+
+    def test_compiled_once_per_version(self):
+        template = CertificateTemplate.objects.create(name="Cached", template_html=TEMPLATE_HTML)
+        generator = TemplateGenerator()
+
+        first = generator.compile(template)
+        assert TemplateGenerator().compile(CertificateTemplate.objects.get(pk=template.pk)) is first
+        assert first.css.strip() == 'h1 { color: navy; }'
+        assert '<style' not in first.fill({})
+
+        template.template_html = TEMPLATE_HTML.replace('<h1>', '<h1 class="name">')
+        template.save()
+        assert generator.compile(template) is not first
+
+    @given(
+        values=st.fixed_dictionaries({
+            key: st.text(alphabet=st.characters(blacklist_characters='{}'), max_size=30)
+            for key in ('student_name', 'program_title', 'completion_date', 'serial_number')
+        }),
+        prefix=st.text(alphabet='<>/pabc "=', max_size=20),
+    )
+    @settings(max_examples=50, deadline=None)
+    def test_fill_matches_sequential_replacement(self, values, prefix):
+        html = prefix + "{{student_name}} / {{program_title}} / {{unknown}} / {{completion_date}} {{serial_number}}"
+        template = CertificateTemplate(name="Unsaved", template_html=html)
+
+        expected = html
+        for key, value in values.items():
+            expected = expected.replace(f"{{{{{key}}}}}", str(value))
+
+        assert TemplateGenerator().compile(template).fill(values) == expected
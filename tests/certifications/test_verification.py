@@ -11,6 +11,12 @@ from apps.certifications.services import VerificationService, VerificationResult
 from apps.certifications.models import Certificate, CertificateTemplate, VerificationLog
 
 
+@pytest.fixture(autouse=True)
+def unbuffered_verification_logs(settings):
+    """These tests assert one log row per verification as it happens."""
+    settings.VERIFICATION_LOG_BUFFER_SIZE = 1
+
+
 @pytest.mark.django_db
 class TestVerificationReturnsCorrectResponse:
     """
@@ -0,0 +1,229 @@
+"""
+Tests for cached and rate-limited certificate verification.
+Tests read-through caching and invalidation, live revocation reads, the
+verification log spool, the per-IP token bucket and the throughput
+benchmark command.
+"""
+from io import StringIO
+from unittest.mock import patch
+
+import os
+import socket
+
+import pytest
+from django.core.management import call_command
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.certifications.models import Certificate, CertificateTemplate, VerificationLog
+from apps.certifications.services import CertificationEngine, VerificationLogSpool, VerificationService
+from apps.certifications.throttling import TokenBucket, client_ip
+from apps.core.models import Program, User
+from apps.progression.models import Enrollment
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def certificate():
+    program = Program.objects.create(name="Verified Program", code="VER-1")
+    user = User.objects.create(username="verified", email="verified@example.com")
+    template = CertificateTemplate.objects.create(
+        name="Default", template_html="{{student_name}} {{program_title}} {{completion_date}} {{serial_number}}"
+    )
+    today = timezone.now().date()
+    return Certificate.objects.create(
+        enrollment=Enrollment.objects.create(user=user, program=program),
+        template=template,
+        serial_number="LMS-2026-CACHE1",
+        student_name="Vera Fied",
+        program_title=program.name,
+        completion_date=today,
+        issue_date=today,
+        pdf_path="certificates/LMS-2026-CACHE1.pdf",
+    )
+
+
+class TestVerificationCache:
+
+    def test_repeat_lookups_only_read_revocation(self, certificate, django_assert_num_queries):
+        service = VerificationService()
+        service.verify(certificate.serial_number)
+
+        # The revocation read; the log row is spooled
+        with django_assert_num_queries(1):
+            result = service.verify(certificate.serial_number)
+
+        assert result.status == 'valid'
+        assert result.certificate.pk == certificate.pk
+        assert result.certificate.student_name == "Vera Fied"
+
+    def test_revoke_invalidates_cached_result(self, certificate):
+        service = VerificationService()
+        assert service.verify(certificate.serial_number).status == 'valid'
+
+        CertificationEngine().revoke(certificate, "Issued in error")
+
+        result = service.verify(certificate.serial_number)
+        assert result.status == 'revoked'
+        assert result.certificate.revocation_reason == "Issued in error"
+
+    def test_revocation_without_signals_is_seen_at_once(self, certificate):
+        service = VerificationService()
+        assert service.verify(certificate.serial_number).status == 'valid'
+
+        Certificate.objects.filter(pk=certificate.pk).update(
+            is_revoked=True, revoked_at=timezone.now(), revocation_reason="Fraud"
+        )
+
+        result = service.verify(certificate.serial_number)
+        assert result.status == 'revoked'
+        assert result.certificate.revocation_reason == "Fraud"
+
+    def test_deleted_certificate_is_not_found(self, certificate):
+        service = VerificationService()
+        service.verify(certificate.serial_number)
+
+        Certificate.objects.filter(pk=certificate.pk).delete()
+
+        assert service.verify(certificate.serial_number).status == 'not_found'
+
+    def test_cached_not_found_clears_when_certificate_is_created(
+        self, certificate, django_capture_on_commit_callbacks
+    ):
+        service = VerificationService()
+        assert service.verify("LMS-2026-LATER1").status == 'not_found'
+
+        Certificate.objects.filter(pk=certificate.pk).update(serial_number="LMS-2026-OTHER1")
+        certificate.refresh_from_db()
+        certificate.pk = None
+        certificate.serial_number = "LMS-2026-LATER1"
+        with django_capture_on_commit_callbacks(execute=True):
+            certificate.save()
+
+        assert service.verify("LMS-2026-LATER1").status == 'valid'
+
+
+class TestVerificationLogSpool:
+
+    def test_rows_are_spooled_then_bulk_inserted(self, certificate):
+        service = VerificationService()
+        service.verify(certificate.serial_number, ip_address="198.51.100.1")
+        service.verify("LMS-2026-NOPE01")
+
+        assert not VerificationLog.objects.exists()
+        assert VerificationLogSpool.flush() == 2
+        assert VerificationLog.objects.filter(
+            certificate=certificate, result='valid', ip_address="198.51.100.1"
+        ).count() == 1
+        assert VerificationLog.objects.filter(certificate=None, result='not_found').count() == 1
+        assert os.listdir(VerificationLogSpool.directory()) == []
+
+    def test_full_segment_is_inserted(self, certificate, settings):
+        settings.VERIFICATION_LOG_BUFFER_SIZE = 3
+        service = VerificationService()
+
+        for _ in range(3):
+            service.verify(certificate.serial_number)
+
+        assert VerificationLog.objects.count() == 3
+
+    def test_stale_segment_is_inserted(self, certificate, settings):
+        settings.VERIFICATION_LOG_FLUSH_SECONDS = 0
+        VerificationService().verify(certificate.serial_number)
+
+        assert VerificationLog.objects.count() == 1
+
+    def test_segment_of_dead_process_is_recovered(self, certificate):
+        service = VerificationService()
+        service.verify(certificate.serial_number)
+        VerificationLogSpool.reset()
+        # The process crashed: its segment is still open under a pid that no longer runs
+        directory = VerificationLogSpool.directory()
+        segment, = os.listdir(directory)
+        dead = f"{segment.split('-', 1)[0]}-999999999-{socket.gethostname()}.open"
+        os.rename(os.path.join(directory, segment), os.path.join(directory, dead))
+        # A live process's open segment is left alone
+        live = os.path.join(directory, f"feed-{os.getppid()}-{socket.gethostname()}.open")
+        open(live, 'w').close()
+
+        assert VerificationLogSpool.flush() == 1
+        assert VerificationLog.objects.get().certificate_id == certificate.pk
+        assert os.listdir(directory) == [os.path.basename(live)]
+
+    def test_deleted_certificate_is_logged_without_it(self, certificate):
+        VerificationService().verify(certificate.serial_number)
+        certificate.delete()
+
+        assert VerificationLogSpool.flush() == 1
+        assert VerificationLog.objects.get().certificate_id is None
+
+
+class TestVerificationThrottling:
+
+    def test_token_bucket_refills_over_time(self):
+        bucket = TokenBucket('test', capacity=2, per_minute=60)
+
+        with patch('apps.certifications.throttling.time.time', return_value=1000.0):
+            assert [bucket.consume('a')[0] for _ in range(3)] == [True, True, False]
+            assert bucket.consume('b')[0] is True
+        with patch('apps.certifications.throttling.time.time', return_value=1001.0):
+            assert bucket.consume('a')[0] is True
+
+    def test_verify_endpoint_returns_429_past_the_burst(self, certificate, settings):
+        settings.VERIFICATION_RATE_BURST = 3
+        settings.VERIFICATION_RATE_PER_MINUTE = 6
+        client = Client()
+        url = reverse('certifications:verify', kwargs={'serial_number': certificate.serial_number})
+
+        statuses = [client.get(url, REMOTE_ADDR="192.0.2.10").status_code for _ in range(4)]
+        blocked = client.get(url, REMOTE_ADDR="192.0.2.10")
+
+        assert statuses[:3] == [200, 200, 200]
+        assert statuses[3] == 429
+        assert int(blocked["Retry-After"]) >= 1
+        assert client.get(url, REMOTE_ADDR="192.0.2.11").status_code == 200
+        # Blocked requests are not verified, so they are not logged
+        assert VerificationLogSpool.flush() == 4
+
+    def test_verify_page_is_throttled(self, settings):
+        settings.VERIFICATION_RATE_BURST = 1
+        client = Client()
+
+        assert client.post("/verify-certificate/", {"serial_number": "X"}).status_code == 200
+        assert client.post("/verify-certificate/", {"serial_number": "X"}).status_code == 429
+
+    def test_verify_page_form_is_not_throttled(self, settings):
+        settings.VERIFICATION_RATE_BURST = 1
+        client = Client()
+
+        assert client.post("/verify-certificate/", {"serial_number": "X"}).status_code == 200
+        assert client.get("/verify-certificate/").status_code == 200
+        assert client.post("/verify-certificate/", {"serial_number": ""}).status_code == 200
+
+    def test_forwarded_for_is_ignored_without_trusted_proxies(self, rf, settings):
+        settings.TRUSTED_PROXY_COUNT = 0
+        request = rf.get("/", REMOTE_ADDR="192.0.2.20", HTTP_X_FORWARDED_FOR="203.0.113.1")
+
+        assert client_ip(request) == "192.0.2.20"
+
+    def test_forwarded_for_is_read_behind_trusted_proxies(self, rf, settings):
+        settings.TRUSTED_PROXY_COUNT = 1
+        # The client forged the first hop; the proxy appended the real address
+        request = rf.get(
+            "/", REMOTE_ADDR="10.0.0.2", HTTP_X_FORWARDED_FOR="203.0.113.1, 198.51.100.9"
+        )
+
+        assert client_ip(request) == "198.51.100.9"
+
+
+def test_benchmark_command_reports_throughput():
+    out = StringIO()
+
+    call_command('benchmark_certificate_verification', '--certificates=20', '--lookups=200', stdout=out)
+
+    assert 'verifications/s' in out.getvalue()
+    assert 'Speed-up' in out.getvalue()
+    assert not Certificate.objects.exists()
+    assert not VerificationLog.objects.exists()
@@ -0,0 +1,152 @@
+"""
+Tests for session HTML stored outside CurriculumNode.properties.
+Tests round-trips of single and paginated bodies, content-addressed sharing,
+legacy inline HTML, node listings without HTML and the data migration.
+"""
+import importlib
+from datetime import timedelta
+
+import pytest
+from django.apps import apps as django_apps
+from django.core.management import call_command
+from django.utils import timezone
+from hypothesis import given, settings, strategies as st
+
+from apps.content.body_store import ContentBodyStore, pack, unpack
+from apps.content.models import ContentBody
+from apps.core.models import Program
+from apps.core.views import _clone_node
+from apps.curriculum.models import CurriculumNode
+
+move_session_bodies = importlib.import_module('apps.content.migrations.0008_move_session_bodies')
+
+
+@given(body=st.one_of(
+    st.text(max_size=200),
+    st.lists(st.text(max_size=50), min_size=2, max_size=5),
+))
+@settings(max_examples=50, deadline=None)
+def test_pack_round_trips(body):
+    data, _, chunk_count, _ = pack(body)
+
+    assert unpack(data) == body
+    assert chunk_count == (1 if isinstance(body, str) else len(body))
+
+
+@pytest.mark.django_db
+class TestContentBodyStore:
+
+    @pytest.fixture
+    def program(self):
+        return Program.objects.create(name='Body Program', code='BODY-1')
+
+    def session(self, program, title='Session', properties=None):
+        return CurriculumNode.objects.create(
+            program=program, node_type='Unit', title=title, properties=properties or {}
+        )
+
+    def test_put_replaces_inline_html_with_reference(self, program):
+        node = self.session(program, properties={'content_html': '<p>old</p>', 'page_range': {'start': 1, 'end': 2}})
+        store = ContentBodyStore()
+
+        ref = store.put(node, ['<p>one</p>', '<p>two – é</p>'])
+        node.save()
+        node.refresh_from_db()
+
+        assert 'content_html' not in node.properties
+        assert node.properties['content_body'] == ref
+        assert node.properties['is_paginated'] is True
+        assert node.properties['page_range'] == {'start': 1, 'end': 2}
+        assert store.load(node) == ['<p>one</p>', '<p>two – é</p>']
+
+    def test_identical_bodies_share_a_row(self, program):
+        store = ContentBodyStore()
+        first, second = self.session(program, 'A'), self.session(program, 'B')
+
+        assert store.put(first, '<p>same</p>') == store.put(second, '<p>same</p>')
+        assert ContentBody.objects.count() == 1
+
+    def test_load_falls_back_to_legacy_inline_html(self, program):
+        node = self.session(program, properties={'content_html': '<p>inline</p>'})
+
+        assert ContentBodyStore().load(node) == '<p>inline</p>'
+        assert ContentBodyStore().load(self.session(program, 'Empty')) == ''
+
+    def test_clone_shares_body_until_edited(self, program):
+        store = ContentBodyStore()
+        source = self.session(program)
+        store.put(source, '<p>original</p>')
+        source.save()
+
+        clone = _clone_node(source, None, program)
+        assert store.load(clone) == '<p>original</p>'
+
+        store.put(clone, '<p>edited</p>')
+        clone.save()
+        source.refresh_from_db()
+        assert store.load(source) == '<p>original</p>'
+        assert store.load(clone) == '<p>edited</p>'
+
+    def test_prune_deletes_only_unreferenced_bodies(self, program):
+        store = ContentBodyStore()
+        edited, shared = self.session(program, 'Edited'), self.session(program, 'Shared')
+        store.put(edited, '<p>old</p>')
+        edited.save()
+        store.put(shared, '<p>kept</p>')
+        shared.save()
+        clone = _clone_node(shared, None, program)
+        store.put(edited, '<p>new</p>')
+        edited.save()
+        shared.delete()
+
+        assert store.prune(timezone.now() - timedelta(hours=1)) == 0
+        assert store.prune(timezone.now() + timedelta(seconds=1), batch_size=1) == 1
+        assert set(ContentBody.objects.values_list('content_hash', flat=True)) == {
+            edited.properties['content_body']['hash'], clone.properties['content_body']['hash'],
+        }
+        assert store.load(clone) == '<p>kept</p>'
+
+    def test_reusing_a_body_keeps_it_from_pruning(self, program):
+        store = ContentBodyStore()
+        node = self.session(program)
+        store.put(node, '<p>again</p>')
+        ContentBody.objects.update(stored_at=timezone.now() - timedelta(days=2))
+
+        store.put(node, '<p>again</p>')
+
+        assert store.prune(timezone.now() - timedelta(days=1)) == 0
+
+    def test_prune_command_dry_run(self, program, capsys):
+        ContentBodyStore().put(self.session(program), '<p>never saved</p>')
+        ContentBody.objects.update(stored_at=timezone.now() - timedelta(days=2))
+
+        call_command('prune_content_bodies', '--dry-run')
+        assert 'Would delete 1 ' in capsys.readouterr().out
+        assert ContentBody.objects.count() == 1
+
+        call_command('prune_content_bodies')
+        assert not ContentBody.objects.exists()
+
+    def test_migration_moves_bodies_out_and_back(self, program):
+        big = ['<p>' + 'x' * 5000 + '</p>', '<p>second</p>']
+        paginated = self.session(program, 'Paginated', {'content_html': big})
+        single = self.session(program, 'Single', {'content_html': '<p>single</p>', 'duration_minutes': 5})
+        plain = self.session(program, 'Plain', {'duration_minutes': 5})
+
+        move_session_bodies.move_bodies_out(django_apps, None)
+
+        for node in (paginated, single, plain):
+            node.refresh_from_db()
+            assert 'content_html' not in node.properties
+        assert len(str(paginated.properties)) < 300
+        assert paginated.properties['is_paginated'] is True
+        assert single.properties['duration_minutes'] == 5
+        assert plain.properties == {'duration_minutes': 5}
+        assert ContentBodyStore().load(paginated) == big
+        assert ContentBodyStore().load(single) == '<p>single</p>'
+
+        move_session_bodies.move_bodies_in(django_apps, None)
+
+        paginated.refresh_from_db()
+        assert paginated.properties['content_html'] == big
+        assert 'content_body' not in paginated.properties
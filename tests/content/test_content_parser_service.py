@@ -52,11 +52,12 @@ class TestEditPersistenceWithModifiedFlag:
         with patch('apps.content.services.ContentVersion') as MockVersion:
             MockVersion.objects.filter.return_value.update.return_value = 1
             
-            service = ContentParserService()
+            body_store = MagicMock()
+            service = ContentParserService(body_store=body_store)
             result = service.edit_content(session, new_html)
         
         # Content should be updated
-        assert session.properties['content_html'] == new_html
+        body_store.put.assert_called_once_with(session, new_html)
         session.save.assert_called()
     
     @given(new_html=st.text(min_size=1, max_size=500))
@@ -71,7 +72,7 @@ class TestEditPersistenceWithModifiedFlag:
         with patch('apps.content.services.ContentVersion') as MockVersion:
             MockVersion.objects.filter.return_value = mock_queryset
             
-            service = ContentParserService()
+            service = ContentParserService(body_store=MagicMock())
             service.edit_content(session, new_html)
         
         # Should update is_manually_edited flag
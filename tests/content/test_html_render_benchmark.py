@@ -0,0 +1,188 @@
+"""
+Microbenchmarks for the HTML render and pagination stage.
+
+Compares ContentOptimizer.to_html / paginate / iter_chunks with the previous
+string-concatenating implementations, kept below as references. The default
+run only checks that both produce identical output, on random and large
+inputs. The timing comparisons (best of several runs) are marked benchmark
+and skipped unless pytest is given --run-benchmarks.
+"""
+import re
+import time
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from apps.content.services import ContentOptimizer, ExtractedContent
+
+
+def legacy_to_html(optimizer: ContentOptimizer, content: ExtractedContent) -> str:
+    """to_html as it was: each page grown by repeated concatenation."""
+    html_parts = []
+    for page in content.pages:
+        page_html = f"<div class='page' data-page='{page['page']}'>"
+        blocks = page.get('blocks', [])
+        if blocks:
+            for block in blocks:
+                text = block.get('text', '').strip()
+                if not text:
+                    continue
+                font_size = block.get('font_size', 12)
+                if font_size >= 18:
+                    page_html += f"<h2>{optimizer._escape_html(text)}</h2>"
+                elif font_size >= 14:
+                    page_html += f"<h3>{optimizer._escape_html(text)}</h3>"
+                else:
+                    for para in text.split('\n\n'):
+                        para = para.strip()
+                        if para:
+                            page_html += f"<p>{optimizer._escape_html(para)}</p>"
+        else:
+            text = page.get('text', '').strip()
+            if text:
+                for para in text.split('\n\n'):
+                    para = para.strip()
+                    if para:
+                        page_html += f"<p>{optimizer._escape_html(para)}</p>"
+        page_html += "</div>"
+        html_parts.append(page_html)
+    return '\n'.join(html_parts)
+
+
+def legacy_paginate(html: str, max_size_kb: int) -> list:
+    """paginate as it was: the accumulated chunk is re-encoded for every part."""
+    max_bytes = max_size_kb * 1024
+    if len(html.encode('utf-8')) <= max_bytes:
+        return [html]
+    chunks = []
+    current_chunk = ""
+    for part in re.split(r"(<div class='page'[^>]*>.*?</div>)", html, flags=re.DOTALL):
+        if not part.strip():
+            continue
+        part_size = len(part.encode('utf-8'))
+        current_size = len(current_chunk.encode('utf-8'))
+        if current_size + part_size > max_bytes and current_chunk:
+            chunks.append(current_chunk)
+            current_chunk = part
+        else:
+            current_chunk += part
+    if current_chunk:
+        chunks.append(current_chunk)
+    return chunks if chunks else [html]
+
+
+def make_content(pages: int, blocks_per_page: int = 20) -> ExtractedContent:
+    """Synthetic textbook: a heading and many paragraph blocks per page, with non-ASCII text."""
+    return ExtractedContent(
+        pages=[
+            {
+                'page': i + 1,
+                'text': '',
+                'blocks': [{'text': f'Chapter {i + 1} <intro>', 'font_size': 20}] + [
+                    {'text': f'Paragraph {j} on page {i + 1} – café & “quotes”.\n\nSecond part.', 'font_size': 11}
+                    for j in range(blocks_per_page)
+                ],
+            }
+            for i in range(pages)
+        ],
+        page_count=pages,
+    )
+
+
+def best_of(func, *args, runs: int = 3) -> float:
+    timings = []
+    for _ in range(runs):
+        began = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - began)
+    return min(timings)
+
+
+class TestRenderEquivalence:
+
+    @given(
+        pages=st.integers(min_value=0, max_value=40),
+        blocks=st.integers(min_value=0, max_value=6),
+        max_size_kb=st.integers(min_value=1, max_value=8),
+    )
+    @settings(max_examples=40, deadline=None)
+    def test_new_stage_matches_legacy_output(self, pages, blocks, max_size_kb):
+        optimizer = ContentOptimizer()
+        content = make_content(pages, blocks)
+
+        html = optimizer.to_html(content)
+        assert html == legacy_to_html(optimizer, content)
+
+        expected = legacy_paginate(html, max_size_kb)
+        assert optimizer.paginate(html, max_size_kb) == expected
+        assert list(optimizer.iter_chunks(optimizer.iter_html_pages(content), max_size_kb)) == expected
+
+    def test_iter_chunks_is_lazy(self):
+        optimizer = ContentOptimizer()
+        consumed = []
+
+        def pages():
+            for i in range(1000):
+                consumed.append(i)
+                yield f"<div class='page' data-page='{i}'>{'x' * 1000}</div>"
+
+        first = next(optimizer.iter_chunks(pages(), max_size_kb=10))
+
+        assert len(first.encode('utf-8')) <= 10 * 1024
+        assert len(consumed) < 20
+
+
+@pytest.fixture(scope='module')
+def large():
+    content = make_content(pages=1500)
+    html = ContentOptimizer().to_html(content)
+    return content, html
+
+
+class TestLargeInputEquivalence:
+
+    def test_to_html(self, large):
+        content, html = large
+        assert html == legacy_to_html(ContentOptimizer(), content)
+
+    @pytest.mark.parametrize('max_size_kb', [100, 2048])
+    def test_paginate(self, large, max_size_kb):
+        content, html = large
+        optimizer = ContentOptimizer()
+
+        expected = legacy_paginate(html, max_size_kb)
+        assert optimizer.paginate(html, max_size_kb) == expected
+        assert list(optimizer.iter_chunks(optimizer.iter_html_pages(content), max_size_kb)) == expected
+
+
+@pytest.mark.benchmark
+class TestRenderBenchmark:
+    """Large-input timings; assertions only guard against regressions to quadratic behaviour."""
+
+    def test_to_html(self, large):
+        content, _ = large
+        optimizer = ContentOptimizer()
+
+        legacy = best_of(legacy_to_html, optimizer, content)
+        current = best_of(optimizer.to_html, content)
+
+        assert current < legacy * 1.5, f'to_html: legacy {legacy * 1000:.1f} ms, current {current * 1000:.1f} ms'
+
+    @pytest.mark.parametrize('max_size_kb', [100, 2048])
+    def test_paginate(self, large, max_size_kb):
+        _, html = large
+        optimizer = ContentOptimizer()
+
+        legacy = best_of(legacy_paginate, html, max_size_kb)
+        current = best_of(optimizer.paginate, html, max_size_kb)
+
+        assert current < legacy, f'paginate: legacy {legacy * 1000:.1f} ms, current {current * 1000:.1f} ms'
+
+    def test_streaming_render_and_paginate(self, large):
+        content, _ = large
+        optimizer = ContentOptimizer()
+
+        legacy = best_of(lambda: legacy_paginate(legacy_to_html(optimizer, content), 2048))
+        current = best_of(lambda: list(optimizer.iter_chunks(optimizer.iter_html_pages(content), 2048)))
+
+        assert current < legacy, f'render + paginate: legacy {legacy * 1000:.1f} ms, current {current * 1000:.1f} ms'
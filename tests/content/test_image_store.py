@@ -0,0 +1,148 @@
+"""
+Tests for content-addressed image optimization and storage.
+Tests in-batch deduplication, stored files and assets, re-parse reuse,
+settings-sensitive keys and the process-pool encoder.
+"""
+import io
+import os
+from unittest.mock import patch
+
+import fitz  # PyMuPDF
+import pytest
+from PIL import Image
+
+from apps.content import imaging, services
+from apps.content.image_store import ImageStore
+from apps.content.models import ImageAsset, ParsedImage
+from apps.content.services import ContentOptimizer, ContentParserService
+from apps.core.models import Program
+from apps.curriculum.models import CurriculumNode
+
+
+def png_bytes(color, size=(120, 80)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color=color).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def create_pdf_with_logo(num_pages: int) -> bytes:
+    """Every page repeats the same logo and has one unique figure."""
+    logo = png_bytes((0, 0, 255))
+    doc = fitz.open()
+    for i in range(num_pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {i + 1}")
+        page.insert_image(fitz.Rect(72, 100, 192, 180), stream=logo)
+        page.insert_image(fitz.Rect(72, 200, 192, 280), stream=png_bytes((i * 40 % 256, 200, 0)))
+    pdf_bytes = doc.tobytes()
+    doc.close()
+    return pdf_bytes
+
+
+def image(page, data):
+    return {'page': page, 'index': 0, 'data': data, 'ext': 'png', 'width': 120, 'height': 80}
+
+
+class TestOptimizeImages:
+
+    def test_identical_sources_are_encoded_once(self):
+        logo = png_bytes((0, 0, 255))
+        images = [image(1, logo), image(2, logo), image(3, png_bytes((255, 0, 0)))]
+
+        with patch.object(services, 'encode_for_mobile', wraps=services.encode_for_mobile) as encode:
+            optimized = ContentOptimizer(workers=1).optimize_images(images)
+
+        assert encode.call_count == 2
+        assert len(optimized) == 3
+        assert optimized[0]['key'] == optimized[1]['key'] != optimized[2]['key']
+        assert optimized[0]['data'] == optimized[1]['data']
+
+    def test_key_depends_on_optimizer_settings(self):
+        logo = png_bytes((0, 0, 255))
+
+        low = ContentOptimizer(image_quality=40, workers=1).optimize_images([image(1, logo)])
+        high = ContentOptimizer(image_quality=90, workers=1).optimize_images([image(1, logo)])
+
+        assert low[0]['source_digest'] == high[0]['source_digest']
+        assert low[0]['key'] != high[0]['key']
+
+    def test_process_pool_matches_inline_encoding(self):
+        images = [image(i, png_bytes((i * 50, 10, 10), size=(900, 300))) for i in range(1, 5)]
+
+        try:
+            pooled = ContentOptimizer(workers=2).optimize_images(images)
+        finally:
+            imaging.shutdown_pool()
+        inline = ContentOptimizer(workers=1).optimize_images(images)
+
+        assert [(i['key'], i['width'], i['data']) for i in pooled] == \
+            [(i['key'], i['width'], i['data']) for i in inline]
+        assert all(i['width'] == 800 for i in pooled)
+
+    def test_undecodable_image_keeps_original(self):
+        optimized = ContentOptimizer(workers=1).optimize_images([image(1, b'not an image')])
+
+        assert 'data' not in optimized[0]
+        assert optimized[0]['source'] == b'not an image'
+        assert optimized[0]['ext'] == 'png'
+
+
+@pytest.mark.django_db
+class TestStoredImages:
+
+    @pytest.fixture(autouse=True)
+    def media_root(self, settings, tmp_path):
+        settings.MEDIA_ROOT = str(tmp_path / 'media')
+        return settings.MEDIA_ROOT
+
+    @pytest.fixture
+    def unit(self):
+        program = Program.objects.create(name='Image Program', code='IMG-1')
+        return CurriculumNode.objects.create(program=program, node_type='Unit', title='Unit')
+
+    @pytest.fixture
+    def pdf_path(self, tmp_path):
+        path = tmp_path / 'logo.pdf'
+        path.write_bytes(create_pdf_with_logo(4))
+        return str(path)
+
+    def test_parse_writes_deduplicated_files(self, unit, pdf_path, media_root):
+        version = ContentParserService(optimizer=ContentOptimizer(image_store=ImageStore(), workers=1)).parse_pdf(
+            unit, pdf_path, 'logo.pdf', page_ranges=[{'start': 1, 'end': 2}, {'start': 3, 'end': 4}]
+        )
+
+        images = list(ParsedImage.objects.filter(content_version=version))
+        assert len(images) == 8
+        # One shared logo plus four distinct figures
+        assert ImageAsset.objects.count() == 5
+        assert len({img.asset_id for img in images}) == 5
+        for img in images:
+            assert os.path.exists(os.path.join(media_root, img.original_path))
+            assert os.path.exists(os.path.join(media_root, img.optimized_path))
+            assert img.optimized_path.endswith('.jpeg')
+
+    def test_reparse_of_unchanged_pdf_skips_image_work(self, unit, pdf_path):
+        service = ContentParserService(optimizer=ContentOptimizer(image_store=ImageStore(), workers=1))
+        first = service.parse_pdf(unit, pdf_path, 'logo.pdf')
+        first_paths = sorted(ParsedImage.objects.filter(content_version=first).values_list('optimized_path', flat=True))
+
+        with patch.object(services, 'encode_for_mobile') as encode, \
+                patch.object(ImageStore, 'put') as put:
+            second = service.re_parse(first)
+
+        encode.assert_not_called()
+        put.assert_not_called()
+        assert ImageAsset.objects.count() == 5
+        second_paths = sorted(ParsedImage.objects.filter(content_version=second).values_list('optimized_path', flat=True))
+        assert second_paths == first_paths
+
+    def test_stored_undecodable_image_keeps_its_format(self):
+        optimizer = ContentOptimizer(image_store=ImageStore(), workers=1)
+        [fresh] = optimizer.optimize_images([image(1, b'not an image')])
+        ImageStore().put(fresh, optimizer.fingerprint)
+
+        [stored] = optimizer.optimize_images([image(2, b'not an image')])
+
+        assert stored['asset_id']
+        assert stored['ext'] == 'png'
+        assert stored['optimized_path'].endswith('.png')
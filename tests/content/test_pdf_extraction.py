@@ -206,3 +206,86 @@ class TestSectionDetection:
         finally:
             import os
             os.unlink(pdf_path)
+
+
+def create_pdf_with_images(num_pages: int) -> bytes:
+    """Create a test PDF with one small PNG image per page."""
+    from PIL import Image
+
+    doc = fitz.open()
+    for i in range(num_pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {i + 1}: Test content")
+        buffer = io.BytesIO()
+        Image.new('RGB', (40, 40), color=(i * 20 % 256, 0, 0)).save(buffer, format='PNG')
+        page.insert_image(fitz.Rect(72, 100, 112, 140), stream=buffer.getvalue())
+    pdf_bytes = doc.tobytes()
+    doc.close()
+    return pdf_bytes
+
+
+class TestStreamingExtraction:
+    """
+    Streaming extraction yields the same pages as extract() while keeping
+    image payloads in spool files instead of memory.
+    """
+
+    @pytest.fixture
+    def pdf_path(self, tmp_path):
+        path = tmp_path / 'images.pdf'
+        path.write_bytes(create_pdf_with_images(5))
+        return str(path)
+
+    def test_iter_pages_is_lazy_and_matches_extract(self, pdf_path):
+        extractor = PdfExtractor()
+        pages = extractor.iter_pages(pdf_path)
+
+        first = next(pages)
+        assert first['page'] == 1
+        rest = list(pages)
+
+        eager = extractor.extract(pdf_path)
+        assert [p['text'] for p in [first] + rest] == [p['text'] for p in eager.pages]
+
+    def test_images_are_spilled_to_spool_files(self, pdf_path):
+        import os
+
+        with PdfExtractor().stream(pdf_path) as pdf:
+            content = pdf.extract_range(2, 4)
+
+            assert [p['page'] for p in content.pages] == [2, 3, 4]
+            assert len(content.images) == 3
+            for image in content.images:
+                assert 'data' not in image
+                assert os.path.getsize(image['path']) == image['original_size']
+
+            pdf.release(content)
+            assert not any(os.path.exists(image['path']) for image in content.images)
+
+            content = pdf.extract_range(5, 5)
+            spool_path = content.images[0]['path']
+
+        # Closing the stream removes anything not yet released
+        assert not os.path.exists(spool_path)
+
+    def test_outline_has_text_and_headings_without_images(self, tmp_path):
+        path = tmp_path / 'headings.pdf'
+        path.write_bytes(create_pdf_with_headings(['Intro', 'Methods']))
+
+        with PdfExtractor().stream(str(path)) as pdf:
+            outline = pdf.outline()
+
+        assert outline.page_count == 2
+        assert outline.headings == ['Intro', 'Methods']
+        assert outline.images == []
+        assert all('blocks' not in page for page in outline.pages)
+
+    def test_spilled_images_can_be_optimized(self, pdf_path):
+        from apps.content.services import ContentOptimizer
+
+        with PdfExtractor().stream(pdf_path) as pdf:
+            content = pdf.extract_range(1, 2)
+            optimized = ContentOptimizer().optimize_images(content.images)
+
+        assert [img['ext'] for img in optimized] == ['jpeg', 'jpeg']
+        assert all(img['optimized_size'] > 0 for img in optimized)
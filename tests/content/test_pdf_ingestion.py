@@ -0,0 +1,237 @@
+"""
+Tests for the background PDF ingestion pipeline.
+Tests job planning, per-range progress, resuming after a crash,
+stale-job reclaiming, the upload endpoint and the worker command.
+"""
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+import fitz  # PyMuPDF
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db.models import F
+from django.utils import timezone
+
+from apps.content.body_store import ContentBodyStore
+from apps.content.ingestion_service import PdfIngestionService
+from apps.content.models import ContentVersion, PdfIngestionJob
+from apps.core.models import Program, User
+from apps.core.services.job_queue import Heartbeat
+from apps.curriculum.models import CurriculumNode
+
+pytestmark = pytest.mark.django_db
+
+
+def create_test_pdf(num_pages: int) -> bytes:
+    doc = fitz.open()
+    for i in range(num_pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {i + 1} content")
+    pdf_bytes = doc.tobytes()
+    doc.close()
+    return pdf_bytes
+
+
+@pytest.fixture
+def unit():
+    program = Program.objects.create(name='Ingest Program', code='ING-1')
+    return CurriculumNode.objects.create(program=program, node_type='Unit', title='Unit 1')
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / 'book.pdf'
+    path.write_bytes(create_test_pdf(6))
+    return str(path)
+
+
+RANGES = [
+    {'start': 1, 'end': 2, 'title': 'Part A'},
+    {'start': 3, 'end': 4, 'title': 'Part B'},
+    {'start': 5, 'end': 6, 'title': 'Part C'},
+]
+
+
+class TestPdfIngestionService:
+
+    def test_processes_job_range_by_range(self, unit, pdf_path):
+        service = PdfIngestionService()
+        job = service.enqueue(unit, pdf_path, 'book.pdf', page_ranges=RANGES)
+
+        job = service.process(service.claim_next())
+
+        assert job.status == 'completed'
+        assert job.page_count == 6
+        assert job.progress == {'done': 3, 'total': 3}
+        sessions = list(unit.children.filter(node_type='Session').order_by('position'))
+        assert [s.title for s in sessions] == ['Part A', 'Part B', 'Part C']
+        assert [r['session_id'] for r in job.ranges] == [s.id for s in sessions]
+        assert 'Page 3 content' in ContentBodyStore().load(sessions[1])
+        assert sessions[0].properties['page_range'] == {'start': 1, 'end': 2}
+        assert job.content_version.page_count == 6
+
+    def test_resumes_after_crash_without_duplicating_sessions(self, unit, pdf_path):
+        service = PdfIngestionService()
+        job = service.enqueue(unit, pdf_path, 'book.pdf', page_ranges=RANGES)
+        original = service.parser.render_session
+        calls = []
+
+        def crash_on_second_range(version, session):
+            calls.append(session.title)
+            if len(calls) == 2:
+                raise RuntimeError('worker killed')
+            original(version, session)
+
+        with patch.object(service.parser, 'render_session', side_effect=crash_on_second_range):
+            job = service.process(service.claim_next())
+
+        assert job.status == 'failed'
+        assert job.progress == {'done': 1, 'total': 3}
+        # The failed range rolled back together with its session
+        assert unit.children.filter(node_type='Session').count() == 1
+
+        job.status = 'pending'
+        job.save()
+        job = service.process(service.claim_next())
+
+        assert job.status == 'completed'
+        titles = list(unit.children.filter(node_type='Session').order_by('position').values_list('title', flat=True))
+        assert titles == ['Part A', 'Part B', 'Part C']
+        assert ContentVersion.objects.filter(node=unit).count() == 1
+
+    def test_auto_detects_ranges_without_requested_ranges(self, unit, pdf_path):
+        service = PdfIngestionService()
+        service.enqueue(unit, pdf_path, 'book.pdf')
+
+        job = service.process(service.claim_next())
+
+        assert job.status == 'completed'
+        assert job.ranges[0]['start'] == 1
+        assert job.ranges[-1]['end'] == 6
+
+    def test_missing_file_marks_job_failed(self, unit, tmp_path):
+        service = PdfIngestionService()
+        service.enqueue(unit, str(tmp_path / 'missing.pdf'), 'missing.pdf')
+
+        job = service.process(service.claim_next())
+
+        assert job.status == 'failed'
+        assert 'Failed to extract PDF' in job.error
+
+    def test_claim_skips_running_jobs_until_stale(self, unit, pdf_path):
+        service = PdfIngestionService()
+        job = service.enqueue(unit, pdf_path, 'book.pdf')
+        assert service.claim_next().id == job.id
+        assert service.claim_next() is None
+
+        PdfIngestionJob.objects.filter(pk=job.pk).update(
+            heartbeat_at=timezone.now() - service.STALE_AFTER - timedelta(minutes=1)
+        )
+        reclaimed = service.claim_next()
+        assert reclaimed.id == job.id
+        assert reclaimed.attempts == 2
+
+    def test_gives_up_after_max_attempts(self, unit, pdf_path):
+        service = PdfIngestionService()
+        job = service.enqueue(unit, pdf_path, 'book.pdf')
+        PdfIngestionJob.objects.filter(pk=job.pk).update(attempts=service.MAX_ATTEMPTS)
+
+        assert service.claim_next() is None
+        job.refresh_from_db()
+        assert job.status == 'failed'
+
+    def test_reclaimed_job_stops_committing(self, unit, pdf_path):
+        service = PdfIngestionService()
+        job = service.enqueue(unit, pdf_path, 'book.pdf', page_ranges=RANGES)
+        original = service._ingest_range
+        calls = []
+
+        def reclaimed_before_second_range(job, pdf, index):
+            calls.append(index)
+            if len(calls) == 2:
+                # Another worker takes the job over; its claim commits outside
+                # the transaction this worker renders the range in
+                PdfIngestionJob.objects.filter(pk=job.pk).update(attempts=F('attempts') + 1)
+            original(job, pdf, index)
+
+        with patch.object(service, '_ingest_range', side_effect=reclaimed_before_second_range):
+            job = service.process(service.claim_next())
+
+        assert job.status == 'running'
+        assert job.attempts == 2
+        assert job.progress == {'done': 1, 'total': 3}
+        assert unit.children.filter(node_type='Session').count() == 1
+
+
+@pytest.mark.django_db(transaction=True)
+class TestHeartbeat:
+
+    def test_beats_until_stopped_and_only_while_owned(self, unit, pdf_path):
+        service = PdfIngestionService()
+        service.enqueue(unit, pdf_path, 'book.pdf')
+        service.HEARTBEAT_INTERVAL = timedelta(milliseconds=10)
+        job = service.claim_next()
+        claimed_at = job.heartbeat_at
+
+        with Heartbeat(service, [job]):
+            time.sleep(0.2)
+        job.refresh_from_db()
+        assert job.heartbeat_at > claimed_at
+
+        PdfIngestionJob.objects.filter(pk=job.pk).update(attempts=F('attempts') + 1)
+        beaten_at = job.heartbeat_at
+        with Heartbeat(service, [job]):
+            time.sleep(0.1)
+        job.refresh_from_db()
+        assert job.heartbeat_at == beaten_at
+
+
+class TestPdfIngestionEndpoints:
+
+    def test_upload_queues_job_and_returns_immediately(self, client, unit, settings, tmp_path):
+        settings.MEDIA_ROOT = str(tmp_path)
+        staff = User.objects.create_user(username='ingest-staff', email='is@example.com', password='x', is_staff=True)
+        client.force_login(staff)
+
+        response = client.post('/content/pdf-ingest/', {
+            'node_id': unit.id,
+            'file': SimpleUploadedFile('book.pdf', create_test_pdf(2), content_type='application/pdf'),
+        })
+
+        assert response.status_code == 202
+        job = PdfIngestionJob.objects.get(pk=response.json()['id'])
+        assert job.status == 'pending'
+        assert job.created_by == staff
+        assert not unit.children.exists()
+
+        call_command('ingest_pdfs', '--once', '--workers=0')
+
+        status = client.get(f'/content/pdf-ingest/{job.id}/').json()
+        assert status['status'] == 'completed'
+        assert status['progress']['done'] == status['progress']['total']
+
+    def test_upload_requires_instructor(self, client, unit):
+        student = User.objects.create_user(username='ingest-student', email='st@example.com', password='x')
+        client.force_login(student)
+
+        response = client.post('/content/pdf-ingest/', {
+            'node_id': unit.id,
+            'file': SimpleUploadedFile('book.pdf', create_test_pdf(1), content_type='application/pdf'),
+        })
+
+        assert response.status_code == 403
+        assert not PdfIngestionJob.objects.exists()
+
+    def test_database_error_requeues_job(self, unit, pdf_path):
+        from django.db import OperationalError
+
+        service = PdfIngestionService()
+        service.enqueue(unit, pdf_path, 'book.pdf', page_ranges=RANGES)
+
+        with patch.object(service.parser, 'render_session', side_effect=OperationalError('database is locked')):
+            job = service.process(service.claim_next())
+
+        assert job.status == 'pending'
+        assert service.process(service.claim_next()).status == 'completed'
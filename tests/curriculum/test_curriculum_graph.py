@@ -0,0 +1,161 @@
+"""
+Tests for the compiled, cached curriculum graph.
+
+**Feature: curriculum-graph, Compiled Program Tree**
+
+Tests that the compiled graph mirrors the node tree, is served from cache,
+and is invalidated when node changes commit.
+"""
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.blueprints.models import AcademicBlueprint
+from apps.core.models import Program, User
+from apps.curriculum.models import CurriculumNode
+from apps.curriculum.repositories import CurriculumNodeRepository
+from apps.curriculum.services import CurriculumGraph, CurriculumGraphService
+from apps.progression.models import Enrollment, NodeCompletion
+from apps.progression.views import _build_instructor_curriculum_tree
+
+
+@pytest.fixture
+def program(db):
+    blueprint = AcademicBlueprint.objects.create(
+        name="Graph Blueprint",
+        hierarchy_structure=["Year", "Unit", "Session"],
+        grading_logic={"type": "weighted", "components": []},
+    )
+    return Program.objects.create(name="Graph Program", code="GRAPH-1", blueprint=blueprint)
+
+
+@pytest.fixture
+def tree(program):
+    """Two years, each with two units, the first unit holding two sessions."""
+    nodes = {}
+    for i in range(2):
+        year = CurriculumNode.objects.create(
+            program=program, node_type="Year", title=f"Year {i}", position=1 - i,
+            is_published=True,
+        )
+        nodes[f"y{i}"] = year
+        for j in range(2):
+            unit = CurriculumNode.objects.create(
+                program=program, parent=year, node_type="Unit", title=f"Unit {i}.{j}",
+                position=j, is_published=(j == 0),
+            )
+            nodes[f"u{i}{j}"] = unit
+        for k in range(2):
+            nodes[f"s{i}{k}"] = CurriculumNode.objects.create(
+                program=program, parent=nodes[f"u{i}0"], node_type="Session",
+                title=f"Session {i}.{k}", position=k, is_published=True,
+            )
+    return nodes
+
+
+@pytest.mark.django_db
+class TestCurriculumGraph:
+
+    def test_roots_follow_sibling_order(self, program, tree):
+        graph = CurriculumGraphService.get_graph(program.id)
+        assert [n.id for n in graph.roots()] == [tree["y1"].id, tree["y0"].id]
+
+    def test_published_children_filter(self, program, tree):
+        graph = CurriculumGraphService.get_graph(program.id)
+        assert [n.id for n in graph.children(tree["y0"].id)] == [tree["u00"].id, tree["u01"].id]
+        assert [n.id for n in graph.children(tree["y0"].id, published_only=True)] == [tree["u00"].id]
+
+    def test_depth_leaf_and_ancestors(self, program, tree):
+        graph = CurriculumGraphService.get_graph(program.id)
+        session = tree["s00"]
+        assert graph.depth(session.id) == 2
+        assert graph.get(session.id).is_leaf
+        assert not graph.get(tree["u00"].id).is_leaf
+        assert graph.ancestor_ids(session.id) == [tree["y0"].id, tree["u00"].id]
+        assert graph.subtree_height(tree["y0"].id) == 2
+
+    def test_descendants_match_recursive_walk(self, program, tree):
+        def walk(node):
+            result = []
+            for child in node.children.order_by("position", "id"):
+                result.append(child.id)
+                result.extend(walk(child))
+            return result
+
+        graph = CurriculumGraphService.get_graph(program.id)
+        for node in tree.values():
+            assert graph.descendant_ids(node.id) == walk(node)
+            assert [n.id for n in node.get_descendants()] == walk(node)
+
+    def test_preorder_index_is_contiguous(self, program, tree):
+        graph = CurriculumGraphService.get_graph(program.id)
+        assert [n.preorder for n in graph.nodes] == list(range(len(tree)))
+
+    def test_cached_graph_needs_no_queries(self, program, tree):
+        CurriculumGraphService.get_graph(program.id)
+        with CaptureQueriesContext(connection) as ctx:
+            graph = CurriculumGraphService.get_graph(program.id)
+        assert len(ctx.captured_queries) == 0
+        assert len(graph) == len(tree)
+
+    def test_save_invalidates_graph(self, program, tree, django_capture_on_commit_callbacks):
+        before = CurriculumGraphService.get_graph(program.id)
+        with django_capture_on_commit_callbacks(execute=True):
+            CurriculumNode.objects.create(
+                program=program, parent=tree["y1"], node_type="Unit", title="New", position=5,
+            )
+        after = CurriculumGraphService.get_graph(program.id)
+        assert after.version != before.version
+        assert len(after) == len(before) + 1
+
+    def test_delete_invalidates_graph(self, program, tree, django_capture_on_commit_callbacks):
+        CurriculumGraphService.get_graph(program.id)
+        with django_capture_on_commit_callbacks(execute=True):
+            tree["u00"].delete()
+        graph = CurriculumGraphService.get_graph(program.id)
+        assert tree["u00"].id not in graph
+        assert tree["s00"].id not in graph
+
+    def test_reorder_invalidates_graph(self, program, tree, django_capture_on_commit_callbacks):
+        CurriculumGraphService.get_graph(program.id)
+        with django_capture_on_commit_callbacks(execute=True):
+            CurriculumNodeRepository().reorder_siblings([tree["y0"].id, tree["y1"].id])
+        graph = CurriculumGraphService.get_graph(program.id)
+        assert [n.id for n in graph.roots()] == [tree["y0"].id, tree["y1"].id]
+
+    def test_rollback_keeps_graph_version(self, program, tree):
+        before = CurriculumGraphService.get_graph(program.id)
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                tree["s10"].delete()
+                raise RuntimeError
+        assert CurriculumGraphService.get_graph(program.id).version == before.version
+
+    def test_instructor_tree_counts_in_constant_queries(self, program, tree):
+        student = User.objects.create_user(username="grapher", email="grapher@example.com")
+        enrollment = Enrollment.objects.create(user=student, program=program, status="active")
+        NodeCompletion.objects.create(
+            enrollment=enrollment, node=tree["s00"], completion_type="view",
+            completed_at=timezone.now(),
+        )
+        graph = CurriculumGraphService.get_graph(program.id)
+        with CaptureQueriesContext(connection) as ctx:
+            result = _build_instructor_curriculum_tree(graph.roots(published_only=True), program, graph)
+        assert len(ctx.captured_queries) == 2
+        sessions = {
+            s["id"]: s for year in result for unit in year["children"] for s in unit["children"]
+        }
+        assert sessions[tree["s00"].id]["completionCount"] == 1
+        assert sessions[tree["s01"].id]["completionCount"] == 0
+        assert sessions[tree["s00"].id]["totalStudents"] == 1
+
+    def test_compile_skips_orphans(self):
+        rows = [
+            {"id": 1, "parent_id": None, "title": "A", "node_type": "Year", "code": None,
+             "position": 0, "is_published": True},
+            {"id": 2, "parent_id": 99, "title": "B", "node_type": "Unit", "code": None,
+             "position": 0, "is_published": True},
+        ]
+        graph = CurriculumGraph.compile(1, rows)
+        assert 1 in graph and 2 not in graph
@@ -0,0 +1,137 @@
+"""
+Tests for the CurriculumNode materialized path index.
+
+**Feature: curriculum-graph, Materialized Path**
+
+Tests that path and depth stay consistent across create, move and reorder,
+and that subtree/ancestor lookups are single queries.
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.blueprints.models import AcademicBlueprint
+from apps.core.models import Program
+from apps.curriculum.models import CurriculumNode, path_segment, path_upper_bound
+from apps.curriculum.repositories import CurriculumNodeRepository
+
+
+@pytest.fixture
+def program(db):
+    blueprint = AcademicBlueprint.objects.create(
+        name="Path Blueprint",
+        hierarchy_structure=["Year", "Unit", "Session", "Lesson"],
+        grading_logic={"type": "weighted", "components": []},
+    )
+    return Program.objects.create(name="Path Program", code="PATH-1", blueprint=blueprint)
+
+
+def _node(program, node_type, parent=None, position=0):
+    return CurriculumNode.objects.create(
+        program=program, parent=parent, node_type=node_type, title=node_type, position=position
+    )
+
+
+@pytest.mark.django_db
+class TestMaterializedPath:
+
+    def test_path_and_depth_set_on_create(self, program):
+        year = _node(program, "Year")
+        unit = _node(program, "Unit", year)
+        session = _node(program, "Session", unit)
+        session.refresh_from_db()
+        assert session.path == path_segment(year.id) + path_segment(unit.id) + path_segment(session.id)
+        assert session.depth == 2
+        assert session.get_depth() == 2
+
+    def test_upper_bound_excludes_siblings(self):
+        assert path_upper_bound("0000000009") == "0000000010"
+        assert path_upper_bound("00000000010000000099") == "00000000010000000100"
+
+    def test_move_rewrites_subtree(self, program):
+        year_a = _node(program, "Year")
+        year_b = _node(program, "Year", position=1)
+        unit_b = _node(program, "Unit", year_b)
+        unit = _node(program, "Unit", year_a)
+        session = _node(program, "Session", unit)
+        lesson = _node(program, "Lesson", session)
+        
+        CurriculumNodeRepository().move_node(session.id, unit_b.id)
+        
+        lesson.refresh_from_db()
+        session.refresh_from_db()
+        assert session.path.startswith(unit_b.path)
+        assert lesson.path == session.path + path_segment(lesson.id)
+        assert (session.depth, lesson.depth) == (2, 3)
+        assert [n.id for n in year_a.get_descendants()] == [unit.id]
+        assert {n.id for n in year_b.get_descendants()} == {unit_b.id, session.id, lesson.id}
+
+    def test_move_to_root_reduces_depth(self, program):
+        year = _node(program, "Year")
+        unit = _node(program, "Unit", year)
+        session = _node(program, "Session", unit)
+        
+        CurriculumNodeRepository().move_node(unit.id, None)
+        
+        session.refresh_from_db()
+        assert session.depth == 1
+        assert session.path == path_segment(unit.id) + path_segment(session.id)
+
+    def test_reorder_keeps_paths(self, program):
+        year = _node(program, "Year")
+        units = [_node(program, "Unit", year, i) for i in range(3)]
+        before = {u.id: CurriculumNode.objects.get(pk=u.id).path for u in units}
+        
+        CurriculumNodeRepository().reorder_siblings([u.id for u in reversed(units)])
+        
+        assert {u.id: CurriculumNode.objects.get(pk=u.id).path for u in units} == before
+
+    def test_subtree_and_ancestors_are_single_queries(self, program):
+        year = _node(program, "Year")
+        unit = _node(program, "Unit", year)
+        session = _node(program, "Session", unit)
+        lesson = _node(program, "Lesson", session)
+        year.refresh_from_db()
+        lesson.refresh_from_db()
+        
+        with CaptureQueriesContext(connection) as ctx:
+            descendants = list(year.descendants_queryset())
+        assert len(ctx.captured_queries) == 1
+        assert {n.id for n in descendants} == {unit.id, session.id, lesson.id}
+        
+        with CaptureQueriesContext(connection) as ctx:
+            ancestors = lesson.get_ancestors()
+        assert len(ctx.captured_queries) == 1
+        assert [n.id for n in ancestors] == [year.id, unit.id, session.id]
+
+    def test_rebuild_paths_repairs_bulk_inserts(self, program):
+        year = _node(program, "Year")
+        units = CurriculumNode.objects.bulk_create([
+            CurriculumNode(program=program, parent=year, node_type="Unit", title=f"U{i}", position=i)
+            for i in range(3)
+        ])
+        CurriculumNodeRepository().rebuild_paths(program.id)
+        for unit in units:
+            unit.refresh_from_db()
+            assert unit.path == year.path + path_segment(unit.id)
+            assert unit.depth == 1
+
+    def test_subtree_without_paths_follows_parents(self, program):
+        year = _node(program, "Year")
+        CurriculumNode.objects.filter(pk=year.pk).update(path="")
+        units = CurriculumNode.objects.bulk_create([
+            CurriculumNode(program=program, parent=year, node_type="Unit", title=f"U{i}", position=i)
+            for i in range(2)
+        ])
+        session = CurriculumNode.objects.bulk_create([
+            CurriculumNode(program=program, parent=units[0], node_type="Session", title="S", position=0)
+        ])[0]
+        _node(program, "Year", position=1)
+        
+        subtree = CurriculumNodeRepository().get_subtree(year.id)
+        
+        assert subtree[0].id == year.id
+        assert {n.id for n in subtree[1:]} == {units[0].id, units[1].id, session.id}
+        
+        year.refresh_from_db()
+        assert [n.id for n in year.get_descendants()] == [units[0].id, session.id, units[1].id]
@@ -0,0 +1,128 @@
+"""
+Tests for keyset-paginated discussions in the course player.
+"""
+from datetime import timedelta
+
+import pytest
+from django.test import Client
+from django.utils import timezone
+
+from apps.core.models import Program, User
+from apps.curriculum.models import CurriculumNode
+from apps.discussions.models import DiscussionPost, DiscussionThread
+from apps.discussions.services import DiscussionFeedService
+from apps.progression.models import Enrollment
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def node():
+    program = Program.objects.create(name='Feed Program', code='DF-1')
+    return CurriculumNode.objects.create(
+        program=program, node_type='Session', title='Lesson', position=0, is_published=True
+    )
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(username='student', email='student@example.com')
+
+
+def _threads(node, user, count, pinned=()):
+    now = timezone.now()
+    threads = []
+    for i in range(count):
+        thread = DiscussionThread.objects.create(
+            node=node, user=user, title=f'Thread {i}', content='?', is_pinned=i in pinned
+        )
+        threads.append(thread)
+    # Two threads share a timestamp to exercise the id tie-breaker
+    for i, thread in enumerate(threads):
+        created_at = now - timedelta(minutes=i if i != 3 else 2)
+        DiscussionThread.objects.filter(pk=thread.pk).update(created_at=created_at)
+    return threads
+
+
+def _walk(fetch, key):
+    items, cursor = [], None
+    while True:
+        page = fetch(cursor)
+        items.extend(item['id'] for item in page[key])
+        cursor = page['nextCursor']
+        if cursor is None:
+            return items
+
+
+def test_thread_pages_list_pinned_then_newest(node, user):
+    _threads(node, user, 7, pinned={4, 6})
+
+    seen = _walk(lambda cursor: DiscussionFeedService.thread_page(node.id, cursor=cursor, limit=2), 'threads')
+
+    expected = list(
+        DiscussionThread.objects.filter(node=node)
+        .order_by('-is_pinned', '-created_at', '-id').values_list('id', flat=True)
+    )
+    assert seen == expected
+    assert len(set(seen)) == 7
+
+
+def test_reply_pages_follow_parent(node, user):
+    thread = _threads(node, user, 1)[0]
+    top = [DiscussionPost.objects.create(thread=thread, user=user, content=f'Reply {i}') for i in range(5)]
+    nested = [
+        DiscussionPost.objects.create(thread=thread, user=user, content='Nested', parent=top[0])
+        for _ in range(3)
+    ]
+
+    seen = _walk(
+        lambda cursor: DiscussionFeedService.reply_page(thread.id, cursor=cursor, limit=2), 'posts'
+    )
+    assert seen == [post.id for post in top]
+
+    page = DiscussionFeedService.reply_page(thread.id, limit=1)
+    assert page['posts'][0]['replyCount'] == 3
+
+    seen = _walk(
+        lambda cursor: DiscussionFeedService.reply_page(thread.id, parent_id=top[0].id, cursor=cursor, limit=2),
+        'posts',
+    )
+    assert seen == [post.id for post in nested]
+
+
+def test_invalid_cursor_is_rejected(node):
+    with pytest.raises(ValueError):
+        DiscussionFeedService.thread_page(node.id, cursor='garbage')
+
+
+def test_session_discussion_endpoints(node, user):
+    enrollment = Enrollment.objects.create(user=user, program=node.program, status='active')
+    threads = _threads(node, user, 3)
+    DiscussionPost.objects.create(thread=threads[0], user=user, content='Reply')
+    client = Client()
+    client.force_login(user)
+    base = f'/student/programs/{enrollment.id}/session/{node.id}/discussions/'
+
+    data = client.get(base, {'limit': 2}).json()
+    assert [t['id'] for t in data['threads']] == [threads[0].id, threads[1].id]
+    assert data['threads'][0]['postCount'] == 1
+
+    data = client.get(base, {'limit': 2, 'cursor': data['nextCursor']}).json()
+    assert [t['id'] for t in data['threads']] == [threads[2].id]
+    assert data['nextCursor'] is None
+
+    data = client.get(f'{base}{threads[0].id}/replies/').json()
+    assert [p['content'] for p in data['posts']] == ['Reply']
+
+    assert client.get(base, {'cursor': 'garbage'}).status_code == 400
+
+
+def test_endpoints_require_own_enrollment(node, user):
+    enrollment = Enrollment.objects.create(user=user, program=node.program, status='active')
+    outsider = User.objects.create_user(username='outsider', email='outsider@example.com')
+    client = Client()
+    client.force_login(outsider)
+
+    response = client.get(f'/student/programs/{enrollment.id}/session/{node.id}/discussions/')
+
+    assert response.status_code == 404
@@ -0,0 +1,110 @@
+"""
+Tests for full-text discussion search.
+Runs against the test database's engine (SQLite FTS5 by default).
+"""
+from importlib import import_module
+
+import pytest
+from django.apps import apps as django_apps
+from django.core.management import call_command
+from django.db import connection
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.core.models import Program, User
+from apps.curriculum.models import CurriculumNode
+from apps.discussions.models import DiscussionPost, DiscussionSearchDocument, DiscussionThread
+from apps.discussions.search import BACKENDS, get_search_backend
+from apps.discussions.views import DiscussionPostViewSet, DiscussionThreadViewSet
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(username='student', email='student@example.com')
+
+
+@pytest.fixture
+def nodes():
+    program = Program.objects.create(name='Search Program', code='DS-1')
+    return [
+        CurriculumNode.objects.create(program=program, node_type='Session', title=f'Lesson {i}', position=i)
+        for i in range(2)
+    ]
+
+
+@pytest.fixture
+def forum(nodes, user):
+    biology = DiscussionThread.objects.create(
+        node=nodes[0], user=user, title='Photosynthesis question', content='How do plants make sugar?'
+    )
+    chemistry = DiscussionThread.objects.create(
+        node=nodes[1], user=user, title='Balancing equations', content='Stuck on redox.'
+    )
+    reply = DiscussionPost.objects.create(
+        thread=chemistry, user=user, content='Chlorophyll and photosynthesis come up here too.'
+    )
+    return biology, chemistry, reply
+
+
+def _search(viewset, user, **params):
+    request = APIRequestFactory().get('/', params)
+    force_authenticate(request, user=user)
+    response = viewset.as_view({'get': 'list'})(request)
+    return [item['id'] for item in response.data['results']]
+
+
+def test_index_follows_saves_and_deletes(forum):
+    biology, chemistry, reply = forum
+    backend = get_search_backend()
+
+    assert {hit.object_id for hit in backend.search('photosynthesis')} == {biology.id, reply.id}
+
+    reply.content = 'Never mind.'
+    reply.save()
+    assert [hit.object_id for hit in backend.search('photosynthesis')] == [biology.id]
+
+    biology.delete()
+    assert backend.search('photosynthesis') == []
+    assert not DiscussionSearchDocument.objects.filter(thread_id=biology.id).exists()
+
+
+def test_title_match_ranks_first(forum, user):
+    biology, chemistry, _ = forum
+
+    assert _search(DiscussionThreadViewSet, user, search='photosynthesis') == [biology.id, chemistry.id]
+
+
+def test_search_filters_by_node_and_kind(forum, user, nodes):
+    _, chemistry, reply = forum
+
+    assert _search(DiscussionThreadViewSet, user, search='photosynthesis', node=nodes[1].id) == [chemistry.id]
+    assert _search(DiscussionPostViewSet, user, search='photosynthesis') == [reply.id]
+
+
+def test_query_syntax_is_not_interpreted(forum, user):
+    assert _search(DiscussionThreadViewSet, user, search='"redox*(') == [forum[1].id]
+    assert _search(DiscussionThreadViewSet, user, search='***') == []
+
+
+def test_rebuild_command(forum):
+    DiscussionSearchDocument.objects.all().delete()
+    assert get_search_backend().search('redox') == []
+
+    call_command('rebuild_discussion_search', '--batch-size=1')
+
+    assert DiscussionSearchDocument.objects.count() == 3
+    assert [hit.thread_id for hit in get_search_backend().search('redox')] == [forum[1].id]
+
+
+def test_migration_indexes_existing_posts(forum):
+    DiscussionSearchDocument.objects.all().delete()
+
+    import_module('apps.discussions.migrations.0003_discussion_search').backfill_documents(django_apps, None)
+
+    assert DiscussionSearchDocument.objects.count() == 3
+    assert {hit.object_id for hit in get_search_backend().search('photosynthesis')} == {forum[0].id, forum[2].id}
+
+
+def test_backend_follows_connection_vendor():
+    assert type(get_search_backend()) is BACKENDS[connection.vendor]
@@ -0,0 +1,116 @@
+"""
+Tests for denormalized discussion thread stats.
+Tests incremental maintenance, backfill and the fixed-cost thread listing.
+"""
+from importlib import import_module
+
+import pytest
+from django.apps import apps as django_apps
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.core.models import Program, User
+from apps.curriculum.models import CurriculumNode
+from apps.discussions.models import DiscussionPost, DiscussionThread
+from apps.discussions.services import ThreadStatsService
+from apps.discussions.views import DiscussionThreadViewSet
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def node():
+    program = Program.objects.create(name='Discussion Program', code='DP-1')
+    return CurriculumNode.objects.create(program=program, node_type='Session', title='Lesson', position=0)
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(username='student', email='student@example.com')
+
+
+def _thread(node, user, title='Question'):
+    return DiscussionThread.objects.create(node=node, user=user, title=title, content='Why?')
+
+
+def _post(thread, user, parent=None):
+    return DiscussionPost.objects.create(thread=thread, user=user, content='Because.', parent=parent)
+
+
+def test_posts_update_thread_stats(node, user):
+    thread = _thread(node, user)
+    first = _post(thread, user)
+    second = _post(thread, user, parent=first)
+
+    thread.refresh_from_db()
+    assert thread.post_count == 2
+    assert thread.last_post_at == second.created_at
+
+    second.delete()
+    thread.refresh_from_db()
+    assert thread.post_count == 1
+    assert thread.last_post_at == first.created_at
+
+
+def test_cascaded_replies_are_uncounted(node, user):
+    thread = _thread(node, user)
+    first = _post(thread, user)
+    _post(thread, user, parent=first)
+    _post(thread, user, parent=first)
+
+    first.delete()
+
+    thread.refresh_from_db()
+    assert thread.post_count == 0
+    assert thread.last_post_at is None
+
+
+def test_backfill_repairs_drift(node, user):
+    thread = _thread(node, user)
+    post = _post(thread, user)
+    DiscussionThread.objects.filter(pk=thread.pk).update(post_count=7, last_post_at=None)
+
+    assert ThreadStatsService.rebuild() == 1
+
+    thread.refresh_from_db()
+    assert thread.post_count == 1
+    assert thread.last_post_at == post.created_at
+
+
+def test_migration_backfills_existing_threads(node, user):
+    thread = _thread(node, user)
+    _post(thread, user)
+    latest = _post(thread, user)
+    empty = _thread(node, user, title='Unanswered')
+    DiscussionThread.objects.update(post_count=0, last_post_at=None)
+
+    import_module('apps.discussions.migrations.0002_thread_stats').backfill_stats(django_apps, None)
+
+    thread.refresh_from_db()
+    empty.refresh_from_db()
+    assert (thread.post_count, thread.last_post_at) == (2, latest.created_at)
+    assert (empty.post_count, empty.last_post_at) == (0, None)
+
+
+def _list_threads(user, page_size):
+    request = APIRequestFactory().get('/', {'page_size': page_size})
+    force_authenticate(request, user=user)
+    return DiscussionThreadViewSet.as_view({'get': 'list'})(request)
+
+
+def test_listing_queries_do_not_grow_with_page_size(node, user):
+    for i in range(30):
+        thread = _thread(node, user, title=f'Thread {i}')
+        _post(thread, user)
+
+    with CaptureQueriesContext(connection) as small:
+        response = _list_threads(user, 5)
+    assert len(response.data['results']) == 5
+
+    with CaptureQueriesContext(connection) as large:
+        response = _list_threads(user, 30)
+    assert len(response.data['results']) == 30
+    assert response.data['results'][0]['posts_count'] == 1
+
+    assert len(large.captured_queries) == len(small.captured_queries)
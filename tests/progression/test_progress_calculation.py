@@ -36,6 +36,7 @@ def _make_program_with_nodes(num_completable: int, num_containers: int = 0):
     
     program = Program.objects.create(
         name=f'Test Program {timestamp}',
+        code=f'TP-{timestamp}',
         blueprint=blueprint,
         is_published=True
     )
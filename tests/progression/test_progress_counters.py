@@ -0,0 +1,182 @@
+"""
+Tests for denormalized Enrollment progress counters.
+Tests incremental maintenance, curriculum-revision rebuilds and reconciliation.
+"""
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.blueprints.models import AcademicBlueprint
+from apps.core.models import Program, User
+from apps.curriculum.models import CurriculumNode
+from apps.progression.models import Enrollment, NodeCompletion
+from apps.progression.services import ProgressionEngine, ProgressCounterService
+
+pytestmark = pytest.mark.django_db
+
+
+def _make_program(code='PC-1', num_units=2, lessons_per_unit=3):
+    blueprint = AcademicBlueprint.objects.create(
+        name=f'Counter Blueprint {code}',
+        hierarchy_structure=['Year', 'Unit', 'Session'],
+        grading_logic={'type': 'weighted', 'components': []},
+        progression_rules={'sequential': False},
+    )
+    program = Program.objects.create(name=f'Program {code}', code=code, blueprint=blueprint)
+    units, lessons = [], []
+    for i in range(num_units):
+        unit = CurriculumNode.objects.create(
+            program=program, node_type='Unit', title=f'Unit {i}', position=i,
+            is_published=True, completion_rules={'is_completable': False},
+        )
+        units.append(unit)
+        for j in range(lessons_per_unit):
+            lessons.append(CurriculumNode.objects.create(
+                program=program, parent=unit, node_type='Session', title=f'Lesson {i}.{j}',
+                position=j, is_published=True, completion_rules={'type': 'view'},
+            ))
+    return program, units, lessons
+
+
+def _enroll(program, username):
+    user = User.objects.create_user(
+        username=username, email=f'{username}@example.com', password='testpass123'
+    )
+    return Enrollment.objects.create(user=user, program=program, status='active')
+
+
+def _complete(enrollment, node):
+    return NodeCompletion.objects.create(
+        enrollment=enrollment, node=node, completed_at=timezone.now(), completion_type='view'
+    )
+
+
+class TestIncrementalCounters:
+
+    def test_counters_track_completions(self):
+        program, units, lessons = _make_program()
+        enrollment = _enroll(program, 'counter1')
+        for lesson in lessons[:4]:
+            _complete(enrollment, lesson)
+        
+        ProgressCounterService.refresh(enrollment)
+        assert enrollment.completion_count == 4
+        assert enrollment.completable_count == 6
+        assert enrollment.completable_completed_count == 4
+        assert enrollment.leaf_node_count == 6
+        assert enrollment.subtree_counters[str(units[0].id)] == [3, 3]
+        assert enrollment.subtree_counters[str(units[1].id)] == [1, 3]
+
+    def test_calculate_matches_recount(self):
+        program, units, lessons = _make_program()
+        enrollment = _enroll(program, 'counter2')
+        for lesson in lessons[1:5]:
+            _complete(enrollment, lesson)
+        
+        calculator = ProgressionEngine().progress_calculator
+        assert calculator.calculate(enrollment) == pytest.approx(4 / 6 * 100)
+        assert calculator.calculate(enrollment, units[0]) == pytest.approx(2 / 3 * 100)
+
+    def test_mark_complete_completes_program(self):
+        program, units, lessons = _make_program(num_units=1, lessons_per_unit=2)
+        enrollment = _enroll(program, 'counter3')
+        engine = ProgressionEngine()
+        
+        engine.mark_complete(enrollment, lessons[0], 'view')
+        enrollment.refresh_from_db()
+        assert enrollment.status == 'active'
+        
+        engine.mark_complete(enrollment, lessons[1], 'view')
+        enrollment.refresh_from_db()
+        assert enrollment.status == 'completed'
+        assert enrollment.completable_completed_count == 2
+
+    def test_curriculum_change_triggers_rebuild(self):
+        program, units, lessons = _make_program()
+        enrollment = _enroll(program, 'counter4')
+        _complete(enrollment, lessons[0])
+        ProgressCounterService.refresh(enrollment)
+        assert enrollment.completable_count == 6
+        
+        CurriculumNode.objects.create(
+            program=program, parent=units[1], node_type='Session', title='Extra',
+            position=9, is_published=True, completion_rules={'type': 'view'},
+        )
+        ProgressCounterService.refresh(enrollment)
+        assert enrollment.completable_count == 7
+        assert enrollment.leaf_node_count == 7
+        assert enrollment.completable_completed_count == 1
+
+    def test_delete_decrements_counters(self):
+        program, units, lessons = _make_program()
+        enrollment = _enroll(program, 'counter5')
+        completions = [_complete(enrollment, lesson) for lesson in lessons[:3]]
+        ProgressCounterService.refresh(enrollment)
+        
+        completions[0].delete()
+        enrollment.refresh_from_db()
+        assert enrollment.completion_count == 2
+        assert enrollment.completable_completed_count == 2
+        assert enrollment.subtree_counters[str(units[0].id)] == [2, 3]
+
+    def test_fresh_counters_survive_cache_loss(self):
+        program, units, lessons = _make_program()
+        enrollment = _enroll(program, 'counter6')
+        _complete(enrollment, lessons[0])
+        ProgressCounterService.refresh(enrollment)
+        
+        # Another process (or a restart) has none of this process's cache
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            ProgressCounterService.refresh(enrollment)
+        assert len(ctx.captured_queries) == 1
+        assert enrollment.completion_count == 1
+
+
+class TestDashboardQueries:
+
+    def test_dashboard_progress_is_constant_queries(self):
+        enrollments = []
+        for i in range(10):
+            program, units, lessons = _make_program(code=f'PC-D{i}')
+            enrollment = _enroll(program, f'dash{i}') if i == 0 else Enrollment.objects.create(
+                user=enrollments[0].user, program=program, status='active'
+            )
+            _complete(enrollment, lessons[0])
+            enrollments.append(enrollment)
+        user = enrollments[0].user
+        
+        # Warm counters once
+        ProgressCounterService.refresh_stale(list(Enrollment.objects.filter(user=user)))
+        
+        with CaptureQueriesContext(connection) as ctx:
+            loaded = list(Enrollment.objects.filter(user=user).select_related('program'))
+            ProgressCounterService.refresh_stale(loaded)
+            progress = [e.progress_percent for e in loaded]
+        
+        assert len(ctx.captured_queries) == 1
+        assert progress == [pytest.approx(100 / 6)] * 10
+
+
+class TestReconcileCommand:
+
+    def test_reconcile_repairs_drift(self):
+        program, units, lessons = _make_program()
+        enrollment = _enroll(program, 'drift1')
+        _complete(enrollment, lessons[0])
+        _complete(enrollment, lessons[1])
+        ProgressCounterService.refresh(enrollment)
+        Enrollment.objects.filter(pk=enrollment.pk).update(completion_count=42)
+        
+        call_command('reconcile_progress_counters', '--dry-run', stdout=StringIO())
+        enrollment.refresh_from_db()
+        assert enrollment.completion_count == 42
+        
+        call_command('reconcile_progress_counters', stdout=StringIO())
+        enrollment.refresh_from_db()
+        assert enrollment.completion_count == 2
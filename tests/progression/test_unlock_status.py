@@ -32,6 +32,7 @@ def _make_program_with_mixed_nodes(num_nodes: int, sequential: bool = True):
     
     program = Program.objects.create(
         name=f'Test Program {timestamp}',
+        code=f'TP-{timestamp}',
         blueprint=blueprint,
         is_published=True
     )
@@ -281,3 +282,71 @@ class TestLockReasonIncluded:
         for status in statuses:
             if status['status'] == 'unlocked':
                 assert status['lock_reason'] is None
+
+
+class TestBatchUnlockEvaluation:
+    """
+    **Feature: progression-engine, Batch Unlock Evaluation**
+    **Validates: Requirements 5.1, 5.2**
+    
+    *For any* program, get_unlock_status SHALL agree with can_access and
+    SHALL issue a constant number of queries regardless of tree size.
+    """
+
+    @given(
+        num_nodes=st.integers(min_value=1, max_value=8),
+        completed_mask=st.lists(st.booleans(), min_size=8, max_size=8),
+        sequential=st.booleans()
+    )
+    @settings(max_examples=25, deadline=None)
+    def test_batch_matches_can_access(self, num_nodes, completed_mask, sequential):
+        """Batch statuses should match per-node can_access results."""
+        data = _make_program_with_mixed_nodes(num_nodes, sequential=sequential)
+        enrollment = data['enrollment']
+        nodes = data['nodes']
+        
+        for node, completed in zip(nodes, completed_mask):
+            if completed:
+                NodeCompletion.objects.create(
+                    enrollment=enrollment,
+                    node=node,
+                    completed_at=timezone.now(),
+                    completion_type='view'
+                )
+        
+        engine = ProgressionEngine()
+        statuses = {s['node_id']: s for s in engine.get_unlock_status(enrollment)}
+        
+        for node in [data['parent']] + nodes:
+            expected = engine.can_access(enrollment, node)
+            actual = statuses[node.id]
+            assert actual['status'] == expected.status
+            assert actual['lock_reason'] == expected.lock_reason
+            assert actual['blocking_nodes'] == expected.blocking_nodes
+
+    def test_query_count_constant_as_tree_grows(self):
+        """Query count should not depend on the number of nodes."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from apps.progression.models import Enrollment
+        
+        engine = ProgressionEngine()
+        counts = []
+        for num_nodes in (5, 50):
+            data = _make_program_with_mixed_nodes(num_nodes)
+            enrollment = Enrollment.objects.get(pk=data['enrollment'].pk)
+            for node in data['nodes'][:2]:
+                NodeCompletion.objects.create(
+                    enrollment=enrollment,
+                    node=node,
+                    completed_at=timezone.now(),
+                    completion_type='view'
+                )
+            
+            with CaptureQueriesContext(connection) as ctx:
+                statuses = engine.get_unlock_status(enrollment)
+            
+            assert len(statuses) == num_nodes + 1
+            counts.append(len(ctx.captured_queries))
+        
+        assert counts[0] == counts[1]